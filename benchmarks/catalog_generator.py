@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gerador de catálogos XML de localização sintéticos para benchmarks
+"""
+
+import random
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+# Vocabulário usado para montar textos de interface plausíveis
+WORDS = (
+    "save", "cancel", "delete", "edit", "add", "search", "report", "dashboard", "export",
+    "data", "filter", "results", "user", "password", "settings", "account", "invoice",
+    "customer", "supplier", "payment", "balance", "period", "company", "branch", "tax",
+    "document", "record", "loading", "error", "warning", "success", "select", "open",
+    "close", "print", "preview", "import", "file", "date", "value", "total", "status",
+)
+
+NAMESPACE = "http://nasajon.com/schemas/localization.xsd"
+
+
+def make_text(rng: random.Random, text_length: int) -> str:
+    """
+    Monta um texto com aproximadamente `text_length` caracteres
+
+    Args:
+        rng: Gerador aleatório (determinístico pela semente)
+        text_length: Tamanho médio desejado
+
+    Returns:
+        Texto com inicial maiúscula
+    """
+    words = []
+    size = 0
+    target = max(1, int(rng.uniform(0.5, 1.5) * text_length))
+    while size < target:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words).capitalize()
+
+
+def generate_catalog(
+    output_path: str,
+    strings: int = 1000,
+    duplicate_ratio: float = 0.3,
+    depth: int = 2,
+    text_length: int = 30,
+    group_size: int = 50,
+    seed: int = 42,
+) -> dict:
+    """
+    Gera um catálogo XML sintético no formato de localização suportado
+
+    O arquivo é escrito em streaming, então catálogos com milhões de
+    strings não precisam caber em memória.
+
+    Args:
+        output_path: Arquivo XML a gerar
+        strings: Número de elementos <string>
+        duplicate_ratio: Fração (0-1) de strings que repetem um texto anterior
+        depth: Profundidade de aninhamento dos grupos (1 = grupos na raiz)
+        text_length: Tamanho médio dos textos em caracteres
+        group_size: Strings por grupo mais interno
+        seed: Semente do gerador aleatório
+
+    Returns:
+        Dicionário com os parâmetros e o número de textos únicos gerados
+    """
+    rng = random.Random(seed)
+    depth = max(1, depth)
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    seen = []
+    written = 0
+    group_index = 0
+    with open(path, "w", encoding="utf-8") as out:
+        out.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        out.write(f'<localization xmlns="{NAMESPACE}" culture="en" moduleId="BENCHMARK">\n')
+        while written < strings:
+            # Uma cadeia de `depth` grupos aninhados com `group_size` strings no mais interno
+            for level in range(depth):
+                indent = "  " * (level + 1)
+                out.write(f'{indent}<group name="G{group_index}_{level}">\n')
+            indent = "  " * (depth + 1)
+            for _ in range(min(group_size, strings - written)):
+                if seen and rng.random() < duplicate_ratio:
+                    text = rng.choice(seen)
+                else:
+                    text = f"{make_text(rng, text_length)} {len(seen)}"
+                    seen.append(text)
+                out.write(f'{indent}<string key="GS_{written}">{escape(text)}</string>\n')
+                written += 1
+            for level in reversed(range(depth)):
+                out.write(f'{"  " * (level + 1)}</group>\n')
+            group_index += 1
+        out.write("</localization>\n")
+
+    return {
+        "strings": strings,
+        "unique_texts": len(seen),
+        "duplicate_ratio": duplicate_ratio,
+        "depth": depth,
+        "text_length": text_length,
+        "seed": seed,
+        "bytes": path.stat().st_size,
+    }
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks do pipeline de tradução (sem rede)
+
+Gera catálogos sintéticos, traduz com o motor local (latência e taxa de
+erro configuráveis) e grava vazão, pico de memória (RSS) e tempo por etapa
+em JSON, para comparar o desempenho entre commits.
+
+Exemplos:
+    python benchmarks/run_benchmarks.py --preset quick
+    python benchmarks/run_benchmarks.py --sizes 100000 --latency 0.05 --workers 8
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import platform
+import random
+import resource
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from catalog_generator import generate_catalog
+from xml_translator.core.fuzzy_memory import FuzzyMemory
+from xml_translator.core.inplace_writer import write_in_place
+from xml_translator.core.tm_exchange import export_memory, import_memory, write_segments
+from xml_translator.core.translator import XMLTranslator
+from xml_translator.core.xml_backend import XML_BACKENDS
+from xml_translator.engines.local import LocalEngine
+from xml_translator.utils.logger import AsyncQueueHandler, RepeatFilter, create_handlers
+
+MODES = ("tree", "streaming", "stages", "xml_io", "memory", "fuzzy", "logging", "tm")
+
+PRESETS = {
+    "quick": [1000, 10000],
+    "default": [1000, 10000, 100000],
+    "full": [1000, 10000, 100000, 1000000],
+}
+
+
+def peak_rss_mb() -> float:
+    """Pico de memória residente do processo atual em MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 2)
+
+
+def make_translator(work_dir: Path, engine_options: dict, workers: int) -> XMLTranslator:
+    """Cria um XMLTranslator com memória de tradução vazia e motor local"""
+    config_dir = work_dir / "config"
+    config_dir.mkdir(exist_ok=True)
+    return XMLTranslator(str(config_dir), engine=LocalEngine(prefix="pt:", **engine_options),
+                         workers=workers, rate_limit=0)
+
+
+def timed(stages: dict, name: str, function, *args):
+    """Executa uma etapa e registra seu tempo de parede"""
+    started = time.perf_counter()
+    result = function(*args)
+    stages[name] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def run_stages(translator: XMLTranslator, source: Path, output: Path) -> dict:
+    """Executa cada etapa do pipeline separadamente, incluindo uma segunda passada com cache"""
+    stages = {}
+    tree = timed(stages, "load_xml", translator.load_xml, str(source))
+    strings = timed(stages, "extract_strings", translator.extract_strings, tree)
+    translations = timed(stages, "process_translations", translator.process_translations, strings)
+    timed(stages, "flush_cache", translator.translator.flush_cache)
+    timed(stages, "process_translations_warm", translator.process_translations, strings)
+    timed(stages, "apply_translations", translator.apply_translations, tree, translations)
+    timed(stages, "save_xml", translator.save_xml, tree, str(output))
+    return {"stages": stages, "strings_processed": len(strings)}
+
+
+def run_xml_io(translator: XMLTranslator, source: Path, output: Path) -> dict:
+    """Compara leitura e gravação de cada backend de XML instalado e a gravação in-place"""
+    stages = {}
+    strings = translator.extract_strings(translator.load_xml(str(source)))
+    translations = timed(stages, "process_translations", translator.process_translations, strings)
+    for name, backend_class in sorted(XML_BACKENDS.items()):
+        try:
+            backend = backend_class()
+        except ImportError:
+            continue
+        tree = timed(stages, f"parse_{name}", backend.parse, str(source))
+        timed(stages, f"write_{name}", backend.write, tree, str(output))
+    timed(stages, "write_in_place", write_in_place, str(source), str(output), translations,
+          translator.target_culture)
+    return {"stages": stages, "strings_processed": len(strings)}
+
+
+def traced_mb(function, *args):
+    """Executa a função e retorna (resultado, MB alocados que continuam vivos)"""
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, round(current / (1024 * 1024), 2)
+
+
+def legacy_extract(tree) -> tuple:
+    """Extração no formato anterior (dict por string, caminho montado, lista por texto)"""
+    strings = []
+
+    def extract_recursive(element, path=""):
+        for child in element:
+            tag_name = child.tag.split('}')[-1] if '}' in child.tag else child.tag
+            current_path = f"{path}/{tag_name}" if path else tag_name
+            if tag_name == 'string':
+                text = child.text or ""
+                if text.strip():
+                    strings.append({'key': child.get('key'), 'text': text, 'path': current_path})
+            elif tag_name == 'group':
+                group_name = child.get('name', '')
+                extract_recursive(child, f"{current_path}[{group_name}]" if group_name
+                                  else current_path)
+            elif tag_name == 'localization':
+                extract_recursive(child, current_path)
+
+    extract_recursive(tree.getroot())
+    groups = {}
+    for string_data in strings:
+        groups.setdefault(string_data['text'].strip(), []).append(string_data)
+    return strings, groups
+
+
+def run_memory(translator: XMLTranslator, source: Path, output: Path) -> dict:
+    """Mede a memória dos registros extraídos e agrupados e a compara com o formato anterior"""
+    stages = {}
+    tree = timed(stages, "load_xml", translator.load_xml, str(source))
+
+    def extract_and_group():
+        strings = translator.extract_strings(tree)
+        return strings, translator.group_strings(strings)
+
+    (strings, _), records_mb = traced_mb(extract_and_group)
+    _, legacy_mb = traced_mb(legacy_extract, tree)
+    timed(stages, "extract_strings", translator.extract_strings, tree)
+    count = len(strings)
+    return {
+        "stages": stages,
+        "strings_processed": count,
+        "memory": {
+            "records_mb": records_mb,
+            "legacy_records_mb": legacy_mb,
+            "bytes_per_string": round(records_mb * 1024 * 1024 / count, 1) if count else 0.0,
+            "legacy_bytes_per_string": round(legacy_mb * 1024 * 1024 / count, 1) if count else 0.0,
+        },
+    }
+
+
+def percentile_ms(latencies: list, fraction: float) -> float:
+    """Percentil de uma lista ordenada de durações (segundos), em milissegundos"""
+    return round(latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000, 4)
+
+
+def run_fuzzy(size: int, seed: int, queries: int = 2000) -> dict:
+    """
+    Mede construção e latência da memória aproximada com size textos distintos
+
+    O vocabulário do catálogo sintético é pequeno demais para medir o índice
+    de trigramas: os textos são montados com 5000 palavras em distribuição
+    de Zipf, como em catálogos reais.
+    """
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10)))
+                  for _ in range(5000)]
+    cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+
+    def sentence() -> str:
+        words = rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(2, 8))
+        return " ".join(words).capitalize()
+
+    texts = list(dict.fromkeys(sentence() for _ in range(int(size * 1.05))))[:size]
+    stages = {}
+    memory = FuzzyMemory()
+    timed(stages, "build_index", memory.add_many, ((text, f"pt:{text}") for text in texts),
+          "memory")
+
+    result = {"entries": len(memory)}
+    # Textos novos (quase sempre sem candidato) e variações de pontuação de textos indexados
+    near = [text.replace(" ", ", ", 1) for text in rng.sample(texts, min(queries, len(texts)))]
+    for name, sample in (("new", [sentence() for _ in range(queries)]), ("near", near)):
+        latencies, hits = [], 0
+        for text in sample:
+            started = time.perf_counter()
+            hits += memory.lookup(text) is not None
+            latencies.append(time.perf_counter() - started)
+        latencies.sort()
+        result[name] = {"queries": len(sample), "hits": hits,
+                        "p50_ms": percentile_ms(latencies, 0.5),
+                        "p99_ms": percentile_ms(latencies, 0.99)}
+    return {"stages": stages, "strings_processed": len(texts), "fuzzy": result}
+
+
+def run_logging(work_dir: Path, source: Path, workers: int) -> dict:
+    """
+    Mede o custo do log no laço de tradução com todas as strings falhando no motor
+
+    Cada string gera avisos (erro do motor e texto mantido como original).
+    Compara o log descartado (apenas a criação dos registros), handlers
+    síncronos de arquivo e console e o caminho assíncrono de setup_logging
+    (fila + limite de repetições). O console é gravado em os.devnull.
+    """
+    package_logger = logging.getLogger("xml_translator")
+    previous = (package_logger.handlers[:], package_logger.propagate, package_logger.level)
+    package_logger.propagate = False
+    package_logger.setLevel(logging.INFO)
+    stages, result = {}, {}
+    try:
+        with open(os.devnull, "w") as devnull:
+            for variant in ("none", "sync", "async", "async_json"):
+                log_dir = work_dir / f"logs-{variant}"
+                if variant == "none":
+                    handler = logging.NullHandler()
+                else:
+                    handlers = create_handlers(str(log_dir), variant == "async_json", devnull)
+                    if variant == "sync":
+                        handler = handlers[0]
+                        package_logger.addHandler(handlers[1])
+                    else:
+                        handler = AsyncQueueHandler(queue.SimpleQueue(), handlers)
+                        handler.addFilter(RepeatFilter())
+                package_logger.addHandler(handler)
+
+                translator = XMLTranslator(str(work_dir / "config"), use_cache=False,
+                                           workers=workers, rate_limit=0,
+                                           engine=LocalEngine(error_rate=1.0))
+                strings = translator.extract_strings(translator.load_xml(str(source)))
+                timed(stages, f"process_translations_{variant}", translator.process_translations,
+                      strings)
+                # Esvaziar a fila faz parte do custo, mas fora do laço de tradução
+                timed(stages, f"close_{variant}",
+                      lambda: [h.close() for h in package_logger.handlers])
+                package_logger.handlers[:] = []
+                result[variant] = {"lines": sum(len(path.read_text(encoding="utf-8").splitlines())
+                                                for path in log_dir.glob("*"))}
+    finally:
+        package_logger.handlers[:], package_logger.propagate, package_logger.level = previous
+
+    baseline = stages["process_translations_none"]
+    for variant in result:
+        seconds = stages[f"process_translations_{variant}"]
+        result[variant]["overhead_pct"] = round((seconds - baseline) / baseline * 100, 1) \
+            if baseline else 0.0
+    return {"stages": stages, "strings_processed": len(strings), "logging": result}
+
+
+def run_tm(translator: XMLTranslator, work_dir: Path, size: int) -> dict:
+    """Mede importação de um TMX com size segmentos para a memória de tradução e a exportação"""
+    stages = {}
+    memory = work_dir / "memory.tmx"
+    timed(stages, "write_tmx", write_segments, str(memory),
+          ((f"Message {i} for the {i % 97} screen", f"Mensagem {i} da tela {i % 97}")
+           for i in range(size)), "en", "pt-BR")
+    auto_translator = translator.translator
+    imported = timed(stages, "import_tmx", import_memory, auto_translator, str(memory))
+    exported = timed(stages, "export_tmx", export_memory, auto_translator,
+                     str(work_dir / "exported.tmx"))
+    return {"stages": stages, "strings_processed": size,
+            "tm": {"imported": imported["imported"],
+                   "import_segments_per_second": imported["segments_per_second"],
+                   "exported": exported["exported"],
+                   "export_segments_per_second": exported["segments_per_second"]}}
+
+
+def run_scenario(scenario: dict) -> dict:
+    """
+    Executa um cenário (chamado em um processo novo para medir o RSS isolado)
+
+    Args:
+        scenario: Parâmetros do catálogo, do motor e do modo
+
+    Returns:
+        Resultado com vazão, pico de RSS e tempos por etapa
+    """
+    with tempfile.TemporaryDirectory(prefix="xml-translator-bench-") as tmp:
+        work_dir = Path(tmp)
+        source = work_dir / "catalog.xml"
+        output = work_dir / "catalog_pt-BR.xml"
+        catalog = generate_catalog(str(source), **scenario["catalog"])
+        translator = make_translator(work_dir, scenario["engine"], scenario["workers"])
+        rss_before = peak_rss_mb()
+
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if scenario["mode"] == "stages":
+                result = run_stages(translator, source, output)
+            elif scenario["mode"] == "xml_io":
+                result = run_xml_io(translator, source, output)
+            elif scenario["mode"] == "memory":
+                result = run_memory(translator, source, output)
+            elif scenario["mode"] == "fuzzy":
+                result = run_fuzzy(scenario["catalog"]["strings"], scenario["catalog"]["seed"])
+            elif scenario["mode"] == "logging":
+                result = run_logging(work_dir, source, scenario["workers"])
+            elif scenario["mode"] == "tm":
+                result = run_tm(translator, work_dir, scenario["catalog"]["strings"])
+            else:
+                result = translator.translate_file(str(source), str(output),
+                                                   streaming=scenario["mode"] == "streaming")
+        duration = time.perf_counter() - started
+
+        metrics = result.get("metrics", {})
+        stats = translator.translator.get_stats()
+        return {
+            "mode": scenario["mode"],
+            "catalog": catalog,
+            "engine": scenario["engine"],
+            "workers": scenario["workers"],
+            "duration": round(duration, 4),
+            "strings_per_second": round(catalog["strings"] / duration, 1) if duration else 0.0,
+            "peak_rss_mb": peak_rss_mb(),
+            "baseline_rss_mb": rss_before,
+            "stages": result.get("stages") or metrics.get("stages", {}),
+            "engine_latency": metrics.get("engine_latency", {}),
+            "engine_requests": stats["engine_requests"],
+            "engine_retries": stats["engine_retries"],
+            "output_bytes": output.stat().st_size if output.exists() else 0,
+            "memory": result.get("memory", {}),
+            "fuzzy": result.get("fuzzy", {}),
+            "logging": result.get("logging", {}),
+            "tm": result.get("tm", {}),
+        }
+
+
+def run_isolated(scenario: dict) -> dict:
+    """Executa o cenário em um processo separado (spawn) para que o pico de RSS não se acumule"""
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        return pool.apply(run_scenario, (scenario,))
+
+
+def git_revision() -> str:
+    """Commit atual do repositório (vazio fora de um checkout git)"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    """Lê argumentos da linha de comando"""
+    parser = argparse.ArgumentParser(description="Benchmarks do tradutor de XML (sem rede)")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick",
+                        help="Conjunto de tamanhos de catálogo (ignorado com --sizes)")
+    parser.add_argument("--sizes",
+                        help="Números de strings separados por vírgula (ex.: 1000,1000000)")
+    parser.add_argument("--modes", default=",".join(MODES),
+                        help=f"Modos separados por vírgula ({', '.join(MODES)})")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.3,
+                        help="Fração de strings com texto repetido")
+    parser.add_argument("--depth", type=int, default=2, help="Profundidade dos grupos")
+    parser.add_argument("--text-length", type=int, default=30, help="Tamanho médio dos textos")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Latência simulada por requisição ao motor (segundos)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fração de textos que falham no motor")
+    parser.add_argument("--workers", type=int, default=4, help="Requisições simultâneas ao motor")
+    parser.add_argument("--seed", type=int, default=42, help="Semente do gerador")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Não isolar cenários em processos (RSS passa a ser cumulativo)")
+    parser.add_argument("-o", "--output", help="Arquivo JSON de resultados "
+                        "(padrão: benchmarks/results/<data>-<commit>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv: list = None) -> int:
+    """Executa os cenários e grava os resultados"""
+    args = parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",")] if args.sizes else PRESETS[args.preset]
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        print(f"Modos desconhecidos: {', '.join(sorted(unknown))}")
+        return 1
+
+    runner = run_scenario if args.in_process else run_isolated
+    revision = git_revision()
+    results = []
+    for size in sizes:
+        for mode in modes:
+            scenario = {
+                "mode": mode,
+                "workers": args.workers,
+                "engine": {"latency": args.latency, "error_rate": args.error_rate},
+                "catalog": {"strings": size, "duplicate_ratio": args.duplicate_ratio,
+                            "depth": args.depth, "text_length": args.text_length,
+                            "seed": args.seed},
+            }
+            result = runner(scenario)
+            results.append(result)
+            print(f"{mode:>9} {size:>8} strings: {result['duration']:8.3f}s "
+                  f"{result['strings_per_second']:>10.0f} strings/s "
+                  f"RSS {result['peak_rss_mb']:.1f} MB")
+            if result["memory"]:
+                print(f"{'':>9} registros: {result['memory']['records_mb']:.1f} MB "
+                      f"(formato anterior: {result['memory']['legacy_records_mb']:.1f} MB)")
+            if result["fuzzy"]:
+                fuzzy = result["fuzzy"]
+                print(f"{'':>9} busca aproximada ({fuzzy['entries']} textos): "
+                      f"novos p50 {fuzzy['new']['p50_ms']:.3f} ms / "
+                      f"p99 {fuzzy['new']['p99_ms']:.3f} ms, "
+                      f"variações p50 {fuzzy['near']['p50_ms']:.3f} ms / "
+                      f"p99 {fuzzy['near']['p99_ms']:.3f} ms "
+                      f"({fuzzy['near']['hits']}/{fuzzy['near']['queries']} encontradas)")
+            if result["logging"]:
+                print(f"{'':>9} custo do log: " + ", ".join(
+                    f"{variant} {info['overhead_pct']:+.1f}% ({info['lines']} linhas)"
+                    for variant, info in result["logging"].items() if variant != "none"))
+            if result["tm"]:
+                print(f"{'':>9} memória TMX: importação "
+                      f"{result['tm']['import_segments_per_second']:.0f} "
+                      f"segmentos/s, exportação {result['tm']['export_segments_per_second']:.0f} "
+                      f"segmentos/s")
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": revision,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    output = Path(args.output) if args.output else (
+        Path(__file__).resolve().parent / "results"
+        / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{revision or 'local'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"✓ Resultados gravados em {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
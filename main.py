@@ -5,6 +5,8 @@ XML Localization Translator - Main Entry Point
 Traduz arquivos XML de localização do inglês para português (pt-BR)
 """
 
+import argparse
+import math
 import os
 import sys
 from pathlib import Path
@@ -12,26 +14,112 @@ from pathlib import Path
 # Adicionar src ao path para imports
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from xml_translator.core.translator import XMLTranslator
-from xml_translator.utils.logger import setup_logging
+# Apenas módulos leves no topo: o pipeline de tradução, o servidor e o cliente do
+# serviço são importados quando a execução precisa deles (ver tests/test_startup.py)
+from xml_translator.engines.registry import ENGINES
+from xml_translator.service import DEFAULT_HOST, DEFAULT_PORT
+from xml_translator.utils.config import DEFAULT_CULTURE
+from xml_translator.utils.logger import get_logger, setup_logging
 
 
-def detect_xml_files(directory: str = ".") -> list:
+def parse_args(argv: list = None) -> argparse.Namespace:
+    """
+    Lê argumentos da linha de comando
+    
+    Args:
+        argv: Argumentos (padrão: sys.argv)
+        
+    Returns:
+        Argumentos interpretados
+    """
+    parser = argparse.ArgumentParser(
+        description="Traduz arquivos XML de localização do inglês para português (pt-BR)"
+    )
+    parser.add_argument("input_file", nargs="?",
+                        help="Arquivo XML de origem (se omitido, pergunta interativamente)")
+    parser.add_argument("-o", "--output", help="Arquivo de saída (padrão: <nome>_pt-BR.xml)")
+    parser.add_argument("--config-dir", default="config", help="Diretório de configurações")
+    parser.add_argument("--engine", choices=sorted(ENGINES),
+                        help="Motor de tradução (padrão: settings.json ou google)")
+    parser.add_argument("--workers", type=int, help="Requisições simultâneas ao motor")
+    parser.add_argument("--rate-limit", type=float, help="Máximo de requisições por segundo")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Não usar a memória de tradução persistente")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Processar em streaming (memória constante para arquivos grandes)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Traduzir apenas chaves novas ou alteradas desde a última execução")
+    parser.add_argument("--previous-source",
+                        help="Origem da execução anterior (modo incremental sem manifesto)")
+    parser.add_argument("--dir", dest="directory",
+                        help="Traduzir todos os catálogos XML do diretório (não interativo)")
+    parser.add_argument("--no-recursive", action="store_true",
+                        help="Com --dir, não buscar em subdiretórios")
+    parser.add_argument("--jobs", type=int,
+                        help="Com --dir, número de processos em paralelo (padrão: CPUs)")
+    parser.add_argument("--max-engine-calls", type=int,
+                        help="Limite total de requisições ao motor na execução")
+    parser.add_argument("--time-budget", type=float,
+                        help="Segundos em que o motor pode ser usado; depois disso as strings "
+                             "restantes ficam como original")
+    parser.add_argument("--max-engine-chars", type=int,
+                        help="Limite total de caracteres enviados ao motor na execução")
+    parser.add_argument("--max-minutes", type=float,
+                        help="Orçamento de tempo estimado de motor, em minutos (com limit, "
+                             "limita as requisições pela estimativa do plano)")
+    parser.add_argument("--over-budget", choices=["limit", "refuse", "split"], default="limit",
+                        help="Plano acima do orçamento: limit executa até esgotar o orçamento, "
+                             "refuse não executa, split executa apenas a primeira parte que cabe")
+    parser.add_argument("--plan", action="store_true",
+                        help="Apenas planejar: classificar as strings e estimar requisições, "
+                             "caracteres e tempo sem chamar o motor")
+    parser.add_argument("--import-tm", metavar="ARQUIVO",
+                        help="Importar uma memória de tradução TMX/XLIFF (sem traduzir)")
+    parser.add_argument("--export-tm", metavar="ARQUIVO",
+                        help="Exportar a memória de tradução para TMX/XLIFF (sem traduzir)")
+    parser.add_argument("--tm-store", choices=["cache", "overrides"], default="cache",
+                        help="Com --import-tm/--export-tm: memória de tradução do motor (cache) "
+                             "ou overrides aprovados")
+    parser.add_argument("--checkpoint", action="store_true",
+                        help="Registrar o progresso e retomar a execução se ela for interrompida")
+    parser.add_argument("--log-json", action="store_true",
+                        help="Gravar o arquivo de log como JSON lines (logs/*.jsonl)")
+    parser.add_argument("--metrics-file",
+                        help="Gravar métricas da execução (tempos por etapa, latência do motor) "
+                             "em JSON")
+    parser.add_argument("--target", dest="targets", action="append",
+                        help="Cultura de destino "
+                             "(repetível; padrão: target_cultures do settings.json)")
+    parser.add_argument("--xml-backend", choices=["auto", "lxml", "etree"],
+                        help="Parser/gravador de XML (padrão: xml_backend do settings.json)")
+    parser.add_argument("--preserve-format", action="store_true", default=None,
+                        help="Gravar copiando o original e trocando apenas os textos traduzidos")
+    parser.add_argument("--serve", action="store_true",
+                        help="Iniciar o serviço residente (HTTP/JSON local) "
+                             "com o tradutor aquecido")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Com --serve, endereço de escuta")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Com --serve, porta")
+    parser.add_argument("--service",
+                        help="Endereço do serviço (padrão: XML_TRANSLATOR_SERVICE ou "
+                             "http://127.0.0.1:8765)")
+    parser.add_argument("--no-service", action="store_true",
+                        help="Traduzir neste processo mesmo com um serviço ativo")
+    return parser.parse_args(argv)
+
+
+def detect_xml_files(directory: str = ".", cultures: list = None) -> list:
     """
     Detecta arquivos XML no diretório
     
     Args:
         directory: Diretório para buscar
+        cultures: Culturas de destino cujas saídas devem ser ignoradas
         
     Returns:
         Lista de arquivos XML encontrados
     """
-    xml_files = []
-    for file in Path(directory).glob("*.xml"):
-        # Ignorar arquivos já traduzidos
-        if not file.name.endswith("_pt-BR.xml"):
-            xml_files.append(str(file))
-    return sorted(xml_files)
+    from xml_translator.core.tree_runner import find_catalogs
+    return find_catalogs(directory, recursive=False, cultures=cultures or [DEFAULT_CULTURE])
 
 
 def get_user_choice(xml_files: list) -> str:
@@ -52,15 +140,363 @@ def get_user_choice(xml_files: list) -> str:
         return input("Caminho do XML: ").strip()
 
 
-def main():
+def service_client(args: argparse.Namespace):
+    """
+    Retorna o cliente do serviço residente quando a execução pode usá-lo
+    
+    O serviço é usado para um único arquivo quando está ativo com o mesmo
+    diretório de configurações e nenhuma opção de construção do tradutor
+    (motor, workers, cache...) foi alterada na linha de comando.
+    
+    Args:
+        args: Argumentos da linha de comando
+        
+    Returns:
+        ServiceClient ou None para traduzir neste processo
+    """
+    local_only = (args.no_service or args.directory or not args.input_file or args.engine
+                  or args.workers is not None or args.rate_limit is not None or args.no_cache
+                  or args.xml_backend or args.max_engine_calls is not None or args.plan
+                  or args.max_engine_chars is not None or args.max_minutes is not None
+                  or args.time_budget is not None or args.import_tm or args.export_tm
+                  or args.over_budget != "limit")
+    if local_only:
+        return None
+    from xml_translator.service.client import ServiceClient
+    return ServiceClient.discover(args.config_dir, args.service)
+
+
+def print_result(result: dict) -> int:
+    """
+    Imprime o resultado de translate_file
+    
+    Args:
+        result: Resultado local ou do serviço
+        
+    Returns:
+        Código de saída
+    """
+    if result.get("outputs"):
+        for culture, output in result["outputs"].items():
+            if output.get("status") == "success":
+                print(f"[{culture}] {output['output_file']}: "
+                      f"{output['translations_applied']} traduções aplicadas")
+            else:
+                print(f"[{culture}] {output.get('message', 'Erro na tradução')}")
+        print(f"Strings processadas: {result['strings_processed']}")
+        return 0 if result.get("status") == "success" else 1
+    
+    if result.get("status") == "success":
+        print("\n Tradução concluída com sucesso!")
+        print(f"Arquivo gerado: {result['output_file']}")
+        print(f"Strings processadas: {result['strings_processed']}")
+        print(f"Traduções aplicadas: {result['translations_applied']}")
+        print(f"Textos únicos: {result['unique_texts']} "
+              f"({result['saved_calls']} chamadas economizadas)")
+        
+        if result.get('incremental'):
+            changes = result['incremental']
+            print(f"Incremental: {changes['added']} novas, {changes['changed']} alteradas, "
+                  f"{changes['reused']} reaproveitadas, {changes['removed']} removidas")
+        
+        if result.get('checkpoint', {}).get('resumed'):
+            print(f"Retomadas do checkpoint: {result['checkpoint']['resumed']}")
+        
+        if result.get('overrides_count', 0) > 0:
+            print(f"Overrides utilizados: {result['overrides_count']}")
+        
+        metrics = result.get('metrics', {})
+        if metrics.get('stages'):
+            stages = ", ".join(f"{name} {seconds:.2f}s"
+                               for name, seconds in metrics['stages'].items())
+            print(f"Tempo por etapa: {stages}")
+            latency = metrics['engine_latency']
+            if latency['count']:
+                print(f"Latência do motor: p50 {latency['p50_ms']:.0f}ms, "
+                      f"p95 {latency['p95_ms']:.0f}ms, p99 {latency['p99_ms']:.0f}ms "
+                      f"({metrics['engine_retries']} novas tentativas, "
+                      f"{metrics['throttle_events']} limitações)")
+        if metrics.get('engine_failures'):
+            print(f"Falhas do motor: {metrics['engine_failures']} "
+                  f"({metrics['engine_timeouts']} por prazo), disjuntor aberto "
+                  f"{metrics['breaker_trips']}x, {metrics['failure_seconds']:.1f}s perdidos; "
+                  f"{metrics['recovered_texts']}/{metrics['deferred_texts']} textos recuperados")
+        
+        return 0
+    else:
+        print(f"\n{result.get('message', 'Erro na tradução')}")
+        return 1
+
+
+def exchange_memory(translator, cultures: list, args: argparse.Namespace) -> int:
+    """
+    Importa ou exporta a memória de tradução (--import-tm / --export-tm)
+    
+    Args:
+        translator: XMLTranslator da execução
+        cultures: Culturas de destino
+        args: Argumentos da linha de comando
+        
+    Returns:
+        Código de saída
+    """
+    from xml_translator.core.tm_exchange import export_memory, import_memory
+    if args.export_tm and len(cultures) > 1:
+        print("--export-tm só pode ser usado com uma única cultura de destino")
+        return 1
+    try:
+        for culture in cultures:
+            auto_translator = translator.for_culture(culture).translator
+            if args.import_tm:
+                stats = import_memory(auto_translator, args.import_tm, args.tm_store)
+                print(f"✓ [{culture}] {stats['imported']} segmentos importados em {args.tm_store} "
+                      f"({stats['segments']} lidos em {stats['seconds']:.2f}s, "
+                      f"{stats['segments_per_second']:.0f} segmentos/s)")
+                skipped = {"outro idioma": stats["skipped_language"],
+                           "sem tradução": stats["untranslated"],
+                           "placeholders divergentes": stats["mismatched"]}
+                if any(skipped.values()):
+                    print("  - Ignorados: " + ", ".join(
+                        f"{count} {reason}" for reason, count in skipped.items() if count))
+            if args.export_tm:
+                stats = export_memory(auto_translator, args.export_tm, args.tm_store)
+                print(f"✓ [{culture}] {stats['exported']} segmentos exportados de {args.tm_store} "
+                      f"para {args.export_tm} ({stats['seconds']:.2f}s)")
+            auto_translator.flush_cache()
+    except (OSError, ValueError, SyntaxError) as e:
+        # ET.ParseError é uma SyntaxError
+        print(f"Erro na memória de tradução: {e}")
+        return 1
+    return 0
+
+
+def budget_limits(args: argparse.Namespace) -> dict:
+    """
+    Orçamento da linha de comando no formato dos custos do plano
+    
+    Args:
+        args: Argumentos da linha de comando
+        
+    Returns:
+        Limites por custo (engine_calls, engine_chars, estimated_seconds)
+    """
+    limits = {}
+    if args.max_engine_calls is not None:
+        limits["engine_calls"] = args.max_engine_calls
+    if args.max_engine_chars is not None:
+        limits["engine_chars"] = args.max_engine_chars
+    if args.max_minutes is not None:
+        limits["estimated_seconds"] = args.max_minutes * 60
+    return limits
+
+
+def format_duration(seconds: float) -> str:
+    """Duração legível (ex.: 2h 05min, 3min 20s, 4.2s)"""
+    if seconds >= 3600:
+        return f"{int(seconds // 3600)}h {int(seconds % 3600 // 60):02d}min"
+    if seconds >= 60:
+        return f"{int(seconds // 60)}min {int(seconds % 60):02d}s"
+    return f"{seconds:.1f}s"
+
+
+def print_plan(plan: dict):
+    """
+    Imprime o plano de um arquivo ou diretório
+    
+    Args:
+        plan: Resultado de plan_file ou plan_tree
+    """
+    for file_plan in plan.get("files", [plan]):
+        if file_plan.get("status") != "success":
+            print(f"✗ {file_plan['input_file']}: {file_plan.get('message')}")
+            continue
+        print(f"{file_plan['input_file']}: {file_plan['total_keys']} strings "
+              f"({file_plan['unique_texts']} textos únicos)")
+        for culture, culture_plan in file_plan["cultures"].items():
+            sources = ", ".join(f"{source}: {counts['unique']}"
+                                for source, counts in culture_plan["sources"].items()
+                                if counts["unique"])
+            print(f"  [{culture}] {sources}")
+            print(f"  [{culture}] motor: {culture_plan['engine_texts']} textos, "
+                  f"{culture_plan['engine_calls']} requisições, "
+                  f"{culture_plan['engine_chars']} caracteres, "
+                  f"~{format_duration(culture_plan['estimated_seconds'])} "
+                  f"(latência {culture_plan['latency'] * 1000:.0f}ms "
+                  f"[{culture_plan['latency_source']}], {culture_plan['workers']} simultâneas, "
+                  f"{culture_plan['rate_limit']:g} req/s)")
+            if culture_plan["engine_texts"] and not culture_plan["engine_available"]:
+                print(f"  [{culture}] ⚠ Motor indisponível: esses textos ficariam como original")
+    if "files" in plan:
+        print(f"Total: {len(plan['files'])} catálogos, {plan['total_keys']} strings, "
+              f"{plan['engine_calls']} requisições, {plan['engine_chars']} caracteres, "
+              f"~{format_duration(plan['estimated_seconds'])}")
+
+
+def apply_plan(plan: dict, limits: dict, args: argparse.Namespace) -> tuple:
+    """
+    Compara o plano com o orçamento e decide como a execução continua
+    
+    Args:
+        plan: Resultado de plan_file ou plan_tree
+        limits: Orçamento (ver budget_limits)
+        args: Argumentos da linha de comando
+        
+    Returns:
+        Tupla (código de saída ou None para executar, catálogos a traduzir ou None
+        para todos, limite de requisições desta execução ou None)
+    """
+    from xml_translator.core.planner import (budget_overruns, parts_needed, split_by_budget,
+                                             sum_costs)
+    print_plan(plan)
+    overruns = budget_overruns(plan, limits)
+    if args.plan:
+        if overruns:
+            print(f"Orçamento excedido: {', '.join(overruns)}")
+        return (2 if overruns else 0), None, None
+    if not overruns:
+        return None, None, None
+    if args.over_budget == "limit":
+        # Requisições e caracteres são limitados durante a execução (EngineCallBudget);
+        # o tempo estimado vira um limite de requisições proporcional ao plano
+        calls = None
+        seconds = limits.get("estimated_seconds")
+        if seconds is not None and plan["estimated_seconds"] > seconds:
+            calls = math.floor(plan["engine_calls"] * seconds / plan["estimated_seconds"])
+        print(f"Orçamento excedido: {', '.join(overruns)}; traduzindo até esgotá-lo")
+        return None, None, calls
+    if args.over_budget == "refuse":
+        print(f"Execução recusada, orçamento excedido: {', '.join(overruns)}")
+        return 2, None, None
+    
+    # split: traduz agora só o que cabe; o resultado fica na memória de tradução
+    # e a próxima execução (novo plano) começa de onde esta parou
+    part = plan
+    files = None
+    if "files" in plan:
+        parts = split_by_budget([item for item in plan["files"] if item.get("status") == "success"],
+                                limits)
+        files = [item["input_file"] for item in parts[0]]
+        part = sum_costs(parts[0])
+        print(f"Execução dividida em {len(parts)} partes: traduzindo {len(files)} catálogos agora")
+    count = parts_needed(part, limits)
+    calls = math.ceil(part["engine_calls"] / count) if count > 1 else None
+    if calls is not None:
+        print(f"Execução dividida em {count} partes: até {calls} requisições ao motor agora")
+    print("Execute novamente para continuar (o que já foi traduzido vem da memória de tradução)")
+    return None, files, calls
+
+
+def translate_with_service(client, args: argparse.Namespace) -> int:
+    """
+    Traduz o arquivo pelo serviço residente
+    
+    Serviço parado, inacessível ou que recusa a requisição (caminho fora do
+    diretório raiz, token trocado) não impede a execução: o arquivo é
+    traduzido neste processo. Apenas erros da própria tradução são exibidos.
+    
+    Args:
+        client: Cliente do serviço
+        args: Argumentos da linha de comando
+        
+    Returns:
+        Código de saída ou None para traduzir neste processo
+    """
+    from xml_translator.service.client import ServiceError, ServiceForbidden, ServiceUnavailable
+    print(f"\n Iniciando tradução de: {args.input_file} (serviço em {client.url})")
+    try:
+        result = client.translate_file(args.input_file, args.output, streaming=args.streaming,
+                                       incremental=args.incremental,
+                                       previous_source=args.previous_source,
+                                       target_cultures=args.targets,
+                                       metrics_file=args.metrics_file,
+                                       checkpoint=args.checkpoint,
+                                       preserve_format=args.preserve_format)
+    except (ServiceUnavailable, ServiceForbidden) as e:
+        get_logger(__name__).info(f"Serviço não utilizado: {e}")
+        print(f" Serviço não utilizado ({e}); traduzindo neste processo")
+        return None
+    except ServiceError as e:
+        print(f"\n Erro no serviço: {e}")
+        return 1
+    return print_result(result)
+
+
+def main(argv: list = None):
     """Função principal - tradução automática"""
-    logger = setup_logging()
+    args = parse_args(argv)
+    logger = setup_logging(json_lines=args.log_json)
+    
+    # Antes de carregar o tradutor ou procurar o serviço
+    if args.input_file and not args.serve and not args.directory \
+            and not os.path.exists(args.input_file):
+        error_msg = f"Arquivo não encontrado: {args.input_file}"
+        logger.error(error_msg)
+        print(f"{error_msg}")
+        return 1
+    
+    if not args.serve:
+        client = service_client(args)
+        if client is not None:
+            status = translate_with_service(client, args)
+            if status is not None:
+                return status
     
     try:
-        translator = XMLTranslator()
+        from xml_translator.core.translator import XMLTranslator
+        translator = XMLTranslator(args.config_dir, use_cache=not args.no_cache,
+                                   workers=args.workers, rate_limit=args.rate_limit,
+                                   engine=args.engine, xml_backend=args.xml_backend)
+        cultures = args.targets or translator.translator.settings.get("target_cultures")
+        cultures = list(dict.fromkeys(cultures or [DEFAULT_CULTURE]))
+        
+        if args.serve:
+            from xml_translator.service.server import create_server, serve
+            serve(create_server(translator, args.host, args.port))
+            return 0
+        
+        if args.import_tm or args.export_tm:
+            return exchange_memory(translator, cultures, args)
         
-        xml_files = detect_xml_files()
-        input_file = get_user_choice(xml_files)
+        if args.output and len(cultures) > 1:
+            print("--output só pode ser usado com uma única cultura de destino")
+            return 1
+        
+        limits = budget_limits(args)
+        # Com limit, só o tempo estimado precisa do plano (requisições e caracteres são
+        # contados durante a execução)
+        planning = args.plan or bool(limits and (args.over_budget != "limit"
+                                                 or "estimated_seconds" in limits))
+        max_engine_calls = args.max_engine_calls
+        time_budget = args.time_budget
+        if time_budget is None:
+            time_budget = translator.translator.settings.get("run_time_budget")
+        
+        if args.directory:
+            files = None
+            if planning:
+                plan = translator.plan_tree(args.directory, recursive=not args.no_recursive,
+                                            target_cultures=cultures,
+                                            metrics_file=args.metrics_file)
+                status, files, calls = apply_plan(plan, limits, args)
+                if status is not None:
+                    return status
+                if calls is not None:
+                    max_engine_calls = min(calls, max_engine_calls or calls)
+            report = translator.translate_tree(
+                args.directory, recursive=not args.no_recursive, workers=args.jobs,
+                max_engine_calls=max_engine_calls, files=files, time_budget=time_budget,
+                max_engine_chars=args.max_engine_chars, streaming=args.streaming,
+                incremental=args.incremental, target_cultures=cultures,
+                metrics_file=args.metrics_file, checkpoint=args.checkpoint,
+                preserve_format=args.preserve_format
+            )
+            return 0 if report.get("status") != "error" else 1
+        
+        if args.input_file:
+            input_file = args.input_file
+        else:
+            xml_files = detect_xml_files(cultures=cultures)
+            input_file = get_user_choice(xml_files)
         
         if not os.path.exists(input_file):
             error_msg = f"Arquivo não encontrado: {input_file}"
@@ -68,25 +504,35 @@ def main():
             print(f"{error_msg}")
             return 1
         
+        if planning:
+            plan = translator.plan_file(input_file, cultures, metrics_file=args.metrics_file)
+            status, _, calls = apply_plan(plan, limits, args)
+            if status is not None:
+                return status
+            if calls is not None:
+                max_engine_calls = min(calls, max_engine_calls or calls)
+        
+        if max_engine_calls is not None or time_budget is not None \
+                or args.max_engine_chars is not None:
+            from xml_translator.core.budget import EngineCallBudget
+            translator.set_call_budget(EngineCallBudget(max_engine_calls, time_budget,
+                                                        args.max_engine_chars))
+        
         print(f"\n Iniciando tradução de: {input_file}")
-        result = translator.translate_file(input_file)
+        result = translator.translate_file(input_file, args.output, streaming=args.streaming,
+                                           incremental=args.incremental,
+                                           previous_source=args.previous_source,
+                                           target_cultures=cultures,
+                                           metrics_file=args.metrics_file,
+                                           checkpoint=args.checkpoint,
+                                           preserve_format=args.preserve_format)
         
-        if result.get("status") == "success":
-            print("\n Tradução concluída com sucesso!")
-            print(f"Arquivo gerado: {result['output_file']}")
-            print(f"Strings processadas: {result['strings_processed']}")
-            print(f"Traduções aplicadas: {result['translations_applied']}")
-            
-            if result.get('overrides_count', 0) > 0:
-                print(f"Overrides utilizados: {result['overrides_count']}")
-
-            return 0
-        else:
-            print(f"\n{result.get('message', 'Erro na tradução')}")
-            return 1
+        return print_result(result)
             
     except KeyboardInterrupt:
         print("\n\n Operação cancelada pelo usuário")
+        if args.checkpoint:
+            print("Progresso salvo: execute novamente com --checkpoint para retomar")
         return 130
     except Exception as e:
         logger.error(f"Erro na execução principal: {e}")
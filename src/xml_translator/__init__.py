@@ -7,7 +7,16 @@ __version__ = "1.0.0"
 __author__ = "Nasajon Systems"
 __description__ = "Tradutor automatizado de arquivos XML de localização"
 
-from .core.translator import XMLTranslator
-from .core.auto_translator import AutoTranslator
-
 __all__ = ['XMLTranslator', 'AutoTranslator']
+
+
+def __getattr__(name):
+    # Importação sob demanda: "import xml_translator" (ou um submódulo leve) não carrega
+    # o pipeline de tradução inteiro
+    if name == 'XMLTranslator':
+        from .core.translator import XMLTranslator
+        return XMLTranslator
+    if name == 'AutoTranslator':
+        from .core.auto_translator import AutoTranslator
+        return AutoTranslator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
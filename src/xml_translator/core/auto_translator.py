@@ -1,77 +1,336 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-Classe para tradução automática com Google Translate e overrides manuais
+Classe para tradução automática com motores plugáveis e overrides manuais
 """
 
 import json
 import os
+import re
+import threading
 import time
-from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
 
+from .budget import BudgetExhausted, EngineCallBudget
+from .circuit_breaker import CircuitBreaker, CircuitOpen, call_with_timeout
+from .fuzzy_memory import FuzzyMemory
+from .masking import mask, sentinels_match, split_masked
+from .metrics import LatencyRecorder
+from .override_index import OverrideIndex, adapt_translation
+from .override_store import OverrideStore
+from .prefilter import PreFilter
+from .rate_limiter import TokenBucket
+from .translation_cache import TranslationCache
+from ..engines.base import TranslationEngine
+from ..engines.registry import create_engine
+from ..utils.config import (DEFAULT_CULTURE, culture_language, glossary_filename, load_settings,
+                            overrides_filename)
 from ..utils.logger import get_logger
 
 
+# Status 429 citado em mensagens de erro (ex.: 'Unexpected status code "429"')
+_THROTTLING_STATUS = re.compile(r'(status|code|http|error)\W{0,3}429\b')
+
+
 class AutoTranslator:
-    """Classe para tradução automática com Google Translate e overrides manuais"""
+    """Classe para tradução automática com motores plugáveis e overrides manuais"""
+    
+    # Limites máximos de cada requisição em lote (o motor pode declarar menos)
+    MAX_BATCH_SIZE = 50
+    MAX_BATCH_CHARS = 4500
+    
+    # Novas tentativas após throttling do motor (espera exponencial)
+    MAX_RETRIES = 3
+    BACKOFF_BASE = 1.0
     
-    def __init__(self, config_dir: str = "config"):
+    # Contadores de execução (próprios de cada sessão, ver session)
+    SESSION_COUNTERS = ("engine_requests", "engine_retries", "throttle_events", "mask_failures",
+                        "engine_failures", "engine_timeouts", "failure_seconds", "deferred_texts",
+                        "recovered_texts", "cache_hits", "cache_misses", "fuzzy_lookups")
+    
+    def __init__(self, config_dir: str = "config", use_cache: bool = True,
+                 workers: int = None, rate_limit: float = None,
+                 engine: Union[str, TranslationEngine] = None,
+                 call_budget: EngineCallBudget = None, target_culture: str = None):
         """
         Inicializa o AutoTranslator
         
+        Parâmetros omitidos são lidos de config/settings.json.
+        
         Args:
             config_dir: Diretório onde buscar arquivos de configuração
+            use_cache: Usar memória de tradução persistente em disco
+            workers: Número de requisições simultâneas ao motor
+            rate_limit: Máximo de requisições por segundo ao motor (<= 0 desativa)
+            engine: Nome do motor (google, local, memory) ou instância pronta
+            call_budget: Limite total de requisições ao motor (opcional)
+            target_culture: Cultura de destino (padrão: pt-BR)
         """
         self.config_dir = Path(config_dir)
-        self.overrides_file = self.config_dir / "overrides.json"
-        self.translator = None
+        self.settings = load_settings(config_dir)
+        self.target_culture = target_culture or DEFAULT_CULTURE
+        self.overrides_file = self.config_dir / overrides_filename(self.target_culture)
+        self.glossary_file = self.config_dir / glossary_filename(self.target_culture)
+        self.cache_file = self.config_dir / "translation_cache.db"
+        self.source_lang = "en"
+        self.target_lang = culture_language(self.target_culture, self.settings)
+        self.engine_spec = engine if engine is not None else self.settings["engine"]
+        self.engine_name = (self.engine_spec if isinstance(self.engine_spec, str)
+                            else self.engine_spec.name)
+        self.translator: Optional[TranslationEngine] = None
+        self.workers = max(1, workers if workers is not None else self.settings["workers"])
+        self.call_budget = call_budget
+        self.budget_exhausted = False
+        self.engine_requests = 0
+        self.engine_retries = 0
+        self.throttle_events = 0
+        self.mask_failures = 0
+        self.engine_failures = 0
+        self.engine_timeouts = 0
+        self.failure_seconds = 0.0
+        self.deferred_texts = 0
+        self.recovered_texts = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.fuzzy_lookups = 0
+        self.fuzzy_hits = {}
+        self.engine_latency = LatencyRecorder()
+        self._stats_lock = threading.Lock()
         self.logger = get_logger(__name__)
+        self.prefilter = PreFilter(self.settings.get("prefilter"), self.target_lang)
+        self.skipped = dict.fromkeys(self.prefilter.reasons, 0)
+        resilience = self.settings.get("engine_resilience") or {}
+        self.breaker = CircuitBreaker(resilience.get("failure_threshold", 5),
+                                      resilience.get("reset_timeout", 30.0))
+        self._call_timeout = resilience.get("timeout")
+        self.recovery_rounds = resilience.get("recovery_rounds", 2)
+        self.max_recovery_wait = resilience.get("max_recovery_wait", 60.0)
+        self.cache = TranslationCache(self.cache_file,
+                                      self.settings.get("cache_max_entries", 200000)) \
+            if use_cache else None
+        self.fuzzy = self._create_fuzzy_memory()
+        self._fuzzy_loaded = False
+        self._fuzzy_lock = threading.Lock()
         self.load_overrides()
         self.init_translator()
+        
+        if rate_limit is None:
+            rate_limit = self.settings["rate_limit"]
+        if rate_limit is None:
+            rate_limit = self.translator.default_rate_limit if self.translator else 0.0
+        self.rate_limiter = TokenBucket(rate_limit, capacity=self.workers)
+    
+    def _create_fuzzy_memory(self) -> Optional[FuzzyMemory]:
+        """Cria a memória aproximada se ativada em settings["fuzzy_memory"] (padrão: desativada)"""
+        options = self.settings.get("fuzzy_memory") or {}
+        if not options.get("enabled", False):
+            return None
+        return FuzzyMemory(threshold=options.get("threshold", 0.85),
+                           min_length=options.get("min_length", 8),
+                           scan_budget=options.get("scan_budget", 1000))
     
     def init_translator(self):
-        """Inicializa o tradutor automático"""
-        try:
-            from googletrans import Translator
-            self.translator = Translator()
-            self.logger.info("Google Translate inicializado com sucesso")
-        except ImportError:
-            self.logger.error("googletrans não instalado. Execute: poetry install")
-            self.translator = None
-        except Exception as e:
-            self.logger.error(f"Erro ao inicializar tradutor: {e}")
-            self.translator = None
+        """Inicializa o motor de tradução configurado"""
+        if isinstance(self.engine_spec, TranslationEngine):
+            self.translator = self.engine_spec
+        else:
+            options = self.settings.get("engine_options", {}).get(self.engine_spec, {})
+            try:
+                self.translator = create_engine(self.engine_spec, **options)
+                self.logger.info(f"Motor de tradução '{self.engine_spec}' inicializado com sucesso")
+            except ImportError:
+                self.logger.error("googletrans não instalado. Execute: poetry install")
+                self.translator = None
+            except Exception as e:
+                self.logger.error(f"Erro ao inicializar tradutor: {e}")
+                self.translator = None
+        
+        if self.translator is not None:
+            self.engine_name = self.translator.cache_namespace
+    
+    @property
+    def call_timeout(self) -> Optional[float]:
+        """Prazo de cada requisição ao motor (settings ou padrão declarado pelo motor)"""
+        if self._call_timeout is not None:
+            return self._call_timeout
+        return self.translator.default_timeout if self.translator is not None else None
+    
+    @property
+    def breaker_trips(self) -> int:
+        """Quantas vezes o disjuntor do motor abriu"""
+        return self.breaker.trips
+    
+    @property
+    def engine_available(self) -> bool:
+        """Indica se há um motor capaz de traduzir textos novos"""
+        return self.translator is not None and self.translator.can_translate
     
     def load_overrides(self):
-        """Carrega arquivo de overrides manuais"""
+        """Carrega arquivo de overrides manuais (arquivo base + log de alterações)"""
+        self.override_store = OverrideStore(self.overrides_file,
+                                            self.settings.get("overrides_compact_every", 1000))
+        self._overrides_lock = threading.Lock()
         try:
-            if self.overrides_file.exists():
-                with open(self.overrides_file, 'r', encoding='utf-8') as f:
-                    self.overrides = json.load(f)
+            self.overrides = self.override_store.load()
+            if self.overrides:
                 self.logger.info(f"Carregados {len(self.overrides)} overrides de {self.overrides_file}")
             else:
                 # Se não existe, inicializar vazio (sem criar arquivo de exemplo)
-                self.overrides = {}
-                self.logger.info("Nenhum arquivo de overrides encontrado. Usando apenas Google Translate.")
+                self.logger.info("Nenhum arquivo de overrides encontrado. "
+                                 "Usando apenas o motor de tradução.")
         except Exception as e:
             self.logger.error(f"Erro ao carregar overrides: {e}")
             self.overrides = {}
+        
+        self._glossary_signature = self._file_signature(self.glossary_file)
+        self.glossary = self._load_glossary()
+        self.override_index = OverrideIndex(self.overrides, self.glossary)
     
-    def save_overrides(self):
-        """Salva arquivo de overrides"""
+    @staticmethod
+    def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _load_glossary(self) -> dict:
+        """Carrega o glossário da cultura (vazio se não existir)"""
+        if not self.glossary_file.exists():
+            return {}
         try:
-            # Criar diretório se não existir
-            self.config_dir.mkdir(exist_ok=True)
+            with open(self.glossary_file, 'r', encoding='utf-8') as f:
+                glossary = json.load(f)
+            self.logger.info(f"Carregados {len(glossary)} termos de {self.glossary_file}")
+            return glossary
+        except Exception as e:
+            self.logger.error(f"Erro ao carregar glossário: {e}")
+            return {}
+    
+    def reload_overrides(self) -> int:
+        """
+        Recarrega overrides e glossário se os arquivos mudaram
+        
+        Sem mudanças custa apenas um stat por arquivo. O novo índice é montado
+        à parte e trocado de uma vez, então traduções em andamento veem o
+        índice antigo ou o novo, nunca um intermediário.
+        
+        Returns:
+            Número de overrides alterados (0 se nada mudou)
+        """
+        with self._overrides_lock:
+            glossary_signature = self._file_signature(self.glossary_file)
+            glossary_changed = glossary_signature != self._glossary_signature
+            try:
+                changes = self.override_store.refresh(self.overrides)
+            except Exception as e:
+                # Arquivo sendo gravado pelo editor: mantém o índice atual e tenta de novo depois
+                self.logger.error(f"Erro ao recarregar overrides: {e}")
+                return 0
+            if not changes and not glossary_changed:
+                return 0
+            overrides = dict(self.overrides)
+            for source, translation in (changes or {}).items():
+                if translation is None:
+                    overrides.pop(source, None)
+                else:
+                    overrides[source] = translation
+            if glossary_changed:
+                self._glossary_signature = glossary_signature
+                self.glossary = self._load_glossary()
+            self._swap_overrides(overrides, changes or {})
+        
+        self.logger.info(f"Overrides recarregados: {len(changes or {})} alterações")
+        return len(changes or {})
+    
+    def set_overrides(self, changes: dict):
+        """
+        Adiciona, altera ou remove overrides (gravação incremental no log)
+        
+        Args:
+            changes: {texto original: tradução ou None para remover}
+        """
+        with self._overrides_lock:
+            overrides = dict(self.overrides)
+            for source, translation in changes.items():
+                if translation is None:
+                    overrides.pop(source, None)
+                else:
+                    overrides[source] = translation
+            self.override_store.append(changes, overrides)
+            self._swap_overrides(overrides, changes)
+    
+    def import_overrides(self, pairs: Iterable[Tuple[str, str]]) -> int:
+        """
+        Acrescenta muitos overrides de uma vez (importação de TMX/XLIFF)
+        
+        Diferente de set_overrides, o índice é reconstruído e o arquivo base
+        gravado (de forma atômica) uma única vez, ao final.
+        
+        Args:
+            pairs: Pares (texto original, tradução)
             
-            with open(self.overrides_file, 'w', encoding='utf-8') as f:
-                json.dump(self.overrides, f, ensure_ascii=False, indent=2)
+        Returns:
+            Número de overrides novos ou alterados
+        """
+        with self._overrides_lock:
+            overrides = dict(self.overrides)
+            changes = {}
+            for source, translation in pairs:
+                if overrides.get(source) != translation:
+                    overrides[source] = translation
+                    changes[source] = translation
+            if changes:
+                self.override_store.compact(overrides)
+                self._swap_overrides(overrides, changes)
+        return len(changes)
+    
+    def _swap_overrides(self, overrides: dict, changes: dict):
+        """Troca mapa e índice e invalida as traduções do motor sombreadas pelas alterações"""
+        index = OverrideIndex(overrides, self.glossary)
+        index.matches = self.override_index.matches
+        self.overrides = overrides
+        self.override_index = index
+        if self.cache is not None and changes:
+            self.cache.invalidate_texts([mask(source.strip()).text for source in changes],
+                                        dest=self.target_lang)
+        if self._fuzzy_loaded:
+            for source, translation in changes.items():
+                masked = mask(source.strip())
+                # A tradução do motor para o mesmo texto também foi invalidada acima
+                self.fuzzy.remove(masked.text)
+                if translation is not None and not masked.tokens:
+                    self.fuzzy.add(masked.text, translation, "override")
+    
+    def save_overrides(self):
+        """Salva arquivo de overrides (incorpora o log de alterações ao arquivo base)"""
+        try:
+            with self._overrides_lock:
+                self.override_store.compact(self.overrides)
         except Exception as e:
             self.logger.error(f"Erro ao salvar overrides: {e}")
     
+    def should_skip(self, text: str) -> bool:
+        """
+        Indica se o texto não deve ser enviado ao motor de tradução
+        
+        Args:
+            text: Texto original
+            
+        Returns:
+            True para textos muito curtos, siglas, URLs, números, caminhos,
+            GUIDs, identificadores de código ou já no idioma de destino
+        """
+        return self.prefilter.classify(text) is not None
+    
     def translate_text(self, text: str) -> Optional[str]:
         """
-        Traduz texto usando Google Translate
+        Traduz texto usando o motor de tradução
+        
+        Placeholders e marcação inline são substituídos por sentinelas antes
+        do envio e recolocados depois (ver masking.mask).
         
         Args:
             text: Texto a ser traduzido
@@ -79,25 +338,486 @@ class AutoTranslator:
         Returns:
             Texto traduzido ou None se falhar
         """
-        if not self.translator:
+        if not self.engine_available:
             return None
         
         try:
-            # Skip muito curtos ou códigos
-            if len(text.strip()) < 2 or (text.isupper() and len(text) < 8):
+            # Skip muito curtos, códigos ou apenas placeholders
+            masked = mask(text.strip())
+            if self.should_skip(text) or not masked.translatable:
                 return None
             
-            result = self.translator.translate(text, src='en', dest='pt')
-            translation = result.text.strip()
+            translation = self._request_engine([masked.text])[0]
+            if not self._store_result(masked.text, translation):
+                return None
             
-            # Rate limiting
-            time.sleep(0.1)
+            restored = masked.restore(translation)
+            return restored if restored.lower() != text.strip().lower() else None
             
-            return translation if translation.lower() != text.lower() else None
+        except (BudgetExhausted, CircuitOpen):
+            # Sem saldo ou motor indisponível: original imediatamente, sem esperar
+            return None
+        except Exception as e:
+            # Argumentos no estilo %: formatação fora da thread de tradução e repetições agrupadas
+            self.logger.warning("Erro na tradução de '%s': %s", text, e)
+            return None
+    
+    def translate_batch(self, texts: List[str],
+                        on_result: Callable[[int, str], None] = None) -> List[Optional[str]]:
+        """
+        Traduz vários textos agrupando-os em requisições ao motor
+        
+        Lotes são limitados por quantidade (MAX_BATCH_SIZE) e tamanho
+        (MAX_BATCH_CHARS). Um lote com erro é dividido ao meio e cada
+        metade é tentada novamente, isolando o segmento problemático.
+        Lotes que falham por indisponibilidade do motor (prazo, conexão,
+        disjuntor aberto) não são divididos: ficam na fila e são tentados de
+        novo quando o disjuntor libera (ver _retry_deferred).
+        Com workers > 1 os lotes são enviados em paralelo; a ordem dos
+        resultados é sempre a mesma dos textos. Textos que diferem apenas
+        em placeholders ou marcação compartilham uma única requisição.
+        
+        Args:
+            texts: Textos a serem traduzidos
+            on_result: Chamado com (índice, tradução) assim que cada resposta do
+                motor chega, antes do fim do lote (chamadas serializadas)
             
+        Returns:
+            Lista com o texto traduzido ou None para cada entrada
+        """
+        results: List[Optional[str]] = [None] * len(texts)
+        if not self.engine_available:
+            return results
+        
+        masked, _ = split_masked(texts)
+        sendable = [not self.should_skip(text) and item.translatable
+                    for text, item in zip(texts, masked)]
+        unique = list(dict.fromkeys(item.text for item, send in zip(masked, sendable) if send))
+        translated: List[Optional[str]] = [None] * len(unique)
+        
+        def restore(i: int, translation: Optional[str]) -> Optional[str]:
+            restored = masked[i].restore(translation) if translation else None
+            return restored if restored and restored.lower() != texts[i].strip().lower() else None
+        
+        notify = None
+        if on_result is not None:
+            positions = {}
+            for i, (item, send) in enumerate(zip(masked, sendable)):
+                if send:
+                    positions.setdefault(item.text, []).append(i)
+            notify_lock = threading.Lock()
+            
+            def report(j: int, translation: str):
+                with notify_lock:
+                    for i in positions[unique[j]]:
+                        restored = restore(i, translation)
+                        if restored:
+                            on_result(i, restored)
+            notify = report
+        
+        batches = list(self._pack_batches(range(len(unique)), unique))
+        workers = min(self.workers, self.translator.max_concurrency)
+        deferred: List[List[int]] = []
+        
+        if workers > 1 and len(batches) > 1:
+            # Cada lote escreve apenas nos seus próprios índices
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(self._translate_chunk, batch, unique, translated,
+                                           deferred, notify)
+                           for batch in batches]
+                for future in futures:
+                    future.result()
+        else:
+            for batch in batches:
+                self._translate_chunk(batch, unique, translated, deferred, notify)
+        if deferred:
+            self._retry_deferred(deferred, unique, translated, notify)
+        
+        by_masked = dict(zip(unique, translated))
+        for i, (item, send) in enumerate(zip(masked, sendable)):
+            if send:
+                results[i] = restore(i, by_masked.get(item.text))
+        return results
+    
+    def _pack_batches(self, indices: Iterable[int], texts: List[str]) -> Iterator[List[int]]:
+        """Agrupa índices em lotes respeitando os limites de quantidade e caracteres"""
+        max_size = min(self.MAX_BATCH_SIZE, self.translator.max_batch_size)
+        if not self.translator.supports_batch:
+            max_size = 1
+        max_chars = min(self.MAX_BATCH_CHARS, self.translator.max_batch_chars)
+        
+        batch: List[int] = []
+        batch_chars = 0
+        for i in indices:
+            size = len(texts[i])
+            if batch and (len(batch) >= max_size or batch_chars + size > max_chars):
+                yield batch
+                batch, batch_chars = [], 0
+            batch.append(i)
+            batch_chars += size
+        if batch:
+            yield batch
+    
+    def _translate_chunk(self, indices: List[int], texts: List[str],
+                         results: List[Optional[str]], deferred: List[List[int]],
+                         on_result: Callable[[int, str], None] = None):
+        """Traduz um lote, dividindo-o ao meio em caso de falha (ou adiando-o, se o motor caiu)"""
+        batch = [texts[i] for i in indices]
+        try:
+            translated = self._request_engine(batch)
+        except BudgetExhausted:
+            # Sem saldo não adianta dividir o lote: textos ficam como original
+            return
+        except CircuitOpen:
+            deferred.append(indices)
+            return
         except Exception as e:
-            self.logger.warning(f"Erro na tradução de '{text}': {e}")
+            if self.is_unavailable_error(e):
+                # Dividir não resolve indisponibilidade e multiplicaria as esperas
+                self.logger.warning("Motor indisponível para lote de %d textos: %s",
+                                    len(indices), e)
+                deferred.append(indices)
+                return
+            if len(indices) == 1:
+                self.logger.warning("Erro na tradução de '%s': %s", batch[0], e)
+                return
+            self.logger.warning("Erro no lote de %d textos, dividindo: %s", len(indices), e)
+            middle = len(indices) // 2
+            self._translate_chunk(indices[:middle], texts, results, deferred, on_result)
+            self._translate_chunk(indices[middle:], texts, results, deferred, on_result)
+            return
+        
+        for i, text, translation in zip(indices, batch, translated):
+            if self._store_result(text, translation):
+                results[i] = translation
+                if on_result is not None:
+                    on_result(i, translation)
+    
+    def _retry_deferred(self, deferred: List[List[int]], texts: List[str],
+                        results: List[Optional[str]], on_result: Callable[[int, str], None] = None):
+        """
+        Tenta de novo os lotes adiados por indisponibilidade do motor
+        
+        Espera o disjuntor liberar a requisição de teste (no máximo
+        max_recovery_wait segundos e dentro do prazo da execução) e reenvia
+        os lotes em sequência: se o teste falhar, os demais são recusados
+        sem chamar o motor. Após recovery_rounds rodadas os textos restantes
+        ficam como original.
+        
+        Args:
+            deferred: Lotes adiados (índices em texts); esvaziado ao final
+            texts: Textos mascarados únicos
+            results: Traduções, preenchidas no lugar
+            on_result: Ver _translate_chunk
+        """
+        queued = sum(len(indices) for indices in deferred)
+        with self._stats_lock:
+            self.deferred_texts += queued
+        
+        for _ in range(self.recovery_rounds):
+            wait = self.breaker.retry_in()
+            time_left = self.call_budget.time_left() if self.call_budget is not None else None
+            if wait > self.max_recovery_wait or (time_left is not None and wait >= time_left):
+                break
+            if wait:
+                self.logger.info(f"Motor indisponível: nova tentativa de "
+                                 f"{sum(len(indices) for indices in deferred)} textos "
+                                 f"em {wait:.1f}s")
+                time.sleep(wait)
+                with self._stats_lock:
+                    self.failure_seconds += wait
+            pending = list(deferred)
+            deferred.clear()
+            for indices in pending:
+                self._translate_chunk(indices, texts, results, deferred, on_result)
+            if not deferred:
+                break
+        
+        remaining = sum(len(indices) for indices in deferred)
+        with self._stats_lock:
+            self.recovered_texts += queued - remaining
+        if remaining:
+            self.logger.warning(f"Motor indisponível: {remaining} textos mantidos como original")
+        deferred.clear()
+    
+    @staticmethod
+    def is_unavailable_error(error: Exception) -> bool:
+        """
+        Indica se o erro do motor é de disponibilidade (e não do conteúdo do lote)
+        
+        Args:
+            error: Exceção lançada pelo motor
+            
+        Returns:
+            True para prazo esgotado, falhas de conexão/rede e limitação persistente
+        """
+        if isinstance(error, (TimeoutError, OSError)) or AutoTranslator.is_throttling_error(error):
+            return True
+        # Bibliotecas HTTP (httpx, requests) não compartilham uma hierarquia de exceções
+        name = type(error).__name__.lower()
+        return any(word in name for word in ("timeout", "connect", "network", "transport"))
+    
+    def _call_timeout_left(self) -> Optional[float]:
+        """Prazo da próxima requisição: o menor entre call_timeout e o tempo restante da execução"""
+        timeout = self.call_timeout
+        time_left = self.call_budget.time_left() if self.call_budget is not None else None
+        if time_left is not None and time_left > 0:
+            timeout = min(timeout, time_left) if timeout else time_left
+        return timeout
+    
+    def _request_engine(self, batch: List[str]) -> List[str]:
+        """
+        Envia uma requisição ao motor de tradução
+        
+        Respeita o limitador de taxa e, em caso de throttling, aguarda com
+        espera exponencial antes de tentar novamente. Cada tentativa tem
+        prazo (call_timeout) e passa pelo disjuntor: com o motor
+        indisponível a requisição é recusada imediatamente (CircuitOpen).
+        
+        Args:
+            batch: Textos da requisição
+            
+        Returns:
+            Traduções na mesma ordem dos textos
+        """
+        # Uma reserva do disjuntor por lote (as novas tentativas após throttling
+        # usam a mesma, inclusive quando ela é a requisição de teste)
+        if not self.breaker.allow():
+            raise CircuitOpen()
+        attempt = 0
+        while True:
+            if self.call_budget is not None and not self.call_budget.consume(
+                    chars=sum(len(text) for text in batch)):
+                if not self.budget_exhausted:
+                    self.budget_exhausted = True
+                    if self.call_budget.expired():
+                        self.logger.warning(f"Tempo da execução esgotado "
+                                            f"({self.call_budget.time_budget:g}s); textos "
+                                            f"restantes mantidos como original")
+                    elif self.call_budget.remaining != 0:
+                        self.logger.warning(f"Orçamento de {self.call_budget.char_limit} "
+                                            f"caracteres enviados ao motor esgotado; textos "
+                                            f"restantes mantidos como original")
+                    else:
+                        self.logger.warning(f"Orçamento de {self.call_budget.limit} chamadas "
+                                            f"ao motor esgotado; textos restantes mantidos "
+                                            f"como original")
+                # A reserva não foi usada: não conta como falha nem sucesso do motor
+                self.breaker.release()
+                raise BudgetExhausted()
+            
+            # Rate limiting
+            self.rate_limiter.acquire()
+            started = time.perf_counter()
+            try:
+                if len(batch) == 1:
+                    response = [call_with_timeout(self._call_timeout_left(),
+                                                  self.translator.translate, batch[0],
+                                                  self.source_lang, self.target_lang)]
+                else:
+                    response = call_with_timeout(self._call_timeout_left(),
+                                                 self.translator.translate_batch, batch,
+                                                 self.source_lang, self.target_lang)
+                break
+            except Exception as e:
+                elapsed = time.perf_counter() - started
+                if not self.is_throttling_error(e) or attempt >= self.MAX_RETRIES:
+                    self._record_engine_error(e, elapsed)
+                    raise
+                delay = self.BACKOFF_BASE * (2 ** attempt)
+                attempt += 1
+                with self._stats_lock:
+                    self.throttle_events += 1
+                    self.engine_retries += 1
+                    self.failure_seconds += elapsed + delay
+                self.logger.warning(f"Motor limitando requisições, nova tentativa em {delay:.1f}s")
+                self.rate_limiter.penalize(delay)
+            finally:
+                self.engine_latency.record(time.perf_counter() - started)
+                with self._stats_lock:
+                    self.engine_requests += 1
+        
+        self.breaker.record_success()
+        if len(response) != len(batch):
+            raise ValueError(f"Resposta com {len(response)} itens para {len(batch)} textos")
+        return [translation.strip() for translation in response]
+    
+    def _record_engine_error(self, error: Exception, elapsed: float):
+        """Contabiliza a falha de uma requisição e informa o disjuntor"""
+        if not self.is_unavailable_error(error):
+            # O motor respondeu (erro no conteúdo do lote): continua disponível
+            self.breaker.record_success()
+            return
+        with self._stats_lock:
+            self.engine_failures += 1
+            self.failure_seconds += elapsed
+            if isinstance(error, TimeoutError):
+                self.engine_timeouts += 1
+        if self.breaker.record_failure():
+            self.logger.warning(f"Motor indisponível após {self.breaker.failure_threshold} falhas "
+                                f"seguidas ({error}); requisições suspensas por "
+                                f"{self.breaker.reset_timeout:g}s")
+    
+    @staticmethod
+    def is_throttling_error(error: Exception) -> bool:
+        """
+        Indica se o erro do motor corresponde a limitação de requisições
+        
+        Args:
+            error: Exceção lançada pelo motor
+            
+        Returns:
+            True para respostas HTTP 429 / "Too Many Requests"
+        """
+        status = getattr(error, "status_code", None)
+        if status is None:
+            status = getattr(getattr(error, "response", None), "status_code", None)
+        message = str(error).lower()
+        # A mensagem pode conter o texto enviado: "429" sozinho não basta
+        return (status == 429 or "too many requests" in message
+                or _THROTTLING_STATUS.search(message) is not None)
+    
+    def _store_result(self, text: str, translation: str) -> bool:
+        """
+        Registra resposta do motor na memória de tradução (inclui respostas idênticas)
+        
+        Respostas que perderam, duplicaram ou inventaram sentinelas de
+        placeholders são descartadas e não vão para a memória.
+        
+        Args:
+            text: Texto (mascarado) enviado ao motor
+            translation: Resposta do motor
+            
+        Returns:
+            True se a resposta foi aceita
+        """
+        if not sentinels_match(text, translation):
+            with self._stats_lock:
+                self.mask_failures += 1
+            self.logger.warning("Placeholders perdidos na tradução de '%s': '%s'",
+                                text, translation)
+            return False
+        if self.cache is not None:
+            self.cache.put(text.strip(), self.source_lang, self.target_lang,
+                           self.engine_name, translation)
+        if self.fuzzy is not None:
+            self.fuzzy.add(text.strip(), translation, "memory")
+        return True
+    
+    def get_override(self, text: str) -> Optional[str]:
+        """
+        Retorna o override manual de um texto
+        
+        Args:
+            text: Texto original
+            
+        Returns:
+            Tradução do override ou None se não houver
+        """
+        found = self.override_index.lookup(text)
+        return found[0] if found else None
+    
+    def _lookup_memory(self, text: str, record: bool = True) -> Optional[Tuple[str, str]]:
+        """
+        Busca texto nos overrides e na memória de tradução
+        
+        Args:
+            text: Texto original
+            record: Contabilizar acertos e uso da memória (False no planejamento)
+            
+        Returns:
+            Tupla (tradução, fonte) ou None se o motor precisar ser consultado
+        """
+        # 1. Override manual baseado no texto original (prioridade máxima):
+        #    exato, normalizado, modelo com placeholders ou termos do glossário
+        text_clean = text.strip()
+        override = self.override_index.lookup(text_clean, record)
+        if override is not None:
+            return override[0], "override"
+        
+        # 2. Pré-filtro (URLs, números, códigos...) e apenas placeholders/marcação
+        reason = self.prefilter.classify(text_clean)
+        if reason is not None:
+            if record:
+                with self._stats_lock:
+                    self.skipped[reason] = self.skipped.get(reason, 0) + 1
+            return text, "original"
+        masked = mask(text_clean)
+        if not masked.translatable:
+            return text, "original"
+        
+        # 3. Memória de tradução persistente (chaveada pelo texto mascarado)
+        if self.cache is not None:
+            lookup = self.cache.get if record else self.cache.peek
+            cached = lookup(masked.text, self.source_lang, self.target_lang, self.engine_name)
+            if record:
+                with self._stats_lock:
+                    if cached is not None:
+                        self.cache_hits += 1
+                    else:
+                        self.cache_misses += 1
+            restored = masked.restore(cached) if cached is not None else None
+            if restored is not None:
+                if restored.lower() != text.lower():
+                    return restored, "cache"
+                return text, "original"
+        
+        # 4. Memória aproximada: texto quase igual já traduzido
+        if self.fuzzy is not None:
+            restored = self._lookup_fuzzy(masked, record)
+            if restored is not None:
+                return restored, "fuzzy"
+        
+        return None
+    
+    def _load_fuzzy_memory(self):
+        """Indexa overrides e memória de tradução na primeira busca aproximada"""
+        with self._fuzzy_lock:
+            if self._fuzzy_loaded:
+                return
+            start = time.perf_counter()
+            # Overrides com placeholders já são tratados como modelos pelo índice de overrides
+            overrides = [(masked.text, translation) for masked, translation in
+                         ((mask(source.strip()), translation)
+                          for source, translation in self.overrides.items())
+                         if not masked.tokens]
+            count = self.fuzzy.add_many(overrides, "override")
+            if self.cache is not None:
+                entries = self.cache.entries(self.source_lang, self.target_lang, self.engine_name)
+                count += self.fuzzy.add_many(entries, "memory")
+            self._fuzzy_loaded = True
+            self.logger.info(f"Memória aproximada: {len(self.fuzzy)} textos indexados de {count} "
+                             f"em {time.perf_counter() - start:.2f}s")
+    
+    def _lookup_fuzzy(self, masked, record: bool = True) -> Optional[str]:
+        """
+        Busca na memória aproximada um texto parecido o bastante
+        
+        Args:
+            masked: Texto original mascarado
+            record: Contabilizar a busca nas estatísticas
+            
+        Returns:
+            Tradução adaptada ao texto (placeholders restaurados) ou None
+        """
+        if not self._fuzzy_loaded:
+            self._load_fuzzy_memory()
+        match = self.fuzzy.lookup(masked.text, record)
+        if record:
+            with self._stats_lock:
+                self.fuzzy_lookups += 1
+        # Textos mantidos no original (nomes, siglas) não servem de tradução para outro texto
+        if (match is None or match.translation == match.source
+                or not sentinels_match(masked.text, match.translation)):
             return None
+        if record:
+            with self._stats_lock:
+                self.fuzzy_hits[match.origin] = self.fuzzy_hits.get(match.origin, 0) + 1
+        if record and match.score < 1.0:
+            # A tradução de outro texto é aplicada sem revisão: registrar para conferência
+            self.logger.info("Tradução aproximada para revisar: '%s' reaproveitou '%s' "
+                             "(similaridade %.3f)", masked.text, match.source, match.score)
+        return masked.restore(adapt_translation(masked.text, match.source, match.translation))
     
     def get_translation(self, text: str, key: str = None) -> Tuple[str, str]:
         """
@@ -111,33 +831,185 @@ class AutoTranslator:
             Tupla (tradução, fonte)
         """
         
-        # 1. Override manual baseado no texto original (prioridade máxima)
-        text_clean = text.strip()
-        if text_clean in self.overrides:
-            return self.overrides[text_clean], "override"
+        # 1-2. Overrides e memória de tradução
+        found = self._lookup_memory(text)
+        if found:
+            return found
         
-        # 2. Tradução automática do Google
+        # 3. Tradução automática pelo motor
         auto_translation = self.translate_text(text)
         if auto_translation:
-            return auto_translation, "google"
+            return auto_translation, self.translator.name
         
-        # 3. Manter original se nada funcionar
+        # 4. Manter original se nada funcionar
         return text, "original"
     
+    def get_translations(self, texts: List[str],
+                         on_result: Callable[[int, str], None] = None) -> List[Tuple[str, str]]:
+        """
+        Versão em lote de get_translation
+        
+        Args:
+            texts: Textos originais
+            on_result: Chamado com (índice em texts, tradução) a cada resposta do
+                motor, assim que chega (ver translate_batch)
+            
+        Returns:
+            Lista de tuplas (tradução, fonte) na mesma ordem dos textos
+        """
+        results: List[Optional[Tuple[str, str]]] = [self._lookup_memory(text) for text in texts]
+        
+        missing = [i for i, found in enumerate(results) if found is None]
+        notify = None
+        if on_result is not None:
+            def notify_missing(k: int, translation: str):
+                on_result(missing[k], translation)
+            notify = notify_missing
+        translated = self.translate_batch([texts[i] for i in missing], notify)
+        for i, translation in zip(missing, translated):
+            results[i] = ((translation, self.translator.name) if translation
+                          else (texts[i], "original"))
+        
+        return results
+    
+    def peek_translation(self, text: str) -> Optional[Tuple[str, str]]:
+        """
+        Tradução conhecida de um texto (overrides e memória), sem chamar o motor
+        
+        Args:
+            text: Texto original
+            
+        Returns:
+            Tupla (tradução, fonte) ou None se o texto dependeria do motor
+        """
+        return self._lookup_memory(text, record=False)
+    
+    def plan_translations(self, texts: List[str]) -> dict:
+        """
+        Classifica textos como get_translations faria, sem chamar o motor
+        
+        Nada é contabilizado (acertos, uso da memória, pré-filtro): o
+        planejamento não altera as estatísticas nem a ordem de remoção do cache.
+        
+        Args:
+            texts: Textos originais (já sem duplicatas)
+            
+        Returns:
+            Dicionário com a fonte de cada texto ('sources', na ordem dos textos)
+            e os textos mascarados que iriam ao motor ('engine_texts', únicos),
+            além de requisições e caracteres estimados
+        """
+        sources = []
+        engine_texts = []
+        for text in texts:
+            found = self.peek_translation(text)
+            if found is not None:
+                sources.append("skipped" if found[1] == "original" else found[1])
+                continue
+            sources.append("engine")
+            engine_texts.append(mask(text.strip()).text)
+        
+        # Textos que diferem apenas em placeholders compartilham a requisição
+        engine_texts = list(dict.fromkeys(engine_texts))
+        if self.translator is not None:
+            calls = sum(1 for _ in self._pack_batches(range(len(engine_texts)), engine_texts))
+            workers = min(self.workers, self.translator.max_concurrency)
+        else:
+            calls, workers = len(engine_texts), self.workers
+        return {
+            "sources": sources,
+            "engine_texts": engine_texts,
+            "engine_calls": calls,
+            "engine_chars": sum(len(text) for text in engine_texts),
+            "workers": workers,
+            "rate_limit": self.rate_limiter.rate,
+        }
     
     def get_stats(self) -> dict:
         """
         Retorna estatísticas do tradutor
         
+        Os contadores são os desta instância (de cada sessão, no serviço); os
+        totais da memória de tradução e da memória aproximada, compartilhadas
+        pelo processo, ficam em 'cache' e 'fuzzy'.
+        
         Returns:
             Dicionário com estatísticas
         """
-        return {
+        lookups = self.cache_hits + self.cache_misses
+        stats = {
             "overrides_count": len(self.overrides),
-            "translator_available": self.translator is not None,
+            "glossary_terms": len(self.glossary),
+            "override_matches": dict(self.override_index.matches),
+            "translator_available": self.engine_available,
+            "engine": self.translator.name if self.translator else self.engine_name,
+            "engine_capabilities": self.translator.get_capabilities() if self.translator else {},
             "config_file": str(self.overrides_file),
-            "override_type": "text_based"
+            "target_culture": self.target_culture,
+            "override_type": "text_based",
+            "cache_enabled": self.cache is not None,
+            "engine_requests": self.engine_requests,
+            "engine_retries": self.engine_retries,
+            "throttle_events": self.throttle_events,
+            "mask_failures": self.mask_failures,
+            "engine_failures": self.engine_failures,
+            "engine_timeouts": self.engine_timeouts,
+            "engine_timeout": self.call_timeout,
+            "failure_seconds": round(self.failure_seconds, 4),
+            "breaker_state": self.breaker.state,
+            "breaker_trips": self.breaker.trips,
+            "breaker_rejections": self.breaker.rejections,
+            "deferred_texts": self.deferred_texts,
+            "recovered_texts": self.recovered_texts,
+            "prefilter_skips": dict(self.skipped),
+            "budget_exhausted": self.budget_exhausted,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_rate": round(self.cache_hits / lookups, 4) if lookups else 0.0,
+            "workers": self.workers,
+            "rate_limit": self.rate_limiter.rate
         }
+        if self.cache is not None:
+            stats["cache"] = self.cache.get_stats()
+        if self.fuzzy is not None:
+            stats["fuzzy_lookups"] = self.fuzzy_lookups
+            stats["fuzzy_hits"] = dict(self.fuzzy_hits)
+            stats["fuzzy"] = self.fuzzy.get_stats()
+        return stats
+    
+    def invalidate_cache(self, text: str = None) -> int:
+        """
+        Invalida entradas da memória de tradução
+        
+        Args:
+            text: Texto original a invalidar (None remove todas as entradas)
+            
+        Returns:
+            Número de entradas removidas
+        """
+        if self.fuzzy is not None:
+            if text:
+                self.fuzzy.remove(mask(text.strip()).text)
+            else:
+                self.fuzzy = self._create_fuzzy_memory()
+                self._fuzzy_loaded = False
+        if self.cache is None:
+            return 0
+        return self.cache.invalidate(text=mask(text.strip()).text if text else None)
+    
+    def flush_cache(self):
+        """Grava no disco as traduções pendentes da memória de tradução"""
+        if self.cache is not None:
+            self.cache.flush()
+    
+    def session(self) -> "AutoTranslatorSession":
+        """
+        Cria uma visão deste tradutor com contadores próprios (uma por requisição do serviço)
+        
+        Returns:
+            AutoTranslatorSession ligada a este tradutor
+        """
+        return AutoTranslatorSession(self)
     
     def list_overrides(self) -> dict:
         """
@@ -147,3 +1019,62 @@ class AutoTranslator:
             Dicionário com overrides (texto original → tradução)
         """
         return self.overrides.copy()
+
+
+class AutoTranslatorSession(AutoTranslator):
+    """
+    AutoTranslator de uma execução concorrente sobre um tradutor aquecido
+    
+    Motor, overrides, memória de tradução, disjuntor e limite de taxa são os
+    do tradutor de origem: atributos que a sessão não tem são lidos da origem
+    e atribuições vão para a origem. Apenas os contadores da execução
+    (SESSION_COUNTERS, latência do motor, textos ignorados) e o orçamento do
+    motor são da sessão, então o resultado de cada requisição não mistura o
+    de outras. release() soma os contadores aos da origem (GET /stats).
+    """
+    
+    LOCAL_ATTRIBUTES = frozenset(AutoTranslator.SESSION_COUNTERS + (
+        "engine_latency", "skipped", "fuzzy_hits", "call_budget", "budget_exhausted", "_origin",
+        "_released"))
+    
+    def __init__(self, origin: AutoTranslator):
+        """
+        Args:
+            origin: Tradutor aquecido compartilhado
+        """
+        if isinstance(origin, AutoTranslatorSession):
+            origin = origin._origin
+        object.__setattr__(self, "_origin", origin)
+        for name in self.SESSION_COUNTERS:
+            setattr(self, name, 0.0 if name == "failure_seconds" else 0)
+        self.engine_latency = LatencyRecorder()
+        self.skipped = dict.fromkeys(origin.skipped, 0)
+        self.fuzzy_hits = {}
+        self.call_budget = None
+        self.budget_exhausted = False
+        self._released = False
+    
+    def __getattr__(self, name: str):
+        # Chamado apenas para atributos que a sessão não tem
+        return getattr(object.__getattribute__(self, "_origin"), name)
+    
+    def __setattr__(self, name: str, value):
+        if name in self.LOCAL_ATTRIBUTES:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._origin, name, value)
+    
+    def release(self):
+        """Soma os contadores da sessão aos do tradutor de origem (uma única vez)"""
+        origin = self._origin
+        with origin._stats_lock:
+            if self._released:
+                return
+            self._released = True
+            for name in self.SESSION_COUNTERS:
+                setattr(origin, name, getattr(origin, name) + getattr(self, name))
+            for reason, count in self.skipped.items():
+                origin.skipped[reason] = origin.skipped.get(reason, 0) + count
+            for source, count in self.fuzzy_hits.items():
+                origin.fuzzy_hits[source] = origin.fuzzy_hits.get(source, 0) + count
+        origin.engine_latency.merge(self.engine_latency)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Orçamento de chamadas e de tempo do motor de tradução (compartilhável entre processos)
+"""
+
+import time
+from typing import Optional
+
+
+class BudgetExhausted(Exception):
+    """Orçamento de chamadas ao motor (ou tempo da execução) esgotado"""
+
+
+class EngineCallBudget:
+    """
+    Limite total de requisições e de caracteres enviados ao motor e prazo da execução
+
+    Os contadores são multiprocessing.Value, então a mesma instância pode ser
+    repassada aos processos de um pool (via initializer) e o limite vale para
+    a execução inteira. O prazo é um instante de relógio (time.time), válido
+    em qualquer processo.
+    """
+
+    def __init__(self, limit: Optional[int] = None, time_budget: Optional[float] = None,
+                 char_limit: Optional[int] = None):
+        """
+        Inicializa o orçamento
+
+        Args:
+            limit: Número máximo de requisições ao motor (None = sem limite)
+            time_budget: Segundos a partir de agora em que o motor pode ser usado
+                (None = sem prazo)
+            char_limit: Número máximo de caracteres enviados ao motor (None = sem limite)
+        """
+        # multiprocessing só é carregado quando há orçamento
+        import multiprocessing
+        self.limit = limit
+        self.time_budget = time_budget
+        self.char_limit = char_limit
+        self.deadline = time.time() + time_budget if time_budget is not None else None
+        self._used = multiprocessing.Value("l", 0)
+        self._chars = multiprocessing.Value("q", 0)
+
+    def consume(self, calls: int = 1, chars: int = 0) -> bool:
+        """
+        Reserva requisições (e os caracteres enviados nelas) do orçamento
+
+        Args:
+            calls: Quantidade de requisições
+            chars: Caracteres enviados nessas requisições
+
+        Returns:
+            True se havia saldo suficiente (e o prazo não acabou)
+        """
+        if self.expired():
+            return False
+        # O lock do contador de requisições protege também o de caracteres
+        with self._used.get_lock():
+            if self.limit is not None and self._used.value + calls > self.limit:
+                return False
+            if self.char_limit is not None and self._chars.value + chars > self.char_limit:
+                return False
+            self._used.value += calls
+            self._chars.value += chars
+            return True
+
+    def expired(self) -> bool:
+        """Indica se o prazo da execução acabou"""
+        return self.deadline is not None and time.time() >= self.deadline
+
+    def time_left(self) -> Optional[float]:
+        """Segundos até o fim do prazo (None sem prazo)"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.time())
+
+    @property
+    def used(self) -> int:
+        """Requisições já consumidas"""
+        return self._used.value
+
+    @property
+    def chars_used(self) -> int:
+        """Caracteres já consumidos"""
+        return self._chars.value
+
+    @property
+    def remaining(self) -> Optional[int]:
+        """Requisições ainda disponíveis (None sem limite)"""
+        if self.limit is None:
+            return None
+        return max(0, self.limit - self._used.value)
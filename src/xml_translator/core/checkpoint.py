@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Checkpoint de tradução: diário append-only para retomar execuções interrompidas
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..utils.logger import get_logger
+
+
+# Sufixo do diário gravado ao lado do arquivo traduzido
+CHECKPOINT_SUFFIX = ".checkpoint.jsonl"
+CHECKPOINT_VERSION = 1
+
+
+def checkpoint_path(output_path: str) -> Path:
+    """Retorna o caminho do diário associado a um arquivo traduzido"""
+    return Path(str(output_path) + CHECKPOINT_SUFFIX)
+
+
+def input_fingerprint(input_path: str, scope: Dict) -> str:
+    """
+    Identifica a origem e a configuração de uma execução
+
+    Args:
+        input_path: Arquivo de origem (o conteúdo entra no hash)
+        scope: Parâmetros que invalidam o diário (cultura, motor...)
+
+    Returns:
+        Hash hexadecimal
+    """
+    digest = hashlib.sha1(json.dumps(scope, sort_keys=True).encode("utf-8"))
+    with open(input_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CheckpointJournal:
+    """
+    Diário de traduções concluídas (JSON lines)
+
+    Cada tradução recebida do motor é acumulada em memória e gravada em
+    blocos (por quantidade ou tempo), então o custo no laço principal é o de
+    um append em lista. Uma interrupção perde no máximo o último bloco; uma
+    linha truncada no fim do arquivo é ignorada ao retomar.
+    """
+
+    def __init__(self, path: Path, fingerprint: str, flush_every: int = 200,
+                 flush_interval: float = 1.0):
+        """
+        Abre o diário, retomando-o se pertencer à mesma origem e configuração
+
+        Args:
+            path: Caminho do diário
+            fingerprint: Identificação da execução (ver input_fingerprint)
+            flush_every: Entradas acumuladas antes de gravar
+            flush_interval: Segundos máximos entre gravações
+        """
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.logger = get_logger(__name__)
+        self.entries: Dict[str, str] = self._load()
+        self.resumed = len(self.entries)
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+
+        if self.resumed:
+            self.logger.info(f"Retomando de {self.path}: {self.resumed} traduções já concluídas")
+
+        # Regrava o diário sem a eventual linha truncada (troca atômica) e passa a acrescentar
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"version": CHECKPOINT_VERSION, "fingerprint": fingerprint}) + "\n")
+            for text, translation in self.entries.items():
+                f.write(json.dumps({"t": text, "r": translation}, ensure_ascii=False) + "\n")
+        os.replace(temporary, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _load(self) -> Dict[str, str]:
+        """Lê as entradas de um diário anterior compatível"""
+        if not self.path.exists():
+            return {}
+        entries: Dict[str, str] = {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            try:
+                header = json.loads(f.readline())
+            except ValueError:
+                return {}
+            if (header.get("version") != CHECKPOINT_VERSION
+                    or header.get("fingerprint") != self.fingerprint):
+                self.logger.info(f"Checkpoint '{self.path}' de outra origem/configuração: "
+                                 f"descartado")
+                return {}
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Última linha incompleta (interrupção durante a gravação)
+                    break
+                entries[entry["t"]] = entry["r"]
+        return entries
+
+    def get(self, text: str) -> Optional[str]:
+        """Tradução já registrada para o texto normalizado (ou None)"""
+        return self.entries.get(text)
+
+    def record(self, text: str, translation: str):
+        """
+        Registra uma tradução concluída
+
+        Args:
+            text: Texto normalizado
+            translation: Tradução
+        """
+        self.entries[text] = translation
+        self._buffer.append(json.dumps({"t": text, "r": translation}, ensure_ascii=False))
+        if (len(self._buffer) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Grava as entradas acumuladas"""
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._file.flush()
+            self._buffer.clear()
+        self._last_flush = time.monotonic()
+
+    def close(self, completed: bool):
+        """
+        Fecha o diário
+
+        Args:
+            completed: Execução concluída (o diário é removido); caso contrário
+                é mantido para a próxima execução retomar
+        """
+        self.flush()
+        self._file.close()
+        if completed:
+            self.path.unlink()
+        else:
+            self.logger.info(f"Checkpoint mantido em {self.path} ({len(self.entries)} traduções)")
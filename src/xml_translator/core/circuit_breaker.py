@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Disjuntor (circuit breaker) e prazo por requisição ao motor de tradução
+"""
+
+import threading
+import time
+
+from ..engines.base import EngineTimeout
+
+
+class CircuitOpen(Exception):
+    """Requisição recusada sem chamar o motor: o disjuntor está aberto"""
+
+
+class CircuitBreaker:
+    """
+    Disjuntor de falhas consecutivas de disponibilidade do motor
+
+    Fechado, deixa passar todas as requisições. Após failure_threshold falhas
+    seguidas (prazo esgotado, conexão, limitação persistente) abre e recusa
+    requisições imediatamente por reset_timeout segundos. Depois disso uma
+    única requisição de teste é liberada (meio aberto): sucesso fecha o
+    disjuntor, falha o abre de novo.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            failure_threshold: Falhas consecutivas que abrem o disjuntor (<= 0 desativa)
+            reset_timeout: Segundos aberto antes da requisição de teste
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.trips = 0
+        self.rejections = 0
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Estado atual (closed, open ou half_open)"""
+        with self._lock:
+            if self._opened_at is None:
+                return self.CLOSED
+            if self._probing or time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self.OPEN
+
+    def allow(self) -> bool:
+        """
+        Indica se uma requisição pode ser feita (reserva a requisição de teste)
+
+        Returns:
+            False se o disjuntor está aberto ou outra requisição de teste está em curso
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if not self._probing and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._probing = True
+                return True
+            self.rejections += 1
+            return False
+
+    def retry_in(self) -> float:
+        """Segundos até a próxima requisição de teste (0 se o disjuntor está fechado)"""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def release(self):
+        """Devolve a reserva de allow() sem resultado (requisição não enviada)"""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        """Registra requisição bem-sucedida (fecha o disjuntor)"""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> bool:
+        """
+        Registra falha de disponibilidade
+
+        Returns:
+            True se esta falha abriu o disjuntor
+        """
+        with self._lock:
+            self._failures += 1
+            if self._probing or (self._opened_at is None and self.failure_threshold > 0
+                                 and self._failures >= self.failure_threshold):
+                opened = self._opened_at is None
+                self._opened_at = time.monotonic()
+                self._probing = False
+                if opened:
+                    self.trips += 1
+                return opened
+            return False
+
+
+def call_with_timeout(timeout: float, function, *args):
+    """
+    Executa uma chamada bloqueante com prazo
+
+    A chamada roda em uma thread daemon: ao fim do prazo o chamador segue
+    (EngineTimeout) e uma requisição travada não impede o encerramento do
+    processo. Sem prazo (None ou <= 0) a chamada é feita diretamente.
+
+    Args:
+        timeout: Prazo em segundos
+        function: Função a executar
+        *args: Argumentos da função
+
+    Returns:
+        Resultado da função (exceções são repassadas ao chamador)
+    """
+    if not timeout or timeout <= 0:
+        return function(*args)
+
+    outcome = {}
+    done = threading.Event()
+
+    def run():
+        try:
+            outcome["result"] = function(*args)
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            done.set()
+
+    threading.Thread(target=run, name="engine-call", daemon=True).start()
+    if not done.wait(timeout):
+        raise EngineTimeout(f"Motor não respondeu em {timeout:.1f}s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
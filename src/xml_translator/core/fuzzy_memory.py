@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Memória de tradução aproximada: índice de trigramas para textos quase iguais
+"""
+
+import math
+import re
+import threading
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .override_index import normalize_key
+from ..utils.logger import get_logger
+
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def same_words(source: str, key: str) -> bool:
+    """
+    Verifica se dois textos têm as mesmas palavras e os mesmos números na mesma ordem
+
+    Uma palavra a mais, a menos, trocada ("enable" / "disable", "could not" /
+    "could", "exported" / "imported") ou em outra posição ("euros to dollars" /
+    "dollars to euros") muda o significado mesmo com trigramas quase iguais,
+    então só diferenças de pontuação, espaços e caixa são aceitas.
+
+    Args:
+        source: Texto indexado
+        key: Texto buscado, normalizado (normalize_key)
+
+    Returns:
+        True se a tradução de um pode ser reaproveitada para o outro
+    """
+    # Números também são palavras (\w+): a lista ordenada cobre os dois casos
+    return _WORD_RE.findall(normalize_key(source)) == _WORD_RE.findall(key)
+
+
+class FuzzyMatch:
+    """Candidato encontrado na memória aproximada"""
+
+    __slots__ = ("source", "translation", "origin", "score")
+
+    def __init__(self, source: str, translation: str, origin: str, score: float):
+        self.source = source
+        self.translation = translation
+        self.origin = origin
+        self.score = score
+
+    def __repr__(self) -> str:
+        return (f"FuzzyMatch({self.source!r}, {self.translation!r}, "
+                f"origin={self.origin!r}, score={self.score:.3f})")
+
+
+class FuzzyMemory:
+    """
+    Índice invertido de trigramas de caracteres sobre textos já traduzidos
+
+    A similaridade é o índice de Jaccard entre os conjuntos de trigramas dos
+    textos normalizados (normalize_key). A busca não percorre a memória:
+
+    - um texto com similaridade >= limite não tem no máximo p - 1 dos n
+      trigramas da consulta (p = n - ceil(limite * n) + 1), então só quem
+      está nas listas dos p trigramas mais raros da consulta é candidato
+      (filtro de prefixo);
+    - as listas são contadas da mais rara para a mais comum até scan_budget
+      entradas; quem aparece em menos de m - p + 1 das m listas contadas é
+      descartado sem cálculo. Se as p primeiras listas não couberem no
+      orçamento (textos só com trigramas muito comuns), a busca fica
+      aproximada em vez de lenta;
+    - candidatos com quantidade de trigramas fora de [limite * n, n / limite]
+      são descartados (filtro de tamanho) e só os restantes têm a
+      interseção calculada, sobre arrays de identificadores de trigramas.
+
+    Candidatos acima do limite só são aceitos com as mesmas palavras e
+    números da consulta, na mesma ordem (same_words): trigramas quase
+    iguais não bastam para "enable" / "disable" terem a mesma tradução.
+
+    Listas e trigramas de cada entrada são arrays de inteiros de 32 bits.
+    """
+
+    def __init__(self, threshold: float = 0.85, min_length: int = 8, ngram: int = 3,
+                 scan_budget: int = 1000):
+        """
+        Args:
+            threshold: Similaridade mínima (0-1) para reaproveitar uma tradução
+            min_length: Textos normalizados mais curtos não são buscados
+            ngram: Tamanho dos n-gramas de caracteres
+            scan_budget: Entradas de listas contadas por busca além das obrigatórias
+        """
+        self.threshold = threshold
+        self.min_length = min_length
+        self.ngram = ngram
+        self.scan_budget = scan_budget
+        self.logger = get_logger(__name__)
+        self._ids: Dict[str, int] = {}
+        self._entries: List[Optional[Tuple[str, str, str]]] = []
+        self._entry_grams: List[Optional[array]] = []
+        self._gram_ids: Dict[str, int] = {}
+        self._postings: List[array] = []
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits: Dict[str, int] = {}
+        self.score_total = 0.0
+        self.score_min = None
+
+    def grams(self, key: str) -> Set[str]:
+        """Conjunto de n-gramas de um texto normalizado (com bordas marcadas por espaço)"""
+        padded = f" {key} "
+        size = self.ngram
+        return {padded[i:i + size] for i in range(len(padded) - size + 1)}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, source: str, translation: str, origin: str):
+        """
+        Indexa (ou substitui) um texto traduzido
+
+        Args:
+            source: Texto original (mascarado)
+            translation: Tradução
+            origin: Procedência (override ou memory)
+        """
+        key = normalize_key(source)
+        if len(key) < self.min_length:
+            return
+        with self._lock:
+            entry_id = self._ids.get(key)
+            if entry_id is not None:
+                self._entries[entry_id] = (source, translation, origin)
+                return
+            entry_id = len(self._entries)
+            gram_ids = self._gram_ids
+            postings = self._postings
+            grams = array("I")
+            for gram in self.grams(key):
+                gram_id = gram_ids.get(gram)
+                if gram_id is None:
+                    gram_id = gram_ids[gram] = len(postings)
+                    postings.append(array("I"))
+                postings[gram_id].append(entry_id)
+                grams.append(gram_id)
+            self._ids[key] = entry_id
+            self._entries.append((source, translation, origin))
+            self._entry_grams.append(grams)
+
+    def add_many(self, items: Iterable[Tuple[str, str]], origin: str) -> int:
+        """
+        Indexa vários textos
+
+        Args:
+            items: Pares (texto original, tradução)
+            origin: Procedência
+
+        Returns:
+            Quantidade de textos recebidos
+        """
+        count = 0
+        for source, translation in items:
+            self.add(source, translation, origin)
+            count += 1
+        return count
+
+    def remove(self, source: str):
+        """Remove um texto do índice (as listas de trigramas são filtradas na busca)"""
+        key = normalize_key(source)
+        with self._lock:
+            entry_id = self._ids.pop(key, None)
+            if entry_id is not None:
+                self._entries[entry_id] = None
+                self._entry_grams[entry_id] = None
+
+    def lookup(self, text: str, record: bool = True) -> Optional[FuzzyMatch]:
+        """
+        Busca o texto indexado mais parecido
+
+        Args:
+            text: Texto original (mascarado)
+            record: Contabilizar a busca nas estatísticas (False no planejamento)
+
+        Returns:
+            Melhor candidato com similaridade >= limite ou None
+        """
+        key = normalize_key(text)
+        if len(key) < self.min_length:
+            return None
+        if record:
+            self.lookups += 1
+
+        # Mesmo texto normalizado (caixa, espaços, pontuação nas bordas)
+        entry_id = self._ids.get(key)
+        if entry_id is not None:
+            return self._hit(entry_id, 1.0, record)
+
+        gram_ids = self._gram_ids
+        postings = self._postings
+        grams = self.grams(key)
+        size = len(grams)
+        query = {gram_ids[gram] for gram in grams if gram in gram_ids}
+        # Trigramas que nenhuma entrada tem contam como "faltando" em qualquer candidato
+        known = sorted((postings[gram_id] for gram_id in query), key=len)
+        threshold = self.threshold
+        prefix = size - math.ceil(threshold * size - 1e-9) + 1
+        missing = size - len(known)
+        if missing >= prefix:
+            return None
+
+        counts = Counter()
+        scanned = consulted = 0
+        for posting in known:
+            if consulted and scanned + len(posting) > self.scan_budget:
+                break
+            counts.update(posting)
+            scanned += len(posting)
+            consulted += 1
+        # Com o prefixo inteiro dentro do orçamento nenhum candidato se perde; senão
+        # a busca fica aproximada (candidatos só das listas mais raras que couberam)
+        min_count = max(1, consulted - (prefix - missing) + 1)
+        exact = consulted == len(known)
+
+        low, high = threshold * size, size / threshold
+        entry_grams = self._entry_grams
+        best_id, best_score = None, threshold
+        for candidate, count in counts.items():
+            if count < min_count:
+                continue
+            other = entry_grams[candidate]
+            if other is None or not low <= len(other) <= high:
+                continue
+            common = count if exact else len(query.intersection(other))
+            score = common / (size + len(other) - common)
+            # Palavras ou números diferentes nunca são a mesma mensagem
+            # ("Enable updates" / "Disable updates", "Page 1 of 20" / "Page 1 of 21")
+            if score >= best_score and same_words(self._entries[candidate][0], key):
+                best_id, best_score = candidate, score
+        if best_id is None:
+            return None
+        return self._hit(best_id, best_score, record)
+
+    def _hit(self, entry_id: int, score: float, record: bool) -> Optional[FuzzyMatch]:
+        entry = self._entries[entry_id]
+        if entry is None:
+            return None
+        source, translation, origin = entry
+        if not record:
+            return FuzzyMatch(source, translation, origin, score)
+        with self._lock:
+            self.hits[origin] = self.hits.get(origin, 0) + 1
+            self.score_total += score
+            self.score_min = score if self.score_min is None else min(self.score_min, score)
+        return FuzzyMatch(source, translation, origin, score)
+
+    def get_stats(self) -> dict:
+        """
+        Estatísticas da memória aproximada
+
+        Returns:
+            Entradas, buscas, acertos por procedência e similaridade média/mínima
+        """
+        hits = sum(self.hits.values())
+        return {
+            "fuzzy_entries": len(self),
+            "fuzzy_lookups": self.lookups,
+            "fuzzy_hits": dict(self.hits),
+            "fuzzy_score_avg": round(self.score_total / hits, 4) if hits else 0.0,
+            "fuzzy_score_min": round(self.score_min, 4) if self.score_min is not None else None,
+            "fuzzy_threshold": self.threshold,
+        }
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Re-tradução incremental: reaproveita a saída anterior e traduz apenas o que mudou
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Callable, Collection, Dict, List, Optional
+
+from .string_unit import StringUnit
+from ..utils.logger import get_logger
+
+
+# Sufixo do manifesto de hashes gravado ao lado do arquivo traduzido
+MANIFEST_SUFFIX = ".state.json"
+MANIFEST_VERSION = 1
+
+
+def manifest_path(output_path: str) -> Path:
+    """Retorna o caminho do manifesto associado a um arquivo traduzido"""
+    return Path(str(output_path) + MANIFEST_SUFFIX)
+
+
+def hash_text(text: str) -> str:
+    """Hash curto e estável do texto original de uma chave"""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def load_manifest(path: Path) -> Optional[Dict[str, str]]:
+    """
+    Carrega hashes por chave de uma execução anterior
+
+    Args:
+        path: Caminho do manifesto
+
+    Returns:
+        Dicionário chave → hash ou None se não existir/for inválido
+    """
+    if not path.exists():
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != MANIFEST_VERSION:
+            return None
+        return data["hashes"]
+    except Exception as e:
+        get_logger(__name__).warning(f"Manifesto incremental inválido '{path}': {e}")
+        return None
+
+
+def save_manifest(path: Path, strings: List[StringUnit], input_path: str,
+                  untranslated: Collection[str] = ()):
+    """
+    Grava hashes por chave do texto de origem traduzido
+
+    Chaves gravadas como original (falha do motor, orçamento esgotado,
+    disjuntor aberto) ficam fora do manifesto e voltam como novas na
+    próxima execução incremental.
+
+    Args:
+        path: Caminho do manifesto
+        strings: Strings extraídas da origem
+        input_path: Arquivo de origem (informativo)
+        untranslated: Chaves mantidas como original nesta execução
+    """
+    data = {
+        "version": MANIFEST_VERSION,
+        "source": str(input_path),
+        "hashes": {unit.key: hash_text(unit.text) for unit in strings
+                   if unit.key not in untranslated},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def diff_catalog(
+    strings: List[StringUnit],
+    baseline: Dict[str, str],
+    existing: Dict[str, str],
+    override_for: Callable[[str], Optional[str]],
+) -> dict:
+    """
+    Compara a origem atual com a execução anterior
+
+    Uma chave é reaproveitada quando seu hash não mudou, ela existe na saída
+    anterior e nenhum override atual diverge da tradução existente.
+
+    Args:
+        strings: Strings extraídas da origem atual
+        baseline: Hashes por chave da origem anterior
+        existing: Traduções por chave da saída anterior
+        override_for: Função que retorna o override atual de um texto (ou None)
+
+    Returns:
+        Dicionário com 'reused' (chave → tradução), 'pending' (strings a
+        traduzir) e contagens 'added', 'changed', 'reused', 'removed'
+    """
+    reused: Dict[str, str] = {}
+    pending: List[StringUnit] = []
+    added = changed = 0
+
+    for unit in strings:
+        key = unit.key
+        previous_hash = baseline.get(key)
+        if previous_hash is None or key not in existing:
+            added += 1
+            pending.append(unit)
+            continue
+
+        override = override_for(unit.text)
+        if previous_hash != hash_text(unit.text) or (
+            override is not None and override != existing[key]
+        ):
+            changed += 1
+            pending.append(unit)
+            continue
+
+        reused[key] = existing[key]
+
+    current_keys = {unit.key for unit in strings}
+    removed = len(set(baseline) - current_keys)
+
+    return {
+        "reused_translations": reused,
+        "pending": pending,
+        "added": added,
+        "changed": changed,
+        "reused": len(reused),
+        "removed": removed,
+    }
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gravação por substituição: altera apenas o texto dos elementos <string> no arquivo original
+"""
+
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from xml.parsers import expat
+
+from ..utils.logger import get_logger
+
+
+# Atributo culture na tag raiz (aspas simples ou duplas)
+_CULTURE_RE = re.compile(rb"""(\sculture\s*=\s*)(["'])(.*?)\2""", re.DOTALL)
+
+
+def _local_name(qname: str) -> str:
+    return qname.rsplit(":", 1)[-1]
+
+
+def _start_tag_end(data: bytes, start: int) -> int:
+    """Posição do '>' que fecha a tag iniciada em `start` (ignora '>' entre aspas)"""
+    quote = None
+    position = start + 1
+    while True:
+        char = data[position:position + 1]
+        if not char:
+            raise ValueError(f"Tag sem fechamento na posição {start}")
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in (b'"', b"'"):
+            quote = char
+        elif char == b">":
+            return position
+        position += 1
+
+
+class _Span:
+    """Trecho de texto de um <string> no arquivo original"""
+
+    __slots__ = ("key", "start", "end", "text")
+
+    def __init__(self, key: str, start: int):
+        self.key = key
+        self.start = start
+        self.end: Optional[int] = None
+        self.text: List[str] = []
+
+
+def find_string_spans(data: bytes) -> Tuple[List[_Span], Optional[Tuple[int, int]], str]:
+    """
+    Localiza, por posição em bytes, o texto de cada elemento <string>
+
+    Args:
+        data: Conteúdo bruto do XML
+
+    Returns:
+        Tupla (trechos em ordem, intervalo da tag raiz, codificação declarada)
+    """
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    spans: List[_Span] = []
+    stack: List[Optional[_Span]] = []
+    root: List[Tuple[int, int]] = []
+    declared = {"encoding": "utf-8"}
+
+    def xml_decl(version, encoding, standalone):
+        if encoding:
+            declared["encoding"] = encoding
+
+    def start(name, attributes):
+        index = parser.CurrentByteIndex
+        end = _start_tag_end(data, index)
+        if not stack:
+            root.append((index, end))
+        if stack and stack[-1] is not None and stack[-1].end is None:
+            # Filho dentro de <string>: o texto termina onde o filho começa (como em .text)
+            stack[-1].end = index
+        span = None
+        if _local_name(name) == "string" and attributes.get("key") and data[end - 1:end] != b"/":
+            span = _Span(attributes["key"], end + 1)
+            spans.append(span)
+        stack.append(span)
+
+    def end(name):
+        span = stack.pop()
+        if span is not None and span.end is None:
+            span.end = parser.CurrentByteIndex
+
+    def character_data(text):
+        if stack and stack[-1] is not None and stack[-1].end is None:
+            stack[-1].text.append(text)
+
+    parser.XmlDeclHandler = xml_decl
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = character_data
+    try:
+        parser.Parse(data, True)
+    except expat.ExpatError as e:
+        raise ET.ParseError(str(e))
+    return spans, (root[0] if root else None), declared["encoding"]
+
+
+def write_in_place(input_path: str, output_path: str, translations: Dict[str, str],
+                   culture: str = None) -> int:
+    """
+    Grava a saída copiando o arquivo original e trocando apenas textos traduzidos
+
+    Comentários, prefixos de namespace, ordem e aspas de atributos, espaços
+    e a declaração XML ficam byte a byte como no original; só mudam o texto
+    dos <string> cuja tradução difere e o atributo culture da raiz.
+
+    Args:
+        input_path: Arquivo de origem
+        output_path: Arquivo de saída
+        translations: Traduções por chave
+        culture: Nova cultura da tag raiz (opcional)
+
+    Returns:
+        Número de textos substituídos
+    """
+    data = Path(input_path).read_bytes()
+    spans, root, encoding = find_string_spans(data)
+    pieces: List[bytes] = []
+    position = 0
+
+    if culture and root is not None:
+        root_start, root_end = root
+        tag = data[root_start:root_end]
+        if _CULTURE_RE.search(tag):
+            tag = _CULTURE_RE.sub(lambda match: match.group(1) + match.group(2)
+                                  + culture.encode(encoding) + match.group(2), tag, count=1)
+            pieces.append(data[:root_start])
+            pieces.append(tag)
+            position = root_end
+
+    replaced = 0
+    for span in spans:
+        translation = translations.get(span.key)
+        if translation is None or translation == "".join(span.text):
+            continue
+        pieces.append(data[position:span.start])
+        pieces.append(ET._escape_cdata(translation).encode(encoding, "xmlcharrefreplace"))
+        position = span.end
+        replaced += 1
+    pieces.append(data[position:])
+
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "wb") as f:
+        f.writelines(pieces)
+    get_logger(__name__).info(f"Substituídos {replaced} textos em {output_path} "
+                              f"(formato preservado)")
+    return replaced
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Proteção de placeholders e marcação durante a tradução automática
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+from .override_index import PLACEHOLDER_RE
+
+
+# Tokens protegidos: placeholders/formatos, tags inline e entidades
+MASK_RE = re.compile(
+    "|".join((
+        PLACEHOLDER_RE.pattern,
+        r"</?[A-Za-z][\w:.-]*(?:\s[^<>]*)?/?>",
+        r"&(?:#\d+|#x[0-9A-Fa-f]+|\w+);",
+    ))
+)
+
+# Sentinela enviada ao motor no lugar de cada token: ⟦0⟧, ⟦1⟧...
+SENTINEL_OPEN = "⟦"
+SENTINEL_CLOSE = "⟧"
+# Motores às vezes inserem espaços dentro da sentinela ("⟦ 0 ⟧")
+SENTINEL_RE = re.compile(SENTINEL_OPEN + r"\s*(\d+)\s*" + SENTINEL_CLOSE)
+
+
+class Masked:
+    """Texto com tokens substituídos por sentinelas estáveis"""
+
+    __slots__ = ("text", "tokens")
+
+    def __init__(self, text: str, tokens: List[str]):
+        self.text = text
+        self.tokens = tokens
+
+    def restore(self, translation: str) -> Optional[str]:
+        """
+        Recoloca os tokens originais na tradução
+
+        Args:
+            translation: Tradução do texto mascarado
+
+        Returns:
+            Tradução com os tokens ou None se alguma sentinela se perdeu,
+            foi duplicada ou inventada pelo motor
+        """
+        if not self.tokens:
+            return translation
+        if not sentinels_match(self.text, translation):
+            return None
+        return SENTINEL_RE.sub(lambda match: self.tokens[int(match.group(1))], translation)
+
+    @property
+    def translatable(self) -> bool:
+        """Indica se sobra texto a traduzir além dos tokens"""
+        return any(char.isalpha() for char in SENTINEL_RE.sub("", self.text))
+
+
+def mask(text: str) -> Masked:
+    """
+    Substitui placeholders e marcação por sentinelas numeradas
+
+    Textos que diferem apenas nesses tokens ("Hello {0}" e "Hello {name}",
+    links com destinos diferentes) produzem o mesmo texto mascarado e
+    compartilham a tradução.
+
+    Args:
+        text: Texto original
+
+    Returns:
+        Texto mascarado e tokens na ordem das sentinelas
+    """
+    if SENTINEL_OPEN in text:
+        # Não é possível distinguir sentinelas próprias das do texto
+        return Masked(text, [])
+    tokens: List[str] = []
+
+    def replace(match) -> str:
+        tokens.append(match.group())
+        return f"{SENTINEL_OPEN}{len(tokens) - 1}{SENTINEL_CLOSE}"
+
+    return Masked(MASK_RE.sub(replace, text), tokens)
+
+
+def mask_like(masked: Masked, translation: str) -> Optional[str]:
+    """
+    Mascara uma tradução conhecida com as sentinelas do texto original
+
+    Usado ao importar memórias de tradução: cada token da tradução recebe a
+    sentinela do mesmo token no original, mesmo que a ordem mude.
+
+    Args:
+        masked: Texto original mascarado
+        translation: Tradução com os tokens originais
+
+    Returns:
+        Tradução mascarada ou None se os tokens não correspondem
+    """
+    if not masked.tokens:
+        return translation
+    available = {}
+    for index, token in enumerate(masked.tokens):
+        available.setdefault(token, []).append(index)
+
+    def replace(match) -> str:
+        indices = available.get(match.group())
+        if not indices:
+            # Token ausente no original: a sentinela inválida reprova a verificação abaixo
+            return f"{SENTINEL_OPEN}-{SENTINEL_CLOSE}"
+        return f"{SENTINEL_OPEN}{indices.pop(0)}{SENTINEL_CLOSE}"
+
+    result = MASK_RE.sub(replace, translation)
+    if SENTINEL_OPEN + "-" in result or not sentinels_match(masked.text, result):
+        return None
+    return result
+
+
+def _sentinel_ids(text: str) -> List[int]:
+    return sorted(int(found) for found in SENTINEL_RE.findall(text))
+
+
+def sentinels_match(masked_text: str, translation: str) -> bool:
+    """
+    Verifica se todas as sentinelas sobreviveram exatamente uma vez na tradução
+
+    Args:
+        masked_text: Texto enviado ao motor
+        translation: Resposta do motor
+
+    Returns:
+        True se os conjuntos de sentinelas são idênticos
+    """
+    return _sentinel_ids(masked_text) == _sentinel_ids(translation)
+
+
+def split_masked(texts: List[str]) -> Tuple[List[Masked], List[str]]:
+    """
+    Mascara vários textos e lista os textos mascarados únicos
+
+    Args:
+        texts: Textos originais
+
+    Returns:
+        Tupla (mascarados na ordem dos textos, textos mascarados únicos)
+    """
+    masked = [mask(text.strip()) for text in texts]
+    unique = list(dict.fromkeys(item.text for item in masked))
+    return masked, unique
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Instrumentação da tradução: tempo por etapa, latência do motor e taxas de acerto
+"""
+
+import contextlib
+import itertools
+import json
+import math
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, List
+
+
+# Contadores do AutoTranslator reportados como diferença dentro da execução
+RUN_COUNTERS = ("engine_requests", "engine_retries", "throttle_events", "engine_failures",
+                "engine_timeouts", "breaker_trips", "failure_seconds", "deferred_texts",
+                "recovered_texts", "cache_hits", "cache_misses")
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """
+    Percentil pelo método do posto mais próximo
+
+    Args:
+        samples: Amostras ordenadas
+        pct: Percentil desejado (0-100)
+
+    Returns:
+        Valor da amostra correspondente (0.0 sem amostras)
+    """
+    if not samples:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(samples)))
+    return samples[min(rank, len(samples)) - 1]
+
+
+class LatencyRecorder:
+    """
+    Amostras de latência das requisições ao motor (seguro entre threads)
+
+    Guarda apenas as `max_samples` amostras mais recentes, então o uso de
+    memória é limitado mesmo no serviço residente; len() conta todas as
+    requisições registradas e serve de marca de início para summary().
+    """
+
+    # Amostras guardadas por padrão (percentis das requisições mais recentes)
+    MAX_SAMPLES = 10000
+
+    def __init__(self, max_samples: int = MAX_SAMPLES):
+        """
+        Args:
+            max_samples: Quantidade máxima de amostras guardadas
+        """
+        self._samples = deque(maxlen=max(1, max_samples))
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        """Registra a duração de uma requisição"""
+        with self._lock:
+            self._samples.append(seconds)
+            self._count += 1
+
+    def merge(self, other: "LatencyRecorder"):
+        """Acrescenta as amostras de outro registro (ex.: de uma sessão do serviço)"""
+        with other._lock:
+            samples = list(other._samples)
+            count = other._count
+        with self._lock:
+            self._samples.extend(samples)
+            self._count += count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def summary(self, start: int = 0) -> Dict:
+        """
+        Resumo das latências em milissegundos
+
+        Com mais de `max_samples` requisições desde `start`, os percentis
+        são calculados sobre as mais recentes.
+
+        Args:
+            start: Valor de len() no início da execução
+
+        Returns:
+            Dicionário com count, mean_ms, p50_ms, p95_ms, p99_ms e max_ms
+        """
+        with self._lock:
+            count = self._count - start
+            kept = min(count, len(self._samples))
+            samples = sorted(itertools.islice(self._samples, len(self._samples) - kept, None))
+        if not samples:
+            return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0,
+                    "p99_ms": 0.0, "max_ms": 0.0}
+
+        def to_ms(seconds: float) -> float:
+            return round(seconds * 1000, 3)
+
+        return {
+            "count": count,
+            "mean_ms": to_ms(sum(samples) / len(samples)),
+            "p50_ms": to_ms(percentile(samples, 50)),
+            "p95_ms": to_ms(percentile(samples, 95)),
+            "p99_ms": to_ms(percentile(samples, 99)),
+            "max_ms": to_ms(samples[-1]),
+        }
+
+
+class RunMetrics:
+    """Métricas de uma execução de translate_file"""
+
+    def __init__(self, auto_translator):
+        """
+        Inicia a medição, guardando os contadores atuais do tradutor
+
+        Args:
+            auto_translator: AutoTranslator cujas requisições são medidas
+        """
+        self.auto_translator = auto_translator
+        self.stages: Dict[str, float] = {}
+        self.started = time.perf_counter()
+        self._latency_start = len(auto_translator.engine_latency)
+        self._counters = {name: getattr(auto_translator, name) for name in RUN_COUNTERS}
+        self._skipped = dict(auto_translator.skipped)
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """Acumula o tempo de parede de uma etapa (load_xml, save_xml, ...)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    def report(self, run_stats: Dict = None) -> Dict:
+        """
+        Consolida as métricas da execução
+
+        Args:
+            run_stats: last_run_stats do XMLTranslator (contagens por fonte)
+
+        Returns:
+            Dicionário serializável em JSON
+        """
+        translator = self.auto_translator
+        hits = translator.cache_hits - self._counters["cache_hits"]
+        misses = translator.cache_misses - self._counters["cache_misses"]
+
+        run_stats = run_stats or {}
+        total_keys = run_stats.get("total_keys", 0)
+        override_keys = run_stats.get("sources", {}).get("override", {}).get("keys", 0)
+
+        metrics = {
+            "total_seconds": round(time.perf_counter() - self.started, 4),
+            "stages": {name: round(seconds, 4) for name, seconds in self.stages.items()},
+            "engine_latency": translator.engine_latency.summary(self._latency_start),
+            "cache_hits": hits,
+            "cache_misses": misses,
+            "cache_hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "override_hits": override_keys,
+            "override_hit_rate": round(override_keys / total_keys, 4) if total_keys else 0.0,
+        }
+        for name in RUN_COUNTERS:
+            value = getattr(translator, name) - self._counters[name]
+            metrics[name] = round(value, 4) if isinstance(value, float) else value
+        metrics["prefilter_skips"] = skip_deltas(translator.skipped, self._skipped)
+        return metrics
+
+
+def skip_deltas(current: Dict[str, int], before: Dict[str, int]) -> Dict[str, int]:
+    """
+    Textos ignorados pelo pré-filtro desde um instante, por motivo
+
+    Args:
+        current: Contagens atuais (AutoTranslator.skipped)
+        before: Contagens no início da execução
+
+    Returns:
+        Dicionário motivo → textos únicos (apenas motivos com ocorrências)
+    """
+    deltas = {reason: count - before.get(reason, 0) for reason, count in current.items()}
+    return {reason: count for reason, count in deltas.items() if count}
+
+
+def write_metrics(path: str, metrics: Dict):
+    """
+    Grava o relatório de métricas em JSON (para acompanhamento em CI)
+
+    Args:
+        path: Caminho do arquivo
+        metrics: Métricas da execução
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(metrics, f, ensure_ascii=False, indent=2)
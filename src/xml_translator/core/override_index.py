@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índice compilado de overrides: chaves normalizadas, modelos com placeholders e glossário
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from ..utils.logger import get_logger
+
+
+# Placeholders e especificadores de formato: {0}, {name}, %s, %d, %(name)s, %1$s
+PLACEHOLDER_RE = re.compile(
+    r"\{[^{}\s]*\}|%(?:\(\w+\)|\d+\$)?[-+ #0]*\d*(?:\.\d+)?[sdifuxXeEgGcr]"
+)
+
+# Pontuação removida das bordas ao normalizar ("Settings:" → "settings")
+EDGE_PUNCTUATION = " \t\r\n.:;,!?…\"'()[]*-–—"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_key(text: str) -> str:
+    """
+    Normaliza um texto para busca: minúsculas, espaços colapsados e sem pontuação nas bordas
+
+    Args:
+        text: Texto original
+
+    Returns:
+        Chave normalizada
+    """
+    return _WHITESPACE_RE.sub(" ", text.strip(EDGE_PUNCTUATION)).casefold()
+
+
+def adapt_translation(text: str, source: str, translation: str) -> str:
+    """
+    Reaplica a pontuação das bordas e a caixa do texto à tradução de outro texto equivalente
+
+    Args:
+        text: Texto que está sendo traduzido ("settings:")
+        source: Texto cuja tradução é reaproveitada ("Settings")
+        translation: Tradução de source ("Definições")
+
+    Returns:
+        Tradução ajustada ("definições:")
+    """
+    core = text.strip(EDGE_PUNCTUATION)
+    start = text.find(core)
+    prefix, suffix = text[:start], text[start + len(core):]
+    source_core = source.strip(EDGE_PUNCTUATION)
+    translation = translation.strip(EDGE_PUNCTUATION) if source_core != source else translation
+
+    if core.isupper() and not source_core.isupper():
+        translation = translation.upper()
+    elif core[:1].islower() and source_core[:1].isupper():
+        translation = translation[:1].lower() + translation[1:]
+    elif core[:1].isupper() and source_core[:1].islower():
+        translation = translation[:1].upper() + translation[1:]
+    return prefix + translation + suffix
+
+
+def _lower_same_length(text: str) -> str:
+    """Minúsculas preservando posições (para mapear trechos de volta ao original)"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class _Automaton:
+    """Autômato Aho-Corasick: encontra todos os padrões em uma única passada pelo texto"""
+
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[int]] = [[]]
+        self.patterns: List[str] = []
+
+    def add(self, pattern: str) -> int:
+        """Adiciona um padrão (em minúsculas) e retorna seu índice"""
+        node = 0
+        for char in pattern:
+            following = self.goto[node].get(char)
+            if following is None:
+                following = len(self.goto)
+                self.goto[node][char] = following
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            node = following
+        self.patterns.append(pattern)
+        self.outputs[node].append(len(self.patterns) - 1)
+        return len(self.patterns) - 1
+
+    def build(self):
+        """Calcula os links de falha (busca em largura)"""
+        queue = list(self.goto[0].values())
+        for node in queue:
+            self.fail[node] = 0
+        for node in queue:
+            for char, following in self.goto[node].items():
+                queue.append(following)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[following] = target if target != following else 0
+                self.outputs[following] = (self.outputs[following]
+                                           + self.outputs[self.fail[following]])
+
+    def search(self, text: str) -> List[Tuple[int, int, int]]:
+        """
+        Encontra todas as ocorrências dos padrões
+
+        Args:
+            text: Texto em minúsculas
+
+        Returns:
+            Lista de (início, fim, índice do padrão)
+        """
+        found = []
+        node = 0
+        goto, fail, outputs, patterns = self.goto, self.fail, self.outputs, self.patterns
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in outputs[node]:
+                found.append((position + 1 - len(patterns[index]), position + 1, index))
+        return found
+
+
+class _Template:
+    """Override com placeholders ("Delete {0} items" → "Excluir {0} itens")"""
+
+    __slots__ = ("regex", "tokens", "translation")
+
+    def __init__(self, source: str, translation: str):
+        parts = []
+        self.tokens = []
+        position = 0
+        for match in PLACEHOLDER_RE.finditer(source):
+            parts.append(re.escape(source[position:match.start()]))
+            parts.append("(.+?)")
+            self.tokens.append(match.group())
+            position = match.end()
+        parts.append(re.escape(source[position:]))
+        self.regex = re.compile("".join(parts), re.IGNORECASE | re.DOTALL)
+        self.translation = translation
+
+    def apply(self, text: str) -> Optional[str]:
+        """Preenche a tradução com os valores do texto, se ele seguir o modelo"""
+        match = self.regex.fullmatch(text)
+        if match is None:
+            return None
+        values = {}
+        for token, value in zip(self.tokens, match.groups()):
+            values.setdefault(token, value)
+        return PLACEHOLDER_RE.sub(lambda found: values.get(found.group(), found.group()),
+                                  self.translation)
+
+
+class OverrideIndex:
+    """
+    Índice dos overrides montado uma vez no carregamento
+
+    A busca tenta, em ordem: chave exata, chave normalizada (caixa, espaços e
+    pontuação nas bordas), modelos com placeholders e composição por termos
+    do glossário separados por pontuação ("Save / Cancel"). Modelos e termos
+    são localizados por um único autômato Aho-Corasick, então o custo da busca
+    depende do tamanho do texto e não do número de regras.
+    """
+
+    MATCH_KINDS = ("exact", "normalized", "template", "glossary")
+
+    def __init__(self, overrides: Dict[str, str], glossary: Dict[str, str] = None):
+        """
+        Compila os overrides e o glossário
+
+        Args:
+            overrides: Overrides manuais (texto original → tradução)
+            glossary: Termos adicionais usados apenas na composição por termos
+        """
+        self.exact: Dict[str, str] = {}
+        self.normalized: Dict[str, Tuple[str, str]] = {}
+        self.templates: Dict[int, List[_Template]] = {}
+        self.terms: Dict[int, str] = {}
+        self.matches = dict.fromkeys(self.MATCH_KINDS, 0)
+        self.logger = get_logger(__name__)
+        self._automaton = _Automaton()
+        anchors: Dict[str, int] = {}
+
+        def pattern_index(pattern: str) -> int:
+            if pattern not in anchors:
+                anchors[pattern] = self._automaton.add(pattern)
+            return anchors[pattern]
+
+        # Glossário primeiro: em conflito, os overrides prevalecem
+        entries = [(source, translation, False) for source, translation in (glossary or {}).items()]
+        entries += [(source, translation, True) for source, translation in overrides.items()]
+        for source, translation, is_override in entries:
+            source = source.strip()
+            if not source:
+                continue
+            if is_override:
+                self.exact[source] = translation
+            if PLACEHOLDER_RE.search(source):
+                literals = [part.strip(EDGE_PUNCTUATION).lower()
+                            for part in PLACEHOLDER_RE.split(source)]
+                anchor = max(literals, key=len)
+                if len(anchor) >= 2:
+                    self.templates.setdefault(pattern_index(anchor), []).append(
+                        _Template(source, translation))
+                continue
+            key = normalize_key(source)
+            if key:
+                self.normalized[key] = (source, translation)
+                # Na composição a pontuação vem do texto, não do termo ("Loading..." → "A carregar")
+                if source.strip(EDGE_PUNCTUATION) != source:
+                    translation = translation.strip(EDGE_PUNCTUATION)
+                self.terms[pattern_index(key)] = translation
+        self._automaton.build()
+        self.logger.info(f"Índice de overrides: {len(self.exact)} exatos, "
+                         f"{sum(len(items) for items in self.templates.values())} modelos, "
+                         f"{len(self.terms)} termos")
+
+    def __len__(self) -> int:
+        return len(self.exact)
+
+    def lookup(self, text: str, record: bool = True) -> Optional[Tuple[str, str]]:
+        """
+        Busca a tradução de um texto
+
+        Args:
+            text: Texto original
+            record: Contabilizar a correspondência em matches (False no planejamento)
+
+        Returns:
+            Tupla (tradução, tipo de correspondência) ou None
+        """
+        clean = text.strip()
+        translation = self.exact.get(clean)
+        if translation is not None:
+            return self._hit(translation, "exact", record)
+
+        key = normalize_key(clean)
+        if not key:
+            return None
+        found = self.normalized.get(key)
+        if found is not None:
+            return self._hit(adapt_translation(clean, *found), "normalized", record)
+
+        matches = self._automaton.search(_lower_same_length(clean))
+        for _, _, index in matches:
+            for template in self.templates.get(index, ()):
+                translation = template.apply(clean)
+                if translation is not None:
+                    return self._hit(translation, "template", record)
+
+        translation = self._compose(clean, matches)
+        if translation is not None:
+            return self._hit(translation, "glossary", record)
+        return None
+
+    def _hit(self, translation: str, kind: str, record: bool) -> Tuple[str, str]:
+        if record:
+            self.matches[kind] += 1
+        return translation, kind
+
+    def _compose(self, text: str, matches: List[Tuple[int, int, int]]) -> Optional[str]:
+        """
+        Compõe a tradução a partir de termos separados por pontuação
+
+        Só é aceita quando os termos cobrem todas as palavras do texto e cada
+        par de termos é separado por pontuação (não apenas espaço), para não
+        traduzir frases palavra por palavra.
+        """
+        chosen = []
+        end = 0
+        # Mais à esquerda e, no mesmo início, o mais longo; respeitando limites de palavra
+        for start, stop, index in sorted(matches, key=lambda item: (item[0], item[0] - item[1])):
+            if index not in self.terms or start < end:
+                continue
+            if (start > 0 and _is_word_char(text[start - 1])) or (
+                    stop < len(text) and _is_word_char(text[stop])):
+                continue
+            chosen.append((start, stop, index))
+            end = stop
+        if not chosen:
+            return None
+
+        pieces = []
+        position = 0
+        for number, (start, stop, index) in enumerate(chosen):
+            gap = text[position:start]
+            if any(_is_word_char(char) for char in gap):
+                return None
+            if number and not gap.strip():
+                return None
+            pieces.append(gap)
+            pieces.append(self.terms[index])
+            position = stop
+        tail = text[position:]
+        if any(_is_word_char(char) for char in tail):
+            return None
+        pieces.append(tail)
+        return "".join(pieces)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Armazenamento de overrides: arquivo base JSON e log incremental de alterações (JSONL)
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from ..utils.logger import get_logger
+
+
+class OverrideStore:
+    """
+    Overrides persistidos como arquivo base + log de alterações
+
+    overrides.json continua sendo o arquivo editado pelos linguistas. As
+    alterações feitas pelo programa são acrescentadas ao log
+    (overrides.delta.jsonl, uma linha {"source": ..., "translation": ...} por
+    alteração; translation null remove o override), sem reescrever o mapa
+    inteiro. Quando o log passa de compact_every linhas, ele é incorporado ao
+    arquivo base (gravação atômica) e esvaziado.
+
+    changed() compara apenas mtime e tamanho dos arquivos; refresh() relê o
+    arquivo base somente quando ele mudou e, do log, apenas as linhas novas.
+    """
+
+    def __init__(self, base_file: Path, compact_every: int = 1000):
+        """
+        Args:
+            base_file: Arquivo de overrides (overrides.json, overrides.<cultura>.json)
+            compact_every: Linhas no log antes da compactação automática
+        """
+        self.base_file = Path(base_file)
+        self.delta_file = self.base_file.with_suffix(".delta.jsonl")
+        self.compact_every = compact_every
+        self.logger = get_logger(__name__)
+        self._lock = threading.Lock()
+        self._base_signature = None
+        self._delta_signature = None
+        self._delta_offset = 0
+        self._delta_lines = 0
+
+    @staticmethod
+    def _signature(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def changed(self) -> bool:
+        """Indica se algum dos arquivos mudou desde a última leitura (apenas stat)"""
+        return (self._signature(self.base_file) != self._base_signature
+                or self._signature(self.delta_file) != self._delta_signature)
+
+    def load(self) -> Dict[str, str]:
+        """
+        Lê o arquivo base e aplica o log de alterações
+
+        Returns:
+            Overrides (texto original → tradução)
+        """
+        with self._lock:
+            overrides = self._read_base()
+            self._delta_offset = 0
+            self._delta_lines = 0
+            self._apply_delta(overrides)
+            return overrides
+
+    def refresh(self, overrides: Dict[str, str]) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Atualiza um mapa já carregado com o que mudou nos arquivos
+
+        Args:
+            overrides: Mapa atual (não é modificado)
+
+        Returns:
+            Alterações {texto original: tradução ou None se removido}, ou None
+            se nada mudou
+        """
+        if not self.changed():
+            return None
+        with self._lock:
+            base_signature = self._signature(self.base_file)
+            delta_signature = self._signature(self.delta_file)
+            delta_size = delta_signature[1] if delta_signature else 0
+            if base_signature != self._base_signature or delta_size < self._delta_offset:
+                # Arquivo base editado ou log compactado por outro processo: releitura completa
+                updated = self._read_base()
+                self._delta_offset = 0
+                self._delta_lines = 0
+            else:
+                updated = dict(overrides)
+            self._apply_delta(updated)
+        changes = {source: translation for source, translation in updated.items()
+                   if overrides.get(source) != translation}
+        changes.update(dict.fromkeys(overrides.keys() - updated.keys()))
+        return changes
+
+    def append(self, changes: Dict[str, Optional[str]], overrides: Dict[str, str]):
+        """
+        Acrescenta alterações ao log (compacta quando ele fica grande)
+
+        Args:
+            changes: {texto original: tradução ou None para remover}
+            overrides: Mapa completo já com as alterações (usado na compactação)
+        """
+        lines = "".join(json.dumps({"source": source, "translation": translation},
+                                   ensure_ascii=False) + "\n"
+                        for source, translation in changes.items())
+        with self._lock:
+            self.delta_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.delta_file, "a", encoding="utf-8") as f:
+                f.write(lines)
+            self._delta_lines += len(changes)
+            # As próprias linhas já estão no mapa em memória
+            self._delta_offset = self.delta_file.stat().st_size
+            self._delta_signature = self._signature(self.delta_file)
+            if self._delta_lines >= self.compact_every:
+                self._compact(overrides)
+
+    def compact(self, overrides: Dict[str, str]):
+        """
+        Grava o mapa completo no arquivo base e esvazia o log
+
+        Args:
+            overrides: Mapa completo
+        """
+        with self._lock:
+            self._compact(overrides)
+
+    def _compact(self, overrides: Dict[str, str]):
+        """Gravação atômica do arquivo base (chamado com lock)"""
+        self.base_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.base_file.with_name(self.base_file.name + ".tmp")
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(overrides, f, ensure_ascii=False, indent=2)
+        os.replace(temp_file, self.base_file)
+        # Se o processo parar aqui o log é reaplicado sobre o novo arquivo base,
+        # o que não altera o resultado
+        if self.delta_file.exists():
+            self.delta_file.unlink()
+        if self._delta_lines:
+            self.logger.info(f"Log de overrides compactado em {self.base_file} "
+                             f"({self._delta_lines} alterações)")
+        self._delta_offset = 0
+        self._delta_lines = 0
+        self._base_signature = self._signature(self.base_file)
+        self._delta_signature = None
+
+    def _read_base(self) -> Dict[str, str]:
+        """Lê o arquivo base (chamado com lock)"""
+        self._base_signature = self._signature(self.base_file)
+        if self._base_signature is None:
+            return {}
+        with open(self.base_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _apply_delta(self, overrides: Dict[str, str]):
+        """Aplica as linhas completas do log a partir da última posição lida (chamado com lock)"""
+        self._delta_signature = self._signature(self.delta_file)
+        if self._delta_signature is None:
+            return
+        with open(self.delta_file, "rb") as f:
+            f.seek(self._delta_offset)
+            data = f.read()
+        # Uma linha sem quebra final ainda está sendo gravada: fica para a próxima leitura
+        complete = data[:data.rfind(b"\n") + 1]
+        for number, line in enumerate(complete.decode("utf-8").splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                source, translation = record["source"], record["translation"]
+            except (ValueError, KeyError, TypeError) as e:
+                self.logger.warning(f"Linha inválida ignorada em {self.delta_file}: {e}")
+                continue
+            if translation is None:
+                overrides.pop(source, None)
+            else:
+                overrides[source] = translation
+            self._delta_lines += 1
+        self._delta_offset += len(complete)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Planejamento de execuções: custo estimado no motor sem chamá-lo
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..utils.logger import get_logger
+
+
+# Classificação de cada texto único no plano, na ordem em que são resolvidos
+PLAN_SOURCES = ("override", "cache", "fuzzy", "skipped", "engine")
+
+# Custos somados entre culturas e arquivos (e limitáveis por orçamento)
+COST_KEYS = ("engine_texts", "engine_calls", "engine_chars", "estimated_seconds")
+
+
+def estimate_seconds(calls: int, latency: float, workers: int, rate_limit: float) -> float:
+    """
+    Tempo de parede estimado para as requisições ao motor
+
+    O maior entre o limite de concorrência (rodadas de `workers` requisições
+    com a latência dada) e o limite de taxa (o balde começa cheio, com
+    `workers` fichas).
+
+    Args:
+        calls: Requisições ao motor
+        latency: Duração média de uma requisição (segundos)
+        workers: Requisições simultâneas
+        rate_limit: Requisições por segundo (<= 0 sem limite)
+
+    Returns:
+        Segundos estimados
+    """
+    if not calls:
+        return 0.0
+    workers = max(1, workers)
+    concurrency = math.ceil(calls / workers) * latency
+    rate = max(0, calls - workers) / rate_limit if rate_limit > 0 else 0.0
+    return round(max(concurrency, rate), 3)
+
+
+def recorded_latency(metrics_file: str) -> Optional[float]:
+    """
+    Latência média do motor registrada em um arquivo de métricas (--metrics-file)
+
+    Aceita o relatório de um arquivo e o de um diretório (métricas por arquivo).
+
+    Args:
+        metrics_file: Arquivo de métricas de uma execução anterior
+
+    Returns:
+        Segundos por requisição ou None se o arquivo não tiver medições
+    """
+    try:
+        with open(Path(metrics_file), "r", encoding="utf-8") as f:
+            report = json.load(f)
+    except (OSError, ValueError) as e:
+        get_logger(__name__).debug(f"Métricas anteriores indisponíveis em {metrics_file}: {e}")
+        return None
+
+    sections = [report] + list((report.get("files") or {}).values())
+    count = total_ms = 0
+    for section in sections:
+        latency = section.get("engine_latency") or {}
+        if latency.get("count"):
+            count += latency["count"]
+            total_ms += latency["count"] * latency.get("mean_ms", 0.0)
+    return total_ms / count / 1000 if count else None
+
+
+def expected_latency(auto_translator, metrics_file: str = None) -> Tuple[float, str]:
+    """
+    Latência usada na estimativa e sua procedência
+
+    Em ordem: medições deste processo (serviço aquecido), métricas gravadas
+    por uma execução anterior e a latência típica declarada pelo motor.
+
+    Args:
+        auto_translator: AutoTranslator da execução
+        metrics_file: Arquivo de métricas de uma execução anterior (opcional)
+
+    Returns:
+        Tupla (segundos por requisição, procedência: measured, metrics_file ou engine)
+    """
+    summary = auto_translator.engine_latency.summary()
+    if summary["count"]:
+        return summary["mean_ms"] / 1000, "measured"
+    if metrics_file:
+        latency = recorded_latency(metrics_file)
+        if latency is not None:
+            return latency, "metrics_file"
+    engine = auto_translator.translator
+    return (engine.expected_latency if engine is not None else 0.0), "engine"
+
+
+def sum_costs(plans: List[dict]) -> Dict[str, float]:
+    """Soma os custos (COST_KEYS) de vários planos"""
+    totals = {key: sum(plan.get(key, 0) for plan in plans) for key in COST_KEYS}
+    totals["estimated_seconds"] = round(totals["estimated_seconds"], 3)
+    return totals
+
+
+def budget_overruns(plan: dict, limits: Dict[str, float]) -> List[str]:
+    """
+    Custos do plano acima do orçamento
+
+    Args:
+        plan: Plano (ou totais) com as chaves de COST_KEYS
+        limits: Limites por chave (engine_calls, engine_chars, estimated_seconds)
+
+    Returns:
+        Descrição de cada limite excedido (vazia se o plano cabe no orçamento)
+    """
+    return [f"{key} {plan.get(key, 0)} > {limit}" for key, limit in limits.items()
+            if plan.get(key, 0) > limit]
+
+
+def parts_needed(plan: dict, limits: Dict[str, float]) -> int:
+    """
+    Número de execuções necessárias para o plano caber no orçamento
+
+    Args:
+        plan: Plano com as chaves de COST_KEYS
+        limits: Limites por chave
+
+    Returns:
+        Quantidade de partes (1 se já cabe)
+    """
+    ratios = [math.ceil(plan.get(key, 0) / limit) for key, limit in limits.items() if limit > 0]
+    return max([1] + ratios)
+
+
+def split_by_budget(plans: List[dict], limits: Dict[str, float]) -> List[List[dict]]:
+    """
+    Agrupa planos de arquivos, na ordem, em partes que cabem no orçamento
+
+    Um arquivo que sozinho excede o orçamento forma uma parte própria.
+
+    Args:
+        plans: Planos por arquivo
+        limits: Limites por chave
+
+    Returns:
+        Lista de partes (listas de planos)
+    """
+    parts: List[List[dict]] = []
+    current: List[dict] = []
+    totals = dict.fromkeys(COST_KEYS, 0)
+    for plan in plans:
+        candidate = {key: totals[key] + plan.get(key, 0) for key in COST_KEYS}
+        if current and budget_overruns(candidate, limits):
+            parts.append(current)
+            current = []
+            candidate = {key: plan.get(key, 0) for key in COST_KEYS}
+        current.append(plan)
+        totals = candidate
+    if current:
+        parts.append(current)
+    return parts
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pré-filtro: identifica textos que não devem ir ao motor (URLs, números, códigos...)
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from ..utils.logger import get_logger
+
+
+# Regras na ordem de avaliação: (motivo, expressão aplicada ao texto inteiro)
+DEFAULT_RULES: List[Tuple[str, str]] = [
+    ("url", r"(?:[a-z][a-z0-9+.-]*://|www\.)\S+|mailto:\S+"),
+    ("email", r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"),
+    ("guid", r"\{?[0-9a-fA-F]{8}(?:-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12}\}?|(?:0x)?[0-9a-fA-F]{16,}"),
+    ("number", r"[-+(]?[$€£¥]?\s?\d[\d\s.,:/%'°x×+()-]*[$€£¥%]?"),
+    ("path", r"(?:[A-Za-z]:[\\/]|\\\\)[^<>|\"\r\n]*|(?:~?/|\.{1,2}[\\/])[^\s<>|\"]*"
+             r"|[\w.-]+(?:[\\/][\w.-]+)*\.(?:json|xml|txt|csv|log|ini|cfg|config|ya?ml|dll|exe"
+             r"|js|ts|py|cs|html?|css|png|jpe?g|gif|svg|pdf|zip|xlsx?|docx?|sql|bat|sh)"),
+    ("identifier", r"[a-z]+(?:[A-Z][a-z0-9]*)+"            # camelCase: btnSaveAll
+                   r"|[A-Z][a-z0-9]+(?:[A-Z][a-z0-9]+)+"  # PascalCase: SaveAll
+                   r"|[A-Za-z][A-Za-z0-9]*(?:_[A-Za-z0-9]+)+"  # snake_case / CONST_NAME
+                   r"|[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)+"),   # Namespace.Member
+]
+
+# Perfis do identificador de idioma: palavras frequentes e caracteres exclusivos
+LANGUAGE_PROFILES: Dict[str, Dict] = {
+    "pt": {
+        "words": {"de", "da", "das", "dos", "para", "com", "não", "uma", "um", "os", "ao", "à",
+                  "pelo", "pela", "que", "é", "são", "está", "estão", "você", "seu", "sua",
+                  "este", "esta", "isso", "nenhum", "nenhuma", "ou", "mais", "já", "arquivo",
+                  "salvar", "excluir", "selecione", "deseja", "foi", "ser", "também"},
+        "markers": set("ãõç"),
+    },
+    "es": {
+        "words": {"de", "del", "los", "las", "para", "con", "una", "el", "es", "que", "está",
+                  "están", "usted", "su", "este", "esta", "ninguno", "más", "ya", "archivo",
+                  "guardar", "eliminar", "seleccione", "desea", "fue", "ser", "también"},
+        "markers": set("ñ¿¡"),
+    },
+}
+
+# Palavras frequentes em inglês (evidência contra o idioma de destino)
+ENGLISH_WORDS = {"the", "and", "of", "to", "is", "are", "you", "your", "with", "for", "this",
+                 "not", "be", "on", "in", "at", "by", "from", "all", "an", "or", "it", "was",
+                 "please", "file", "save", "delete", "select", "cannot", "no", "do", "as"}
+
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+
+class PreFilter:
+    """
+    Classificação rápida de textos antes do motor de tradução
+
+    Cada regra é uma expressão pré-compilada aplicada ao texto inteiro
+    (fullmatch): um texto que seja só uma URL, número, caminho, GUID ou
+    identificador de código volta como original sem requisição. O
+    identificador de idioma (opcional) reconhece textos que já estão no
+    idioma de destino por palavras frequentes e caracteres exclusivos.
+
+    Configuração em settings.json:
+        "prefilter": {"disabled": ["identifier"], "language_check": true,
+                      "patterns": {"ticket": "[A-Z]+-\\\\d+"}}
+    """
+
+    def __init__(self, options: Dict = None, target_lang: str = "pt"):
+        """
+        Compila as regras
+
+        Args:
+            options: Configuração "prefilter" (regras desativadas, padrões extras, idioma)
+            target_lang: Idioma de destino (código do motor)
+        """
+        options = options or {}
+        self.logger = get_logger(__name__)
+        disabled = set(options.get("disabled", []))
+        rules = DEFAULT_RULES + list((options.get("patterns") or {}).items())
+        self.rules: List[Tuple[str, re.Pattern]] = []
+        for reason, pattern in rules:
+            if reason in disabled:
+                continue
+            try:
+                self.rules.append((reason, re.compile(pattern)))
+            except re.error as e:
+                self.logger.error(f"Padrão inválido no pré-filtro '{reason}': {e}")
+        self.language_profile = (LANGUAGE_PROFILES.get(target_lang.split("-")[0].lower())
+                                 if options.get("language_check", True)
+                                 and "already_translated" not in disabled else None)
+        self.short_text = "short" not in disabled
+        self.reasons = (["short"] if self.short_text else []) + [
+            reason for reason, _ in self.rules] + (
+            ["already_translated"] if self.language_profile else [])
+
+    def classify(self, text: str) -> Optional[str]:
+        """
+        Indica se o texto deve ficar como original e por quê
+
+        Args:
+            text: Texto original
+
+        Returns:
+            Motivo (short, url, email, guid, number, path, identifier,
+            already_translated ou um padrão extra) ou None para traduzir
+        """
+        clean = text.strip()
+        # Muito curtos ou siglas (OK, ID, USD)
+        if self.short_text and (len(clean) < 2 or (clean.isupper() and len(clean) < 8)):
+            return "short"
+        for reason, regex in self.rules:
+            if regex.fullmatch(clean):
+                return reason
+        if self.language_profile is not None and self.is_target_language(clean):
+            return "already_translated"
+        return None
+
+    def is_target_language(self, text: str) -> bool:
+        """
+        Heurística de idioma: o texto já parece estar no idioma de destino
+
+        Caracteres exclusivos contam 2 pontos, palavras frequentes do destino
+        1 ponto e palavras frequentes do inglês -2; 2 pontos ou mais indicam
+        o idioma de destino.
+        """
+        words = _WORD_RE.findall(text.lower())
+        if not words:
+            return False
+        profile = self.language_profile
+        score = 2 * any(char in profile["markers"] for char in text.lower())
+        for word in words:
+            if word in ENGLISH_WORDS:
+                score -= 2
+            elif word in profile["words"]:
+                score += 1
+        return score >= 2
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Limitador de taxa (token bucket) para requisições ao motor de tradução
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Limitador de taxa thread-safe baseado em token bucket"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Inicializa o limitador
+
+        Args:
+            rate: Tokens repostos por segundo (requisições por segundo; <= 0 desativa)
+            capacity: Máximo de tokens acumulados (rajada permitida)
+        """
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """Repõe tokens proporcionalmente ao tempo decorrido (chamado com lock)"""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Bloqueia até haver tokens disponíveis e os consome
+
+        Args:
+            tokens: Quantidade de tokens necessária
+
+        Returns:
+            Tempo total de espera em segundos
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def penalize(self, seconds: float):
+        """
+        Suspende a emissão de tokens por um período (ex.: após throttling)
+
+        Sem limite de taxa configurado, a pausa é feita no próprio chamador.
+
+        Args:
+            seconds: Duração da pausa em segundos
+        """
+        if self.rate <= 0:
+            time.sleep(seconds)
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pipeline de tradução em streaming (iterparse) para arquivos XML muito grandes
+"""
+
+import contextlib
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .string_unit import StringUnit
+from ..utils.logger import get_logger
+
+
+def local_name(tag: str) -> str:
+    """Remove o namespace ({uri}nome → nome)"""
+    return tag.split('}')[-1] if '}' in tag else tag
+
+
+class _PendingText:
+    """Conteúdo de <string> aguardando tradução dentro do buffer de saída"""
+
+    __slots__ = ("unit", "end_tag", "value")
+
+    def __init__(self, unit: StringUnit, end_tag: Optional[str]):
+        """
+        Args:
+            unit: Chave e texto original
+            end_tag: Tag de fechamento, ou None para o texto antes do primeiro
+                filho (marcação inline), gravado depois da tag já aberta
+        """
+        self.unit = unit
+        self.end_tag = end_tag
+        self.value = None
+
+    def render(self) -> str:
+        """Serializa o conteúdo traduzido como o ElementTree faria"""
+        if self.end_tag is None:
+            return ET._escape_cdata(self.value) if self.value else ""
+        if self.value:
+            return ">" + ET._escape_cdata(self.value) + self.end_tag
+        return " />"
+
+
+class _Frame:
+    """Elemento aberto durante o streaming"""
+
+    __slots__ = ("elem", "opened", "has_children", "last_child", "translatable")
+
+    def __init__(self, elem: ET.Element, translatable: bool):
+        self.elem = elem
+        self.opened = False
+        self.has_children = False
+        self.last_child = None
+        self.translatable = translatable
+
+
+class StreamingTranslator:
+    """
+    Traduz um XML de localização lendo, traduzindo e gravando de forma incremental
+
+    Os elementos são descartados assim que gravados, então o uso de memória
+    depende apenas de `chunk_size` (textos pendentes de tradução), e não do
+    tamanho do arquivo. A saída é idêntica, byte a byte, à gerada pelo
+    caminho baseado em árvore com o backend etree (ElementTree.write) para
+    catálogos com chaves únicas; chaves repetidas recebem cada uma a tradução do próprio texto.
+    """
+
+    def __init__(self, xml_translator, chunk_size: int = 1000, metrics=None):
+        """
+        Inicializa o tradutor em streaming
+
+        Args:
+            xml_translator: XMLTranslator usado para traduzir e contabilizar
+            chunk_size: Quantidade de strings traduzidas por vez
+            metrics: RunMetrics onde acumular o tempo de tradução e de escrita
+        """
+        self.xml_translator = xml_translator
+        self.chunk_size = max(1, chunk_size)
+        self.metrics = metrics
+        self.logger = get_logger(__name__)
+
+    def collect_namespaces(self, input_path: str) -> Dict[str, str]:
+        """
+        Primeira passada: atribui prefixos aos namespaces como o ElementTree
+
+        Args:
+            input_path: Caminho do XML de origem
+
+        Returns:
+            Dicionário URI → prefixo, na ordem de descoberta
+        """
+        namespaces: Dict[str, str] = {}
+
+        def add(name: str):
+            if name[:1] == "{":
+                uri = name[1:].rsplit("}", 1)[0]
+                if uri not in namespaces:
+                    prefix = ET._namespace_map.get(uri) or "ns%d" % len(namespaces)
+                    if prefix != "xml":
+                        namespaces[uri] = prefix
+
+        stack: List[ET.Element] = []
+        for event, elem in ET.iterparse(input_path, events=("start", "end")):
+            if event == "start":
+                add(elem.tag)
+                for key in elem.keys():
+                    add(key)
+                stack.append(elem)
+            else:
+                stack.pop()
+                if stack:
+                    # Descartar elementos já vistos para manter a memória constante
+                    stack[-1].remove(elem)
+        return namespaces
+
+    def translate_file(self, input_path: str, output_path: str) -> int:
+        """
+        Traduz o arquivo em streaming
+
+        Args:
+            input_path: Caminho do XML de origem
+            output_path: Caminho do XML de saída
+
+        Returns:
+            Número de strings traduzidas
+        """
+        namespaces = self.collect_namespaces(input_path)
+        qnames: Dict[str, str] = {}
+
+        def qname(name: str) -> str:
+            if name not in qnames:
+                if name[:1] == "{":
+                    uri, local = name[1:].rsplit("}", 1)
+                    prefix = namespaces.get(uri)
+                    qnames[name] = f"{prefix}:{local}" if prefix else local
+                else:
+                    qnames[name] = name
+            return qnames[name]
+
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.counters = self.xml_translator.new_counters()
+        self.processed = 0
+        self.buffer: List = []
+        self.pending: List[_PendingText] = []
+
+        with open(output_path, "w", encoding="utf-8", errors="xmlcharrefreplace") as out:
+            self.out = out
+            out.write("<?xml version='1.0' encoding='utf-8'?>\n")
+            self._stream(input_path, namespaces, qname)
+            self._flush()
+
+        self.xml_translator.finish_run(self.counters, self.processed)
+        return self.processed
+
+    def _stream(self, input_path: str, namespaces: Dict[str, str], qname):
+        """Segunda passada: percorre eventos e grava a saída incrementalmente"""
+        stack: List[_Frame] = []
+        write = self.buffer.append
+
+        for event, elem in ET.iterparse(input_path, events=("start", "end")):
+            if event == "start":
+                if stack:
+                    parent = stack[-1]
+                    self._open_content(parent)
+                    if not parent.has_children:
+                        parent.has_children = True
+                        text = parent.elem.text
+                        if (len(stack) > 1 and parent.translatable
+                                and local_name(parent.elem.tag) == "string"
+                                and text and text.strip()):
+                            # <string> com marcação inline: como extract_strings, o texto
+                            # antes do primeiro filho é traduzido e os filhos mantidos
+                            self._add_pending(StringUnit(parent.elem.get('key'), text), None)
+                        elif text:
+                            write(ET._escape_cdata(text))
+                    else:
+                        self._close_previous(parent)
+                    # Mesmo critério de extract_strings: apenas group/localization abaixo da raiz
+                    translatable = parent.translatable and (
+                        len(stack) == 1 or local_name(parent.elem.tag) in ("group", "localization")
+                    )
+                else:
+                    translatable = True
+                    # Alterar cultura para a de destino
+                    if elem.get('culture'):
+                        culture = self.xml_translator.target_culture
+                        elem.set('culture', culture)
+                        self.logger.info(f"Cultura alterada para {culture}")
+
+                write("<" + qname(elem.tag))
+                if not stack and namespaces:
+                    for uri, prefix in sorted(namespaces.items(), key=lambda x: x[1]):
+                        write(' xmlns%s="%s"' % (":" + prefix if prefix else "",
+                                                 ET._escape_attrib(uri)))
+                for key, value in elem.items():
+                    write(' %s="%s"' % (qname(key), ET._escape_attrib(value)))
+                stack.append(_Frame(elem, translatable))
+                continue
+
+            frame = stack.pop()
+            end_tag = "</" + qname(elem.tag) + ">"
+            if frame.has_children:
+                # Tag já aberta: falta o tail do último filho
+                self._close_previous(frame)
+                write(end_tag)
+            else:
+                text = elem.text
+                if (stack and frame.translatable and local_name(elem.tag) == "string"
+                        and text and text.strip()):
+                    self._add_pending(StringUnit(elem.get('key'), text), end_tag)
+                elif text:
+                    write(">" + ET._escape_cdata(text) + end_tag)
+                else:
+                    write(" />")
+
+            if stack:
+                stack[-1].last_child = elem
+            elif elem.tail:
+                write(ET._escape_cdata(elem.tail))
+
+            if len(self.pending) >= self.chunk_size or len(self.buffer) >= self.chunk_size * 16:
+                self._flush()
+
+    def _add_pending(self, unit: StringUnit, end_tag: Optional[str]):
+        """Reserva no buffer o lugar do texto que aguarda tradução"""
+        pending = _PendingText(unit, end_tag)
+        self.pending.append(pending)
+        self.buffer.append(pending)
+
+    def _open_content(self, frame: _Frame):
+        """Fecha a tag de abertura do elemento ('>') antes do primeiro filho"""
+        if not frame.opened:
+            self.buffer.append(">")
+            frame.opened = True
+
+    def _close_previous(self, frame: _Frame):
+        """Grava o tail do último filho fechado e o descarta da memória"""
+        previous = frame.last_child
+        if previous is None:
+            return
+        if previous.tail:
+            self.buffer.append(ET._escape_cdata(previous.tail))
+        frame.elem.remove(previous)
+        frame.last_child = None
+
+    def _stage(self, name: str):
+        """Mede uma etapa quando há métricas associadas"""
+        return self.metrics.stage(name) if self.metrics else contextlib.nullcontext()
+
+    def _flush(self):
+        """Traduz os textos pendentes e grava o buffer de saída"""
+        with self._stage("process_translations"):
+            self._translate_pending()
+        with self._stage("save_xml"):
+            self.out.write("".join(
+                piece if isinstance(piece, str) else piece.render() for piece in self.buffer
+            ))
+        self.buffer.clear()
+
+    def _translate_pending(self):
+        """Traduz os textos pendentes do buffer"""
+        if self.pending:
+            strings = [pending.unit for pending in self.pending]
+            groups = self.xml_translator.group_strings(strings)
+            results = self.xml_translator.translate_groups(groups, self.counters)
+            normalize = self.xml_translator.normalize_text
+            for pending in self.pending:
+                text = pending.unit.text
+                translation, source = results[normalize(text)]
+                pending.value = text if source == "original" else translation
+            self.processed += len(self.pending)
+            self.pending = []
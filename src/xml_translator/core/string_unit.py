@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registro compacto de uma string extraída do XML
+"""
+
+from typing import Dict, Iterator, List, Tuple
+
+
+class StringUnit:
+    """
+    String a traduzir: chave, texto e caminho do grupo
+
+    Usa __slots__ (sem dicionário por instância) e compartilha referências:
+    a chave e o texto são os próprios objetos da árvore XML e o caminho é
+    o mesmo objeto para todas as strings de um grupo. Em catálogos de
+    milhões de strings isso reduz a memória a uma fração da de um dict
+    por string. Aceita também acesso por índice (unit['text']) para
+    compatibilidade com código que tratava as strings como dicionários.
+    """
+
+    __slots__ = ("key", "text", "path")
+
+    def __init__(self, key: str, text: str, path: str = ""):
+        self.key = key
+        self.text = text
+        self.path = path
+
+    def __getitem__(self, name: str) -> str:
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, StringUnit):
+            return NotImplemented
+        return (self.key, self.text, self.path) == (other.key, other.text, other.path)
+
+    def __repr__(self) -> str:
+        return f"StringUnit(key={self.key!r}, text={self.text!r}, path={self.path!r})"
+
+    @classmethod
+    def coerce(cls, item) -> "StringUnit":
+        """Converte um dicionário {'key', 'text', 'path'} (formato anterior) em StringUnit"""
+        if isinstance(item, cls):
+            return item
+        return cls(item['key'], item['text'], item.get('path', ""))
+
+    def as_dict(self) -> Dict[str, str]:
+        """Representação em dicionário (relatórios e JSON)"""
+        return {"key": self.key, "text": self.text, "path": self.path}
+
+
+class StringGroups:
+    """
+    Strings agrupadas por texto normalizado
+
+    Guarda por texto apenas o primeiro registro (representante) e a
+    quantidade de chaves, em vez de uma lista por texto; a replicação das
+    traduções para as chaves percorre a lista original de strings.
+    """
+
+    __slots__ = ("representatives", "counts")
+
+    def __init__(self):
+        self.representatives: Dict[str, StringUnit] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, normalized: str, unit: StringUnit):
+        """Adiciona uma string ao grupo do seu texto normalizado"""
+        count = self.counts.get(normalized)
+        if count is None:
+            self.representatives[normalized] = unit
+            self.counts[normalized] = 1
+        else:
+            self.counts[normalized] = count + 1
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.counts)
+
+    def items(self) -> Iterator[Tuple[str, StringUnit, int]]:
+        """Tuplas (texto normalizado, representante, quantidade de chaves)"""
+        representatives = self.representatives
+        for normalized, count in self.counts.items():
+            yield normalized, representatives[normalized], count
+
+    def keys(self) -> List[str]:
+        return list(self.counts)
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Importação e exportação de memórias de tradução (TMX e XLIFF) em streaming
+"""
+
+import functools
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from .masking import SENTINEL_RE, mask, mask_like
+from .streaming import local_name
+from ..utils.logger import get_logger
+
+
+# Extensões reconhecidas por formato
+TM_FORMATS = {".tmx": "tmx", ".xlf": "xliff", ".xliff": "xliff"}
+
+# Lados de uma memória de tradução no projeto
+TM_STORES = ("cache", "overrides")
+
+XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+
+# Elementos que fecham uma unidade (removidos do pai após lidos: memória constante)
+UNIT_TAGS = {"tu", "trans-unit", "unit"}
+
+# Estados XLIFF sem tradução utilizável
+UNTRANSLATED_STATES = {"new", "initial", "needs-translation"}
+
+
+def tm_format(path: str) -> str:
+    """
+    Formato de um arquivo de memória de tradução pela extensão
+
+    Args:
+        path: Arquivo .tmx, .xlf ou .xliff
+
+    Returns:
+        "tmx" ou "xliff"
+
+    Raises:
+        ValueError: Extensão desconhecida
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix not in TM_FORMATS:
+        raise ValueError(f"Formato de memória de tradução desconhecido: '{path}' "
+                         f"(use {', '.join(sorted(TM_FORMATS))})")
+    return TM_FORMATS[suffix]
+
+
+def language_score(tag: Optional[str], wanted: Sequence[str]) -> int:
+    """
+    Quanto uma etiqueta de idioma corresponde às desejadas
+
+    Args:
+        tag: Etiqueta do arquivo (pt-BR, pt_br, PT...)
+        wanted: Etiquetas aceitas (cultura e idioma do motor)
+
+    Returns:
+        2 para igualdade, 1 para o mesmo idioma principal (pt-PT e pt-BR), 0 caso contrário
+    """
+    if not tag:
+        return 0
+    tag = tag.lower().replace("_", "-")
+    score = 0
+    for candidate in wanted:
+        candidate = candidate.lower().replace("_", "-")
+        if tag == candidate:
+            return 2
+        if tag.split("-")[0] == candidate.split("-")[0]:
+            score = 1
+    return score
+
+
+def segment_text(elem: ET.Element) -> str:
+    """
+    Texto de um segmento com marcação inline
+
+    O conteúdo de códigos inline (<ph>{0}</ph>, <bpt>&lt;b&gt;</bpt>) é o
+    texto original e é mantido. Códigos vazios (<x/>, <ph/> do XLIFF 2) usam
+    equiv-text, equiv ou disp.
+    """
+    parts = [elem.text or ""]
+    for child in elem:
+        if child.text or len(child):
+            parts.append(segment_text(child))
+        else:
+            parts.append(child.get("equiv-text") or child.get("equiv") or child.get("disp") or "")
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+def iter_segments(path: str, source_langs: Sequence[str], target_langs: Sequence[str],
+                  stats: Dict[str, int] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Lê os pares (original, tradução) de um TMX ou XLIFF (1.2 e 2.x) sob demanda
+
+    O arquivo é lido com iterparse e cada unidade é descartada depois de
+    lida, então a memória não cresce com o tamanho do arquivo.
+
+    Args:
+        path: Arquivo TMX ou XLIFF
+        source_langs: Etiquetas aceitas para o original (ex.: ["en"])
+        target_langs: Etiquetas aceitas para a tradução (ex.: ["pt-BR", "pt"])
+        stats: Contadores atualizados no lugar (segments, skipped_language, untranslated)
+
+    Yields:
+        Pares (texto original, tradução)
+    """
+    stats = stats if stats is not None else {}
+    for key in ("segments", "skipped_language", "untranslated"):
+        stats.setdefault(key, 0)
+    read_unit = _read_tmx_unit if tm_format(path) == "tmx" else _read_xliff_unit
+
+    # Poucas etiquetas distintas por arquivo: a comparação é feita uma vez por etiqueta
+    @functools.lru_cache(maxsize=None)
+    def scores(lang: Optional[str]) -> Tuple[int, int]:
+        return language_score(lang, source_langs), language_score(lang, target_langs)
+
+    # Idiomas declarados pelo XLIFF (xliff no 2.x, file no 1.2)
+    languages = {"source": None, "target": None}
+    stack = []
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            # <xliff> e <file> são sempre os dois primeiros níveis
+            if len(stack) > 2:
+                continue
+            name = local_name(elem.tag)
+            if name == "xliff" and elem.get("srcLang"):
+                languages.update(source=elem.get("srcLang"), target=elem.get("trgLang"))
+            elif name == "file" and elem.get("source-language"):
+                languages.update(source=elem.get("source-language"),
+                                 target=elem.get("target-language"))
+            continue
+
+        stack.pop()
+        name = local_name(elem.tag)
+        if name in ("tu", "trans-unit", "segment"):
+            stats["segments"] += 1
+            pair = read_unit(elem, scores, languages, stats)
+            if pair is not None:
+                yield pair
+        if name in UNIT_TAGS and stack:
+            stack[-1].remove(elem)
+
+
+def _read_tmx_unit(tu: ET.Element, scores, languages, stats) -> Optional[Tuple[str, str]]:
+    """Par (original, tradução) de um <tu>, escolhendo a variante de idioma mais próxima"""
+    source_score = target_score = 0
+    source = target = None
+    for tuv in tu:
+        if local_name(tuv.tag) != "tuv":
+            continue
+        seg = next((child for child in tuv if local_name(child.tag) == "seg"), None)
+        if seg is None:
+            continue
+        source_match, target_match = scores(tuv.get(XML_LANG) or tuv.get("lang"))
+        if source_match > source_score:
+            source_score, source = source_match, seg
+        if target_match > target_score:
+            target_score, target = target_match, seg
+    if source is None or target is None:
+        stats["skipped_language"] += 1
+        return None
+    source, target = segment_text(source).strip(), segment_text(target).strip()
+    if not source or not target:
+        stats["untranslated"] += 1
+        return None
+    return source, target
+
+
+def _read_xliff_unit(unit: ET.Element, scores, languages, stats) -> Optional[Tuple[str, str]]:
+    """Par (original, tradução) de um <trans-unit> (1.2) ou <segment> (2.x)"""
+    # Sem idiomas declarados o arquivo é aceito
+    if languages["source"] and not scores(languages["source"])[0] \
+            or languages["target"] and not scores(languages["target"])[1]:
+        stats["skipped_language"] += 1
+        return None
+    children = {local_name(child.tag): child for child in unit}
+    source, target = children.get("source"), children.get("target")
+    state = (target.get("state") if target is not None else None) or unit.get("state")
+    if source is None or target is None or state in UNTRANSLATED_STATES:
+        stats["untranslated"] += 1
+        return None
+    source_text, target_text = segment_text(source).strip(), segment_text(target).strip()
+    if not source_text or not target_text:
+        stats["untranslated"] += 1
+        return None
+    return source_text, target_text
+
+
+def _markup(text: str, code: str) -> str:
+    """
+    Escapa o texto e grava sentinelas da memória de tradução como código inline
+
+    A sentinela interna (⟦0⟧) não sai do projeto: cada uma vira o
+    placeholder numerado {0} dentro de <ph>, que ferramentas CAT tratam como
+    código e que mask() transforma de volta na mesma sentinela ao importar.
+    """
+    return SENTINEL_RE.sub(lambda match: f'<ph {code}="{match.group(1)}">'
+                                         f'{{{match.group(1)}}}</ph>',
+                           escape(text))
+
+
+def write_segments(path: str, pairs: Iterable[Tuple[str, str]], source_lang: str,
+                   target_lang: str) -> int:
+    """
+    Grava pares (original, tradução) em TMX 1.4 ou XLIFF 1.2, um por vez
+
+    Args:
+        path: Arquivo de saída (.tmx, .xlf ou .xliff)
+        pairs: Pares (texto original, tradução)
+        source_lang: Idioma do original
+        target_lang: Idioma (cultura) da tradução
+
+    Returns:
+        Número de pares gravados
+    """
+    fmt = tm_format(path)
+    count = 0
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        if fmt == "tmx":
+            f.write(f'<tmx version="1.4">\n  <header creationtool="xml-translator" '
+                    f'creationtoolversion="1" segtype="sentence" o-tmf="xml-translator" '
+                    f'adminlang="en" srclang={quoteattr(source_lang)} datatype="plaintext"/>\n'
+                    f'  <body>\n')
+            for source, target in pairs:
+                count += 1
+                f.write(f'    <tu>\n'
+                        f'      <tuv xml:lang={quoteattr(source_lang)}><seg>{_markup(source, "x")}'
+                        f'</seg></tuv>\n'
+                        f'      <tuv xml:lang={quoteattr(target_lang)}><seg>{_markup(target, "x")}'
+                        f'</seg></tuv>\n'
+                        f'    </tu>\n')
+            f.write('  </body>\n</tmx>\n')
+        else:
+            f.write(f'<xliff version="1.2" xmlns="urn:oasis:names:tc:xliff:document:1.2">\n'
+                    f'  <file original="xml-translator" datatype="plaintext" '
+                    f'source-language={quoteattr(source_lang)} '
+                    f'target-language={quoteattr(target_lang)}>\n    <body>\n')
+            for source, target in pairs:
+                count += 1
+                f.write(f'      <trans-unit id="{count}">\n'
+                        f'        <source>{_markup(source, "id")}</source>\n'
+                        f'        <target state="translated">{_markup(target, "id")}</target>\n'
+                        f'      </trans-unit>\n')
+            f.write('    </body>\n  </file>\n</xliff>\n')
+    return count
+
+
+def _cache_rows(pairs: Iterable[Tuple[str, str]],
+                stats: Dict[str, int]) -> Iterator[Tuple[str, str]]:
+    """Converte pares para as chaves da memória de tradução (textos mascarados)"""
+    for source, target in pairs:
+        masked = mask(source)
+        translation = mask_like(masked, target)
+        if translation is None:
+            stats["mismatched"] += 1
+            continue
+        yield masked.text, translation
+
+
+def import_memory(auto_translator, path: str, store: str = "cache",
+                  batch_size: int = 5000) -> dict:
+    """
+    Importa um TMX ou XLIFF para a memória de tradução ou os overrides
+
+    Na memória de tradução (padrão) os pares entram no espaço do motor
+    configurado, chaveados pelo texto mascarado, em transações de batch_size
+    linhas e com memória constante. Em overrides o mapa é gravado uma única
+    vez, ao final (overrides são mantidos inteiros em memória).
+
+    Args:
+        auto_translator: AutoTranslator da cultura de destino
+        path: Arquivo TMX ou XLIFF
+        store: "cache" ou "overrides"
+        batch_size: Linhas por transação na memória de tradução
+
+    Returns:
+        Estatísticas (segments, imported, skipped_language, untranslated,
+        mismatched, seconds, segments_per_second)
+    """
+    if store not in TM_STORES:
+        raise ValueError(f"Destino desconhecido: {store} (use {', '.join(TM_STORES)})")
+    stats = {"mismatched": 0}
+    started = time.perf_counter()
+    pairs = iter_segments(path, [auto_translator.source_lang],
+                          [auto_translator.target_culture, auto_translator.target_lang], stats)
+
+    if store == "overrides":
+        imported = auto_translator.import_overrides(pairs)
+    elif auto_translator.cache is None:
+        raise ValueError("Memória de tradução desativada (--no-cache)")
+    else:
+        imported = auto_translator.cache.put_many(
+            _cache_rows(pairs, stats), auto_translator.source_lang, auto_translator.target_lang,
+            auto_translator.engine_name, batch_size)
+
+    seconds = time.perf_counter() - started
+    stats.update(imported=imported, seconds=round(seconds, 4),
+                 segments_per_second=round(stats["segments"] / seconds, 1) if seconds else 0.0)
+    get_logger(__name__).info(f"Memória importada de {path} para {store}: {stats}")
+    return stats
+
+
+def export_memory(auto_translator, path: str, store: str = "cache") -> dict:
+    """
+    Exporta a memória de tradução ou os overrides para TMX ou XLIFF
+
+    Placeholders e marcação da memória de tradução (sentinelas ⟦0⟧) são
+    gravados como <ph>{0}</ph>; importar o arquivo de volta recupera as
+    mesmas chaves.
+
+    Args:
+        auto_translator: AutoTranslator da cultura de origem dos dados
+        path: Arquivo de saída (.tmx, .xlf ou .xliff)
+        store: "cache" ou "overrides"
+
+    Returns:
+        Estatísticas (exported, seconds, segments_per_second)
+    """
+    if store not in TM_STORES:
+        raise ValueError(f"Origem desconhecida: {store} (use {', '.join(TM_STORES)})")
+    started = time.perf_counter()
+    if store == "overrides":
+        pairs = list(auto_translator.overrides.items())
+    elif auto_translator.cache is None:
+        raise ValueError("Memória de tradução desativada (--no-cache)")
+    else:
+        pairs = auto_translator.cache.iter_entries(auto_translator.source_lang,
+                                                   auto_translator.target_lang,
+                                                   auto_translator.engine_name)
+    exported = write_segments(path, pairs, auto_translator.source_lang,
+                              auto_translator.target_culture)
+    seconds = time.perf_counter() - started
+    stats = {"exported": exported, "seconds": round(seconds, 4),
+             "segments_per_second": round(exported / seconds, 1) if seconds else 0.0}
+    get_logger(__name__).info(f"Memória exportada de {store} para {path}: {stats}")
+    return stats
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Memória de tradução persistente (cache em disco baseado em SQLite)
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from ..utils.logger import get_logger
+
+
+class TranslationCache:
+    """Cache persistente de traduções chaveado por (texto, origem, destino, motor)"""
+
+    # Espera máxima por outro processo que esteja gravando no mesmo arquivo (segundos)
+    BUSY_TIMEOUT = 30
+
+    # Gravações entre recontagens das respostas do motor no arquivo (inclui as de
+    # outros processos); nas demais o limite usa a contagem mantida em memória
+    RECOUNT_EVERY = 100
+
+    def __init__(self, db_path: str, max_entries: int = 200000, commit_every: int = 500):
+        """
+        Inicializa o cache de traduções
+
+        Args:
+            db_path: Caminho do arquivo SQLite
+            max_entries: Número máximo de respostas do motor antes da remoção das menos
+                usadas (segmentos importados não contam)
+            commit_every: Quantidade de escritas acumuladas em memória antes de gravar
+        """
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.commit_every = commit_every
+        self.hits = 0
+        self.misses = 0
+        self.logger = get_logger(__name__)
+        self._conn = None
+        # Escritas acumuladas em memória e gravadas em uma única transação curta,
+        # para que vários processos possam compartilhar o mesmo arquivo
+        self._pending_puts = {}
+        self._pending_touches = {}
+        self._lock = threading.Lock()
+        # Linhas não aprovadas no arquivo (None = contar de novo) e gravações desde a contagem
+        self._unapproved = None
+        self._commits_since_count = 0
+
+    def _connect(self, create: bool = True) -> Optional[sqlite3.Connection]:
+        """Abre a conexão sob demanda (não cria o arquivo apenas para leitura)"""
+        if self._conn is not None:
+            return self._conn
+        if not create and not self.db_path.exists():
+            return None
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # timeout: o arquivo pode ser compartilhado por vários processos
+        conn = sqlite3.connect(str(self.db_path), timeout=self.BUSY_TIMEOUT,
+                               check_same_thread=False)
+        self._enable_wal(conn)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " source_text TEXT NOT NULL,"
+            " src TEXT NOT NULL,"
+            " dest TEXT NOT NULL,"
+            " engine TEXT NOT NULL,"
+            " translation TEXT NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " approved INTEGER NOT NULL DEFAULT 0,"
+            " PRIMARY KEY (source_text, src, dest, engine))"
+        )
+        # Arquivos criados antes da importação de memórias não têm a coluna approved
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(translations)")}
+        if "approved" not in columns:
+            conn.execute("ALTER TABLE translations ADD COLUMN approved INTEGER NOT NULL DEFAULT 0")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations(last_used)"
+        )
+        conn.commit()
+        self._conn = conn
+        return conn
+
+    def _enable_wal(self, conn: sqlite3.Connection):
+        """
+        Ativa o modo WAL, esperando outros processos que estejam criando o arquivo
+
+        A troca de modo exige bloqueio exclusivo e o SQLite não aplica o
+        timeout da conexão a ela: dois processos abrindo um cache novo ao
+        mesmo tempo recebiam "database is locked" imediatamente.
+        """
+        deadline = time.monotonic() + self.BUSY_TIMEOUT
+        delay = 0.01
+        while True:
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                return
+            except sqlite3.OperationalError:
+                if time.monotonic() >= deadline:
+                    conn.close()
+                    raise
+                time.sleep(delay)
+                delay = min(delay * 2, 0.5)
+
+    def get(self, text: str, src: str, dest: str, engine: str) -> Optional[str]:
+        """
+        Busca uma tradução no cache
+
+        Args:
+            text: Texto original
+            src: Idioma de origem
+            dest: Idioma de destino
+            engine: Nome do motor de tradução
+
+        Returns:
+            Tradução armazenada ou None se não existir
+        """
+        key = (text, src, dest, engine)
+        with self._lock:
+            pending = self._pending_puts.get(key)
+            if pending is not None:
+                self.hits += 1
+                return pending[0]
+
+            conn = self._connect(create=False)
+            row = None
+            if conn is not None:
+                row = conn.execute(
+                    "SELECT translation FROM translations"
+                    " WHERE source_text = ? AND src = ? AND dest = ? AND engine = ?",
+                    key,
+                ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._pending_touches[key] = time.time()
+            self._register_write()
+            return row[0]
+
+    def peek(self, text: str, src: str, dest: str, engine: str) -> Optional[str]:
+        """
+        Busca uma tradução sem contabilizar acerto nem atualizar o uso (planejamento)
+
+        Args:
+            text: Texto original
+            src: Idioma de origem
+            dest: Idioma de destino
+            engine: Nome do motor de tradução
+
+        Returns:
+            Tradução armazenada ou None se não existir
+        """
+        key = (text, src, dest, engine)
+        with self._lock:
+            pending = self._pending_puts.get(key)
+            if pending is not None:
+                return pending[0]
+            conn = self._connect(create=False)
+            if conn is None:
+                return None
+            row = conn.execute(
+                "SELECT translation FROM translations"
+                " WHERE source_text = ? AND src = ? AND dest = ? AND engine = ?",
+                key,
+            ).fetchone()
+            return row[0] if row is not None else None
+
+    def put(self, text: str, src: str, dest: str, engine: str, translation: str):
+        """
+        Armazena uma tradução no cache
+
+        Args:
+            text: Texto original
+            src: Idioma de origem
+            dest: Idioma de destino
+            engine: Nome do motor de tradução
+            translation: Texto traduzido
+        """
+        with self._lock:
+            self._pending_puts[(text, src, dest, engine)] = (translation, time.time())
+            self._register_write()
+
+    def invalidate(
+        self,
+        text: str = None,
+        src: str = None,
+        dest: str = None,
+        engine: str = None,
+    ) -> int:
+        """
+        Remove entradas do cache (sem filtros remove tudo)
+
+        Args:
+            text: Texto original a remover
+            src: Idioma de origem
+            dest: Idioma de destino
+            engine: Nome do motor de tradução
+
+        Returns:
+            Número de entradas removidas
+        """
+        filters = {"source_text": text, "src": src, "dest": dest, "engine": engine}
+        clauses = [f"{column} = ?" for column, value in filters.items() if value is not None]
+        params = [value for value in filters.values() if value is not None]
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            self._commit()
+            conn = self._connect(create=False)
+            if conn is None:
+                return 0
+            removed = conn.execute(f"DELETE FROM translations{where}", params).rowcount
+            conn.commit()
+            self._unapproved = None
+
+        self.logger.info(f"Cache de traduções: {removed} entradas invalidadas")
+        return removed
+
+    def invalidate_texts(self, texts, dest: str = None) -> int:
+        """
+        Remove as entradas de vários textos em uma única transação
+
+        Args:
+            texts: Textos originais
+            dest: Idioma de destino (None = todos)
+
+        Returns:
+            Número de entradas removidas
+        """
+        texts = list(dict.fromkeys(texts))
+        where = "source_text = ?" + (" AND dest = ?" if dest is not None else "")
+        params = [(text, dest) if dest is not None else (text,) for text in texts]
+
+        wanted = set(texts)
+        with self._lock:
+            for key in [key for key in self._pending_puts
+                        if key[0] in wanted and (dest is None or key[2] == dest)]:
+                del self._pending_puts[key]
+            conn = self._connect(create=False)
+            if conn is None or not texts:
+                return 0
+            with conn:
+                before = conn.total_changes
+                conn.executemany(f"DELETE FROM translations WHERE {where}", params)
+                removed = conn.total_changes - before
+            self._unapproved = None
+
+        if removed:
+            self.logger.info(f"Cache de traduções: {removed} entradas invalidadas")
+        return removed
+
+    def entries(self, src: str, dest: str, engine: str) -> List[Tuple[str, str]]:
+        """
+        Lista as traduções de um par de idiomas e motor (incluindo escritas pendentes)
+
+        Args:
+            src: Idioma de origem
+            dest: Idioma de destino
+            engine: Nome do motor de tradução
+
+        Returns:
+            Pares (texto original, tradução)
+        """
+        with self._lock:
+            self._commit()
+            conn = self._connect(create=False)
+            if conn is None:
+                return []
+            return conn.execute(
+                "SELECT source_text, translation FROM translations"
+                " WHERE src = ? AND dest = ? AND engine = ?",
+                (src, dest, engine),
+            ).fetchall()
+
+    def iter_entries(self, src: str, dest: str, engine: str,
+                     batch_size: int = 1000) -> Iterator[Tuple[str, str]]:
+        """
+        Percorre as traduções de um par de idiomas e motor em blocos (exportação)
+
+        Usa uma conexão própria, então a tabela não é carregada inteira em
+        memória nem o lock do cache fica preso durante a iteração.
+
+        Args:
+            src: Idioma de origem
+            dest: Idioma de destino
+            engine: Nome do motor de tradução
+            batch_size: Linhas lidas por vez
+
+        Yields:
+            Pares (texto original, tradução)
+        """
+        self.flush()
+        if not self.db_path.exists():
+            return
+        conn = sqlite3.connect(str(self.db_path), timeout=self.BUSY_TIMEOUT)
+        try:
+            cursor = conn.execute(
+                "SELECT source_text, translation FROM translations"
+                " WHERE src = ? AND dest = ? AND engine = ?",
+                (src, dest, engine),
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+
+    def put_many(self, pairs: Iterable[Tuple[str, str]], src: str, dest: str, engine: str,
+                 batch_size: int = 5000) -> int:
+        """
+        Grava muitas traduções em transações de batch_size linhas (importação)
+
+        Os pares são consumidos sob demanda: um iterador de um arquivo grande
+        não é carregado inteiro em memória. As linhas são gravadas como
+        aprovadas: não contam para max_entries nem são removidas pelo limite,
+        que vale apenas para as respostas do motor.
+
+        Args:
+            pairs: Pares (texto original, tradução)
+            src: Idioma de origem
+            dest: Idioma de destino
+            engine: Nome do motor de tradução
+            batch_size: Linhas por transação
+
+        Returns:
+            Número de linhas gravadas
+        """
+        written = 0
+        batch = []
+        for text, translation in pairs:
+            batch.append((text, src, dest, engine, translation, time.time(), 1))
+            if len(batch) >= batch_size:
+                written += self._insert_batch(batch)
+                batch = []
+        if batch:
+            written += self._insert_batch(batch)
+
+        return written
+
+    def _insert_batch(self, rows: List[tuple]) -> int:
+        """Grava um bloco de linhas em uma transação"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO translations"
+                    " (source_text, src, dest, engine, translation, last_used, approved)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            # Uma escrita pendente antiga não deve sobrescrever a importada
+            for row in rows:
+                self._pending_puts.pop(row[:4], None)
+            # Linhas do motor substituídas por aprovadas saem da contagem
+            self._unapproved = None
+        return len(rows)
+
+    def _register_write(self):
+        """Grava as escritas acumuladas quando atingem o limite (chamado com lock)"""
+        if len(self._pending_puts) + len(self._pending_touches) >= self.commit_every:
+            self._commit()
+
+    def _commit(self):
+        """Grava escritas pendentes em uma transação e aplica o limite de tamanho (com lock)"""
+        if not self._pending_puts and not self._pending_touches:
+            return
+        conn = self._connect()
+        with conn:
+            if self._unapproved is not None:
+                # Chaves novas aumentam a contagem; as existentes são apenas atualizadas
+                self._unapproved += sum(
+                    conn.execute(
+                        "SELECT 1 FROM translations"
+                        " WHERE source_text = ? AND src = ? AND dest = ? AND engine = ?",
+                        key,
+                    ).fetchone() is None
+                    for key in self._pending_puts
+                )
+            # Atualiza no lugar: REPLACE recriaria a linha e um segmento importado
+            # perderia approved, voltando a ser removível pelo limite
+            conn.executemany(
+                "INSERT INTO translations"
+                " (source_text, src, dest, engine, translation, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (source_text, src, dest, engine) DO UPDATE"
+                " SET translation = excluded.translation, last_used = excluded.last_used",
+                [key + value for key, value in self._pending_puts.items()],
+            )
+            conn.executemany(
+                "UPDATE translations SET last_used = ?"
+                " WHERE source_text = ? AND src = ? AND dest = ? AND engine = ?",
+                [(used,) + key for key, used in self._pending_touches.items()],
+            )
+            self._evict()
+        self._pending_puts.clear()
+        self._pending_touches.clear()
+
+    def _evict(self):
+        """Remove as respostas do motor usadas há mais tempo quando o limite é excedido"""
+        # A contagem percorre a tabela: feita na abertura e a cada RECOUNT_EVERY gravações
+        self._commits_since_count += 1
+        if self._unapproved is None or self._commits_since_count >= self.RECOUNT_EVERY:
+            # Segmentos importados (aprovados) nunca são removidos pelo limite
+            self._unapproved = self._conn.execute(
+                "SELECT COUNT(*) FROM translations WHERE approved = 0").fetchone()[0]
+            self._commits_since_count = 0
+        excess = self._unapproved - self.max_entries
+        if excess > 0:
+            removed = self._conn.execute(
+                "DELETE FROM translations WHERE rowid IN ("
+                " SELECT rowid FROM translations WHERE approved = 0"
+                " ORDER BY last_used ASC LIMIT ?)",
+                (excess,),
+            ).rowcount
+            self._unapproved -= removed
+            self.logger.info(f"Cache de traduções: {removed} entradas antigas removidas")
+
+    def flush(self):
+        """Confirma escritas pendentes no disco"""
+        with self._lock:
+            self._commit()
+
+    def close(self):
+        """Confirma escritas pendentes e fecha a conexão"""
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._unapproved = None
+
+    def __len__(self) -> int:
+        self.flush()
+        with self._lock:
+            conn = self._connect(create=False)
+            if conn is None:
+                return 0
+            return conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas do cache
+
+        Returns:
+            Dicionário com acertos, falhas e tamanho do cache
+        """
+        lookups = self.hits + self.misses
+        return {
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "cache_hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "cache_entries": len(self),
+            "cache_file": str(self.db_path),
+        }
@@ -5,26 +5,168 @@ Classe principal para tradução de arquivos XML
 """
 
 import xml.etree.ElementTree as ET
+import contextlib
+import copy
 import os
-from typing import Dict, List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple, Union
 from pathlib import Path
 
 from .auto_translator import AutoTranslator
+from .budget import EngineCallBudget
+from .checkpoint import CheckpointJournal, checkpoint_path, input_fingerprint
+from .incremental import diff_catalog, hash_text, load_manifest, manifest_path, save_manifest
+from .inplace_writer import write_in_place
+from .metrics import RunMetrics, skip_deltas, write_metrics
+from .planner import PLAN_SOURCES, estimate_seconds, expected_latency, sum_costs
+from .streaming import StreamingTranslator
+from .string_unit import StringGroups, StringUnit
+from .tree_runner import aggregate_results, find_catalogs, run_tree
+from .xml_backend import create_backend
+from ..engines.base import TranslationEngine
 from ..utils.logger import get_logger
 
 
 class XMLTranslator:
     """Classe principal para tradução de arquivos XML"""
     
-    def __init__(self, config_dir: str = "config"):
+    # Fontes possíveis de tradução, em ordem de prioridade
+    # ("engine" agrupa as traduções de qualquer motor: google, local...)
+    SOURCES = ("override", "checkpoint", "cache", "fuzzy", "engine", "original")
+    
+    def __init__(self, config_dir: str = "config", use_cache: bool = True,
+                 workers: int = None, rate_limit: float = None,
+                 engine: Union[str, TranslationEngine] = None, target_culture: str = None,
+                 xml_backend: str = None):
         """
         Inicializa o XMLTranslator
         
         Args:
             config_dir: Diretório de configurações
+            use_cache: Usar memória de tradução persistente em disco
+            workers: Número de requisições simultâneas ao motor
+            rate_limit: Máximo de requisições por segundo ao motor
+            engine: Nome do motor de tradução ou instância pronta
+            target_culture: Cultura de destino (padrão: pt-BR)
+            xml_backend: Backend de XML (auto, lxml, etree; padrão: settings.json)
         """
-        self.translator = AutoTranslator(config_dir)
+        # Opções de construção (recriadas nos processos de translate_tree)
+        self.options = {
+            "config_dir": config_dir,
+            "use_cache": use_cache,
+            "workers": workers,
+            "rate_limit": rate_limit,
+            "engine": engine,
+            "target_culture": target_culture,
+            "xml_backend": xml_backend
+        }
+        self.translator = AutoTranslator(config_dir, use_cache=use_cache,
+                                         workers=workers, rate_limit=rate_limit,
+                                         engine=engine, target_culture=target_culture)
+        self.target_culture = self.translator.target_culture
+        self.xml_backend = create_backend(xml_backend or self.translator.settings["xml_backend"])
         self.logger = get_logger(__name__)
+        self.last_run_stats = {}
+        # Chaves mantidas como original na última execução (refeitas no modo incremental)
+        self.last_original_keys: Set[str] = set()
+        self.journal: Optional[CheckpointJournal] = None
+        self._culture_translators = {self.target_culture: self}
+        self._culture_lock = threading.Lock()
+        # Orçamento do motor repassado a todas as culturas (ver set_call_budget)
+        self.call_budget: Optional[EngineCallBudget] = None
+        # Tradutor de origem quando esta instância é uma sessão (ver session)
+        self._origin: Optional["XMLTranslator"] = None
+    
+    def session(self) -> "XMLTranslator":
+        """
+        Cria uma cópia leve para uma execução concorrente
+        
+        A sessão compartilha o motor, os overrides, a memória de tradução e
+        o backend de XML (nada é recarregado), mas tem o próprio estado de
+        execução (last_run_stats, checkpoint, contadores e latência do motor
+        em AutoTranslatorSession). Usada pelo serviço para atender
+        requisições simultâneas com o tradutor já aquecido; release() soma
+        os contadores da sessão aos do tradutor de origem.
+        
+        Returns:
+            XMLTranslator da mesma cultura
+        """
+        clone = copy.copy(self)
+        clone.translator = self.translator.session()
+        clone.call_budget = None
+        clone.last_run_stats = {}
+        clone.last_original_keys = set()
+        clone.journal = None
+        clone._culture_translators = {self.target_culture: clone}
+        clone._culture_lock = threading.Lock()
+        clone._origin = self._origin or self
+        return clone
+    
+    def release(self):
+        """Encerra uma sessão: soma os contadores de todas as culturas usadas aos da origem"""
+        if self._origin is None:
+            return
+        with self._culture_lock:
+            translators = list(self._culture_translators.values())
+        for translator in translators:
+            translator.translator.release()
+    
+    def for_culture(self, culture: str) -> "XMLTranslator":
+        """
+        Retorna o XMLTranslator de uma cultura de destino (criado sob demanda)
+        
+        Args:
+            culture: Cultura de destino (ex.: es-ES)
+            
+        Returns:
+            XMLTranslator com as mesmas opções e overrides da cultura
+        """
+        with self._culture_lock:
+            if culture not in self._culture_translators:
+                if self._origin is not None:
+                    # Sessão: reaproveita o tradutor aquecido da cultura na origem
+                    translator = self._origin.for_culture(culture).session()
+                else:
+                    translator = XMLTranslator(**dict(self.options, target_culture=culture))
+                if self.call_budget is not None:
+                    translator.call_budget = self.call_budget
+                    translator.translator.call_budget = self.call_budget
+                self._culture_translators[culture] = translator
+            return self._culture_translators[culture]
+    
+    def set_call_budget(self, budget: Optional[EngineCallBudget]):
+        """
+        Define o orçamento de chamadas e de tempo do motor de todas as culturas
+        
+        O mesmo objeto vai para os tradutores de cultura já criados e para os
+        criados depois por for_culture, então o limite vale para a execução
+        inteira, somando as culturas de destino.
+        
+        Args:
+            budget: Orçamento compartilhado (None remove o limite)
+        """
+        with self._culture_lock:
+            self.call_budget = budget
+            for translator in self._culture_translators.values():
+                translator.call_budget = budget
+                translator.translator.call_budget = budget
+    
+    def default_output_path(self, input_path: str, culture: str = None) -> Path:
+        """
+        Caminho de saída padrão: <nome>_<cultura>.xml ao lado da origem
+        
+        Args:
+            input_path: Arquivo de origem
+            culture: Cultura de destino (padrão: a deste tradutor)
+            
+        Returns:
+            Caminho do arquivo traduzido
+        """
+        input_file = Path(input_path)
+        suffix = f"_{culture or self.target_culture}{input_file.suffix}"
+        return input_file.parent / f"{input_file.stem}{suffix}"
     
     def load_xml(self, file_path: str) -> ET.ElementTree:
         """
@@ -37,8 +179,8 @@ class XMLTranslator:
             Árvore XML carregada
         """
         try:
-            tree = ET.parse(file_path)
-            self.logger.info(f"XML carregado com sucesso: {file_path}")
+            tree = self.xml_backend.parse(file_path)
+            self.logger.info(f"XML carregado com sucesso: {file_path} ({self.xml_backend.name})")
             return tree
         except ET.ParseError as e:
             error_msg = f"Erro ao carregar XML '{file_path}': {e}"
@@ -49,7 +191,7 @@ class XMLTranslator:
             self.logger.error(error_msg)
             raise Exception(error_msg)
     
-    def extract_strings(self, tree: ET.ElementTree) -> List[Dict]:
+    def extract_strings(self, tree: ET.ElementTree) -> List[StringUnit]:
         """
         Extrai todas as strings para traduzir do XML
         
@@ -57,26 +199,28 @@ class XMLTranslator:
             tree: Árvore XML
             
         Returns:
-            Lista de dicionários com informações das strings
+            Lista de StringUnit (chave, texto e caminho do grupo)
         """
         root = tree.getroot()
         strings = []
+        append = strings.append
         
         def extract_recursive(element, path=""):
+            # Um único objeto de caminho para todas as strings do grupo
+            string_path = f"{path}/string" if path else "string"
             for child in element:
+                if not isinstance(child.tag, str):
+                    # Comentários e instruções de processamento (backends que os preservam)
+                    continue
                 tag_name = child.tag.split('}')[-1] if '}' in child.tag else child.tag
-                current_path = f"{path}/{tag_name}" if path else tag_name
                 
                 if tag_name == 'string':
-                    key = child.get('key')
-                    text = child.text or ""
-                    if text.strip():  
-                        strings.append({
-                            'key': key,
-                            'text': text,
-                            'path': current_path
-                        })
-                elif tag_name == 'group':
+                    text = child.text
+                    if text and text.strip():
+                        append(StringUnit(child.get('key'), text, string_path))
+                    continue
+                current_path = f"{path}/{tag_name}" if path else tag_name
+                if tag_name == 'group':
                     group_name = child.get('name', '')
                     new_path = f"{current_path}[{group_name}]" if group_name else current_path
                     extract_recursive(child, new_path)
@@ -87,56 +231,234 @@ class XMLTranslator:
         self.logger.info(f"Extraídas {len(strings)} strings do XML")
         return strings
     
-    def process_translations(self, strings: List[Dict]) -> Dict[str, str]:
+    def process_translations(self, strings: List[StringUnit], batch: bool = True) -> Dict[str, str]:
         """
         Processa traduções automaticamente
         
+        Textos idênticos (após normalização) são traduzidos uma única vez e
+        o resultado é replicado para todas as chaves que os utilizam.
+        
         Args:
-            strings: Lista de strings extraídas
+            strings: Lista de strings extraídas (StringUnit ou dicionários com 'key' e 'text')
+            batch: Agrupar textos em requisições em lote ao motor
             
         Returns:
             Dicionário com traduções
         """
-        translations = {}
+        strings = [StringUnit.coerce(item) for item in strings]
+        groups = self.group_strings(strings)
+        print(f"Processando {len(strings)} strings ({len(groups)} textos únicos)...")
         
-        print(f"Processando {len(strings)} strings...")
+        counters = self.new_counters()
+        results = self.translate_groups(groups, counters, batch)
+        translations = self.fan_out(strings, results)
+        self.finish_run(counters, len(translations))
+        return translations
+    
+    def group_strings(self, strings: List[StringUnit]) -> StringGroups:
+        """
+        Agrupa chaves por texto normalizado
         
-        override_count = 0
-        google_count = 0
-        original_count = 0
+        Args:
+            strings: Lista de strings extraídas
+            
+        Returns:
+            Grupos por texto normalizado (representante e quantidade de chaves)
+        """
+        groups = StringGroups()
+        normalize = self.normalize_text
+        for unit in strings:
+            groups.add(normalize(unit.text), unit)
+        return groups
+    
+    def new_counters(self) -> dict:
+        """
+        Cria contadores zerados de uma execução
+        
+        Returns:
+            Dicionário com totais e contadores por fonte (chaves e textos únicos)
+        """
+        return {
+            "total_keys": 0,
+            "unique_texts": 0,
+            "keys": dict.fromkeys(self.SOURCES, 0),
+            "unique": dict.fromkeys(self.SOURCES, 0),
+            # Contagens do pré-filtro no início (a execução registra a diferença)
+            "skipped_before": dict(self.translator.skipped)
+        }
+    
+    def translate_groups(self, groups: StringGroups, counters: dict,
+                         batch: bool = True) -> Dict[str, Tuple[str, str]]:
+        """
+        Traduz cada texto único uma vez e atualiza os contadores
+        
+        Args:
+            groups: Strings agrupadas por texto normalizado
+            counters: Contadores da execução (ver new_counters)
+            batch: Agrupar textos em requisições em lote ao motor
+            
+        Returns:
+            Dicionário texto normalizado → (tradução, fonte)
+        """
+        # Obter tradução automática (uma vez por texto único)
+        representatives = list(groups.representatives.values())
+        if self.journal is not None:
+            found = self._translate_checkpointed(groups.keys(), representatives, batch)
+        elif batch:
+            found = self.translator.get_translations([first.text for first in representatives])
+        else:
+            found = [self.translator.get_translation(first.text, first.key)
+                     for first in representatives]
         
-        for string_data in strings:
-            key = string_data['key']
-            text = string_data['text']
+        results = {}
+        for (normalized, first, count), (translation, source) in zip(groups.items(), found):
+            source = source if source in self.SOURCES else "engine"
+            results[normalized] = (translation, source)
             
-            # Obter tradução automática
-            translation, source = self.translator.get_translation(text, key)
+            counters["total_keys"] += count
+            counters["unique_texts"] += 1
+            counters["keys"][source] += count
+            counters["unique"][source] += 1
             
-            # Contar por fonte
-            if source == "override":
-                override_count += 1
-            elif source == "google":
-                google_count += 1
-            else:
-                original_count += 1
+            # Log apenas erros críticos (argumentos no estilo %: ver RepeatFilter)
+            if source == "original" and self.translator.engine_available:
+                self.logger.warning("Mantido original para '%s' (%d chaves): '%s'",
+                                    first.key, count, first.text)
+        return results
+    
+    def _translate_checkpointed(self, normalized: List[str], representatives: List[StringUnit],
+                                batch: bool) -> List[Tuple[str, str]]:
+        """
+        Traduz registrando cada resposta do motor no checkpoint assim que chega
+        
+        O diário agrupa as gravações (ver CheckpointJournal). Textos já
+        presentes no checkpoint (execução interrompida) não são traduzidos
+        novamente.
+        
+        Args:
+            normalized: Textos normalizados, na ordem dos representantes
+            representatives: Primeira string de cada grupo
+            batch: Agrupar textos em requisições em lote ao motor
             
-            translations[key] = translation
+        Returns:
+            Lista de tuplas (tradução, fonte) na ordem dos representantes
+        """
+        found: List[Optional[Tuple[str, str]]] = []
+        for text in normalized:
+            resumed = self.journal.get(text)
+            found.append((resumed, "checkpoint") if resumed is not None else None)
+        
+        pending = [i for i, result in enumerate(found) if result is None]
+        if batch:
+            # Apenas respostas do motor custam para refazer
+            results = self.translator.get_translations(
+                [representatives[i].text for i in pending],
+                lambda k, translation: self.journal.record(normalized[pending[k]], translation))
+            for i, result in zip(pending, results):
+                found[i] = result
+            return found
+        
+        for i in pending:
+            found[i] = self.translator.get_translation(representatives[i].text,
+                                                       representatives[i].key)
+            if found[i][1] not in self.SOURCES:
+                self.journal.record(normalized[i], found[i][0])
+        return found
+    
+    def fan_out(self, strings: List[StringUnit],
+                results: Dict[str, Tuple[str, str]]) -> Dict[str, str]:
+        """
+        Replica os resultados para todas as chaves, na ordem do documento
+        
+        As chaves mantidas como original ficam em last_original_keys.
+        
+        Args:
+            strings: Lista de strings extraídas
+            results: Resultados por texto normalizado (ver translate_groups)
             
-            # Log apenas erros críticos
-            if source == "original" and self.translator.translator:
-                self.logger.warning(f"Mantido original para '{key}': '{text}'")
+        Returns:
+            Dicionário chave → tradução
+        """
+        translations = {}
+        originals = set()
+        normalize = self.normalize_text
+        for unit in strings:
+            translation, source = results[normalize(unit.text)]
+            # Originais preservam o texto exato de cada chave
+            if source == "original":
+                originals.add(unit.key)
+                translations[unit.key] = unit.text
+            else:
+                translations[unit.key] = translation
+        self.last_original_keys = originals
+        return translations
+    
+    def finish_run(self, counters: dict, processed: int):
+        """
+        Registra estatísticas da execução e imprime o relatório final
+        
+        Args:
+            counters: Contadores da execução (ver new_counters)
+            processed: Número de traduções produzidas
+        """
+        key_counts = counters["keys"]
+        unique_counts = counters["unique"]
+        total_keys = counters["total_keys"]
+        unique_texts = counters["unique_texts"]
+        
+        skipped = skip_deltas(self.translator.skipped, counters["skipped_before"])
+        self.last_run_stats = {
+            "total_keys": total_keys,
+            "unique_texts": unique_texts,
+            "saved_calls": total_keys - unique_texts,
+            "sources": {
+                source: {"keys": key_counts[source], "unique": unique_counts[source]}
+                for source in self.SOURCES
+            },
+            "skipped": skipped
+        }
         
         # Relatório final
-        print(f"✓ Processadas: {len(translations)} strings")
-        if override_count > 0:
-            print(f"  - Overrides: {override_count}")
-        print(f"  - Google Translate: {google_count}")
-        if original_count > 0:
-            print(f"  - Mantidos originais: {original_count}")
-        
-        self.logger.info(f"Tradução concluída: {len(translations)} strings processadas "
-                        f"(overrides: {override_count}, google: {google_count}, originais: {original_count})")
-        return translations
+        print(f"✓ Processadas: {processed} strings "
+              f"({unique_texts} textos únicos, {total_keys - unique_texts} chamadas economizadas)")
+        engine_name = self.translator.engine_name
+        labels = {
+            "override": "Overrides",
+            "checkpoint": "Checkpoint (execução anterior)",
+            "cache": "Memória de tradução",
+            "fuzzy": "Memória de tradução (aproximada)",
+            "engine": "Google Translate" if engine_name == "google" else f"Motor '{engine_name}'",
+            "original": "Mantidos originais"
+        }
+        for source in self.SOURCES:
+            if key_counts[source] > 0 or source == "engine":
+                print(f"  - {labels[source]}: {key_counts[source]} "
+                      f"({unique_counts[source]} únicos)")
+        if skipped:
+            details = ", ".join(f"{reason}: {count}" for reason, count in sorted(skipped.items()))
+            print(f"    Ignorados pelo pré-filtro sem chamar o motor: {sum(skipped.values())} "
+                  f"textos únicos ({details})")
+        
+        self.logger.info(f"Tradução concluída: {processed} strings processadas, "
+                         f"{unique_texts} textos únicos "
+                         f"(overrides: {key_counts['override']}, "
+                         f"checkpoint: {key_counts['checkpoint']}, "
+                         f"cache: {key_counts['cache']}, aproximada: {key_counts['fuzzy']}, "
+                         f"{engine_name}: {key_counts['engine']}, "
+                         f"originais: {key_counts['original']})")
+    
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """
+        Normaliza texto para agrupamento de duplicatas
+        
+        Args:
+            text: Texto original
+            
+        Returns:
+            Texto normalizado
+        """
+        return text.strip()
     
     def apply_translations(self, tree: ET.ElementTree, translations: Dict[str, str]) -> ET.ElementTree:
         """
@@ -151,16 +473,18 @@ class XMLTranslator:
         """
         root = tree.getroot()
         
-        # Alterar cultura para pt-BR
+        # Alterar cultura para a de destino
         if root.get('culture'):
-            root.set('culture', 'pt-BR')
-            self.logger.info("Cultura alterada para pt-BR")
+            root.set('culture', self.target_culture)
+            self.logger.info(f"Cultura alterada para {self.target_culture}")
         
         applied_count = 0
         
         def apply_recursive(element):
             nonlocal applied_count
             for child in element:
+                if not isinstance(child.tag, str):
+                    continue
                 # Remover namespace do tag para comparação
                 tag_name = child.tag.split('}')[-1] if '}' in child.tag else child.tag
                 
@@ -190,7 +514,7 @@ class XMLTranslator:
             output_dir.mkdir(parents=True, exist_ok=True)
             
             # Adicionar encoding UTF-8 explicitamente
-            tree.write(output_path, encoding='utf-8', xml_declaration=True)
+            self.xml_backend.write(tree, output_path)
             print(f"✓ Arquivo salvo: {output_path}")
             self.logger.info(f"XML traduzido salvo: {output_path}")
         except Exception as e:
@@ -198,39 +522,122 @@ class XMLTranslator:
             self.logger.error(error_msg)
             raise Exception(error_msg)
     
-    def translate_file(self, input_path: str, output_path: str = None) -> dict:
+    def translate_file(self, input_path: str, output_path: str = None,
+                       streaming: bool = False, incremental: bool = False,
+                       previous_source: str = None, target_cultures: List[str] = None,
+                       metrics_file: str = None, checkpoint: bool = False,
+                       preserve_format: bool = None) -> dict:
         """
         Traduz um arquivo XML completo automaticamente
         
         Args:
             input_path: Caminho do arquivo de entrada
-            output_path: Caminho de saída (opcional)
+            output_path: Caminho de saída (opcional, apenas para uma cultura)
+            streaming: Ler, traduzir e gravar incrementalmente (memória constante)
+            incremental: Reaproveitar a saída existente e traduzir só chaves novas/alteradas
+            previous_source: Origem usada na execução anterior (se não houver manifesto)
+            target_cultures: Culturas de destino (padrão: a deste tradutor)
+            metrics_file: Gravar também as métricas da execução neste arquivo JSON
+            checkpoint: Registrar o progresso em um diário e retomar execuções interrompidas
+            preserve_format: Gravar trocando só os textos no arquivo original
+                (padrão: settings.json)
             
         Returns:
-            Dicionário com estatísticas da tradução
+            Dicionário com estatísticas da tradução (tempos e latências em 'metrics')
         """
+        if preserve_format is None:
+            preserve_format = self.translator.settings["preserve_format"]
+        cultures = list(dict.fromkeys(target_cultures or [self.target_culture]))
+        if len(cultures) > 1:
+            return self.translate_file_multi(input_path, cultures, streaming=streaming,
+                                             incremental=incremental,
+                                             previous_source=previous_source,
+                                             metrics_file=metrics_file, checkpoint=checkpoint,
+                                             preserve_format=preserve_format)
+        if cultures[0] != self.target_culture:
+            return self.for_culture(cultures[0]).translate_file(
+                input_path, output_path, streaming=streaming, incremental=incremental,
+                previous_source=previous_source, metrics_file=metrics_file,
+                checkpoint=checkpoint, preserve_format=preserve_format
+            )
+        
+        if checkpoint:
+            output_path = output_path or self.default_output_path(input_path)
+            return self.run_checkpointed(input_path, output_path, lambda: self.translate_file(
+                input_path, output_path, streaming=streaming, incremental=incremental,
+                previous_source=previous_source, metrics_file=metrics_file,
+                preserve_format=preserve_format
+            ))
+        
         try:
             if not output_path:
-                input_file = Path(input_path)
-                output_path = input_file.parent / f"{input_file.stem}_pt-BR{input_file.suffix}"
+                output_path = self.default_output_path(input_path)
+            
+            if streaming and incremental:
+                raise ValueError("Modos streaming e incremental não podem ser combinados")
+            if streaming and preserve_format:
+                raise ValueError("Modo streaming não preserva a formatação; use apenas um dos dois")
+            if streaming:
+                return self.translate_file_streaming(input_path, str(output_path),
+                                                     metrics_file=metrics_file)
+            
+            metrics = RunMetrics(self.translator)
             
             print(f"Carregando: {input_path}")
-            tree = self.load_xml(input_path)
+            with metrics.stage("load_xml"):
+                tree = self.load_xml(input_path)
             
             print("Extraindo strings...")
-            strings = self.extract_strings(tree)
+            with metrics.stage("extract_strings"):
+                strings = self.extract_strings(tree)
             
             if not strings:
                 self.logger.warning(f"Nenhuma string encontrada em '{input_path}'")
                 print("⚠ Nenhuma string encontrada para traduzir")
                 return {"status": "warning", "message": "Nenhuma string encontrada"}
             
-            translations = self.process_translations(strings)
+            incremental_stats = None
+            if incremental:
+                with metrics.stage("incremental_diff"):
+                    diff = self.diff_with_previous(strings, str(output_path), previous_source)
+                if diff is not None:
+                    incremental_stats = {name: diff[name]
+                                         for name in ("added", "changed", "reused", "removed")}
+                    print(f"Incremental: {diff['added']} novas, {diff['changed']} alteradas, "
+                          f"{diff['reused']} reaproveitadas, {diff['removed']} removidas")
+                    self.logger.info(f"Tradução incremental de '{input_path}': {incremental_stats}")
+                    
+                    if not diff["pending"] and not diff["removed"]:
+                        # Nada mudou: a saída existente já está atualizada
+                        print("✓ Nenhuma alteração desde a última tradução")
+                        stats = self.translator.get_stats()
+                        stats.update({
+                            "status": "success",
+                            "input_file": input_path,
+                            "output_file": str(output_path),
+                            "strings_processed": 0,
+                            "translations_applied": 0,
+                            "unique_texts": 0,
+                            "saved_calls": 0,
+                            "incremental": incremental_stats
+                        })
+                        return self.attach_metrics(stats, metrics, metrics_file)
+                    
+                    translations = dict(diff["reused_translations"])
+                    if diff["pending"]:
+                        with metrics.stage("process_translations"):
+                            translations.update(self.process_translations(diff["pending"]))
+            
+            if incremental_stats is None:
+                with metrics.stage("process_translations"):
+                    translations = self.process_translations(strings)
+            with metrics.stage("flush_cache"):
+                self.translator.flush_cache()
             
             if translations:
                 print(f"Aplicando traduções...")
-                translated_tree = self.apply_translations(tree, translations)
-                self.save_xml(translated_tree, str(output_path))
+                self.write_output(tree, translations, input_path, str(output_path),
+                                  preserve_format, metrics)
                 
                 # Estatísticas
                 stats = self.translator.get_stats()
@@ -239,9 +646,16 @@ class XMLTranslator:
                     "input_file": input_path,
                     "output_file": str(output_path),
                     "strings_processed": len(strings),
-                    "translations_applied": len(translations)
+                    "translations_applied": len(translations),
+                    "unique_texts": self.last_run_stats.get("unique_texts", len(strings)),
+                    "saved_calls": self.last_run_stats.get("saved_calls", 0)
                 })
-                return stats
+                if incremental:
+                    save_manifest(manifest_path(output_path), strings, input_path,
+                                  self.last_original_keys)
+                    if incremental_stats is not None:
+                        stats["incremental"] = incremental_stats
+                return self.attach_metrics(stats, metrics, metrics_file)
             else:
                 self.logger.warning("Nenhuma tradução foi realizada")
                 print("Nenhuma tradução realizada")
@@ -251,9 +665,515 @@ class XMLTranslator:
             self.logger.error(f"Erro durante tradução do arquivo '{input_path}': {e}")
             raise
     
+    def open_checkpoint(self, input_path: str, output_path: str) -> CheckpointJournal:
+        """
+        Abre (ou retoma) o diário de checkpoint de uma saída
+        
+        Args:
+            input_path: Arquivo de origem
+            output_path: Arquivo de saída
+            
+        Returns:
+            Diário associado à saída
+        """
+        translator = self.translator
+        scope = {"culture": self.target_culture, "engine": translator.engine_name,
+                 "src": translator.source_lang, "dest": translator.target_lang}
+        return CheckpointJournal(checkpoint_path(output_path), input_fingerprint(input_path, scope))
+    
+    def run_checkpointed(self, input_path: str, output_path: str, run) -> dict:
+        """
+        Executa uma tradução com checkpoint ativo
+        
+        O diário é removido quando a execução termina e mantido em caso de
+        erro ou interrupção (Ctrl-C), para a próxima execução retomar.
+        
+        Args:
+            input_path: Arquivo de origem
+            output_path: Arquivo de saída
+            run: Função que executa a tradução e retorna o resultado
+            
+        Returns:
+            Resultado da tradução, com as traduções retomadas em 'checkpoint'
+        """
+        journal = self.open_checkpoint(input_path, str(output_path))
+        if journal.resumed:
+            print(f"Retomando execução anterior: {journal.resumed} traduções já concluídas")
+        self.journal = journal
+        completed = False
+        try:
+            result = run()
+            completed = result.get("status") != "error"
+            result["checkpoint"] = {"resumed": journal.resumed,
+                                    "recorded": len(journal.entries) - journal.resumed}
+            return result
+        finally:
+            self.journal = None
+            self.translator.flush_cache()
+            journal.close(completed)
+    
+    def attach_metrics(self, stats: dict, metrics: RunMetrics, metrics_file: str = None) -> dict:
+        """
+        Adiciona as métricas da execução ao resultado e, se pedido, grava em JSON
+        
+        Args:
+            stats: Resultado de translate_file
+            metrics: Métricas medidas durante a execução
+            metrics_file: Arquivo JSON de métricas (opcional)
+            
+        Returns:
+            O próprio resultado, com a chave 'metrics'
+        """
+        stats["metrics"] = metrics.report(self.last_run_stats)
+        if metrics_file:
+            write_metrics(metrics_file, {
+                "input_file": stats.get("input_file"),
+                "output_file": stats.get("output_file"),
+                "engine": stats.get("engine"),
+                "strings_processed": stats.get("strings_processed"),
+                **stats["metrics"]
+            })
+            self.logger.info(f"Métricas gravadas em {metrics_file}")
+        return stats
+    
+    def write_output(self, tree: ET.ElementTree, translations: Dict[str, str], input_path: str,
+                     output_path: str, preserve_format: bool, metrics: RunMetrics):
+        """
+        Aplica as traduções e grava a saída
+        
+        Args:
+            tree: Árvore XML carregada da origem
+            translations: Traduções por chave
+            input_path: Arquivo de origem
+            output_path: Arquivo de saída
+            preserve_format: Copiar o original trocando apenas os textos traduzidos
+            metrics: Métricas onde registrar as etapas
+        """
+        if preserve_format:
+            with metrics.stage("save_xml"):
+                write_in_place(input_path, output_path, translations, self.target_culture)
+            print(f"✓ Arquivo salvo: {output_path}")
+            self.logger.info(f"XML traduzido salvo: {output_path} (formato preservado)")
+            return
+        with metrics.stage("apply_translations"):
+            translated_tree = self.apply_translations(tree, translations)
+        with metrics.stage("save_xml"):
+            self.save_xml(translated_tree, output_path)
+    
+    def translate_file_multi(self, input_path: str, cultures: List[str],
+                             streaming: bool = False, incremental: bool = False,
+                             previous_source: str = None, metrics_file: str = None,
+                             checkpoint: bool = False, preserve_format: bool = False) -> dict:
+        """
+        Traduz um arquivo para várias culturas de destino em uma única passada
+        
+        O XML é carregado e as strings extraídas uma só vez; as culturas são
+        traduzidas em paralelo (cada uma com seus overrides) e uma saída é
+        gravada por cultura. Nos modos streaming/incremental cada cultura
+        processa o arquivo por conta própria, também em paralelo.
+        
+        Args:
+            input_path: Caminho do arquivo de entrada
+            cultures: Culturas de destino (ex.: ["pt-BR", "es-ES"])
+            streaming: Ler, traduzir e gravar incrementalmente (memória constante)
+            incremental: Reaproveitar saídas existentes
+            previous_source: Origem usada na execução anterior (modo incremental)
+            metrics_file: Gravar também as métricas da execução neste arquivo JSON
+            checkpoint: Registrar o progresso de cada cultura e retomar execuções interrompidas
+            preserve_format: Gravar trocando só os textos no arquivo original
+            
+        Returns:
+            Dicionário com o resultado de cada cultura em 'outputs'
+        """
+        translators = {culture: self.for_culture(culture) for culture in cultures}
+        outputs = {}
+        metrics = RunMetrics(self.translator)
+        
+        if streaming or incremental:
+            with ThreadPoolExecutor(max_workers=len(cultures)) as executor:
+                futures = {
+                    culture: executor.submit(translator.translate_file, input_path,
+                                             streaming=streaming, incremental=incremental,
+                                             previous_source=previous_source,
+                                             checkpoint=checkpoint,
+                                             preserve_format=preserve_format)
+                    for culture, translator in translators.items()
+                }
+                outputs = {culture: future.result() for culture, future in futures.items()}
+            strings_processed = max(result.get("strings_processed", 0)
+                                    for result in outputs.values())
+        else:
+            print(f"Carregando: {input_path}")
+            with metrics.stage("load_xml"):
+                tree = self.load_xml(input_path)
+            print("Extraindo strings...")
+            with metrics.stage("extract_strings"):
+                strings = self.extract_strings(tree)
+            
+            if not strings:
+                self.logger.warning(f"Nenhuma string encontrada em '{input_path}'")
+                print("⚠ Nenhuma string encontrada para traduzir")
+                return {"status": "warning", "message": "Nenhuma string encontrada"}
+            
+            culture_metrics = {culture: RunMetrics(translator.translator)
+                               for culture, translator in translators.items()}
+            
+            def process(culture: str) -> Dict[str, str]:
+                with culture_metrics[culture].stage("process_translations"):
+                    return translators[culture].process_translations(strings)
+            
+            journals = {}
+            if checkpoint:
+                for culture, translator in translators.items():
+                    journals[culture] = translator.open_checkpoint(
+                        input_path, str(self.default_output_path(input_path, culture)))
+                    translator.journal = journals[culture]
+            
+            print(f"Traduzindo para {', '.join(cultures)}...")
+            with contextlib.ExitStack() as cleanup, \
+                    ThreadPoolExecutor(max_workers=len(cultures)) as executor:
+                # Diários de culturas não concluídas são mantidos para retomar
+                cleanup.callback(self._close_journals, translators, journals)
+                futures = {culture: executor.submit(process, culture) for culture in cultures}
+                
+                # Aplicar e gravar na ordem pedida, à medida que cada cultura termina
+                for culture, translator in translators.items():
+                    translations = futures[culture].result()
+                    stages = culture_metrics[culture]
+                    with stages.stage("flush_cache"):
+                        translator.translator.flush_cache()
+                    output_path = str(self.default_output_path(input_path, culture))
+                    translator.write_output(tree, translations, input_path, output_path,
+                                            preserve_format, stages)
+                    
+                    stats = translator.translator.get_stats()
+                    stats.update({
+                        "status": "success",
+                        "input_file": input_path,
+                        "output_file": output_path,
+                        "strings_processed": len(strings),
+                        "translations_applied": len(translations),
+                        "unique_texts": translator.last_run_stats.get("unique_texts", len(strings)),
+                        "saved_calls": translator.last_run_stats.get("saved_calls", 0),
+                        "metrics": stages.report(translator.last_run_stats)
+                    })
+                    outputs[culture] = stats
+                    
+                    journal = journals.pop(culture, None)
+                    if journal is not None:
+                        translator.journal = None
+                        journal.close(completed=True)
+            strings_processed = len(strings)
+        
+        self.last_run_stats = {
+            "cultures": {culture: translator.last_run_stats
+                         for culture, translator in translators.items()}
+        }
+        failed = [culture for culture, result in outputs.items()
+                  if result.get("status") != "success"]
+        result = {
+            "status": "success" if not failed else "error",
+            "message": f"Falha nas culturas: {', '.join(failed)}" if failed else "",
+            "input_file": input_path,
+            "cultures": cultures,
+            "outputs": outputs,
+            "output_files": [result.get("output_file") for result in outputs.values()
+                             if result.get("output_file")],
+            "strings_processed": strings_processed,
+            "metrics": {
+                "total_seconds": round(time.perf_counter() - metrics.started, 4),
+                "stages": metrics.report()["stages"],
+                "cultures": {culture: output.get("metrics", {})
+                             for culture, output in outputs.items()}
+            }
+        }
+        if metrics_file:
+            write_metrics(metrics_file, {"input_file": input_path,
+                                         "strings_processed": strings_processed,
+                                         **result["metrics"]})
+            self.logger.info(f"Métricas gravadas em {metrics_file}")
+        return result
+    
+    @staticmethod
+    def _close_journals(translators: Dict[str, "XMLTranslator"],
+                        journals: Dict[str, CheckpointJournal]):
+        """Fecha, mantendo-os em disco, os diários de culturas não concluídas"""
+        for culture, journal in journals.items():
+            translator = translators[culture]
+            translator.journal = None
+            translator.translator.flush_cache()
+            journal.close(completed=False)
+    
+    def diff_with_previous(self, strings: List[StringUnit], output_path: str,
+                           previous_source: str = None) -> Optional[dict]:
+        """
+        Compara as strings atuais com a última tradução gerada
+        
+        A linha de base vem do manifesto de hashes gravado ao lado da saída
+        ou, na falta dele, do arquivo de origem anterior.
+        
+        Args:
+            strings: Strings extraídas da origem atual
+            output_path: Arquivo traduzido existente
+            previous_source: Origem usada na execução anterior (opcional)
+            
+        Returns:
+            Resultado de diff_catalog ou None se não houver linha de base
+        """
+        if not Path(output_path).exists():
+            self.logger.info(f"Sem tradução anterior em '{output_path}': tradução completa")
+            return None
+        
+        baseline = load_manifest(manifest_path(output_path))
+        if baseline is None and previous_source:
+            previous = self.extract_strings(self.load_xml(previous_source))
+            baseline = {unit.key: hash_text(unit.text) for unit in previous}
+        if baseline is None:
+            self.logger.info("Sem manifesto nem origem anterior: tradução completa")
+            return None
+        
+        existing = {unit.key: unit.text
+                    for unit in self.extract_strings(self.load_xml(output_path))}
+        return diff_catalog(strings, baseline, existing, self.translator.get_override)
+    
+    def translate_file_streaming(self, input_path: str, output_path: str,
+                                 chunk_size: int = 1000, metrics_file: str = None) -> dict:
+        """
+        Traduz um arquivo XML em streaming (iterparse), sem montar a árvore completa
+        
+        Args:
+            input_path: Caminho do arquivo de entrada
+            output_path: Caminho de saída
+            chunk_size: Quantidade de strings traduzidas por vez
+            metrics_file: Gravar também as métricas da execução neste arquivo JSON
+            
+        Returns:
+            Dicionário com estatísticas da tradução
+        """
+        print(f"Traduzindo em streaming: {input_path}")
+        metrics = RunMetrics(self.translator)
+        try:
+            with metrics.stage("streaming"):
+                streamer = StreamingTranslator(self, chunk_size, metrics=metrics)
+                processed = streamer.translate_file(input_path, output_path)
+        except ET.ParseError as e:
+            error_msg = f"Erro ao carregar XML '{input_path}': {e}"
+            self.logger.error(error_msg)
+            raise Exception(error_msg)
+        with metrics.stage("flush_cache"):
+            self.translator.flush_cache()
+        
+        if not processed:
+            Path(output_path).unlink()
+            self.logger.warning(f"Nenhuma string encontrada em '{input_path}'")
+            print("⚠ Nenhuma string encontrada para traduzir")
+            return {"status": "warning", "message": "Nenhuma string encontrada"}
+        
+        print(f"✓ Arquivo salvo: {output_path}")
+        self.logger.info(f"XML traduzido salvo: {output_path}")
+        
+        stats = self.translator.get_stats()
+        stats.update({
+            "status": "success",
+            "input_file": input_path,
+            "output_file": output_path,
+            "strings_processed": processed,
+            "translations_applied": processed,
+            "unique_texts": self.last_run_stats.get("unique_texts", processed),
+            "saved_calls": self.last_run_stats.get("saved_calls", 0)
+        })
+        return self.attach_metrics(stats, metrics, metrics_file)
+    
+    def translate_tree(self, directory: str, recursive: bool = True, workers: int = None,
+                       max_engine_calls: int = None, metrics_file: str = None,
+                       files: List[str] = None, time_budget: float = None,
+                       max_engine_chars: int = None, **file_options) -> dict:
+        """
+        Traduz todos os catálogos XML de um diretório, em paralelo entre processos
+        
+        Args:
+            directory: Diretório raiz dos catálogos
+            recursive: Buscar também em subdiretórios
+            workers: Número de processos (padrão: número de CPUs)
+            max_engine_calls: Limite total de requisições ao motor, somando todos os arquivos
+            metrics_file: Gravar as métricas por arquivo e os totais neste arquivo JSON
+            files: Catálogos a traduzir (padrão: todos os encontrados no diretório)
+            time_budget: Segundos em que o motor pode ser usado; depois disso os textos
+                restantes ficam como original
+            max_engine_chars: Limite total de caracteres enviados ao motor
+            **file_options: Argumentos repassados a translate_file (streaming, incremental)
+            
+        Returns:
+            Dicionário com resultados por arquivo ('files') e totais ('totals')
+        """
+        cultures = file_options.get("target_cultures") or [self.target_culture]
+        if files is None:
+            files = find_catalogs(directory, recursive, cultures)
+        if not files:
+            self.logger.warning(f"Nenhum catálogo XML encontrado em '{directory}'")
+            print(f"⚠ Nenhum catálogo XML encontrado em: {directory}")
+            return {"status": "warning", "message": "Nenhum catálogo encontrado",
+                    "files": [], "totals": aggregate_results([], 0.0)}
+        
+        workers = workers or os.cpu_count() or 1
+        budget = None
+        if max_engine_calls is not None or time_budget is not None \
+                or max_engine_chars is not None:
+            budget = EngineCallBudget(max_engine_calls, time_budget, max_engine_chars)
+        print(f"Traduzindo {len(files)} catálogos de '{directory}' "
+              f"com {min(workers, len(files))} processos...")
+        
+        started = time.perf_counter()
+        results = run_tree(self, files, workers, budget, file_options)
+        totals = aggregate_results(results, time.perf_counter() - started)
+        self.translator.flush_cache()
+        
+        # Relatório consolidado
+        print(f"✓ Catálogos: {totals['succeeded']} traduzidos, {totals['warnings']} sem strings, "
+              f"{totals['failed']} com erro ({totals['duration']:.2f}s)")
+        print(f"  - Strings: {totals['strings_processed']} "
+              f"({totals['unique_texts']} textos únicos)")
+        for source, keys in totals["sources"].items():
+            print(f"  - {source}: {keys}")
+        print(f"  - Requisições ao motor: {totals['engine_requests']}"
+              f" | Cache: {totals['cache_hits']} acertos, {totals['cache_misses']} falhas")
+        if totals["prefilter_skips"]:
+            print(f"  - Ignorados pelo pré-filtro: {sum(totals['prefilter_skips'].values())} "
+                  f"textos únicos {totals['prefilter_skips']}")
+        for result in results:
+            if result.get("status") == "error":
+                print(f"  ✗ {result['input_file']}: {result.get('message')}")
+        self.logger.info(f"Tradução de diretório '{directory}' concluída: {totals}")
+        
+        report = {
+            "status": "success" if not totals["failed"] else "error",
+            "files": results,
+            "totals": totals
+        }
+        if metrics_file:
+            write_metrics(metrics_file, {
+                "directory": directory,
+                "totals": totals,
+                "files": {result["input_file"]: dict(result.get("metrics", {}),
+                                                     duration=result["duration"])
+                          for result in results}
+            })
+            self.logger.info(f"Métricas gravadas em {metrics_file}")
+        return report
+    
+    def plan_texts(self, texts: List[str], counts: List[int], metrics_file: str = None) -> dict:
+        """
+        Classifica textos únicos e estima o custo no motor, sem chamá-lo
+        
+        Args:
+            texts: Texto representativo de cada grupo
+            counts: Quantidade de chaves de cada grupo
+            metrics_file: Métricas de uma execução anterior (latência registrada)
+            
+        Returns:
+            Plano com contagens por fonte (PLAN_SOURCES), textos, requisições e
+            caracteres que iriam ao motor e tempo estimado
+        """
+        planned = self.translator.plan_translations(texts)
+        sources = {source: {"keys": 0, "unique": 0} for source in PLAN_SOURCES}
+        for source, count in zip(planned["sources"], counts):
+            sources[source]["keys"] += count
+            sources[source]["unique"] += 1
+        
+        latency, latency_source = expected_latency(self.translator, metrics_file)
+        calls = planned["engine_calls"]
+        return {
+            "sources": sources,
+            "engine_texts": len(planned["engine_texts"]),
+            "engine_calls": calls,
+            "engine_chars": planned["engine_chars"],
+            "estimated_seconds": estimate_seconds(calls, latency, planned["workers"],
+                                                  planned["rate_limit"]),
+            "latency": round(latency, 4),
+            "latency_source": latency_source,
+            "workers": planned["workers"],
+            "rate_limit": planned["rate_limit"],
+            "engine_available": self.translator.engine_available
+        }
+    
+    def plan_file(self, input_path: str, target_cultures: List[str] = None,
+                  metrics_file: str = None) -> dict:
+        """
+        Planeja a tradução de um arquivo: nenhuma requisição ao motor é feita
+        
+        Cada texto único é classificado como override, cache (memória exata),
+        fuzzy (memória aproximada), skipped (pré-filtro ou mantido original) ou
+        engine. Checkpoints e o modo incremental não são considerados, então o
+        plano é um limite superior para execuções retomadas.
+        
+        Args:
+            input_path: Caminho do arquivo XML
+            target_cultures: Culturas de destino (padrão: a deste tradutor)
+            metrics_file: Métricas de uma execução anterior (latência registrada)
+            
+        Returns:
+            Plano com totais de chaves e textos, plano por cultura ('cultures')
+            e custos somados (engine_texts, engine_calls, engine_chars, estimated_seconds)
+        """
+        strings = self.extract_strings(self.load_xml(input_path))
+        groups = self.group_strings(strings)
+        texts = [first.text for _, first, _ in groups.items()]
+        counts = [count for _, _, count in groups.items()]
+        
+        cultures = list(dict.fromkeys(target_cultures or [self.target_culture]))
+        plans = {culture: self.for_culture(culture).plan_texts(texts, counts, metrics_file)
+                 for culture in cultures}
+        plan = {
+            "input_file": input_path,
+            "status": "success",
+            "total_keys": len(strings),
+            "unique_texts": len(texts),
+            "cultures": plans
+        }
+        plan.update(sum_costs(list(plans.values())))
+        self.logger.info(f"Plano de {input_path}: {plan['engine_calls']} requisições, "
+                         f"{plan['engine_chars']} caracteres, ~{plan['estimated_seconds']:.1f}s")
+        return plan
+    
+    def plan_tree(self, directory: str, recursive: bool = True,
+                  target_cultures: List[str] = None, metrics_file: str = None) -> dict:
+        """
+        Planeja a tradução de todos os catálogos de um diretório (sem chamar o motor)
+        
+        Textos repetidos em arquivos diferentes contam em cada arquivo, como
+        nos processos paralelos de translate_tree.
+        
+        Args:
+            directory: Diretório raiz dos catálogos
+            recursive: Buscar também em subdiretórios
+            target_cultures: Culturas de destino (padrão: a deste tradutor)
+            metrics_file: Métricas de uma execução anterior (latência registrada)
+            
+        Returns:
+            Dicionário com planos por arquivo ('files') e custos somados
+        """
+        cultures = target_cultures or [self.target_culture]
+        plans = []
+        for path in find_catalogs(directory, recursive, cultures):
+            try:
+                plans.append(self.plan_file(path, cultures, metrics_file))
+            except Exception as e:
+                plans.append({"input_file": path, "status": "error", "message": str(e)})
+        report = {
+            "directory": directory,
+            "files": plans,
+            "total_keys": sum(plan.get("total_keys", 0) for plan in plans),
+            "unique_texts": sum(plan.get("unique_texts", 0) for plan in plans)
+        }
+        report.update(sum_costs(plans))
+        return report
+    
     def get_translation_preview(self, input_path: str, max_items: int = 10) -> List[dict]:
         """
-        Gera preview das traduções sem aplicar
+        Gera preview das traduções sem aplicar e sem chamar o motor
+        
+        Textos que dependeriam do motor aparecem com translation None e
+        source "engine" (ver plan_file para o custo estimado).
         
         Args:
             input_path: Caminho do arquivo XML
@@ -266,10 +1186,10 @@ class XMLTranslator:
         strings = self.extract_strings(tree)
         
         preview = []
-        for i, string_data in enumerate(strings[:max_items]):
-            key = string_data['key']
-            text = string_data['text']
-            translation, source = self.translator.get_translation(text, key)
+        for unit in strings[:max_items]:
+            key = unit.key
+            text = unit.text
+            translation, source = self.translator.peek_translation(text) or (None, "engine")
             
             preview.append({
                 "key": key,
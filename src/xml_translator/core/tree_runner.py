@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tradução de diretórios inteiros de catálogos XML em paralelo (pool de processos)
+"""
+
+import contextlib
+import io
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .budget import EngineCallBudget
+from ..utils.config import DEFAULT_CULTURE
+
+
+# Contadores acumulados pelo AutoTranslator que são somados por arquivo
+DELTA_COUNTERS = ("engine_requests", "engine_retries", "throttle_events",
+                  "cache_hits", "cache_misses", "fuzzy_lookups", "engine_failures",
+                  "engine_timeouts", "breaker_trips")
+
+# Tradutor de cada processo do pool (criado uma vez por processo)
+_worker_translator = None
+
+
+def is_translated_output(path: Path, cultures: Iterable[str] = (DEFAULT_CULTURE,)) -> bool:
+    """Indica se o arquivo é uma saída já traduzida (ex.: *_pt-BR.xml)"""
+    return any(path.name.endswith(f"_{culture}.xml") for culture in cultures)
+
+
+def find_catalogs(directory: str, recursive: bool = True,
+                  cultures: Iterable[str] = (DEFAULT_CULTURE,)) -> List[str]:
+    """
+    Encontra catálogos XML de origem em um diretório
+
+    Args:
+        directory: Diretório raiz
+        recursive: Buscar também em subdiretórios
+        cultures: Culturas de destino cujas saídas devem ser ignoradas
+
+    Returns:
+        Caminhos dos catálogos, em ordem alfabética
+    """
+    pattern = "**/*.xml" if recursive else "*.xml"
+    cultures = tuple(cultures)
+    return sorted(str(path) for path in Path(directory).glob(pattern)
+                  if path.is_file() and not is_translated_output(path, cultures))
+
+
+def translate_one(xml_translator, input_path: str, file_options: dict) -> dict:
+    """
+    Traduz um arquivo sem imprimir no console e calcula contadores da execução
+
+    Args:
+        xml_translator: XMLTranslator a utilizar
+        input_path: Arquivo de origem
+        file_options: Argumentos extras de translate_file
+
+    Returns:
+        Resultado de translate_file com contadores do arquivo em 'file_counters'
+    """
+    translator = xml_translator.translator
+    xml_translator.last_run_stats = {}
+    before = {name: translator.get_stats().get(name, 0) for name in DELTA_COUNTERS}
+    started = time.perf_counter()
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = xml_translator.translate_file(input_path, **file_options)
+    except Exception as e:
+        result = {"status": "error", "message": str(e)}
+
+    after = translator.get_stats()
+    result["input_file"] = input_path
+    result["duration"] = round(time.perf_counter() - started, 4)
+    result["file_counters"] = {name: after.get(name, 0) - before[name] for name in DELTA_COUNTERS}
+    result["sources"] = xml_translator.last_run_stats.get("sources", {})
+    return result
+
+
+def _init_worker(options: dict, budget: Optional[EngineCallBudget]):
+    """Inicializa o XMLTranslator de um processo do pool"""
+    global _worker_translator
+    from .translator import XMLTranslator
+
+    _worker_translator = XMLTranslator(**options)
+    _worker_translator.set_call_budget(budget)
+
+
+def _run_worker(job: tuple) -> dict:
+    """Traduz um arquivo dentro de um processo do pool"""
+    input_path, file_options = job
+    return translate_one(_worker_translator, input_path, file_options)
+
+
+def run_tree(
+    xml_translator,
+    files: List[str],
+    workers: int,
+    budget: Optional[EngineCallBudget] = None,
+    file_options: dict = None,
+) -> List[dict]:
+    """
+    Traduz vários arquivos, em paralelo quando workers > 1
+
+    Cada processo cria seu próprio XMLTranslator com as mesmas opções; a
+    memória de tradução (SQLite) e o orçamento de chamadas e de tempo são
+    compartilhados (por todas as culturas de destino) e o limite de taxa do
+    motor é dividido entre os processos.
+
+    Args:
+        xml_translator: XMLTranslator de referência (opções e execução local)
+        files: Arquivos de origem
+        workers: Número de processos
+        budget: Orçamento de chamadas ao motor compartilhado
+        file_options: Argumentos extras de translate_file
+
+    Returns:
+        Resultados por arquivo, na mesma ordem de `files`
+    """
+    file_options = file_options or {}
+
+    if workers <= 1 or len(files) <= 1:
+        previous_budget = xml_translator.call_budget
+        xml_translator.set_call_budget(budget or previous_budget)
+        try:
+            return [translate_one(xml_translator, path, file_options) for path in files]
+        finally:
+            xml_translator.set_call_budget(previous_budget)
+
+    # Pool de processos (multiprocessing) carregado apenas no modo paralelo
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = min(workers, len(files))
+    options = dict(xml_translator.options)
+    rate = xml_translator.translator.rate_limiter.rate
+    options["rate_limit"] = rate / workers if rate > 0 else 0
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(options, budget)) as executor:
+        return list(executor.map(_run_worker, [(path, file_options) for path in files]))
+
+
+def aggregate_results(results: List[dict], duration: float) -> Dict:
+    """
+    Consolida os resultados de vários arquivos em um único relatório
+
+    Args:
+        results: Resultados por arquivo
+        duration: Tempo total de parede em segundos
+
+    Returns:
+        Dicionário com totais
+    """
+    totals = {
+        "files": len(results),
+        "succeeded": sum(1 for result in results if result.get("status") == "success"),
+        "warnings": sum(1 for result in results if result.get("status") == "warning"),
+        "failed": sum(1 for result in results if result.get("status") == "error"),
+        "strings_processed": sum(result.get("strings_processed", 0) for result in results),
+        "unique_texts": sum(result.get("unique_texts", 0) for result in results),
+        "duration": round(duration, 4),
+        "sources": {},
+        "prefilter_skips": {},
+    }
+    for name in DELTA_COUNTERS:
+        totals[name] = sum(result["file_counters"].get(name, 0) for result in results)
+    stages = {}
+    skipped = totals["prefilter_skips"]
+    for result in results:
+        for source, counts in result.get("sources", {}).items():
+            totals["sources"][source] = totals["sources"].get(source, 0) + counts["keys"]
+        metrics = result.get("metrics", {})
+        for stage, seconds in metrics.get("stages", {}).items():
+            stages[stage] = stages.get(stage, 0.0) + seconds
+        for reason, count in metrics.get("prefilter_skips", {}).items():
+            skipped[reason] = skipped.get(reason, 0) + count
+    # Soma dos tempos por etapa de todos os arquivos (maior que a duração com vários processos)
+    totals["stages"] = {stage: round(seconds, 4) for stage, seconds in stages.items()}
+    return totals
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Backends de leitura/gravação de XML (lxml opcional, ElementTree da biblioteca padrão)
+"""
+
+import xml.etree.ElementTree as ET
+from typing import Dict, Type
+
+from ..utils.logger import get_logger
+
+
+class XMLBackend:
+    """Interface de um backend: parse e gravação de árvores compatíveis com ElementTree"""
+
+    name = "base"
+    # Preserva comentários, prefixos de namespace e espaços do original
+    preserves_formatting = False
+
+    def parse(self, file_path: str):
+        """Carrega o arquivo e retorna a árvore"""
+        raise NotImplementedError
+
+    def write(self, tree, output_path: str):
+        """Grava a árvore em UTF-8 com declaração XML"""
+        raise NotImplementedError
+
+
+class EtreeBackend(XMLBackend):
+    """
+    xml.etree.ElementTree (sempre disponível)
+
+    Descarta comentários e reescreve prefixos de namespace (ns0:); a saída
+    é a referência do modo streaming.
+    """
+
+    name = "etree"
+
+    def parse(self, file_path: str):
+        return ET.parse(file_path)
+
+    def write(self, tree, output_path: str):
+        tree.write(output_path, encoding='utf-8', xml_declaration=True)
+
+
+class LxmlBackend(XMLBackend):
+    """lxml: parser em C, preserva comentários, prefixos de namespace e espaços"""
+
+    name = "lxml"
+    preserves_formatting = True
+
+    def __init__(self):
+        """Importa o lxml (ImportError se não instalado)"""
+        from lxml import etree
+        self.etree = etree
+        self.parser = etree.XMLParser(remove_blank_text=False, remove_comments=False,
+                                      resolve_entities=False, huge_tree=True)
+
+    def parse(self, file_path: str):
+        try:
+            return self.etree.parse(file_path, self.parser)
+        except self.etree.XMLSyntaxError as e:
+            # Mesmo tipo de erro do backend padrão
+            raise ET.ParseError(str(e))
+
+    def write(self, tree, output_path: str):
+        tree.write(output_path, encoding='utf-8', xml_declaration=True)
+
+
+XML_BACKENDS: Dict[str, Type[XMLBackend]] = {
+    EtreeBackend.name: EtreeBackend,
+    LxmlBackend.name: LxmlBackend,
+}
+
+
+def create_backend(name: str = "auto") -> XMLBackend:
+    """
+    Cria o backend de XML pelo nome
+
+    Args:
+        name: etree, lxml ou auto (lxml quando instalado, senão etree)
+
+    Returns:
+        Instância do backend
+    """
+    if name == "auto":
+        try:
+            return LxmlBackend()
+        except ImportError:
+            return EtreeBackend()
+    try:
+        backend_class = XML_BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Backend de XML desconhecido: '{name}'. "
+            f"Disponíveis: auto, {', '.join(sorted(XML_BACKENDS))}"
+        )
+    try:
+        return backend_class()
+    except ImportError:
+        get_logger(__name__).warning(f"Backend '{name}' indisponível (lxml não instalado); "
+                                     f"usando etree")
+        return EtreeBackend()
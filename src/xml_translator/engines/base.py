@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interface comum dos motores de tradução
+"""
+
+from typing import List
+
+
+class EngineError(Exception):
+    """Erro lançado por um motor de tradução"""
+
+
+class EngineTimeout(EngineError, TimeoutError):
+    """Requisição ao motor sem resposta dentro do prazo"""
+
+
+class TranslationEngine:
+    """
+    Classe base dos motores de tradução
+
+    Subclasses implementam translate() e, quando o serviço aceita vários
+    segmentos por requisição, sobrescrevem translate_batch().
+    """
+
+    # Identificação do motor (usada na seleção e nas estatísticas)
+    name = "base"
+
+    # Capacidades declaradas
+    supports_batch = False
+    requires_network = False
+    deterministic = True
+    can_translate = True
+
+    # Limites declarados
+    max_concurrency = 1
+    max_batch_size = 1
+    max_batch_chars = 5000
+    default_rate_limit = 0.0
+    # Duração típica de uma requisição (segundos), usada no planejamento sem medições
+    expected_latency = 0.0
+    # Prazo padrão de cada requisição (segundos; None = sem prazo)
+    default_timeout = None
+
+    @property
+    def cache_namespace(self) -> str:
+        """Nome usado como chave do motor na memória de tradução"""
+        return self.name
+
+    def translate(self, text: str, src: str, dest: str) -> str:
+        """
+        Traduz um texto
+
+        Args:
+            text: Texto original
+            src: Idioma de origem
+            dest: Idioma de destino
+
+        Returns:
+            Texto traduzido
+        """
+        raise NotImplementedError
+
+    def translate_batch(self, texts: List[str], src: str, dest: str) -> List[str]:
+        """
+        Traduz vários textos em uma requisição
+
+        Args:
+            texts: Textos originais
+            src: Idioma de origem
+            dest: Idioma de destino
+
+        Returns:
+            Traduções na mesma ordem dos textos
+        """
+        return [self.translate(text, src, dest) for text in texts]
+
+    def get_capabilities(self) -> dict:
+        """
+        Retorna capacidades e limites declarados do motor
+
+        Returns:
+            Dicionário com capacidades
+        """
+        return {
+            "name": self.name,
+            "supports_batch": self.supports_batch,
+            "requires_network": self.requires_network,
+            "deterministic": self.deterministic,
+            "can_translate": self.can_translate,
+            "max_concurrency": self.max_concurrency,
+            "max_batch_size": self.max_batch_size,
+            "max_batch_chars": self.max_batch_chars,
+            "default_rate_limit": self.default_rate_limit,
+            "expected_latency": self.expected_latency,
+            "default_timeout": self.default_timeout,
+        }
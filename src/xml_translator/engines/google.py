@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motor de tradução Google Translate (googletrans)
+"""
+
+import threading
+from typing import List
+
+from .base import TranslationEngine
+
+
+class GoogleEngine(TranslationEngine):
+    """Motor de tradução baseado no googletrans"""
+
+    name = "google"
+    supports_batch = True
+    requires_network = True
+    deterministic = False
+    max_concurrency = 8
+    max_batch_size = 50
+    max_batch_chars = 4500
+    default_rate_limit = 10.0
+    expected_latency = 0.5
+    default_timeout = 15.0
+
+    def __init__(self):
+        """
+        Verifica se o googletrans está instalado (ImportError se não estiver)
+
+        O pacote (e sua pilha httpx) só é importado e o cliente só é criado na
+        primeira tradução: execuções resolvidas por overrides e memória de
+        tradução não pagam esse custo.
+        """
+        import importlib.util
+        if importlib.util.find_spec("googletrans") is None:
+            raise ImportError("No module named 'googletrans'")
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """Cliente googletrans (criado sob demanda)"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from googletrans import Translator
+                    self._client = Translator()
+        return self._client
+
+    def translate(self, text: str, src: str, dest: str) -> str:
+        return self.client.translate(text, src=src, dest=dest).text
+
+    def translate_batch(self, texts: List[str], src: str, dest: str) -> List[str]:
+        return [result.text for result in self.client.translate(texts, src=src, dest=dest)]
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motor de tradução local e determinístico (sem rede)
+"""
+
+import json
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .base import EngineError, TranslationEngine
+
+
+class LocalEngine(TranslationEngine):
+    """
+    Motor local baseado em dicionário, com eco para textos desconhecidos
+
+    Útil para testes, builds sem rede e para medir o custo do pipeline
+    separado da latência do motor real.
+    """
+
+    name = "local"
+    supports_batch = True
+    max_concurrency = 64
+    max_batch_size = 100
+    max_batch_chars = 20000
+
+    def __init__(
+        self,
+        dictionary: Optional[Dict[str, str]] = None,
+        dictionary_file: str = None,
+        prefix: str = "",
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+    ):
+        """
+        Inicializa o motor local
+
+        Args:
+            dictionary: Traduções conhecidas (texto original → tradução)
+            dictionary_file: Arquivo JSON com traduções conhecidas
+            prefix: Prefixo adicionado aos textos desconhecidos (eco)
+            latency: Latência simulada por requisição, em segundos
+            error_rate: Fração de textos (0-1) que falham, escolhidos de forma determinística
+        """
+        self.dictionary = dict(dictionary or {})
+        if dictionary_file:
+            with open(Path(dictionary_file), "r", encoding="utf-8") as f:
+                self.dictionary.update(json.load(f))
+        self.prefix = prefix
+        self.latency = latency
+        self.expected_latency = latency
+        self.error_rate = error_rate
+
+    def _translate_one(self, text: str) -> str:
+        """Traduz um texto sem simular latência"""
+        if self.error_rate and zlib.crc32(text.encode("utf-8")) % 10000 < self.error_rate * 10000:
+            raise EngineError(f"Falha simulada para '{text}'")
+        clean = text.strip()
+        if clean in self.dictionary:
+            return self.dictionary[clean]
+        return f"{self.prefix}{clean}"
+
+    def translate(self, text: str, src: str, dest: str) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._translate_one(text)
+
+    def translate_batch(self, texts: List[str], src: str, dest: str) -> List[str]:
+        if self.latency:
+            time.sleep(self.latency)
+        return [self._translate_one(text) for text in texts]
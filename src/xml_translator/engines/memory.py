@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motor "somente memória de tradução" (nunca chama serviços externos)
+"""
+
+from .base import EngineError, TranslationEngine
+
+
+class MemoryOnlyEngine(TranslationEngine):
+    """
+    Motor que apenas reaproveita overrides e a memória de tradução
+
+    Textos sem tradução conhecida são mantidos como original. A memória é
+    consultada no espaço do motor indicado em `source_engine`.
+    """
+
+    name = "memory"
+    can_translate = False
+    max_concurrency = 1
+
+    def __init__(self, source_engine: str = "google"):
+        """
+        Inicializa o motor somente memória
+
+        Args:
+            source_engine: Motor cujas traduções armazenadas serão reutilizadas
+        """
+        self.source_engine = source_engine
+
+    @property
+    def cache_namespace(self) -> str:
+        return self.source_engine
+
+    def translate(self, text: str, src: str, dest: str) -> str:
+        raise EngineError("Motor somente memória não realiza traduções")
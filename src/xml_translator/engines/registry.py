@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registro e seleção de motores de tradução
+"""
+
+from typing import Dict, Type
+
+from .base import TranslationEngine
+from .google import GoogleEngine
+from .local import LocalEngine
+from .memory import MemoryOnlyEngine
+
+
+ENGINES: Dict[str, Type[TranslationEngine]] = {
+    GoogleEngine.name: GoogleEngine,
+    LocalEngine.name: LocalEngine,
+    MemoryOnlyEngine.name: MemoryOnlyEngine,
+}
+
+
+def create_engine(name: str, **options) -> TranslationEngine:
+    """
+    Cria um motor de tradução pelo nome
+
+    Args:
+        name: Nome do motor (google, local, memory)
+        **options: Opções repassadas ao construtor do motor
+
+    Returns:
+        Instância do motor
+    """
+    try:
+        engine_class = ENGINES[name]
+    except KeyError:
+        raise ValueError(
+            f"Motor de tradução desconhecido: '{name}'. Disponíveis: {', '.join(sorted(ENGINES))}"
+        )
+    return engine_class(**options)
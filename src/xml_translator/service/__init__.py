@@ -0,0 +1,11 @@
+"""
+Modo serviço: tradutor residente acessado por HTTP/JSON local
+"""
+
+# Endereço padrão do serviço (aqui para que a linha de comando não importe o servidor)
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Token de acesso: gravado pelo servidor no diretório de configurações e enviado pelo cliente
+TOKEN_FILE = "service.token"
+TOKEN_HEADER = "X-Translator-Token"
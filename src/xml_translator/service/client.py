@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cliente do modo serviço (apenas biblioteca padrão)
+"""
+
+import json
+import os
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from . import DEFAULT_HOST, DEFAULT_PORT, TOKEN_FILE, TOKEN_HEADER
+
+# Endereço padrão do serviço (sobrescrito por XML_TRANSLATOR_SERVICE)
+DEFAULT_SERVICE_URL = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}"
+SERVICE_URL_ENV = "XML_TRANSLATOR_SERVICE"
+
+
+class ServiceError(Exception):
+    """Erro retornado pelo serviço ou falha de comunicação"""
+
+
+class ServiceUnavailable(ServiceError):
+    """Serviço parado ou inacessível"""
+
+
+class ServiceForbidden(ServiceError):
+    """Serviço recusou a requisição (token inválido ou caminho fora do diretório raiz)"""
+
+
+def read_token(config_dir: str) -> Optional[str]:
+    """
+    Lê o token gravado pelo serviço no diretório de configurações
+
+    Args:
+        config_dir: Diretório de configurações do serviço
+
+    Returns:
+        Token ou None se não houver serviço iniciado com esse diretório
+    """
+    try:
+        return (Path(config_dir) / TOKEN_FILE).read_text(encoding="utf-8").strip() or None
+    except OSError:
+        return None
+
+
+class ServiceClient:
+    """Cliente HTTP/JSON do serviço de tradução"""
+
+    def __init__(self, url: str = None, timeout: float = None, token: str = None):
+        """
+        Args:
+            url: Endereço do serviço (padrão: XML_TRANSLATOR_SERVICE ou DEFAULT_SERVICE_URL)
+            timeout: Tempo máximo de cada requisição em segundos (None = sem limite)
+            token: Token de acesso do serviço (ver read_token)
+        """
+        self.url = (url or os.environ.get(SERVICE_URL_ENV) or DEFAULT_SERVICE_URL).rstrip("/")
+        self.timeout = timeout
+        self.token = token
+
+    @classmethod
+    def discover(cls, config_dir: str, url: str = None,
+                 timeout: float = 0.3) -> Optional["ServiceClient"]:
+        """
+        Retorna um cliente se houver serviço ativo com o mesmo diretório de configurações
+
+        O token é lido de <config_dir>/service.token, gravado pelo serviço.
+
+        Args:
+            config_dir: Diretório de configurações que o chamador usaria
+            url: Endereço do serviço
+            timeout: Tempo máximo da verificação
+
+        Returns:
+            Cliente ou None (sem serviço, serviço de outra configuração ou inacessível)
+        """
+        probe = cls(url, timeout=timeout)
+        try:
+            health = probe.health()
+        except ServiceError:
+            return None
+        if health.get("config_dir") != str(Path(config_dir).resolve()):
+            return None
+        token = read_token(config_dir)
+        if token is None:
+            return None
+        return cls(probe.url, token=token)
+
+    def request(self, method: str, path: str, payload: Dict = None,
+                timeout: float = None) -> Dict:
+        """
+        Envia uma requisição JSON
+
+        Args:
+            method: GET ou POST
+            path: Rota (/health, /translate-file...)
+            payload: Corpo JSON
+            timeout: Sobrescreve o tempo máximo do cliente
+
+        Returns:
+            Resposta decodificada
+        """
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers[TOKEN_HEADER] = self.token
+        request = urllib.request.Request(self.url + path, data=data, method=method,
+                                         headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=timeout or self.timeout) as response:
+                return json.loads(response.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read().decode("utf-8")).get("message", str(e))
+            except ValueError:
+                message = str(e)
+            error = ServiceForbidden if e.code == 403 else ServiceError
+            raise error(message) from e
+        except (urllib.error.URLError, OSError) as e:
+            raise ServiceUnavailable(f"Serviço indisponível em {self.url}: {e}") from e
+        except ValueError as e:
+            raise ServiceError(f"Resposta inválida do serviço em {self.url}: {e}") from e
+
+    def health(self) -> Dict:
+        """Estado do serviço"""
+        return self.request("GET", "/health")
+
+    def stats(self) -> Dict:
+        """Estatísticas do tradutor residente"""
+        return self.request("GET", "/stats")
+
+    def translate_file(self, input_file: str, output_file: str = None, **options) -> Dict:
+        """
+        Traduz um arquivo no serviço (caminhos relativos ao diretório atual do cliente)
+
+        Args:
+            input_file: Arquivo de origem
+            output_file: Arquivo de saída (opcional)
+            **options: Opções de translate_file (streaming, target_cultures...)
+
+        Returns:
+            Resultado de XMLTranslator.translate_file
+        """
+        payload = {name: value for name, value in options.items() if value is not None}
+        payload["input_file"] = str(Path(input_file).resolve())
+        for name in ("output_file", "previous_source", "metrics_file"):
+            value = output_file if name == "output_file" else payload.get(name)
+            if value:
+                payload[name] = str(Path(value).resolve())
+        return self.request("POST", "/translate-file", payload)
+
+    def translate_strings(self, texts: List[str], target_culture: str = None) -> List[Dict]:
+        """
+        Traduz textos avulsos
+
+        Args:
+            texts: Textos originais
+            target_culture: Cultura de destino (padrão: a do serviço)
+
+        Returns:
+            Lista de {text, translation, source}
+        """
+        payload = {"texts": texts}
+        if target_culture:
+            payload["target_culture"] = target_culture
+        return self.request("POST", "/translate-strings", payload)["translations"]
+
+    def set_overrides(self, overrides: Dict[str, Optional[str]],
+                      target_culture: str = None) -> Dict:
+        """
+        Adiciona, altera ou remove overrides no serviço
+
+        Args:
+            overrides: {texto original: tradução ou None para remover}
+            target_culture: Cultura de destino (padrão: a do serviço)
+
+        Returns:
+            Quantidade de alterações e total de overrides
+        """
+        payload = {"overrides": overrides}
+        if target_culture:
+            payload["target_culture"] = target_culture
+        return self.request("POST", "/overrides", payload)
+
+    def reload_overrides(self) -> Dict:
+        """Força a releitura dos arquivos de overrides alterados"""
+        return self.request("POST", "/reload-overrides", {})
+
+    def shutdown(self) -> Dict:
+        """Encerra o serviço"""
+        return self.request("POST", "/shutdown", {})
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Servidor do modo serviço: mantém o XMLTranslator aquecido entre requisições
+"""
+
+import contextlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from . import DEFAULT_HOST, DEFAULT_PORT, TOKEN_FILE, TOKEN_HEADER
+from .. import __version__
+from ..core.budget import EngineCallBudget
+from ..core.translator import XMLTranslator
+from ..utils.config import DEFAULT_CULTURE
+from ..utils.logger import get_logger
+
+
+# Intervalo padrão da verificação de overrides alterados (segundos; 0 desativa)
+DEFAULT_RELOAD_INTERVAL = 2.0
+
+# Opções de translate_file aceitas pelo serviço
+FILE_OPTIONS = ("streaming", "incremental", "previous_source", "target_cultures",
+                "metrics_file", "checkpoint", "preserve_format")
+
+# Campos de /translate-file com caminhos (restritos ao diretório raiz do serviço)
+PATH_FIELDS = ("input_file", "output_file", "previous_source", "metrics_file")
+
+# Rotas atendidas sem token (usada pelo cliente para encontrar o serviço)
+PUBLIC_ROUTES = (("GET", "/health"),)
+
+
+class ServiceRequestError(Exception):
+    """Requisição inválida (resposta 400)"""
+
+
+class ServicePathError(ServiceRequestError):
+    """Caminho fora do diretório raiz do serviço (resposta 403)"""
+
+
+class TranslationService:
+    """
+    Tradutor residente
+
+    Overrides, memória de tradução, motor e culturas já usadas ficam em
+    memória; cada requisição roda em uma sessão própria (XMLTranslator.session),
+    então requisições simultâneas não compartilham estado de execução. Uma
+    thread de fundo recarrega os overrides quando os arquivos mudam.
+
+    Todas as rotas, exceto GET /health, exigem o token (cabeçalho
+    TOKEN_HEADER), gravado em <config_dir>/service.token para os clientes
+    locais, e os arquivos lidos e gravados ficam restritos ao diretório raiz
+    (service_root em settings.json; padrão: o diretório acima de config_dir).
+    """
+
+    def __init__(self, xml_translator: XMLTranslator, token: str = None, root: str = None):
+        """
+        Args:
+            xml_translator: Tradutor aquecido (cultura padrão)
+            token: Token de acesso (padrão: service_token do settings.json ou aleatório)
+            root: Diretório raiz dos arquivos (padrão: service_root ou pai de config_dir)
+        """
+        settings = xml_translator.translator.settings
+        self.xml_translator = xml_translator
+        self.config_dir = str(Path(xml_translator.options["config_dir"]).resolve())
+        self.token = token or settings.get("service_token") or secrets.token_urlsafe(32)
+        self.root = Path(root or settings.get("service_root")
+                         or Path(self.config_dir).parent).resolve()
+        self.token_file = Path(self.config_dir) / TOKEN_FILE
+        self.started = time.time()
+        self.requests = 0
+        self.active = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self.logger = get_logger(__name__)
+
+    def health(self) -> Dict:
+        """Identificação do serviço (usada pelo cliente para decidir se pode usá-lo)"""
+        translator = self.xml_translator.translator
+        return {
+            "status": "ok",
+            "version": __version__,
+            "pid": os.getpid(),
+            "config_dir": self.config_dir,
+            "engine": translator.engine_name,
+            "target_culture": self.xml_translator.target_culture,
+            "uptime": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "active": self.active,
+        }
+
+    def translate_file(self, payload: Dict) -> Dict:
+        """
+        Traduz um arquivo (mesmas opções de XMLTranslator.translate_file)
+
+        O prazo do motor (run_time_budget do settings.json) vale para cada
+        requisição, como na linha de comando.
+
+        Args:
+            payload: input_file, output_file (opcional) e opções de FILE_OPTIONS
+
+        Returns:
+            Resultado de translate_file (o progresso é impresso no console do serviço)
+        """
+        input_file = payload.get("input_file")
+        if not input_file:
+            raise ServiceRequestError("Campo obrigatório: input_file")
+        for name in PATH_FIELDS:
+            if payload.get(name):
+                self._check_path(name, payload[name])
+        options = {name: payload[name] for name in FILE_OPTIONS if payload.get(name) is not None}
+        # Mesmo padrão da linha de comando: culturas de settings.json
+        cultures = options.get("target_cultures") or (
+            self.xml_translator.translator.settings.get("target_cultures"))
+        options["target_cultures"] = list(dict.fromkeys(cultures or [DEFAULT_CULTURE]))
+        if payload.get("output_file") and len(options["target_cultures"]) > 1:
+            raise ServiceRequestError("output_file só pode ser usado com uma única "
+                                      "cultura de destino")
+        session = self._session(payload.get("target_culture"))
+        time_budget = self.xml_translator.translator.settings.get("run_time_budget")
+        if time_budget is not None:
+            session.set_call_budget(EngineCallBudget(time_budget=time_budget))
+        try:
+            return session.translate_file(input_file, payload.get("output_file"), **options)
+        finally:
+            session.release()
+
+    def translate_strings(self, payload: Dict) -> Dict:
+        """
+        Traduz textos avulsos (overrides, memória de tradução e motor)
+
+        Args:
+            payload: texts (lista) e target_culture (opcional)
+
+        Returns:
+            Dicionário com 'translations': [{text, translation, source}]
+        """
+        texts = payload.get("texts")
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            raise ServiceRequestError("Campo 'texts' deve ser uma lista de textos")
+        session = self._session(payload.get("target_culture"))
+        try:
+            results = session.translator.get_translations(texts)
+            session.translator.flush_cache()
+        finally:
+            session.release()
+        return {
+            "target_culture": session.target_culture,
+            "translations": [{"text": text, "translation": translation, "source": source}
+                             for text, (translation, source) in zip(texts, results)],
+        }
+
+    def set_overrides(self, payload: Dict) -> Dict:
+        """
+        Adiciona, altera ou remove overrides (null remove) sem reescrever o arquivo
+
+        Args:
+            payload: overrides ({texto original: tradução ou null}) e target_culture (opcional)
+
+        Returns:
+            Quantidade de alterações e total de overrides da cultura
+        """
+        changes = payload.get("overrides")
+        if not isinstance(changes, dict) or not all(
+                isinstance(value, str) or value is None for value in changes.values()):
+            raise ServiceRequestError("Campo 'overrides' deve mapear textos para traduções ou null")
+        translator = self._session(payload.get("target_culture")).translator
+        translator.set_overrides(changes)
+        return {"changed": len(changes), "overrides_count": len(translator.overrides)}
+
+    def reload_overrides(self) -> Dict:
+        """
+        Recarrega os overrides alterados de todas as culturas carregadas
+
+        Returns:
+            Alterações aplicadas por cultura
+        """
+        cultures = self.xml_translator._culture_translators
+        return {"reloaded": {culture: translator.translator.reload_overrides()
+                             for culture, translator in list(cultures.items())}}
+
+    def watch_overrides(self, interval: float = DEFAULT_RELOAD_INTERVAL):
+        """
+        Inicia a verificação periódica dos arquivos de overrides
+
+        Args:
+            interval: Intervalo entre verificações em segundos (<= 0 não inicia)
+        """
+        if interval <= 0 or self._watcher is not None:
+            return
+
+        def watch():
+            while not self._stop.wait(interval):
+                try:
+                    self.reload_overrides()
+                except Exception as e:
+                    self.logger.error(f"Erro ao verificar overrides: {e}")
+
+        self._watcher = threading.Thread(target=watch, name="overrides-watcher", daemon=True)
+        self._watcher.start()
+
+    def stats(self) -> Dict:
+        """Estatísticas do tradutor residente"""
+        return dict(self.health(), translator=self.xml_translator.translator.get_stats())
+
+    def _check_path(self, name: str, value) -> None:
+        """Exige caminho absoluto dentro do diretório raiz do serviço"""
+        if not isinstance(value, str) or not Path(value).is_absolute():
+            raise ServiceRequestError(f"{name} deve ser um caminho absoluto")
+        try:
+            Path(value).resolve().relative_to(self.root)
+        except ValueError:
+            raise ServicePathError(
+                f"{name} fora do diretório permitido ({self.root})") from None
+
+    def authorized(self, method: str, path: str, token: Optional[str]) -> bool:
+        """Indica se a requisição pode ser atendida (token correto ou rota pública)"""
+        if (method, path) in PUBLIC_ROUTES:
+            return True
+        return token is not None and hmac.compare_digest(token.encode("utf-8"),
+                                                         self.token.encode("utf-8"))
+
+    def write_token(self):
+        """Grava o token em <config_dir>/service.token, legível apenas pelo usuário"""
+        self.token_file.parent.mkdir(parents=True, exist_ok=True)
+        with contextlib.suppress(FileNotFoundError):
+            self.token_file.unlink()
+        fd = os.open(self.token_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(self.token)
+
+    def remove_token(self):
+        """Remove o arquivo do token se ainda for o deste serviço"""
+        with contextlib.suppress(OSError):
+            if self.token_file.read_text(encoding="utf-8") == self.token:
+                self.token_file.unlink()
+
+    def _session(self, culture: Optional[str]) -> XMLTranslator:
+        """Sessão da cultura pedida sobre o tradutor aquecido"""
+        translator = self.xml_translator
+        if culture and culture != translator.target_culture:
+            translator = translator.for_culture(culture)
+        return translator.session()
+
+    def handle(self, method: str, path: str, payload: Dict) -> Tuple[int, Dict]:
+        """
+        Despacha uma requisição
+
+        Args:
+            method: GET ou POST
+            path: Rota (/health, /stats, /translate-file, /translate-strings, /overrides...)
+            payload: Corpo JSON (POST)
+
+        Returns:
+            Tupla (status HTTP, resposta)
+        """
+        routes = {
+            ("GET", "/health"): self.health,
+            ("GET", "/stats"): self.stats,
+            ("POST", "/translate-file"): lambda: self.translate_file(payload),
+            ("POST", "/translate-strings"): lambda: self.translate_strings(payload),
+            ("POST", "/overrides"): lambda: self.set_overrides(payload),
+            ("POST", "/reload-overrides"): self.reload_overrides,
+        }
+        route = routes.get((method, path))
+        if route is None:
+            return HTTPStatus.NOT_FOUND, {"status": "error",
+                                          "message": f"Rota desconhecida: {path}"}
+
+        with self._lock:
+            self.requests += 1
+            self.active += 1
+        try:
+            return HTTPStatus.OK, route()
+        except ServicePathError as e:
+            return HTTPStatus.FORBIDDEN, {"status": "error", "message": str(e)}
+        except ServiceRequestError as e:
+            return HTTPStatus.BAD_REQUEST, {"status": "error", "message": str(e)}
+        except Exception as e:
+            self.logger.error(f"Erro ao atender {method} {path}: {e}")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"status": "error", "message": str(e)}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def close(self):
+        """Para a verificação de overrides, remove o token e grava as traduções pendentes"""
+        self._stop.set()
+        self.remove_token()
+        for translator in list(self.xml_translator._culture_translators.values()):
+            translator.translator.flush_cache()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Converte HTTP/JSON em chamadas ao TranslationService"""
+
+    server_version = f"xml-translator/{__version__}"
+
+    def do_GET(self):
+        if self._check_access("GET"):
+            self._dispatch("GET", {})
+
+    def do_POST(self):
+        # Exigir JSON impede POSTs "simples" enviados por páginas de outros sites
+        content_type = (self.headers.get("Content-Type") or "").split(";")[0].strip().lower()
+        if content_type != "application/json":
+            self._respond(HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+                          {"status": "error", "message": "Content-Type deve ser application/json"})
+            return
+        if not self._check_access("POST"):
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("o corpo deve ser um objeto JSON")
+        except ValueError as e:
+            self._respond(HTTPStatus.BAD_REQUEST,
+                          {"status": "error", "message": f"JSON inválido: {e}"})
+            return
+        if self.path == "/shutdown":
+            self._respond(HTTPStatus.OK, {"status": "stopping"})
+            # shutdown() espera o laço de serve_forever: precisa de outra thread
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+        self._dispatch("POST", payload)
+
+    def _check_access(self, method: str) -> bool:
+        """Responde 403 sem o token do serviço"""
+        if self.server.service.authorized(method, self.path, self.headers.get(TOKEN_HEADER)):
+            return True
+        self._respond(HTTPStatus.FORBIDDEN, {"status": "error", "message": "Token inválido"})
+        return False
+
+    def _dispatch(self, method: str, payload: Dict):
+        status, body = self.server.service.handle(method, self.path, payload)
+        self._respond(status, body)
+
+    def _respond(self, status: int, body: Dict):
+        data = json.dumps(body, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        self.server.service.logger.info(f"{self.address_string()} {format % args}")
+
+
+class ServiceHTTPServer(ThreadingHTTPServer):
+    """Servidor HTTP com uma thread por requisição"""
+
+    daemon_threads = True
+
+    def __init__(self, service: TranslationService, host: str = DEFAULT_HOST,
+                 port: int = DEFAULT_PORT):
+        self.service = service
+        super().__init__((host, port), _RequestHandler)
+
+
+def create_server(xml_translator: XMLTranslator, host: str = DEFAULT_HOST,
+                  port: int = DEFAULT_PORT) -> ServiceHTTPServer:
+    """
+    Cria o servidor do modo serviço (ainda sem atender) e grava o token de acesso
+
+    Args:
+        xml_translator: Tradutor aquecido
+        host: Endereço local
+        port: Porta (0 escolhe uma livre)
+
+    Returns:
+        Servidor pronto para serve()
+    """
+    server = ServiceHTTPServer(TranslationService(xml_translator), host, port)
+    server.service.write_token()
+    return server
+
+
+def serve(server: ServiceHTTPServer):
+    """
+    Atende requisições até POST /shutdown ou Ctrl-C e grava as traduções pendentes
+
+    Args:
+        server: Servidor criado por create_server
+    """
+    service = server.service
+    host, port = server.server_address[:2]
+    print(f"Serviço de tradução em http://{host}:{port} (config: {service.config_dir}); "
+          f"Ctrl-C para encerrar")
+    service.logger.info(f"Serviço iniciado em http://{host}:{port}")
+    settings = service.xml_translator.translator.settings
+    service.watch_overrides(settings.get("overrides_reload_interval", DEFAULT_RELOAD_INTERVAL))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        service.logger.info(f"Serviço encerrado após {service.requests} requisições")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Configurações gerais do tradutor (config/settings.json)
+"""
+
+import json
+from pathlib import Path
+
+from .logger import get_logger
+
+
+# Valores padrão (None = usar o padrão declarado pelo motor).
+# "engine_options" é indexado pelo nome do motor: {"local": {"latency": 0.05}}
+DEFAULT_SETTINGS = {
+    "engine": "google",
+    "engine_options": {},
+    "workers": 1,
+    "rate_limit": None,
+    "target_cultures": ["pt-BR"],
+    "culture_languages": {},
+    "xml_backend": "auto",
+    "preserve_format": False,
+}
+
+# Cultura de destino padrão (usa config/overrides.json)
+DEFAULT_CULTURE = "pt-BR"
+
+
+def load_settings(config_dir: str = "config") -> dict:
+    """
+    Carrega configurações do arquivo settings.json
+
+    Args:
+        config_dir: Diretório de configurações
+
+    Returns:
+        Configurações mescladas com os valores padrão
+    """
+    settings = {key: (value.copy() if isinstance(value, dict) else value)
+                for key, value in DEFAULT_SETTINGS.items()}
+    settings_file = Path(config_dir) / "settings.json"
+
+    try:
+        if settings_file.exists():
+            with open(settings_file, 'r', encoding='utf-8') as f:
+                settings.update(json.load(f))
+    except Exception as e:
+        get_logger(__name__).error(f"Erro ao carregar configurações de {settings_file}: {e}")
+
+    return settings
+
+
+def culture_language(culture: str, settings: dict = None) -> str:
+    """
+    Converte uma cultura (ex.: pt-BR) no código de idioma do motor (ex.: pt)
+
+    Args:
+        culture: Cultura de destino
+        settings: Configurações (mapa opcional "culture_languages")
+
+    Returns:
+        Código de idioma
+    """
+    mapping = (settings or {}).get("culture_languages") or {}
+    return mapping.get(culture, culture.split("-")[0].lower())
+
+
+def overrides_filename(culture: str) -> str:
+    """
+    Nome do arquivo de overrides de uma cultura
+
+    Args:
+        culture: Cultura de destino
+
+    Returns:
+        overrides.json para a cultura padrão, overrides.<cultura>.json para as demais
+    """
+    return "overrides.json" if culture == DEFAULT_CULTURE else f"overrides.{culture}.json"
+
+
+def glossary_filename(culture: str) -> str:
+    """
+    Nome do arquivo de glossário de uma cultura
+
+    Args:
+        culture: Cultura de destino
+
+    Returns:
+        glossary.json para a cultura padrão, glossary.<cultura>.json para as demais
+    """
+    return "glossary.json" if culture == DEFAULT_CULTURE else f"glossary.{culture}.json"
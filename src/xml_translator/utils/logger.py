@@ -4,38 +4,225 @@
 Sistema de logging para o tradutor XML
 """
 
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import threading
 from datetime import datetime
 from pathlib import Path
+from typing import List
 
 
-def setup_logging(log_dir: str = "logs") -> logging.Logger:
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(name)s - %(message)s'
+
+
+class DeferredFileHandler(logging.FileHandler):
+    """FileHandler que cria o diretório e abre o arquivo apenas no primeiro registro"""
+    
+    def __init__(self, filename: Path, encoding: str = 'utf-8'):
+        super().__init__(filename, encoding=encoding, delay=True)
+    
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
+
+class TextFormatter(logging.Formatter):
+    """Formato texto, com a contagem de repetições suprimidas (RepeatFilter)"""
+    
+    def __init__(self, fmt: str = LOG_FORMAT):
+        super().__init__(fmt)
+    
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            message += f" (+{suppressed} mensagens semelhantes suprimidas)"
+        return message
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Um objeto JSON por linha: time, level, logger, message e, se houver, suppressed/exception"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class RepeatFilter(logging.Filter):
+    """
+    Limita mensagens repetidas
+    
+    Mensagens com o mesmo logger, nível e modelo (o texto antes da
+    formatação, por isso os pontos críticos usam argumentos no estilo %)
+    passam no máximo `burst` vezes por janela de `interval` segundos. A
+    primeira mensagem da janela seguinte informa quantas foram suprimidas
+    e pending() devolve as que ainda não foram informadas.
+    """
+    
+    # Janelas guardadas antes de descartar as expiradas
+    MAX_KEYS = 2048
+    
+    def __init__(self, burst: int = 5, interval: float = 10.0):
+        """
+        Args:
+            burst: Mensagens iguais aceitas por janela
+            interval: Duração da janela em segundos
+        """
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.suppressed_total = 0
+        self._windows = {}
+        self._lock = threading.Lock()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, record.levelno, str(record.msg))
+        now = record.created
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                if window is not None and window[2]:
+                    record.suppressed = window[2]
+                if window is None and len(self._windows) >= self.MAX_KEYS:
+                    self._expire(now)
+                self._windows[key] = [now, 1, 0]
+                return True
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+            window[2] += 1
+            self.suppressed_total += 1
+            return False
+    
+    def _expire(self, now: float):
+        """Descarta janelas expiradas sem supressões pendentes"""
+        for key, window in list(self._windows.items()):
+            if now - window[0] >= self.interval and not window[2]:
+                del self._windows[key]
+    
+    def pending(self) -> List[logging.LogRecord]:
+        """Registros de resumo das supressões ainda não informadas (e zera as contagens)"""
+        records = []
+        with self._lock:
+            for (name, level, msg), window in self._windows.items():
+                if window[2]:
+                    record = logging.LogRecord(name, level, __file__, 0,
+                                               "Repetições suprimidas de: %s", (msg,), None)
+                    record.suppressed = window[2]
+                    records.append(record)
+                    window[2] = 0
+        return records
+
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enfileira registros para uma thread (QueueListener) que os formata e grava
+    
+    A thread que registra a mensagem paga apenas a criação do registro e o
+    enfileiramento: formatação e E/S de arquivo e console ficam na thread do
+    listener. Em um processo filho criado por fork (pool de --dir) a thread
+    do listener não existe, então os registros são gravados diretamente.
+    """
+    
+    def __init__(self, log_queue, handlers: List[logging.Handler]):
+        super().__init__(log_queue)
+        self.listener = logging.handlers.QueueListener(log_queue, *handlers,
+                                                       respect_handler_level=True)
+        self._pid = os.getpid()
+        self._stopped = False
+        self.listener.start()
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # A mensagem é montada na thread do listener (o registro não sai do processo)
+        return record
+    
+    def emit(self, record: logging.LogRecord):
+        if self._stopped or os.getpid() != self._pid:
+            self._handle_directly(record)
+        else:
+            super().emit(record)
+    
+    def _handle_directly(self, record: logging.LogRecord):
+        for handler in self.listener.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+    
+    def close(self):
+        """Esvazia a fila, grava o resumo das repetições suprimidas e encerra o listener"""
+        if not self._stopped and os.getpid() == self._pid:
+            self._stopped = True
+            self.listener.stop()
+            for log_filter in self.filters:
+                if isinstance(log_filter, RepeatFilter):
+                    for record in log_filter.pending():
+                        self._handle_directly(record)
+        super().close()
+
+
+def create_handlers(log_dir: str = "logs", json_lines: bool = False,
+                    stream=None) -> List[logging.Handler]:
+    """
+    Cria os handlers de arquivo e de console
+    
+    Args:
+        log_dir: Diretório onde salvar os logs
+        json_lines: Gravar o arquivo como JSON lines (.jsonl) em vez de texto
+        stream: Destino do console (padrão: sys.stderr)
+    
+    Returns:
+        Handlers de arquivo e de console
+    """
+    suffix = "jsonl" if json_lines else "log"
+    log_filename = Path(log_dir) / f"xml_translator_{datetime.now().strftime('%Y%m%d')}.{suffix}"
+    file_handler = DeferredFileHandler(log_filename)
+    file_handler.setFormatter(JsonLinesFormatter() if json_lines else TextFormatter())
+    console_handler = logging.StreamHandler(stream)
+    console_handler.setFormatter(TextFormatter())
+    return [file_handler, console_handler]
+
+
+def setup_logging(log_dir: str = "logs", json_lines: bool = False, repeat_burst: int = 5,
+                  repeat_interval: float = 10.0) -> logging.Logger:
     """
     Configura sistema de logging
     
+    O diretório e o arquivo de log são criados apenas quando o primeiro
+    registro é gravado, então execuções curtas não tocam o disco. A gravação
+    é assíncrona (AsyncQueueHandler) e mensagens repetidas são limitadas
+    (RepeatFilter). Como logging.basicConfig, não faz nada se o logger raiz
+    já tiver handlers.
+    
     Args:
         log_dir: Diretório onde salvar os logs
-        
+        json_lines: Gravar o arquivo como JSON lines
+        repeat_burst: Mensagens iguais aceitas por janela (<= 0 desativa o limite)
+        repeat_interval: Duração da janela de repetições em segundos
+    
     Returns:
         Logger configurado
     """
-    # Criar diretório de logs se não existir
-    log_path = Path(log_dir)
-    log_path.mkdir(exist_ok=True)
+    root = logging.getLogger()
+    if root.handlers:
+        return logging.getLogger(__name__)
     
-    # Nome do arquivo com data
-    log_filename = log_path / f"xml_translator_{datetime.now().strftime('%Y%m%d')}.log"
-    
-    # Configurar logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_filename, encoding='utf-8'),
-            logging.StreamHandler()
-        ]
-    )
+    handler = AsyncQueueHandler(queue.SimpleQueue(), create_handlers(log_dir, json_lines))
+    if repeat_burst > 0:
+        handler.addFilter(RepeatFilter(repeat_burst, repeat_interval))
+    root.setLevel(logging.INFO)
+    root.addHandler(handler)
     
     return logging.getLogger(__name__)
 
@@ -46,7 +233,7 @@ def get_logger(name: str = None) -> logging.Logger:
     
     Args:
         name: Nome do módulo
-        
+    
     Returns:
         Logger configurado
     """
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para o gerador de catálogos e o executor de benchmarks
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Adicionar src e benchmarks ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from catalog_generator import generate_catalog
+from run_benchmarks import run_scenario
+from xml_translator.core.translator import XMLTranslator
+
+
+class TestCatalogGenerator:
+    """Testes para o gerador de catálogos sintéticos"""
+
+    def test_generate_catalog(self, tmp_path):
+        """Testa número de strings, duplicatas e profundidade dos grupos"""
+        source = tmp_path / "catalog.xml"
+        info = generate_catalog(str(source), strings=120, duplicate_ratio=0.5, depth=3,
+                                group_size=50, seed=7)
+
+        translator = XMLTranslator(str(tmp_path), use_cache=False)
+        strings = translator.extract_strings(translator.load_xml(str(source)))
+        assert len(strings) == 120
+        assert len({string_data['text'] for string_data in strings}) == info["unique_texts"]
+        assert info["unique_texts"] < 120
+        assert strings[0]['path'] == "group[G0_0]/group[G0_1]/group[G0_2]/string"
+
+        # Mesma semente, mesmo arquivo
+        generate_catalog(str(tmp_path / "again.xml"), strings=120, duplicate_ratio=0.5,
+                         depth=3, group_size=50, seed=7)
+        assert (tmp_path / "again.xml").read_bytes() == source.read_bytes()
+
+
+class TestRunScenario:
+    """Testes para a execução de um cenário de benchmark"""
+
+    @pytest.mark.parametrize("mode", ["tree", "streaming", "stages", "xml_io", "memory", "fuzzy",
+                                      "logging", "tm"])
+    def test_run_scenario(self, mode):
+        """Testa que cada modo produz vazão, RSS e tempos por etapa"""
+        result = run_scenario({
+            "mode": mode,
+            "workers": 2,
+            "engine": {"latency": 0.0, "error_rate": 0.1},
+            "catalog": {"strings": 200, "duplicate_ratio": 0.3, "depth": 2,
+                        "text_length": 20, "seed": 1},
+        })
+
+        assert result["strings_per_second"] > 0
+        assert result["peak_rss_mb"] > 0
+        assert result["output_bytes"] > 0 or mode in ("memory", "fuzzy", "logging", "tm")
+        assert result["stages"]
+        if mode == "stages":
+            assert "process_translations_warm" in result["stages"]
+        if mode == "xml_io":
+            assert {"parse_etree", "write_etree", "write_in_place"} <= set(result["stages"])
+        if mode == "memory":
+            assert 0 < result["memory"]["records_mb"] < result["memory"]["legacy_records_mb"]
+        if mode == "fuzzy":
+            assert 0 < result["fuzzy"]["entries"] <= 200
+            assert result["fuzzy"]["near"]["p99_ms"] > 0
+        if mode == "logging":
+            logging_result = result["logging"]
+            # Repetições agrupadas: o caminho assíncrono grava muito menos linhas
+            assert 0 < logging_result["async"]["lines"] < logging_result["sync"]["lines"]
+            assert logging_result["async_json"]["lines"] == logging_result["async"]["lines"]
+        if mode == "tm":
+            assert result["tm"]["imported"] == result["tm"]["exported"] == 200
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
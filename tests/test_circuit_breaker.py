@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para o disjuntor do motor, prazos por requisição e orçamento de tempo
+"""
+
+import json
+import threading
+import time
+import pytest
+import sys
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from xml_translator.core.auto_translator import AutoTranslator
+from xml_translator.core.budget import EngineCallBudget
+from xml_translator.core.circuit_breaker import CircuitBreaker, call_with_timeout
+from xml_translator.engines.base import EngineError, EngineTimeout
+from xml_translator.engines.local import LocalEngine
+
+
+class FlakyEngine(LocalEngine):
+    """Motor local que pode ficar fora do ar (erro de conexão) ou travar"""
+
+    max_batch_size = 2
+
+    def __init__(self, **options):
+        super().__init__(prefix="pt:", **options)
+        self.down = False
+        self.hang = 0.0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def translate(self, text, src, dest):
+        return self.translate_batch([text], src, dest)[0]
+
+    def translate_batch(self, texts, src, dest):
+        with self._lock:
+            self.calls += 1
+        if self.hang:
+            time.sleep(self.hang)
+        if self.down:
+            raise ConnectionError("Conexão recusada")
+        return super().translate_batch(texts, src, dest)
+
+
+def make_translator(tmp_path, engine, **resilience) -> AutoTranslator:
+    options = {"failure_threshold": 2, "reset_timeout": 0.2, "recovery_rounds": 2,
+               "max_recovery_wait": 1.0}
+    options.update(resilience)
+    (tmp_path / "settings.json").write_text(json.dumps({"engine_resilience": options}),
+                                            encoding="utf-8")
+    return AutoTranslator(str(tmp_path), use_cache=False, rate_limit=0, engine=engine)
+
+
+class TestCircuitBreaker:
+    """Testes dos estados do disjuntor"""
+
+    def test_trip_and_probe(self):
+        """Testa abertura após falhas seguidas e a requisição de teste"""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+        assert breaker.allow()
+        assert not breaker.record_failure()
+        assert breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+        assert breaker.rejections == 1
+
+        time.sleep(0.06)
+        assert breaker.retry_in() == 0.0
+        assert breaker.allow()
+        # Apenas uma requisição de teste por vez
+        assert not breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.trips == 1
+
+        time.sleep(0.06)
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow()
+
+    def test_success_resets_count(self):
+        """Testa que falhas intercaladas com sucessos não abrem o disjuntor"""
+        breaker = CircuitBreaker(failure_threshold=2)
+        for _ in range(3):
+            breaker.record_failure()
+            breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_call_with_timeout(self):
+        """Testa o prazo de uma chamada bloqueante"""
+        assert call_with_timeout(1.0, lambda value: value * 2, 21) == 42
+        with pytest.raises(EngineTimeout):
+            call_with_timeout(0.05, time.sleep, 1.0)
+        with pytest.raises(ValueError):
+            call_with_timeout(1.0, int, "x")
+
+
+class TestEngineOutage:
+    """Testes do AutoTranslator com o motor indisponível"""
+
+    def test_breaker_stops_requests(self, tmp_path):
+        """Testa que o disjuntor aberto evita chamadas e esperas"""
+        engine = FlakyEngine()
+        engine.down = True
+        translator = make_translator(tmp_path, engine, recovery_rounds=0)
+        texts = [f"Message number {i}" for i in range(20)]
+
+        started = time.perf_counter()
+        assert translator.translate_batch(texts) == [None] * 20
+        assert time.perf_counter() - started < 1.0
+        # Os lotes com falha não são divididos: 2 falhas abrem o disjuntor
+        assert engine.calls == 2
+        stats = translator.get_stats()
+        assert stats["engine_failures"] == 2
+        assert stats["breaker_trips"] == 1
+        assert stats["breaker_rejections"] == 8
+        assert stats["deferred_texts"] == 20
+        assert stats["recovered_texts"] == 0
+
+    def test_deferred_texts_recovered(self, tmp_path):
+        """Testa que os textos adiados são traduzidos quando o motor volta"""
+        engine = FlakyEngine()
+        engine.down = True
+        translator = make_translator(tmp_path, engine)
+        threading.Timer(0.1, lambda: setattr(engine, "down", False)).start()
+
+        texts = [f"Message number {i}" for i in range(6)]
+        assert translator.translate_batch(texts) == [f"pt:{text}" for text in texts]
+        stats = translator.get_stats()
+        assert stats["breaker_state"] == CircuitBreaker.CLOSED
+        assert stats["recovered_texts"] == 6
+        assert stats["failure_seconds"] > 0
+
+    def test_timeout_counts_as_failure(self, tmp_path):
+        """Testa que uma requisição travada é abandonada no prazo"""
+        engine = FlakyEngine()
+        engine.hang = 1.0
+        translator = make_translator(tmp_path, engine, timeout=0.05, recovery_rounds=0)
+
+        started = time.perf_counter()
+        assert translator.translate_batch(["Open file", "Close file", "Save file"]) == [None] * 3
+        assert time.perf_counter() - started < 0.5
+        assert translator.engine_timeouts == 2
+        assert translator.breaker_trips == 1
+
+    def test_content_errors_still_split(self, tmp_path):
+        """Testa que erros de conteúdo não abrem o disjuntor"""
+        engine = FlakyEngine(error_rate=1.0)
+        translator = make_translator(tmp_path, engine)
+        assert translator.translate_batch(["Open file", "Close file"]) == [None, None]
+        assert engine.calls == 3
+        assert translator.engine_failures == 0
+        assert translator.breaker.state == CircuitBreaker.CLOSED
+        assert isinstance(EngineTimeout("x"), EngineError)
+
+    def test_text_in_error_is_not_throttling(self):
+        """Testa que números do texto citados no erro não parecem HTTP 429"""
+        assert not AutoTranslator.is_throttling_error(EngineError("Falha para 'Pedido 429'"))
+        assert not AutoTranslator.is_unavailable_error(EngineError("Falha para 'Pedido 429'"))
+        assert AutoTranslator.is_throttling_error(RuntimeError('Unexpected status code "429"'))
+        assert AutoTranslator.is_unavailable_error(EngineTimeout("Motor não respondeu"))
+
+    def test_time_budget(self, tmp_path):
+        """Testa que o motor não é chamado após o prazo da execução"""
+        engine = FlakyEngine()
+        translator = make_translator(tmp_path, engine)
+        translator.call_budget = EngineCallBudget(time_budget=0.05)
+        assert translator.translate_batch(["Open file"]) == ["pt:Open file"]
+
+        time.sleep(0.06)
+        assert translator.translate_batch(["Close file"]) == [None]
+        assert translator.get_translation("Save file") == ("Save file", "original")
+        assert engine.calls == 1
+        assert translator.budget_exhausted
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
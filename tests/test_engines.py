@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para os motores de tradução
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from xml_translator.core.auto_translator import AutoTranslator
+from xml_translator.core.translator import XMLTranslator
+from xml_translator.engines.base import EngineError
+from xml_translator.engines.local import LocalEngine
+from xml_translator.engines.registry import create_engine
+
+SAMPLE_XML = Path(__file__).parent.parent / "examples" / "sample_en.xml"
+
+
+class TestEngines:
+    """Testes para os motores disponíveis"""
+
+    def test_local_engine_dictionary_and_echo(self):
+        """Testa dicionário e eco com prefixo do motor local"""
+        engine = LocalEngine(dictionary={"Save": "Salvar"}, prefix="[pt] ")
+        assert engine.translate_batch(["Save", " Reports "], "en", "pt") == \
+            ["Salvar", "[pt] Reports"]
+
+    def test_local_engine_error_rate_is_deterministic(self):
+        """Testa falhas simuladas sempre nos mesmos textos"""
+        engine = LocalEngine(error_rate=0.5)
+        texts = [f"Text {i}" for i in range(50)]
+        failures = set()
+        for text in texts:
+            try:
+                engine.translate(text, "en", "pt")
+            except EngineError:
+                failures.add(text)
+        assert 0 < len(failures) < len(texts)
+        with pytest.raises(EngineError):
+            engine.translate(sorted(failures)[0], "en", "pt")
+
+    def test_create_engine_unknown(self):
+        """Testa erro para motor desconhecido"""
+        with pytest.raises(ValueError):
+            create_engine("unknown")
+
+    def test_engine_selected_by_settings(self, tmp_path):
+        """Testa seleção do motor e opções via settings.json"""
+        (tmp_path / "settings.json").write_text(json.dumps({
+            "engine": "local",
+            "engine_options": {"local": {"prefix": "pt:"}}
+        }), encoding="utf-8")
+        translator = AutoTranslator(str(tmp_path), use_cache=False)
+        assert translator.get_translation("Reports") == ("pt:Reports", "local")
+        assert translator.get_stats()["engine_capabilities"]["requires_network"] is False
+
+    def test_memory_engine_uses_stored_translations_only(self, tmp_path):
+        """Testa motor somente memória: cache reaproveitado, sem traduções novas"""
+        translator = AutoTranslator(str(tmp_path), engine="memory")
+        translator.cache.put("Reports", "en", "pt", "google", "Relatórios")
+        assert translator.get_translation("Reports") == ("Relatórios", "cache")
+        assert translator.get_translation("Analytics") == ("Analytics", "original")
+        assert translator.engine_requests == 0
+
+    def test_translate_file_offline(self, tmp_path):
+        """Testa pipeline completo sem rede com o motor local"""
+        translator = XMLTranslator(str(tmp_path), use_cache=False,
+                                   engine=LocalEngine(prefix="pt:"))
+        output = tmp_path / "sample_pt-BR.xml"
+        result = translator.translate_file(str(SAMPLE_XML), str(output))
+        assert result["status"] == "success"
+        assert result["engine"] == "local"
+        assert "pt:Dashboard" in output.read_text(encoding="utf-8")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
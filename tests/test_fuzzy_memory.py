@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para a memória de tradução aproximada (índice de trigramas)
+"""
+
+import json
+import logging
+import pytest
+import sys
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from xml_translator.core.auto_translator import AutoTranslator
+from xml_translator.core import fuzzy_memory
+from xml_translator.core.fuzzy_memory import FuzzyMemory, same_words
+from xml_translator.engines.local import LocalEngine
+
+
+SERVER = "Could not connect to the server, please try again"
+SERVER_PT = "Não foi possível conectar ao servidor, tente novamente"
+
+# Textos de significado oposto com trigramas quase iguais (similaridade >= 0.85)
+NEAR_MISSES = [
+    ("Click here to enable automatic updates for all installed applications",
+     "Click here to disable automatic updates for all installed applications"),
+    ("The selected customer records could not be exported to the spreadsheet",
+     "The selected customer records could be exported to the spreadsheet"),
+    ("All selected customer records were successfully exported",
+     "All selected customer records were successfully imported"),
+    ("Convert euros to dollars and back", "Convert dollars to euros and back"),
+]
+
+
+def write_settings(config_dir: Path, **options):
+    fuzzy = {"enabled": True}
+    fuzzy.update(options)
+    (config_dir / "settings.json").write_text(json.dumps({"fuzzy_memory": fuzzy}),
+                                              encoding="utf-8")
+
+
+class TestFuzzyMemory:
+    """Testes para FuzzyMemory"""
+
+    def setup_method(self):
+        self.memory = FuzzyMemory(threshold=0.85)
+        self.memory.add(SERVER, SERVER_PT, "memory")
+        self.memory.add("Delete the selected customer and supplier",
+                        "Excluir o cliente e o fornecedor selecionados", "override")
+
+    def test_near_duplicate(self):
+        """Testa que uma variação de pontuação encontra o texto indexado"""
+        match = self.memory.lookup("Could not connect to the server; please try again")
+        assert match.translation == SERVER_PT
+        assert match.origin == "memory"
+        assert 0.85 <= match.score < 1.0
+
+    def test_normalized_equal(self):
+        """Testa que caixa e pontuação das bordas não afetam a similaridade"""
+        match = self.memory.lookup("could not connect to the server, please try again?")
+        assert match.score == 1.0
+
+    def test_different_texts_not_matched(self):
+        """Testa que textos com outro significado ficam abaixo do limite"""
+        assert self.memory.lookup("Delete the selected customer and carrier") is None
+        assert self.memory.lookup("Could not find the file") is None
+
+    @pytest.mark.parametrize("indexed,query", NEAR_MISSES)
+    def test_changed_word_not_matched(self, indexed, query, monkeypatch):
+        """Testa que uma palavra trocada, a mais ou a menos impede o reaproveitamento"""
+        memory = FuzzyMemory(threshold=0.85)
+        memory.add(indexed, "tradução", "memory")
+        assert memory.lookup(query) is None
+        assert memory.lookup(indexed).score == 1.0
+
+        # Apenas a comparação de palavras separa os dois textos
+        monkeypatch.setattr(fuzzy_memory, "same_words", lambda source, key: True)
+        assert memory.lookup(query).score >= 0.85
+
+    def test_same_words(self):
+        """Testa a comparação de palavras e números"""
+        assert same_words("Delete the selected customer, and supplier",
+                          "delete the selected customer and supplier")
+        assert not same_words("Delete the selected customer and supplier",
+                              "delete the selected supplier and customer")
+        assert not same_words("Save the file", "save the files")
+        assert not same_words("Page 1 of 20", "page 20 of 1")
+
+    def test_swapped_words_not_matched(self):
+        """Testa que palavras em outra ordem não reaproveitam a tradução"""
+        memory = FuzzyMemory(threshold=0.85)
+        memory.add("Convert euros to dollars and back", "Converter euros em dólares e voltar",
+                   "memory")
+        assert memory.lookup("Convert dollars to euros and back") is None
+
+    def test_numbers_must_match(self):
+        """Testa que textos que diferem apenas em números não são reaproveitados"""
+        self.memory.add("Showing page 10 of 20 results", "Mostrando página 10 de 20 resultados",
+                        "memory")
+        assert self.memory.lookup("Showing page 10 of 21 results") is None
+
+    def test_short_texts_ignored(self):
+        """Testa que textos curtos não são indexados nem buscados"""
+        self.memory.add("Save", "Salvar", "memory")
+        assert self.memory.lookup("Save") is None
+        assert len(self.memory) == 2
+
+    def test_remove_and_replace(self):
+        """Testa remoção e substituição de entradas"""
+        self.memory.add(SERVER, "Falha ao conectar ao servidor, tente novamente", "override")
+        assert self.memory.lookup("Could not connect to the server; please try again").origin == \
+            "override"
+
+        self.memory.remove(SERVER.lower())
+        assert self.memory.lookup("Could not connect to the server; please try again") is None
+        assert len(self.memory) == 1
+
+    def test_stats(self):
+        """Testa estatísticas de buscas, acertos por procedência e similaridade"""
+        self.memory.lookup("Could not connect to the server; please try again")
+        self.memory.lookup("Delete the selected customer, and supplier")
+        self.memory.lookup("Unrelated message text")
+        stats = self.memory.get_stats()
+        assert stats["fuzzy_entries"] == 2
+        assert stats["fuzzy_lookups"] == 3
+        assert stats["fuzzy_hits"] == {"memory": 1, "override": 1}
+        assert 0.85 <= stats["fuzzy_score_min"] <= stats["fuzzy_score_avg"] < 1.0
+
+    def test_large_memory(self):
+        """Testa que a busca encontra o texto certo entre muitos parecidos"""
+        memory = FuzzyMemory(threshold=0.85)
+        for number in range(900):
+            words = " ".join(f"w{(number * 7 + i) % 997}" for i in range(4))
+            memory.add(f"Message {words} here", f"Mensagem {number}", "memory")
+        match = memory.lookup("Message w35 w36 w37 w38 - here")
+        assert match.translation == "Mensagem 5"
+
+
+class TestFuzzyTranslation:
+    """Testes da memória aproximada no AutoTranslator"""
+
+    def setup_method(self):
+        self.engine = LocalEngine(prefix="pt:")
+
+    def test_engine_results_reused(self, tmp_path, caplog):
+        """Testa que variações de textos já traduzidos não chamam o motor"""
+        write_settings(tmp_path)
+        translator = AutoTranslator(str(tmp_path), engine=self.engine)
+        assert translator.get_translation(SERVER)[1] == "local"
+
+        assert translator.get_translation(SERVER + "!") == (f"pt:{SERVER}!", "fuzzy")
+        with caplog.at_level(logging.INFO, logger="xml_translator"):
+            assert translator.get_translation(
+                "Could not connect to the server; please try again") == (f"pt:{SERVER}", "fuzzy")
+        assert translator.engine_requests == 1
+        assert translator.get_stats()["fuzzy_hits"] == {"memory": 2}
+        # Reaproveitamentos não exatos ficam registrados para revisão
+        assert "Tradução aproximada para revisar" in caplog.text
+
+    @pytest.mark.parametrize("indexed,query", NEAR_MISSES)
+    def test_near_misses_sent_to_engine(self, tmp_path, indexed, query):
+        """Testa que textos de significado oposto são traduzidos pelo motor"""
+        write_settings(tmp_path)
+        translator = AutoTranslator(str(tmp_path), engine=self.engine)
+        translator.get_translation(indexed)
+        assert translator.get_translation(query) == (f"pt:{query}", "local")
+        assert translator.get_stats()["fuzzy_hits"] == {}
+
+    def test_overrides_and_placeholders(self, tmp_path):
+        """Testa reaproveitamento de overrides e placeholders restaurados"""
+        write_settings(tmp_path)
+        (tmp_path / "overrides.json").write_text(json.dumps(
+            {"Delete the selected customer and supplier":
+             "Excluir o cliente e o fornecedor selecionados"}), encoding="utf-8")
+        translator = AutoTranslator(str(tmp_path), engine=self.engine)
+        assert translator.get_translation("Delete the selected customer, and supplier.") == \
+            ("Excluir o cliente e o fornecedor selecionados.", "fuzzy")
+
+        translator.get_translation("Unable to open {0} for writing to the disk")
+        assert translator.get_translation("Unable to open {1} for writing, to the disk") == \
+            ("pt:Unable to open {1} for writing to the disk", "fuzzy")
+        # Quantidade diferente de placeholders: a tradução não serve
+        assert translator.get_translation(
+            "Unable to open {0} and {1} for writing to the disk")[1] == "local"
+
+    def test_persistent_memory_loaded(self, tmp_path):
+        """Testa que traduções gravadas em execuções anteriores são indexadas"""
+        write_settings(tmp_path)
+        translator = AutoTranslator(str(tmp_path), engine=self.engine)
+        translator.get_translation("Export the monthly report now")
+        translator.flush_cache()
+
+        reloaded = AutoTranslator(str(tmp_path), engine=self.engine)
+        assert reloaded.get_translation("Export the monthly report, now") == \
+            ("pt:Export the monthly report now", "fuzzy")
+        assert reloaded.engine_requests == 0
+
+    def test_override_changes(self, tmp_path):
+        """Testa que overrides alterados substituem o que estava indexado"""
+        write_settings(tmp_path)
+        translator = AutoTranslator(str(tmp_path), engine=self.engine)
+        translator.get_translation("Synchronize all folders and files")
+        translator.set_overrides({"Synchronize all folders and files":
+                                  "Sincronizar todas as pastas e arquivos"})
+        assert translator.get_translation("Synchronize all folders, and files") == \
+            ("Sincronizar todas as pastas e arquivos", "fuzzy")
+
+        translator.set_overrides({"Synchronize all folders and files": None})
+        assert translator.get_translation("Synchronize all folders, and files")[1] == "local"
+
+    @pytest.mark.parametrize("options", [None, {"enabled": False}])
+    def test_disabled(self, tmp_path, options):
+        """Testa que a memória aproximada fica desativada por padrão e por settings.json"""
+        if options is not None:
+            (tmp_path / "settings.json").write_text(json.dumps({"fuzzy_memory": options}),
+                                                    encoding="utf-8")
+        translator = AutoTranslator(str(tmp_path), engine=self.engine)
+        translator.get_translation(SERVER)
+        assert translator.get_translation(
+            "Could not connect to the server; please try again")[1] == "local"
+        assert "fuzzy" not in translator.get_stats()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para o logging assíncrono, o limite de repetições e o formato JSON lines
+"""
+
+import io
+import json
+import logging
+import queue
+import threading
+import pytest
+import sys
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from xml_translator.utils.logger import (AsyncQueueHandler, JsonLinesFormatter, RepeatFilter,
+                                         TextFormatter, create_handlers)
+
+
+def make_record(msg: str, *args, created: float = 0.0, level: int = logging.WARNING):
+    record = logging.LogRecord("xml_translator.test", level, __file__, 1, msg, args, None)
+    record.created = created
+    return record
+
+
+class TestRepeatFilter:
+    """Testes para RepeatFilter"""
+
+    def test_burst_and_summary(self):
+        """Testa o limite por janela e a contagem informada na janela seguinte"""
+        repeat_filter = RepeatFilter(burst=2, interval=10.0)
+        passed = [repeat_filter.filter(make_record("Erro em '%s'", i, created=i)) for i in range(5)]
+        assert passed == [True, True, False, False, False]
+        # Outro modelo de mensagem não é afetado
+        assert repeat_filter.filter(make_record("Outra mensagem", created=1))
+
+        record = make_record("Erro em '%s'", 99, created=12)
+        assert repeat_filter.filter(record)
+        assert record.suppressed == 3
+        assert repeat_filter.suppressed_total == 3
+
+    def test_pending(self):
+        """Testa os registros de resumo das supressões não informadas"""
+        repeat_filter = RepeatFilter(burst=1, interval=10.0)
+        for i in range(4):
+            repeat_filter.filter(make_record("Mantido original para '%s'", i, created=i))
+        records = repeat_filter.pending()
+        assert len(records) == 1
+        assert records[0].suppressed == 3
+        assert "Mantido original" in records[0].getMessage()
+        assert repeat_filter.pending() == []
+
+
+class TestFormatters:
+    """Testes dos formatos texto e JSON lines"""
+
+    def test_json_lines(self):
+        """Testa os campos do registro em JSON"""
+        record = make_record("Erro na tradução de '%s': %s", "Olá", "falha")
+        record.suppressed = 2
+        entry = json.loads(JsonLinesFormatter().format(record))
+        assert entry["level"] == "WARNING"
+        assert entry["logger"] == "xml_translator.test"
+        assert entry["message"] == "Erro na tradução de 'Olá': falha"
+        assert entry["suppressed"] == 2
+        assert "time" in entry
+
+    def test_text_suffix(self):
+        """Testa a indicação de repetições suprimidas no formato texto"""
+        record = make_record("Mensagem")
+        record.suppressed = 4
+        assert TextFormatter().format(record).endswith(
+            "Mensagem (+4 mensagens semelhantes suprimidas)")
+
+
+class TestAsyncQueueHandler:
+    """Testes para AsyncQueueHandler"""
+
+    def test_records_written_by_listener(self, tmp_path):
+        """Testa gravação na thread do listener, resumo e esvaziamento ao fechar"""
+        console = io.StringIO()
+        handlers = create_handlers(str(tmp_path), json_lines=True, stream=console)
+        handler = AsyncQueueHandler(queue.SimpleQueue(), handlers)
+        handler.addFilter(RepeatFilter(burst=3, interval=60.0))
+
+        threads = []
+
+        class RecordingFormatter(JsonLinesFormatter):
+            def format(self, record):
+                threads.append(threading.current_thread())
+                return super().format(record)
+
+        handlers[0].setFormatter(RecordingFormatter())
+        logger = logging.getLogger("xml_translator.test_async")
+        logger.addHandler(handler)
+        logger.propagate = False
+        try:
+            for i in range(100):
+                logger.warning("Mantido original para '%s'", f"K{i}")
+        finally:
+            logger.removeHandler(handler)
+            handler.close()
+
+        lines = [json.loads(line) for path in tmp_path.glob("*.jsonl")
+                 for line in path.read_text(encoding="utf-8").splitlines()]
+        assert [line["message"] for line in lines[:3]] == \
+            [f"Mantido original para 'K{i}'" for i in range(3)]
+        assert lines[-1]["suppressed"] == 97
+        # Apenas o resumo final é gravado por quem fecha o handler
+        assert threading.current_thread() not in threads[:-1]
+        assert console.getvalue().count("Mantido original") == 4
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para a proteção de placeholders e marcação
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from xml_translator.core.auto_translator import AutoTranslator
+from xml_translator.core.masking import mask
+from xml_translator.engines.base import TranslationEngine
+
+
+class SentinelEngine(TranslationEngine):
+    """Motor falso que pode corromper as sentinelas"""
+
+    name = "sentinel"
+    supports_batch = True
+
+    def __init__(self, mangle=False):
+        self.texts = []
+        self.mangle = mangle
+
+    def translate(self, text, src, dest):
+        return self.translate_batch([text], src, dest)[0]
+
+    def translate_batch(self, texts, src, dest):
+        self.texts.extend(texts)
+        if self.mangle:
+            return [f"pt: {text.replace('⟦0⟧', '[0]')}" for text in texts]
+        # Motores às vezes reordenam e espaçam os tokens
+        return [f"pt: {text.replace('⟦1⟧', '⟦ 1 ⟧')}" for text in texts]
+
+
+class TestMask:
+    """Testes para mask/restore"""
+
+    def test_mask_and_restore(self):
+        """Testa placeholders, formatos, tags e entidades"""
+        masked = mask('Hello {0}, you have %d <b>new</b> messages &amp; %(count)s alerts')
+        assert masked.text == "Hello ⟦0⟧, you have ⟦1⟧ ⟦2⟧new⟦3⟧ messages ⟦4⟧ ⟦5⟧ alerts"
+        assert masked.restore("Olá ⟦0⟧, ⟦ 1 ⟧ ⟦2⟧novas⟦3⟧ ⟦4⟧ ⟦5⟧") == (
+            "Olá {0}, %d <b>novas</b> &amp; %(count)s")
+
+    @pytest.mark.parametrize("translation", [
+        "Olá ⟦0⟧ ⟦0⟧",     # duplicada
+        "Olá",             # perdida
+        "Olá ⟦0⟧ ⟦7⟧",     # inventada
+    ])
+    def test_restore_rejects_broken_output(self, translation):
+        """Testa rejeição de sentinelas perdidas, duplicadas ou inventadas"""
+        assert mask("Hello {0}").restore(translation) is None
+
+    def test_variants_share_template(self):
+        """Testa que variantes de placeholders e atributos geram o mesmo texto mascarado"""
+        assert mask("Hello {0}").text == mask("Hello {name}").text
+        assert (mask('<a href="/a">Open</a> file').text
+                == mask('<a href="/b">Open</a> file').text)
+        assert not mask("{0} %s").translatable
+
+
+class TestAutoTranslatorMasking:
+    """Testes de integração com o AutoTranslator"""
+
+    def test_variants_translated_once_and_cached(self, tmp_path):
+        """Testa uma única requisição para variantes e reuso pela memória de tradução"""
+        translator = AutoTranslator(str(tmp_path), engine=SentinelEngine())
+        engine = translator.translator
+        texts = ["Delete {0} of {1} items", "Delete {a} of {b} items", "{0}"]
+
+        results = translator.get_translations(texts)
+
+        assert engine.texts == ["Delete ⟦0⟧ of ⟦1⟧ items"]
+        assert results == [
+            ("pt: Delete {0} of {1} items", "sentinel"),
+            ("pt: Delete {a} of {b} items", "sentinel"),
+            ("{0}", "original"),
+        ]
+        assert translator.get_translation("Delete %s of %d items") == (
+            "pt: Delete %s of %d items", "cache")
+
+    def test_broken_output_not_cached(self, tmp_path):
+        """Testa que respostas com placeholders corrompidos não são usadas nem memorizadas"""
+        translator = AutoTranslator(str(tmp_path), engine=SentinelEngine(mangle=True))
+
+        assert translator.get_translations(["Hello {0}"]) == [("Hello {0}", "original")]
+        assert translator.get_translation("Hello {0}") == ("Hello {0}", "original")
+        assert translator.get_stats()["mask_failures"] == 2
+        assert len(translator.cache) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para as métricas de execução
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from xml_translator.core.metrics import LatencyRecorder, percentile
+from xml_translator.core.translator import XMLTranslator
+from xml_translator.engines.local import LocalEngine
+
+
+class TestLatency:
+    """Testes para percentis de latência"""
+
+    def test_percentile_nearest_rank(self):
+        """Testa percentis pelo posto mais próximo"""
+        samples = [float(value) for value in range(1, 101)]
+        assert percentile(samples, 50) == 50.0
+        assert percentile(samples, 95) == 95.0
+        assert percentile(samples, 99) == 99.0
+        assert percentile([], 50) == 0.0
+
+    def test_summary_from_start(self):
+        """Testa resumo considerando apenas as amostras da execução"""
+        recorder = LatencyRecorder()
+        for seconds in (1.0, 0.010, 0.020, 0.030):
+            recorder.record(seconds)
+        summary = recorder.summary(start=1)
+        assert summary["count"] == 3
+        assert summary["p50_ms"] == 20.0
+        assert summary["max_ms"] == 30.0
+
+    def test_bounded_samples(self):
+        """Testa que apenas as amostras mais recentes são guardadas"""
+        recorder = LatencyRecorder(max_samples=100)
+        for i in range(1000):
+            recorder.record(i / 1000)
+        assert len(recorder) == 1000
+        assert len(recorder._samples) == 100
+        summary = recorder.summary()
+        assert summary["count"] == 1000
+        assert summary["p50_ms"] == 949.0
+        assert recorder.summary(start=995)["count"] == 5
+        assert recorder.summary(start=995)["max_ms"] == 999.0
+
+        other = LatencyRecorder()
+        other.record(2.0)
+        recorder.merge(other)
+        assert len(recorder) == 1001
+        assert recorder.summary()["max_ms"] == 2000.0
+
+
+class TestRunMetrics:
+    """Testes para as métricas de translate_file"""
+
+    def test_translate_file_reports_metrics(self, tmp_path):
+        """Testa tempos por etapa, latência e taxas de acerto no resultado e no JSON"""
+        (tmp_path / "overrides.json").write_text('{"Save": "Salvar"}', encoding="utf-8")
+        source = tmp_path / "catalog.xml"
+        source.write_text('<localization culture="en"><group name="G">'
+                          '<string key="k1">Save</string><string key="k2">Reports</string>'
+                          '</group></localization>', encoding="utf-8")
+        translator = XMLTranslator(str(tmp_path), engine=LocalEngine(prefix="pt:"))
+        metrics_file = tmp_path / "metrics.json"
+
+        result = translator.translate_file(str(source), metrics_file=str(metrics_file))
+
+        metrics = result["metrics"]
+        assert set(metrics["stages"]) >= {"load_xml", "extract_strings", "process_translations",
+                                          "apply_translations", "save_xml"}
+        assert metrics["engine_requests"] == 1
+        assert metrics["engine_latency"]["count"] == 1
+        assert metrics["override_hit_rate"] == 0.5
+        assert metrics["cache_misses"] == 1
+        assert json.loads(metrics_file.read_text(encoding="utf-8"))["stages"] == metrics["stages"]
+
+        # Segunda execução: o texto traduzido vem da memória de tradução
+        metrics = translator.translate_file(str(source))["metrics"]
+        assert metrics["engine_requests"] == 0
+        assert metrics["engine_latency"]["count"] == 0
+        assert metrics["cache_hit_rate"] == 1.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
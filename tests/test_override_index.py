@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para o índice compilado de overrides
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from xml_translator.core.auto_translator import AutoTranslator
+from xml_translator.core.override_index import OverrideIndex, normalize_key
+
+
+OVERRIDES = {
+    "Settings": "Definições",
+    "Save": "Salvar",
+    "Cancel": "Cancelar",
+    "Loading data...": "A carregar dados...",
+    "Delete {0} items": "Excluir {0} itens",
+    "%(user)s logged in": "%(user)s entrou",
+}
+
+
+class TestOverrideIndex:
+    """Testes para OverrideIndex"""
+
+    def setup_method(self):
+        self.index = OverrideIndex(OVERRIDES, {"Customer": "Cliente", "Report": "Relatório"})
+
+    def test_normalize_key(self):
+        """Testa normalização de caixa, espaços e pontuação nas bordas"""
+        assert normalize_key("  Settings:  ") == "settings"
+        assert normalize_key("Loading   data...") == "loading data"
+
+    @pytest.mark.parametrize("text,expected", [
+        ("Settings", ("Definições", "exact")),
+        ("Settings:", ("Definições:", "normalized")),
+        ("SETTINGS", ("DEFINIÇÕES", "normalized")),
+        ("loading data", ("a carregar dados", "normalized")),
+        ("Delete 12 items", ("Excluir 12 itens", "template")),
+        ("Alice logged in", ("Alice entrou", "template")),
+        ("Save / Cancel", ("Salvar / Cancelar", "glossary")),
+        ("Customer - Report:", ("Cliente - Relatório:", "glossary")),
+    ])
+    def test_lookup(self, text, expected):
+        """Testa cada tipo de correspondência"""
+        assert self.index.lookup(text) == expected
+
+    @pytest.mark.parametrize("text", ["Customer Report", "Saved", "Save the file", "Nothing"])
+    def test_no_partial_translation(self, text):
+        """Testa que frases não são traduzidas palavra por palavra"""
+        assert self.index.lookup(text) is None
+
+    def test_many_glossary_rules(self):
+        """Testa glossário grande: termos sobrepostos e prefixos comuns"""
+        glossary = {f"term {i}": f"termo {i}" for i in range(20000)}
+        glossary["term 1 extended"] = "termo 1 estendido"
+        index = OverrideIndex({}, glossary)
+        assert index.lookup("term 1 extended; term 19999") == (
+            "termo 1 estendido; termo 19999", "glossary")
+
+
+class TestAutoTranslatorOverrides:
+    """Testes de integração com o AutoTranslator"""
+
+    def test_index_absorbs_variants(self, tmp_path):
+        """Testa overrides normalizados e glossário por cultura sem chamar o motor"""
+        (tmp_path / "overrides.json").write_text('{"Settings": "Definições"}', encoding="utf-8")
+        (tmp_path / "glossary.json").write_text('{"Reports": "Relatórios"}', encoding="utf-8")
+        translator = AutoTranslator(str(tmp_path), use_cache=False, engine="memory")
+
+        assert translator.get_translation("settings:") == ("definições:", "override")
+        assert translator.get_translation("Settings | Reports") == (
+            "Definições | Relatórios", "override")
+        stats = translator.get_stats()
+        assert stats["glossary_terms"] == 1
+        assert stats["override_matches"]["glossary"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
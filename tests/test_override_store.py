@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para o armazenamento de overrides (log incremental e recarga a quente)
+"""
+
+import json
+import os
+import pytest
+import sys
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from xml_translator.core.auto_translator import AutoTranslator
+from xml_translator.core.override_store import OverrideStore
+from xml_translator.engines.local import LocalEngine
+
+
+def write_json(path: Path, data: dict):
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    # Garante mtime diferente mesmo em sistemas de arquivos com baixa resolução
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestOverrideStore:
+    """Testes para OverrideStore"""
+
+    def test_append_and_load(self, tmp_path):
+        """Testa que o log de alterações é aplicado sobre o arquivo base"""
+        base = tmp_path / "overrides.json"
+        write_json(base, {"Save": "Salvar", "Open": "Abrir"})
+        store = OverrideStore(base)
+        overrides = store.load()
+
+        overrides.update({"Close": "Fechar"})
+        del overrides["Open"]
+        store.append({"Close": "Fechar", "Open": None}, overrides)
+
+        assert json.loads(base.read_text(encoding="utf-8")) == {"Save": "Salvar", "Open": "Abrir"}
+        assert store.delta_file.name == "overrides.delta.jsonl"
+        assert OverrideStore(base).load() == {"Save": "Salvar", "Close": "Fechar"}
+
+    def test_compaction(self, tmp_path):
+        """Testa a incorporação do log ao arquivo base"""
+        base = tmp_path / "overrides.json"
+        store = OverrideStore(base, compact_every=3)
+        overrides = {}
+        for number in range(3):
+            overrides[f"Item {number}"] = f"Item {number} pt"
+            store.append({f"Item {number}": f"Item {number} pt"}, overrides)
+
+        assert not store.delta_file.exists()
+        assert json.loads(base.read_text(encoding="utf-8")) == overrides
+        assert not store.changed()
+
+    def test_refresh_reads_only_new_lines(self, tmp_path):
+        """Testa que a releitura aplica apenas o que mudou"""
+        base = tmp_path / "overrides.json"
+        write_json(base, {"Save": "Salvar"})
+        store = OverrideStore(base)
+        overrides = store.load()
+        assert store.refresh(overrides) is None
+
+        # Outro processo acrescenta ao log; a última linha ainda está incompleta
+        with open(store.delta_file, "a", encoding="utf-8") as f:
+            f.write('{"source": "Save", "translation": "Gravar"}\n{"source": "Op')
+        assert store.refresh(overrides) == {"Save": "Gravar"}
+
+        # Arquivo base editado: releitura completa, o log continua valendo por cima
+        write_json(base, {"Open": "Abrir"})
+        assert store.refresh({"Save": "Gravar"}) == {"Open": "Abrir"}
+
+
+class TestOverridesHotReload:
+    """Testes da recarga de overrides no AutoTranslator"""
+
+    def setup_method(self):
+        self.engine = LocalEngine(prefix="pt:")
+
+    def test_reload_after_file_edit(self, tmp_path):
+        """Testa que a edição do arquivo é aplicada sem recriar o tradutor"""
+        write_json(tmp_path / "overrides.json", {"Save": "Salvar"})
+        translator = AutoTranslator(str(tmp_path), engine=self.engine)
+        assert translator.get_translation("Save") == ("Salvar", "override")
+        assert translator.reload_overrides() == 0
+
+        write_json(tmp_path / "overrides.json", {"Save": "Gravar", "Open": "Abrir"})
+        assert translator.reload_overrides() == 2
+        assert translator.get_translation("Save") == ("Gravar", "override")
+        assert translator.get_translation("Open:") == ("Abrir:", "override")
+
+    def test_set_overrides_invalidates_engine_results(self, tmp_path):
+        """Testa que overrides novos removem da memória as traduções do motor"""
+        translator = AutoTranslator(str(tmp_path), engine=self.engine)
+        assert translator.get_translation("Export Data") == ("pt:Export Data", "local")
+        translator.flush_cache()
+
+        translator.set_overrides({"Export Data": "Exportar dados"})
+        assert translator.get_translation("Export Data") == ("Exportar dados", "override")
+        assert len(translator.cache) == 0
+
+        # Removido o override, o texto volta ao motor em vez de usar a tradução antiga
+        translator.set_overrides({"Export Data": None})
+        assert translator.get_translation("Export Data") == ("pt:Export Data", "local")
+
+        reloaded = AutoTranslator(str(tmp_path), engine=self.engine)
+        assert reloaded.list_overrides() == {}
+
+    def test_glossary_reload(self, tmp_path):
+        """Testa que mudanças no glossário também são recarregadas"""
+        translator = AutoTranslator(str(tmp_path), engine=self.engine)
+        write_json(tmp_path / "glossary.json", {"Customer": "Cliente", "Report": "Relatório"})
+        translator.reload_overrides()
+        assert translator.get_translation("Customer / Report") == \
+            ("Cliente / Relatório", "override")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para o planejamento de execuções (custo estimado sem chamar o motor)
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Adicionar src ao path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT))
+
+from main import main
+from xml_translator.core.planner import (budget_overruns, estimate_seconds, parts_needed,
+                                         recorded_latency, split_by_budget)
+from xml_translator.core.translator import XMLTranslator
+from xml_translator.engines.local import LocalEngine
+
+
+class CountingEngine(LocalEngine):
+    """Motor local que conta as requisições recebidas"""
+
+    max_batch_size = 2
+
+    def __init__(self, **options):
+        super().__init__(prefix="pt:", **options)
+        self.requests = 0
+
+    def translate_batch(self, texts, src, dest):
+        self.requests += 1
+        return super().translate_batch(texts, src, dest)
+
+
+def write_catalog(path: Path, texts: list):
+    strings = "\n".join(f'  <string key="K{i}">{text}</string>' for i, text in enumerate(texts))
+    path.write_text(f'<?xml version="1.0" encoding="utf-8"?>\n<localization>\n{strings}\n'
+                    f'</localization>\n', encoding="utf-8")
+
+
+class TestEstimates:
+    """Testes das funções de estimativa e orçamento"""
+
+    def test_estimate_seconds(self):
+        """Testa os limites de concorrência e de taxa"""
+        assert estimate_seconds(0, 1.0, 4, 10.0) == 0.0
+        assert estimate_seconds(8, 0.5, 4, 0.0) == 1.0
+        # 4 fichas iniciais, depois 2 requisições por segundo
+        assert estimate_seconds(24, 0.1, 4, 2.0) == 10.0
+
+    def test_budget_and_split(self):
+        """Testa orçamento excedido, partes necessárias e divisão por arquivo"""
+        plans = [{"input_file": name, "engine_calls": calls, "engine_chars": calls * 100}
+                 for name, calls in (("a", 20), ("b", 15), ("c", 40), ("d", 5))]
+        limits = {"engine_calls": 30}
+        assert budget_overruns(plans[0], limits) == []
+        assert budget_overruns(plans[2], limits) == ["engine_calls 40 > 30"]
+        assert parts_needed(plans[2], {"engine_calls": 30, "engine_chars": 1000}) == 4
+
+        parts = split_by_budget(plans, limits)
+        assert [[plan["input_file"] for plan in part] for part in parts] == \
+            [["a"], ["b"], ["c"], ["d"]]
+        assert len(split_by_budget(plans, {"engine_calls": 100})) == 1
+
+    def test_recorded_latency(self, tmp_path):
+        """Testa a latência média lida de métricas de arquivo e de diretório"""
+        single = tmp_path / "file.json"
+        single.write_text(json.dumps({"engine_latency": {"count": 4, "mean_ms": 250.0}}))
+        tree = tmp_path / "tree.json"
+        tree.write_text(json.dumps({"files": {
+            "a.xml": {"engine_latency": {"count": 1, "mean_ms": 100.0}},
+            "b.xml": {"engine_latency": {"count": 3, "mean_ms": 500.0}},
+            "c.xml": {"engine_latency": {"count": 0, "mean_ms": 0.0}}}}))
+        assert recorded_latency(str(single)) == 0.25
+        assert recorded_latency(str(tree)) == 0.4
+        assert recorded_latency(str(tmp_path / "missing.json")) is None
+
+
+class TestPlanFile:
+    """Testes de XMLTranslator.plan_file"""
+
+    def setup_method(self):
+        self.engine = CountingEngine(latency=0.2)
+
+    def make_translator(self, tmp_path) -> XMLTranslator:
+        (tmp_path / "overrides.json").write_text(json.dumps({"Save": "Salvar"}), encoding="utf-8")
+        (tmp_path / "settings.json").write_text(json.dumps({"fuzzy_memory": {"enabled": True}}),
+                                                encoding="utf-8")
+        return XMLTranslator(str(tmp_path), engine=self.engine, workers=2, rate_limit=0)
+
+    def test_classification_without_engine_calls(self, tmp_path):
+        """Testa a classificação de cada texto sem nenhuma requisição ao motor"""
+        translator = self.make_translator(tmp_path)
+        translator.translator.get_translation("Export the monthly report now")
+        translator.translator.flush_cache()
+        requests = self.engine.requests
+        stats = translator.translator.get_stats()
+
+        source = tmp_path / "catalog.xml"
+        write_catalog(source, ["Save", "Save", "Export the monthly report now",
+                               "Export the monthly report, now", "https://example.com", "Open file",
+                               "Close file", "Print {0}", "Print {1}"])
+        plan = translator.plan_file(str(source))
+
+        sources = plan["cultures"]["pt-BR"]["sources"]
+        assert sources["override"] == {"keys": 2, "unique": 1}
+        assert sources["cache"]["unique"] == 1
+        assert sources["fuzzy"]["unique"] == 1
+        assert sources["skipped"]["unique"] == 1
+        assert sources["engine"]["unique"] == 4
+        # "Print {0}" e "Print {1}" compartilham a requisição; lotes de 2 textos
+        assert plan["engine_texts"] == 3
+        assert plan["engine_calls"] == 2
+        assert plan["engine_chars"] == len("Open file") + len("Close file") + len("Print ⟦0⟧")
+        assert plan["estimated_seconds"] == pytest.approx(0.2, abs=0.05)
+        assert plan["cultures"]["pt-BR"]["latency_source"] == "measured"
+
+        # Nada foi traduzido nem contabilizado
+        assert self.engine.requests == requests
+        after = translator.translator.get_stats()
+        for name in ("cache_hits", "cache_misses", "override_matches", "prefilter_skips",
+                     "fuzzy_lookups", "fuzzy_hits"):
+            assert after[name] == stats[name]
+
+    def test_declared_latency_and_cultures(self, tmp_path):
+        """Testa a latência declarada pelo motor e o plano por cultura"""
+        translator = self.make_translator(tmp_path)
+        source = tmp_path / "catalog.xml"
+        write_catalog(source, ["Open file", "Close file", "Save"])
+
+        plan = translator.plan_file(str(source), target_cultures=["pt-BR", "es-ES"])
+        assert set(plan["cultures"]) == {"pt-BR", "es-ES"}
+        assert plan["cultures"]["es-ES"]["sources"]["engine"]["unique"] == 3
+        assert plan["cultures"]["pt-BR"]["latency_source"] == "engine"
+        assert plan["engine_calls"] == 1 + 2
+        assert self.engine.requests == 0
+
+    def test_preview_does_not_call_engine(self, tmp_path):
+        """Testa que o preview mostra apenas traduções conhecidas"""
+        translator = self.make_translator(tmp_path)
+        source = tmp_path / "catalog.xml"
+        write_catalog(source, ["Save", "Open file"])
+
+        preview = translator.get_translation_preview(str(source))
+        assert [(item["translation"], item["source"]) for item in preview] == \
+            [("Salvar", "override"), (None, "engine")]
+        assert self.engine.requests == 0
+
+
+class TestPlanCli:
+    """Testes de --plan e --over-budget na linha de comando"""
+
+    def run(self, tmp_path, *args) -> int:
+        (tmp_path / "settings.json").write_text(json.dumps({"engine_options": {"local": {
+            "prefix": "pt:"}}, "rate_limit": 0}), encoding="utf-8")
+        return main(list(args) + ["--config-dir", str(tmp_path), "--engine", "local",
+                                  "--no-service"])
+
+    def test_plan_exit_code(self, tmp_path, capsys):
+        """Testa que --plan não traduz e sinaliza orçamento excedido"""
+        source = tmp_path / "catalog.xml"
+        write_catalog(source, [f"Message number {i}" for i in range(150)])
+
+        assert self.run(tmp_path, str(source), "--plan") == 0
+        # Lotes de até 50 textos (AutoTranslator.MAX_BATCH_SIZE)
+        assert "150 textos, 3 requisições" in capsys.readouterr().out
+        assert self.run(tmp_path, str(source), "--plan", "--max-engine-calls", "1") == 2
+        assert not (tmp_path / "catalog_pt-BR.xml").exists()
+
+    def test_budget_shared_by_cultures(self, tmp_path, capsys):
+        """Testa que --max-engine-calls e --time-budget valem também para as outras culturas"""
+        source = tmp_path / "catalog.xml"
+        write_catalog(source, [f"Message number {i}" for i in range(300)])
+        cultures = ["--target", "pt-BR", "--target", "es-ES"]
+
+        assert self.run(tmp_path, str(source), *cultures, "--max-engine-calls", "1") == 0
+        translated = {culture: (tmp_path / f"catalog_{culture}.xml").read_text(
+            encoding="utf-8").count("pt:Message") for culture in ("pt-BR", "es-ES")}
+        # Uma única requisição (lote de até 50 textos) somando as duas culturas
+        assert sum(translated.values()) == 50
+
+        assert self.run(tmp_path, str(source), *cultures, "--time-budget", "0") == 0
+        for culture in ("pt-BR", "es-ES"):
+            content = (tmp_path / f"catalog_{culture}.xml").read_text(encoding="utf-8")
+            # Apenas o que já estava na memória de tradução
+            assert content.count("pt:Message") == translated[culture]
+
+    def test_limit_enforces_chars_and_minutes(self, tmp_path, capsys):
+        """Testa que --max-engine-chars e --max-minutes limitam a execução com limit"""
+        source = tmp_path / "catalog.xml"
+        output = tmp_path / "catalog_pt-BR.xml"
+        write_catalog(source, [f"Message number {i:03d}" for i in range(150)])
+
+        # Lotes de 50 textos de 18 caracteres: só o primeiro cabe em 1000 caracteres
+        assert self.run(tmp_path, str(source), "--max-engine-chars", "1000") == 0
+        assert output.read_text(encoding="utf-8").count("pt:Message") == 50
+
+        # 3 requisições simultâneas de 60s (latência registrada) em 30s: cabe uma
+        write_catalog(source, [f"Other message {i:03d}" for i in range(150)])
+        metrics = tmp_path / "metrics.json"
+        metrics.write_text(json.dumps({"engine_latency": {"count": 1, "mean_ms": 60000}}),
+                           encoding="utf-8")
+        assert self.run(tmp_path, str(source), "--max-minutes", "0.5", "--workers", "4",
+                        "--metrics-file", str(metrics)) == 0
+        assert "Orçamento excedido: estimated_seconds 60.0 > 30.0" in capsys.readouterr().out
+        assert output.read_text(encoding="utf-8").count("pt:Other") == 50
+
+    def test_refuse_and_split_tree(self, tmp_path, capsys):
+        """Testa recusa e divisão de um diretório pelo orçamento"""
+        catalogs = tmp_path / "catalogs"
+        catalogs.mkdir()
+        write_catalog(catalogs / "a.xml", [f"First catalog text {i}" for i in range(80)])
+        write_catalog(catalogs / "b.xml", [f"Second catalog text {i}" for i in range(80)])
+        options = ["--dir", str(catalogs), "--jobs", "1", "--max-engine-chars", "2000"]
+
+        assert self.run(tmp_path, *options, "--over-budget", "refuse") == 2
+        assert "Execução recusada" in capsys.readouterr().out
+        assert not (catalogs / "a_pt-BR.xml").exists()
+
+        assert self.run(tmp_path, *options, "--over-budget", "split") == 0
+        assert "dividida em 2 partes" in capsys.readouterr().out
+        assert (catalogs / "a_pt-BR.xml").exists()
+        assert not (catalogs / "b_pt-BR.xml").exists()
+
+        # A primeira parte já está na memória: a segunda execução traduz o restante
+        assert self.run(tmp_path, *options, "--over-budget", "split") == 0
+        assert (catalogs / "b_pt-BR.xml").exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
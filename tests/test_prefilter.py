@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para o pré-filtro de textos
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from xml_translator.core.auto_translator import AutoTranslator
+from xml_translator.core.prefilter import PreFilter
+from xml_translator.core.translator import XMLTranslator
+from xml_translator.engines.local import LocalEngine
+
+
+class TestPreFilter:
+    """Testes para PreFilter.classify"""
+
+    @pytest.mark.parametrize("text, reason", [
+        ("OK", "short"),
+        ("x", "short"),
+        ("https://example.com/docs?id=1", "url"),
+        ("www.example.com", "url"),
+        ("support@example.com", "email"),
+        ("550e8400-e29b-41d4-a716-446655440000", "guid"),
+        ("1,234.50", "number"),
+        ("12/31/2024", "number"),
+        ("75%", "number"),
+        (r"C:\Program Files\app.exe", "path"),
+        ("/var/log/app", "path"),
+        ("settings.json", "path"),
+        ("btnSaveAll", "identifier"),
+        ("MAX_RETRY_COUNT", "identifier"),
+        ("System.Windows.Forms", "identifier"),
+        ("Não foi possível salvar o arquivo", "already_translated"),
+        ("Configurações", "already_translated"),
+    ])
+    def test_skipped(self, text, reason):
+        """Testa o motivo atribuído a textos que não devem ir ao motor"""
+        assert PreFilter().classify(text) == reason
+
+    @pytest.mark.parametrize("text", [
+        "Save", "Export Data", "Save/Cancel", "Do you want to delete this file?",
+        "Version 2", "Error: {0}", "No data", "e.g. value",
+    ])
+    def test_translatable(self, text):
+        """Testa que textos comuns continuam indo ao motor"""
+        assert PreFilter().classify(text) is None
+
+    def test_options(self):
+        """Testa regras desativadas, padrões extras e idioma sem perfil"""
+        prefilter = PreFilter({"disabled": ["identifier"], "patterns": {"ticket": r"[A-Z]+-\d+"},
+                               "language_check": False})
+        assert prefilter.classify("btnSaveAll") is None
+        assert prefilter.classify("PROJ-1234") == "ticket"
+        assert prefilter.classify("Configurações") is None
+        assert "ticket" in prefilter.reasons
+        assert PreFilter(target_lang="de").classify("Configurações") is None
+
+
+class TestPreFilterIntegration:
+    """Testes do pré-filtro no fluxo de tradução"""
+
+    def test_skipped_texts_never_reach_engine(self, tmp_path):
+        """Testa que textos filtrados não geram requisições e são contados por motivo"""
+        engine = LocalEngine(prefix="pt:")
+        translator = AutoTranslator(str(tmp_path), use_cache=False, engine=engine)
+        texts = ["Save", "https://example.com", "btnSaveAll", "42", "Deseja excluir o arquivo?"]
+
+        results = translator.get_translations(texts)
+
+        assert results[0] == ("pt:Save", "local")
+        assert [source for _, source in results[1:]] == ["original"] * 4
+        assert [translation for translation, _ in results[1:]] == texts[1:]
+        assert translator.engine_requests == 1
+        assert translator.get_stats()["prefilter_skips"] == {
+            "short": 0, "url": 1, "email": 0, "guid": 0, "number": 1, "path": 0,
+            "identifier": 1, "already_translated": 1,
+        }
+
+    def test_override_wins_over_prefilter(self, tmp_path):
+        """Testa que overrides manuais têm prioridade sobre o pré-filtro"""
+        (tmp_path / "overrides.json").write_text(json.dumps({"btnSaveAll": "Salvar tudo"}),
+                                                 encoding="utf-8")
+        translator = AutoTranslator(str(tmp_path), use_cache=False,
+                                    engine=LocalEngine(prefix="pt:"))
+        assert translator.get_translation("btnSaveAll") == ("Salvar tudo", "override")
+
+    def test_run_stats_report_skips(self, tmp_path):
+        """Testa as contagens por motivo nas estatísticas e métricas da execução"""
+        source = tmp_path / "catalog.xml"
+        source.write_text(
+            '<localization culture="en"><group name="G">'
+            '<string key="a">Save</string><string key="b">10:30</string>'
+            '<string key="c">10:30</string><string key="d">www.example.com</string>'
+            '</group></localization>',
+            encoding="utf-8"
+        )
+        translator = XMLTranslator(str(tmp_path), use_cache=False,
+                                   engine=LocalEngine(prefix="pt:"))
+
+        result = translator.translate_file(str(source))
+
+        assert translator.last_run_stats["skipped"] == {"number": 1, "url": 1}
+        assert result["metrics"]["prefilter_skips"] == {"number": 1, "url": 1}
+        assert translator.last_run_stats["sources"]["original"] == {"keys": 3, "unique": 2}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
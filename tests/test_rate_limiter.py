@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para o limitador de taxa
+"""
+
+import pytest
+import sys
+import time
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from xml_translator.core.rate_limiter import TokenBucket
+
+
+class TestTokenBucket:
+    """Testes para TokenBucket"""
+
+    def test_burst_then_rate(self):
+        """Testa rajada inicial seguida de espera pela taxa configurada"""
+        bucket = TokenBucket(rate=50, capacity=2)
+        started = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        elapsed = time.monotonic() - started
+        assert 0.05 <= elapsed < 0.5
+
+    def test_disabled(self):
+        """Testa que taxa zero não bloqueia"""
+        bucket = TokenBucket(rate=0)
+        assert all(bucket.acquire() == 0.0 for _ in range(100))
+
+    def test_penalize_delays_next_token(self):
+        """Testa pausa após throttling"""
+        bucket = TokenBucket(rate=100, capacity=1)
+        bucket.acquire()
+        bucket.penalize(0.1)
+        assert bucket.acquire() >= 0.1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
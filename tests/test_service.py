@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para o modo serviço (servidor HTTP/JSON e cliente)
+"""
+
+import json
+import pytest
+import sys
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from main import main, parse_args, service_client
+from xml_translator.core.translator import XMLTranslator
+from xml_translator.engines.local import LocalEngine
+from xml_translator.service.client import ServiceClient, ServiceError, ServiceForbidden
+from xml_translator.service.server import create_server
+
+
+def write_catalog(path: Path, texts):
+    body = "".join(f'<string key="k{i}">{text}</string>' for i, text in enumerate(texts))
+    path.write_text(f'<localization culture="en"><group name="G">{body}</group></localization>',
+                    encoding="utf-8")
+
+
+@pytest.fixture
+def service(request, tmp_path):
+    """Serviço em uma porta livre com o motor local (settings extras via parametrize)"""
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    settings = {"engine": "local", "engine_options": {"local": {"prefix": "pt:"}}}
+    settings.update(getattr(request, "param", {}))
+    (config_dir / "settings.json").write_text(json.dumps(settings), encoding="utf-8")
+    server = create_server(XMLTranslator(str(config_dir)), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = ServiceClient(f"http://127.0.0.1:{server.server_address[1]}", timeout=10,
+                           token=server.service.token)
+    yield client, config_dir
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def raw_post(url: str, body: bytes, headers: dict) -> tuple:
+    """POST sem o cliente (como o de uma página de outro site)"""
+    request = urllib.request.Request(url, data=body, method="POST", headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+class TestService:
+    """Testes do serviço residente"""
+
+    def test_health_and_discover(self, service, tmp_path):
+        """Testa a identificação do serviço e a verificação do diretório de configurações"""
+        client, config_dir = service
+        health = client.health()
+        assert health["status"] == "ok"
+        assert health["config_dir"] == str(config_dir.resolve())
+        assert ServiceClient.discover(str(config_dir), client.url) is not None
+        assert ServiceClient.discover(str(tmp_path / "other"), client.url) is None
+        assert ServiceClient.discover(str(config_dir), "http://127.0.0.1:9") is None
+
+    def test_translate_strings(self, service):
+        """Testa tradução de textos avulsos"""
+        client, _ = service
+        results = client.translate_strings(["Save", "https://example.com"])
+        assert [(item["translation"], item["source"]) for item in results] == [
+            ("pt:Save", "local"), ("https://example.com", "original")]
+
+    def test_concurrent_file_requests(self, service, tmp_path):
+        """Testa requisições simultâneas de arquivos diferentes"""
+        client, _ = service
+        sources = []
+        for number in range(8):
+            source = tmp_path / f"module{number}.xml"
+            write_catalog(source, [f"Open item {number}", "Save", f"Close item {number}"])
+            sources.append(source)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda source: client.translate_file(str(source)), sources))
+
+        for source, result in zip(sources, results):
+            assert result["status"] == "success"
+            assert result["strings_processed"] == 3
+            output = Path(result["output_file"])
+            assert output == source.with_name(f"{source.stem}_pt-BR.xml")
+            assert "pt:Save" in output.read_text(encoding="utf-8")
+        assert client.health()["requests"] >= 8
+
+    def test_set_overrides(self, service):
+        """Testa overrides enviados ao serviço sem reiniciá-lo"""
+        client, config_dir = service
+        assert client.translate_strings(["Save"])[0]["translation"] == "pt:Save"
+        assert client.set_overrides({"Save": "Salvar"})["overrides_count"] == 1
+        assert client.translate_strings(["Save"])[0] == {
+            "text": "Save", "translation": "Salvar", "source": "override"}
+        assert (config_dir / "overrides.delta.jsonl").exists()
+        assert client.reload_overrides() == {"reloaded": {"pt-BR": 0}}
+
+    def test_invalid_requests(self, service):
+        """Testa erros de requisição"""
+        client, _ = service
+        with pytest.raises(ServiceError, match="absoluto"):
+            client.request("POST", "/translate-file", {"input_file": "relative.xml"})
+        with pytest.raises(ServiceError, match="texts"):
+            client.request("POST", "/translate-strings", {"texts": "Save"})
+        with pytest.raises(ServiceError, match="desconhecida"):
+            client.request("GET", "/nope")
+
+    def test_sessions_have_own_counters(self, tmp_path):
+        """Testa que cada sessão conta apenas as próprias requisições e soma na origem ao final"""
+        translator = XMLTranslator(str(tmp_path), use_cache=False, engine=LocalEngine(prefix="pt:"))
+        first, second = translator.session(), translator.session()
+        first.translator.get_translations(["Open file", "Close file"])
+        second.translator.get_translations(["Save"])
+        assert first.translator.engine_requests == 1
+        assert second.translator.engine_requests == 1
+        assert len(first.translator.engine_latency) == 1
+        assert translator.translator.engine_requests == 0
+
+        # Overrides alterados por uma sessão valem para a origem e as demais sessões
+        second.translator.set_overrides({"Save": "Salvar"})
+        assert first.translator.get_translation("Save") == ("Salvar", "override")
+
+        first.release()
+        second.release()
+        second.release()
+        assert translator.translator.engine_requests == 2
+        assert len(translator.translator.engine_latency) == 2
+
+    def test_concurrent_metrics_per_request(self, service, tmp_path):
+        """Testa que as métricas de cada requisição não misturam as de outras"""
+        client, _ = service
+        sources = []
+        for number in range(6):
+            source = tmp_path / f"part{number}.xml"
+            write_catalog(source, [f"Message {number} text {i}" for i in range(60)])
+            sources.append(source)
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            results = list(executor.map(lambda source: client.translate_file(str(source)), sources))
+
+        for result in results:
+            # 60 textos em lotes de até 50
+            assert result["metrics"]["engine_requests"] == 2
+            assert result["metrics"]["engine_latency"]["count"] == 2
+            assert result["metrics"]["cache_misses"] == 60
+        assert client.stats()["translator"]["engine_requests"] == 12
+
+    def test_token_and_content_type_required(self, service):
+        """Testa que rotas sem token ou sem JSON são recusadas (POSTs de outros sites)"""
+        client, config_dir = service
+        token_file = config_dir / "service.token"
+        assert token_file.read_text(encoding="utf-8") == client.token
+        assert token_file.stat().st_mode & 0o077 == 0
+
+        anonymous = ServiceClient(client.url, timeout=10)
+        assert anonymous.health()["status"] == "ok"
+        with pytest.raises(ServiceError, match="Token"):
+            anonymous.set_overrides({"Save": "Hacked"})
+        with pytest.raises(ServiceError, match="Token"):
+            anonymous.stats()
+        with pytest.raises(ServiceError, match="Token"):
+            anonymous.shutdown()
+
+        body = json.dumps({"overrides": {"Save": "Hacked"}}).encode("utf-8")
+        headers = {"Content-Type": "text/plain", "X-Translator-Token": client.token}
+        status, _ = raw_post(client.url + "/overrides", body, headers)
+        assert status == 415
+        status, _ = raw_post(client.url + "/shutdown", b"{}", {"Content-Type": "text/plain"})
+        assert status == 415
+        assert client.translate_strings(["Save"])[0]["translation"] == "pt:Save"
+
+    def test_paths_restricted_to_root(self, service, tmp_path):
+        """Testa que arquivos fora do diretório raiz não são lidos nem gravados"""
+        client, _ = service
+        source = tmp_path / "catalog.xml"
+        write_catalog(source, ["Save"])
+        outside = tmp_path.parent / "outside"
+        for name in ("output_file", "metrics_file"):
+            with pytest.raises(ServiceForbidden, match="fora do diretório"):
+                client.request("POST", "/translate-file",
+                               {"input_file": str(source), name: str(outside / "x.json")})
+        with pytest.raises(ServiceError, match="fora do diretório"):
+            client.request("POST", "/translate-file",
+                           {"input_file": str(tmp_path / ".." / "outside" / "catalog.xml")})
+        assert not outside.exists()
+
+    def test_cli_uses_running_service(self, service, tmp_path, capsys):
+        """Testa que a linha de comando delega ao serviço ativo"""
+        client, config_dir = service
+        source = tmp_path / "catalog.xml"
+        write_catalog(source, ["Save"])
+
+        code = main([str(source), "--config-dir", str(config_dir), "--service", client.url])
+
+        assert code == 0
+        assert f"serviço em {client.url}" in capsys.readouterr().out
+        assert "pt:Save" in (tmp_path / "catalog_pt-BR.xml").read_text(encoding="utf-8")
+
+    def test_budget_options_run_locally(self, service, tmp_path):
+        """Testa que opções de orçamento não são enviadas ao serviço (são aplicadas localmente)"""
+        client, config_dir = service
+        source = tmp_path / "catalog.xml"
+        write_catalog(source, ["Save"])
+        base = [str(source), "--config-dir", str(config_dir), "--service", client.url]
+        assert service_client(parse_args(base)) is not None
+        for option in (["--max-engine-chars", "100"], ["--max-minutes", "5"],
+                       ["--max-engine-calls", "1"], ["--time-budget", "60"]):
+            assert service_client(parse_args(base + option)) is None
+
+    @pytest.mark.parametrize("service", [{"run_time_budget": 0}], indirect=True)
+    def test_run_time_budget(self, service, tmp_path):
+        """Testa que o prazo do motor do settings.json vale também no serviço"""
+        client, _ = service
+        source = tmp_path / "catalog.xml"
+        write_catalog(source, ["Save", "Open"])
+        result = client.translate_file(str(source), target_cultures=["pt-BR", "es-ES"])
+        for culture in ("pt-BR", "es-ES"):
+            content = (tmp_path / f"catalog_{culture}.xml").read_text(encoding="utf-8")
+            assert "pt:" not in content
+        assert all(output["budget_exhausted"] for output in result["outputs"].values())
+
+    def test_cli_falls_back_to_local(self, service, tmp_path, tmp_path_factory, capsys,
+                                     monkeypatch):
+        """Testa que serviço inacessível ou caminho recusado não impedem a tradução"""
+        client, config_dir = service
+        source = tmp_path / "catalog.xml"
+        write_catalog(source, ["Save"])
+
+        # Saída fora do diretório raiz do serviço: traduzida neste processo
+        output = tmp_path_factory.mktemp("outside") / "catalog_pt-BR.xml"
+        code = main([str(source), "--output", str(output), "--config-dir", str(config_dir),
+                     "--service", client.url])
+        assert code == 0
+        assert "traduzindo neste processo" in capsys.readouterr().out
+        assert "pt:Save" in output.read_text(encoding="utf-8")
+
+        # Serviço encerrado depois de encontrado
+        monkeypatch.setattr(sys.modules["main"], "service_client",
+                            lambda args: ServiceClient("http://127.0.0.1:9", timeout=1,
+                                                       token=client.token))
+        output.unlink()
+        assert main([str(source), "--output", str(output), "--config-dir", str(config_dir)]) == 0
+        assert "indisponível" in capsys.readouterr().out
+        assert "pt:Save" in output.read_text(encoding="utf-8")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do custo de inicialização da linha de comando (python -X importtime)
+"""
+
+import logging
+import os
+import pytest
+import subprocess
+import sys
+from pathlib import Path
+
+# Adicionar src ao path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from xml_translator.utils.logger import DeferredFileHandler
+
+
+# Orçamento de importação de main.py (ms, tempo acumulado); ajustável em máquinas lentas
+IMPORT_BUDGET_MS = float(os.environ.get("XML_TRANSLATOR_IMPORT_BUDGET_MS", 100))
+
+# Módulos que só devem ser carregados quando a execução precisa deles
+HEAVY_MODULES = ("xml_translator.core.translator", "xml_translator.core.auto_translator",
+                 "xml_translator.service.server", "xml_translator.service.client",
+                 "googletrans", "sqlite3", "xml.etree.ElementTree", "concurrent.futures",
+                 "multiprocessing", "http.server", "urllib.request")
+
+
+def import_times(args, cwd) -> tuple:
+    """
+    Executa o Python com -X importtime
+
+    Returns:
+        Tupla ({módulo: tempo acumulado em microssegundos}, processo concluído)
+    """
+    completed = subprocess.run([sys.executable, "-X", "importtime"] + args, cwd=cwd,
+                               capture_output=True, text=True, timeout=60)
+    times = {}
+    for line in completed.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times, completed
+
+
+class TestStartup:
+    """Testes de importação sob demanda"""
+
+    def test_main_import_is_light(self):
+        """Testa que importar main.py não carrega o pipeline de tradução"""
+        times, _ = import_times(["-c", "import main"], ROOT)
+        assert "main" in times
+        assert [name for name in HEAVY_MODULES if name in times] == []
+
+    def test_main_import_budget(self):
+        """Testa o orçamento de tempo de importação (melhor de três medições)"""
+        best = min(import_times(["-c", "import main"], ROOT)[0]["main"] for _ in range(3))
+        assert best / 1000 < IMPORT_BUDGET_MS
+
+    def test_missing_file_exits_before_loading_translator(self, tmp_path):
+        """Testa que "arquivo não encontrado" termina sem carregar tradutor nem serviço"""
+        times, completed = import_times([str(ROOT / "main.py"), "missing.xml"], tmp_path)
+        assert completed.returncode == 1
+        assert "Arquivo não encontrado: missing.xml" in completed.stdout
+        assert [name for name in HEAVY_MODULES if name in times] == []
+
+    def test_deferred_log_file(self, tmp_path):
+        """Testa que o diretório e o arquivo de log só são criados no primeiro registro"""
+        log_file = tmp_path / "logs" / "run.log"
+        handler = DeferredFileHandler(log_file)
+        try:
+            assert not log_file.parent.exists()
+            handler.emit(logging.makeLogRecord({"msg": "primeiro registro"}))
+            assert "primeiro registro" in log_file.read_text(encoding="utf-8")
+        finally:
+            handler.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para a importação e exportação de memórias de tradução (TMX e XLIFF)
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Adicionar src ao path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT))
+
+from main import main
+from xml_translator.core.auto_translator import AutoTranslator
+from xml_translator.core.masking import mask, mask_like
+from xml_translator.core.tm_exchange import (export_memory, import_memory, iter_segments,
+                                             write_segments)
+from xml_translator.engines.local import LocalEngine
+
+
+TMX = """<?xml version="1.0" encoding="UTF-8"?>
+<tmx version="1.4">
+  <header srclang="en-US" datatype="plaintext" segtype="sentence" adminlang="en"
+          creationtool="test" creationtoolversion="1" o-tmf="test"/>
+  <body>
+    <tu>
+      <tuv xml:lang="en-US"><seg>Save the file</seg></tuv>
+      <tuv xml:lang="pt-PT"><seg>Guardar o ficheiro</seg></tuv>
+      <tuv xml:lang="pt-BR"><seg>Salvar o arquivo</seg></tuv>
+    </tu>
+    <tu>
+      <tuv xml:lang="en-US"><seg>Open <ph x="1">{0}</ph> in <bpt i="1">&lt;b&gt;</bpt>editor\
+<ept i="1">&lt;/b&gt;</ept></seg></tuv>
+      <tuv xml:lang="pt-BR"><seg>Abrir <ph x="1">{0}</ph> no <bpt i="1">&lt;b&gt;</bpt>editor\
+<ept i="1">&lt;/b&gt;</ept></seg></tuv>
+    </tu>
+    <tu>
+      <tuv xml:lang="en-US"><seg>Delete {0} of {1}</seg></tuv>
+      <tuv xml:lang="pt-BR"><seg>Excluir {1} de {0}</seg></tuv>
+    </tu>
+    <tu>
+      <tuv xml:lang="en-US"><seg>Show {0}</seg></tuv>
+      <tuv xml:lang="pt-BR"><seg>Mostrar</seg></tuv>
+    </tu>
+    <tu>
+      <tuv xml:lang="en-US"><seg>Close</seg></tuv>
+      <tuv xml:lang="de-DE"><seg>Schließen</seg></tuv>
+    </tu>
+  </body>
+</tmx>
+"""
+
+XLIFF_12 = """<?xml version="1.0" encoding="UTF-8"?>
+<xliff version="1.2" xmlns="urn:oasis:names:tc:xliff:document:1.2">
+  <file original="app" source-language="en" target-language="pt-BR" datatype="plaintext">
+    <body>
+      <trans-unit id="1"><source>Print report</source>\
+<target state="final">Imprimir relatório</target></trans-unit>
+      <trans-unit id="2"><source>Export <x id="1" equiv-text="{0}"/></source>\
+<target state="translated">Exportar <x id="1" equiv-text="{0}"/></target></trans-unit>
+      <trans-unit id="3"><source>Import data</source>\
+<target state="needs-translation"/></trans-unit>
+      <trans-unit id="4"><source>Refresh</source></trans-unit>
+    </body>
+  </file>
+</xliff>
+"""
+
+XLIFF_20 = """<?xml version="1.0" encoding="UTF-8"?>
+<xliff version="2.0" xmlns="urn:oasis:names:tc:xliff:document:2.0" srcLang="en" trgLang="pt-BR">
+  <file id="f1">
+    <unit id="u1">
+      <segment state="final"><source>Rename folder</source>\
+<target>Renomear pasta</target></segment>
+      <segment state="initial"><source>Move folder</source>\
+<target>Mover</target></segment>
+    </unit>
+  </file>
+</xliff>
+"""
+
+
+class TestMaskLike:
+    """Testes para mask_like"""
+
+    def test_reordered_tokens(self):
+        """Testa sentinelas iguais às do original mesmo com a ordem trocada"""
+        masked = mask("Delete {0} of {1}")
+        assert mask_like(masked, "Excluir {1} de {0}") == "Excluir ⟦1⟧ de ⟦0⟧"
+
+    def test_mismatch(self):
+        """Testa tokens ausentes, duplicados ou inventados"""
+        masked = mask("Show {0}")
+        assert mask_like(masked, "Mostrar") is None
+        assert mask_like(masked, "Mostrar {0} {0}") is None
+        assert mask_like(masked, "Mostrar {1}") is None
+        assert mask_like(mask("Close"), "Fechar") == "Fechar"
+
+
+class TestReadSegments:
+    """Testes da leitura de TMX e XLIFF"""
+
+    def test_tmx(self, tmp_path):
+        """Testa a escolha da variante de idioma, marcação inline e contadores"""
+        path = tmp_path / "memory.tmx"
+        path.write_text(TMX, encoding="utf-8")
+        stats = {}
+        pairs = list(iter_segments(str(path), ["en"], ["pt-BR", "pt"], stats))
+        assert pairs == [("Save the file", "Salvar o arquivo"),
+                         ("Open {0} in <b>editor</b>", "Abrir {0} no <b>editor</b>"),
+                         ("Delete {0} of {1}", "Excluir {1} de {0}"),
+                         ("Show {0}", "Mostrar")]
+        assert stats == {"segments": 5, "skipped_language": 1, "untranslated": 0}
+
+    def test_xliff(self, tmp_path):
+        """Testa XLIFF 1.2 e 2.0, estados sem tradução e idiomas do arquivo"""
+        path = tmp_path / "memory.xlf"
+        path.write_text(XLIFF_12, encoding="utf-8")
+        stats = {}
+        assert list(iter_segments(str(path), ["en"], ["pt-BR", "pt"], stats)) == \
+            [("Print report", "Imprimir relatório"), ("Export {0}", "Exportar {0}")]
+        assert stats["untranslated"] == 2
+        # Outra cultura de destino: nada é importado
+        assert list(iter_segments(str(path), ["en"], ["es-ES", "es"])) == []
+
+        path = tmp_path / "memory.xliff"
+        path.write_text(XLIFF_20, encoding="utf-8")
+        assert list(iter_segments(str(path), ["en"], ["pt-BR", "pt"])) == \
+            [("Rename folder", "Renomear pasta")]
+
+    def test_unknown_format(self, tmp_path):
+        """Testa extensão desconhecida"""
+        with pytest.raises(ValueError):
+            list(iter_segments(str(tmp_path / "memory.csv"), ["en"], ["pt"]))
+
+
+class TestImportExport:
+    """Testes de importação e exportação no AutoTranslator"""
+
+    def setup_method(self):
+        self.engine = LocalEngine(prefix="pt:")
+
+    def test_import_into_cache(self, tmp_path):
+        """Testa que os segmentos importados evitam chamadas ao motor"""
+        memory = tmp_path / "memory.tmx"
+        memory.write_text(TMX, encoding="utf-8")
+        translator = AutoTranslator(str(tmp_path), engine=self.engine, target_culture="pt-BR")
+        stats = import_memory(translator, str(memory), batch_size=2)
+        assert stats["imported"] == 3
+        assert stats["mismatched"] == 1
+        assert stats["segments_per_second"] > 0
+
+        assert translator.get_translation("Save the file") == ("Salvar o arquivo", "cache")
+        assert translator.get_translation("Delete {2} of {3}") == ("Excluir {3} de {2}", "cache")
+        assert translator.get_translation('Open {0} in <b class="x">editor</b>') == \
+            ('Abrir {0} no <b class="x">editor</b>', "cache")
+        assert translator.engine_requests == 0
+
+    def test_import_into_overrides(self, tmp_path):
+        """Testa a importação para overrides (gravados no arquivo base)"""
+        memory = tmp_path / "memory.xlf"
+        memory.write_text(XLIFF_12, encoding="utf-8")
+        translator = AutoTranslator(str(tmp_path), engine=self.engine, target_culture="pt-BR")
+        translator.get_translation("Print report")
+        stats = import_memory(translator, str(memory), store="overrides")
+        assert stats["imported"] == 2
+
+        # O override substitui a resposta do motor já guardada
+        assert translator.get_translation("Print report") == ("Imprimir relatório", "override")
+        saved = json.loads((tmp_path / "overrides.json").read_text(encoding="utf-8"))
+        assert saved["Export {0}"] == "Exportar {0}"
+        assert import_memory(translator, str(memory), store="overrides")["imported"] == 0
+
+    @pytest.mark.parametrize("name", ["memory.tmx", "memory.xlf"])
+    def test_round_trip(self, tmp_path, name):
+        """Testa que exportar e importar de volta recupera as mesmas chaves"""
+        translator = AutoTranslator(str(tmp_path / "a"), engine=self.engine)
+        translator.get_translation("Open {0} & close <b>{1}</b>")
+        translator.get_translation("Save the file")
+        exported = tmp_path / name
+        assert export_memory(translator, str(exported))["exported"] == 2
+
+        other = AutoTranslator(str(tmp_path / "b"), engine=self.engine)
+        assert import_memory(other, str(exported))["imported"] == 2
+        other.flush_cache()
+        assert sorted(other.cache.entries(other.source_lang, other.target_lang,
+                                          other.engine_name)) == \
+            sorted(translator.cache.entries(translator.source_lang, translator.target_lang,
+                                            translator.engine_name))
+        assert other.get_translation("Open {9} & close <i>{8}</i>") == \
+            ("pt:Open {9} & close <i>{8}</i>", "cache")
+
+    @pytest.mark.parametrize("name", ["memory.tmx", "memory.xlf"])
+    def test_export_unmasks_sentinels(self, tmp_path, name):
+        """Testa que as sentinelas internas não aparecem no arquivo exportado"""
+        memory = tmp_path / "memory.tmx"
+        memory.write_text(TMX, encoding="utf-8")
+        translator = AutoTranslator(str(tmp_path), engine=self.engine, target_culture="pt-BR")
+        import_memory(translator, str(memory))
+        exported = tmp_path / "out" / name
+        export_memory(translator, str(exported))
+
+        content = exported.read_text(encoding="utf-8")
+        assert "⟦" not in content and "⟧" not in content
+        assert ">{0}</ph>" in content
+        pairs = list(iter_segments(str(exported), ["en"], ["pt-BR"]))
+        assert ("Delete {0} of {1}", "Excluir {1} de {0}") in pairs
+        assert ("Open {0} in {1}editor{2}", "Abrir {0} no {1}editor{2}") in pairs
+
+    def test_import_larger_than_cache_limit(self, tmp_path):
+        """Testa que a importação não é descartada pelo limite da memória de tradução"""
+        path = tmp_path / "large.tmx"
+        write_segments(str(path), ((f"Message number {i}", f"Mensagem número {i}")
+                                   for i in range(50)), "en", "pt-BR")
+        (tmp_path / "settings.json").write_text(json.dumps({"cache_max_entries": 10}),
+                                                encoding="utf-8")
+        translator = AutoTranslator(str(tmp_path), engine=self.engine, target_culture="pt-BR")
+        assert import_memory(translator, str(path), batch_size=7)["imported"] == 50
+        translator.flush_cache()
+        assert len(translator.cache) == 50
+        assert translator.get_translation("Message number 0") == ("Mensagem número 0", "cache")
+        for i in range(20):
+            translator.get_translation(f"Other text {i}")
+        translator.flush_cache()
+        assert translator.get_translation("Message number 1") == ("Mensagem número 1", "cache")
+        assert translator.engine_requests == 20
+
+    def test_streaming_large_file(self, tmp_path):
+        """Testa que as unidades lidas são descartadas (memória constante)"""
+        path = tmp_path / "large.tmx"
+        count = write_segments(str(path), ((f"Message number {i}", f"Mensagem número {i}")
+                                           for i in range(3000)), "en", "pt-BR")
+        assert count == 3000
+        stats = {}
+        pairs = iter_segments(str(path), ["en"], ["pt-BR"], stats)
+        assert next(pairs) == ("Message number 0", "Mensagem número 0")
+        assert sum(1 for _ in pairs) == 2999
+        assert stats["segments"] == 3000
+
+
+class TestExchangeCli:
+    """Testes de --import-tm e --export-tm"""
+
+    def test_cli(self, tmp_path, capsys):
+        """Testa importação e exportação pela linha de comando"""
+        memory = tmp_path / "memory.tmx"
+        memory.write_text(TMX, encoding="utf-8")
+        options = ["--config-dir", str(tmp_path), "--engine", "local", "--no-service"]
+        assert main(["--import-tm", str(memory)] + options) == 0
+        out = capsys.readouterr().out
+        assert "3 segmentos importados em cache" in out
+        assert "1 outro idioma, 1 placeholders divergentes" in out
+
+        exported = tmp_path / "out.xlf"
+        assert main(["--export-tm", str(exported)] + options) == 0
+        assert list(iter_segments(str(exported), ["en"], ["pt-BR"]))[0] == \
+            ("Save the file", "Salvar o arquivo")
+
+        (tmp_path / "broken.tmx").write_text("<tmx><body><tu>", encoding="utf-8")
+        assert main(["--import-tm", str(tmp_path / "broken.tmx")] + options) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
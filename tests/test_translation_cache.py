@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para a memória de tradução persistente
+"""
+
+import pytest
+import sqlite3
+import sys
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from xml_translator.core.auto_translator import AutoTranslator
+from xml_translator.core.translation_cache import TranslationCache
+from xml_translator.engines.base import TranslationEngine
+
+
+class CountingEngine(TranslationEngine):
+    """Motor falso que conta chamadas"""
+
+    name = "google"
+
+    def __init__(self):
+        self.calls = 0
+
+    def translate(self, text, src, dest):
+        self.calls += 1
+        return f"pt:{text}"
+
+
+class TestTranslationCache:
+    """Testes para TranslationCache"""
+
+    def test_put_get_and_counters(self, tmp_path):
+        """Testa armazenamento, leitura e contadores de acerto"""
+        cache = TranslationCache(tmp_path / "tm.db")
+        assert cache.get("Save", "en", "pt", "google") is None
+        cache.put("Save", "en", "pt", "google", "Salvar")
+        assert cache.get("Save", "en", "pt", "google") == "Salvar"
+        assert cache.get("Save", "en", "es", "google") is None
+
+        stats = cache.get_stats()
+        assert stats["cache_hits"] == 1
+        assert stats["cache_misses"] == 2
+        assert stats["cache_entries"] == 1
+
+    def test_lookup_does_not_create_file(self, tmp_path):
+        """Testa que consultas não criam o banco em disco"""
+        cache = TranslationCache(tmp_path / "tm.db")
+        cache.get("Save", "en", "pt", "google")
+        assert not (tmp_path / "tm.db").exists()
+
+    def test_eviction_and_invalidate(self, tmp_path):
+        """Testa limite de tamanho e invalidação"""
+        cache = TranslationCache(tmp_path / "tm.db", max_entries=3, commit_every=1)
+        for i in range(5):
+            cache.put(f"text {i}", "en", "pt", "google", f"texto {i}")
+        assert len(cache) == 3
+        assert cache.get("text 0", "en", "pt", "google") is None
+
+        assert cache.invalidate(text="text 4") == 1
+        assert cache.invalidate() == 2
+        assert len(cache) == 0
+
+    def test_eviction_keeps_running_count(self, tmp_path):
+        """Testa que o limite não conta a tabela a cada gravação e vê as de outros processos"""
+        cache = TranslationCache(tmp_path / "tm.db", max_entries=3, commit_every=1)
+        # Conta na primeira gravação e de novo na sétima seguinte ("text 6")
+        cache.RECOUNT_EVERY = 7
+        cache.put("text 0", "en", "pt", "google", "texto 0")
+        statements = []
+        cache._conn.set_trace_callback(statements.append)
+        for i in range(1, 6):
+            cache.put(f"text {i}", "en", "pt", "google", f"texto {i}")
+        cache.put("text 5", "en", "pt", "google", "texto 5 revisado")
+
+        assert not any("COUNT(*)" in statement for statement in statements)
+        assert len(cache) == 3
+        assert cache.get("text 2", "en", "pt", "google") is None
+
+        # Gravações de outro processo no mesmo arquivo entram na recontagem seguinte
+        other = TranslationCache(tmp_path / "tm.db", max_entries=100, commit_every=1)
+        for i in range(4):
+            other.put(f"other {i}", "en", "pt", "google", f"outro {i}")
+        other.close()
+        cache.put("text 6", "en", "pt", "google", "texto 6")
+        assert len(cache) == 3
+        assert cache.get("text 6", "en", "pt", "google") == "texto 6"
+
+    def test_imported_entries_not_evicted(self, tmp_path):
+        """Testa que uma importação maior que o limite mantém todos os segmentos aprovados"""
+        cache = TranslationCache(tmp_path / "tm.db", max_entries=3, commit_every=1)
+        pairs = ((f"approved {i}", f"aprovado {i}") for i in range(10))
+        assert cache.put_many(pairs, "en", "pt", "google", batch_size=4) == 10
+        assert len(cache) == 10
+
+        # O limite continua valendo para as respostas do motor
+        for i in range(5):
+            cache.put(f"text {i}", "en", "pt", "google", f"texto {i}")
+        assert len(cache) == 13
+        assert cache.get("text 0", "en", "pt", "google") is None
+        assert all(cache.get(f"approved {i}", "en", "pt", "google") == f"aprovado {i}"
+                   for i in range(10))
+
+    def test_engine_write_keeps_imported_entry(self, tmp_path):
+        """Testa que uma resposta do motor para um segmento importado não o torna removível"""
+        cache = TranslationCache(tmp_path / "tm.db", max_entries=2, commit_every=1)
+        cache.put_many([("Save", "Salvar")], "en", "pt", "google")
+        cache.put("Save", "en", "pt", "google", "Gravar")
+        for i in range(5):
+            cache.put(f"text {i}", "en", "pt", "google", f"texto {i}")
+
+        assert cache.get("Save", "en", "pt", "google") == "Gravar"
+        assert len(cache) == 3
+
+    def test_migrates_old_file(self, tmp_path):
+        """Testa que um arquivo sem a coluna approved continua utilizável"""
+        conn = sqlite3.connect(str(tmp_path / "tm.db"))
+        conn.execute("CREATE TABLE translations (source_text TEXT NOT NULL, src TEXT NOT NULL,"
+                     " dest TEXT NOT NULL, engine TEXT NOT NULL, translation TEXT NOT NULL,"
+                     " last_used REAL NOT NULL, PRIMARY KEY (source_text, src, dest, engine))")
+        conn.execute("INSERT INTO translations VALUES ('Save', 'en', 'pt', 'google', 'Salvar', 0)")
+        conn.commit()
+        conn.close()
+
+        cache = TranslationCache(tmp_path / "tm.db", max_entries=1)
+        assert cache.get("Save", "en", "pt", "google") == "Salvar"
+        cache.put_many([("Open", "Abrir")], "en", "pt", "google")
+        cache.put("Close", "en", "pt", "google", "Fechar")
+        assert len(cache) == 2
+        assert cache.get("Open", "en", "pt", "google") == "Abrir"
+
+    def test_persists_across_instances(self, tmp_path):
+        """Testa que o cache sobrevive entre execuções"""
+        cache = TranslationCache(tmp_path / "tm.db")
+        cache.put("Save", "en", "pt", "google", "Salvar")
+        cache.close()
+        assert TranslationCache(tmp_path / "tm.db").get("Save", "en", "pt", "google") == "Salvar"
+
+
+class TestAutoTranslatorCache:
+    """Testes da integração do cache no AutoTranslator"""
+
+    def test_second_run_uses_no_engine_calls(self, tmp_path):
+        """Testa que textos já traduzidos não chamam o motor novamente"""
+        translator = AutoTranslator(str(tmp_path))
+        translator.translator = CountingEngine()
+        assert translator.get_translation("Export Data") == ("pt:Export Data", "google")
+        translator.flush_cache()
+
+        second = AutoTranslator(str(tmp_path))
+        second.translator = CountingEngine()
+        assert second.get_translation("Export Data") == ("pt:Export Data", "cache")
+        assert second.translator.calls == 0
+        assert second.get_stats()["cache_hits"] == 1
+
+    def test_session_stats_not_shared(self, tmp_path):
+        """Testa que cada sessão informa os próprios acertos, e o processo os totais em 'cache'"""
+        translator = AutoTranslator(str(tmp_path))
+        translator.translator = CountingEngine()
+        translator.get_translation("Export Data")
+        first, second = translator.session(), translator.session()
+        for _ in range(3):
+            assert first.get_translation("Export Data")[1] == "cache"
+        second.get_translation("Import Data")
+
+        assert (first.get_stats()["cache_hits"], first.get_stats()["cache_misses"]) == (3, 0)
+        assert (second.get_stats()["cache_hits"], second.get_stats()["cache_misses"]) == (0, 1)
+        assert second.get_stats()["cache"]["cache_hits"] == 3
+        first.release()
+        second.release()
+        assert translator.get_stats()["cache_hits"] == 3
+        assert translator.get_stats()["cache_misses"] == 2
+
+    def test_invalidate_cache(self, tmp_path):
+        """Testa invalidação pelo AutoTranslator"""
+        translator = AutoTranslator(str(tmp_path))
+        translator.translator = CountingEngine()
+        translator.get_translation("Export Data")
+        assert translator.invalidate_cache("Export Data ") == 1
+        assert translator.get_translation("Export Data")[1] == "google"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
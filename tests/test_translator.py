@@ -6,13 +6,58 @@ Testes para o XML Translator
 
 import pytest
 import sys
+import threading
+import time
 from pathlib import Path
 
 # Adicionar src ao path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from xml_translator.core.auto_translator import AutoTranslator
+from xml_translator.core.budget import EngineCallBudget
 from xml_translator.core.translator import XMLTranslator
+from xml_translator.engines.base import TranslationEngine
+
+
+class FakeEngine(TranslationEngine):
+    """Motor falso que registra os textos e requisições enviados"""
+    
+    name = "fake"
+    supports_batch = True
+    max_concurrency = 64
+    max_batch_size = 1000
+    max_batch_chars = 100000
+    
+    def __init__(self, fail_on=None, latency=0.0, throttle_first=0):
+        self.texts = []
+        self.requests = 0
+        self.fail_on = fail_on
+        self.latency = latency
+        self.throttle_first = throttle_first
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+    
+    def translate(self, text, src, dest):
+        return self.translate_batch([text], src, dest)[0]
+    
+    def translate_batch(self, texts, src, dest):
+        with self._lock:
+            self.requests += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            throttled = self.requests <= self.throttle_first
+        try:
+            time.sleep(self.latency)
+        finally:
+            with self._lock:
+                self.active -= 1
+        if throttled:
+            raise RuntimeError("429 Too Many Requests")
+        if self.fail_on in texts:
+            raise RuntimeError("segmento inválido")
+        self.texts.extend(texts)
+        return [f"pt:{text.strip()}" for text in texts]
 
 
 class TestAutoTranslator:
@@ -32,6 +77,83 @@ class TestAutoTranslator:
         translation, source = translator.get_translation("Hello", "test_key")
         assert translation == "Hello"
         assert source == "original"
+    
+    def test_translate_batch_packs_requests(self, tmp_path):
+        """Testa agrupamento de textos por quantidade e tamanho"""
+        translator = AutoTranslator(str(tmp_path), use_cache=False)
+        engine = FakeEngine()
+        translator.translator = engine
+        translator.MAX_BATCH_SIZE = 4
+        texts = [f"Text number {i}" for i in range(10)] + ["OK"]
+        
+        results = translator.translate_batch(texts)
+        
+        assert engine.requests == 3
+        assert results[:10] == [f"pt:Text number {i}" for i in range(10)]
+        assert results[10] is None  # código curto nunca vai ao motor
+        
+        translator.MAX_BATCH_SIZE = 50
+        translator.MAX_BATCH_CHARS = 30
+        engine.requests = 0
+        translator.translate_batch(texts[:10])
+        assert engine.requests == 5
+    
+    def test_translate_batch_isolates_failing_segment(self, tmp_path):
+        """Testa divisão de lote com erro até isolar o segmento inválido"""
+        translator = AutoTranslator(str(tmp_path), use_cache=False)
+        translator.translator = FakeEngine(fail_on="Broken text")
+        texts = ["First text", "Second text", "Broken text", "Fourth text"]
+        
+        results = translator.translate_batch(texts)
+        
+        assert results == ["pt:First text", "pt:Second text", None, "pt:Fourth text"]
+        assert translator.get_translations(texts)[2] == ("Broken text", "original")
+    
+    def test_translate_batch_reports_each_result(self, tmp_path):
+        """Testa aviso de cada resposta do motor assim que o lote chega"""
+        translator = AutoTranslator(str(tmp_path), use_cache=False, rate_limit=0)
+        translator.translator = FakeEngine(fail_on="Broken text")
+        translator.MAX_BATCH_SIZE = 2
+        texts = ["Open {0}", "Broken text", "Open {1}", "OK", "Close file"]
+        reported = []
+        
+        def on_result(i, translation):
+            # Lotes anteriores já avisados antes do próximo ser enviado
+            reported.append((i, translation, translator.translator.requests))
+        
+        results = translator.translate_batch(texts, on_result)
+        
+        # Lote com erro dividido: "Open {n}" (uma requisição para ambos) sai na metade boa
+        assert sorted(reported) == [(0, "pt:Open {0}", 2), (2, "pt:Open {1}", 2),
+                                    (4, "pt:Close file", 4)]
+        assert results == ["pt:Open {0}", None, "pt:Open {1}", None, "pt:Close file"]
+    
+    def test_concurrent_batches_keep_order(self, tmp_path):
+        """Testa envio paralelo de lotes com ordem determinística"""
+        translator = AutoTranslator(str(tmp_path), use_cache=False, workers=4, rate_limit=0)
+        engine = FakeEngine(latency=0.05)
+        translator.translator = engine
+        translator.MAX_BATCH_SIZE = 2
+        texts = [f"Text number {i}" for i in range(16)]
+        
+        started = time.monotonic()
+        results = translator.translate_batch(texts)
+        elapsed = time.monotonic() - started
+        
+        assert results == [f"pt:{text}" for text in texts]
+        assert engine.max_active > 1
+        assert elapsed < 8 * 0.05
+    
+    def test_throttling_backoff_and_retry(self, tmp_path):
+        """Testa nova tentativa após erro de throttling"""
+        translator = AutoTranslator(str(tmp_path), use_cache=False, rate_limit=0)
+        translator.translator = FakeEngine(throttle_first=2)
+        translator.BACKOFF_BASE = 0.01
+        
+        assert translator.translate_batch(["Export Data"]) == ["pt:Export Data"]
+        stats = translator.get_stats()
+        assert stats["throttle_events"] == 2
+        assert stats["engine_requests"] == 3
 
 
 class TestXMLTranslator:
@@ -43,6 +165,281 @@ class TestXMLTranslator:
         assert translator is not None
         assert hasattr(translator, 'translator')
         assert hasattr(translator, 'logger')
+    
+    def test_extract_strings_compact_records(self, tmp_path):
+        """Testa registros com __slots__ e caminho compartilhado por grupo"""
+        source = tmp_path / "catalog.xml"
+        source.write_text(
+            '<localization culture="en"><group name="G">'
+            '<string key="a">One</string><string key="b">Two</string><string key="c"> </string>'
+            '<group name="H"><string key="d">Three</string></group>'
+            '</group></localization>',
+            encoding="utf-8"
+        )
+        translator = XMLTranslator(str(tmp_path), use_cache=False)
+        
+        strings = translator.extract_strings(translator.load_xml(str(source)))
+        
+        assert [unit.key for unit in strings] == ["a", "b", "d"]
+        assert not hasattr(strings[0], "__dict__")
+        assert strings[0].path == "group[G]/string"
+        assert strings[0].path is strings[1].path
+        assert strings[2]["path"] == "group[G]/group[H]/string"
+        assert strings[2].as_dict() == {"key": "d", "text": "Three", "path": strings[2].path}
+    
+    def test_process_translations_deduplicates(self, tmp_path):
+        """Testa que textos repetidos são traduzidos uma única vez"""
+        translator = XMLTranslator(str(tmp_path), use_cache=False)
+        engine = FakeEngine()
+        translator.translator.translator = engine
+        strings = [
+            {'key': 'A_Save', 'text': 'Save', 'path': 'group'},
+            {'key': 'B_Save', 'text': ' Save ', 'path': 'group'},
+            {'key': 'A_Export', 'text': 'Export Data', 'path': 'group'},
+            {'key': 'C_Save', 'text': 'Save', 'path': 'group'},
+        ]
+        
+        translations = translator.process_translations(strings)
+        
+        assert engine.texts == ['Save', 'Export Data']
+        assert engine.requests == 1
+        assert translations == {
+            'A_Save': 'pt:Save',
+            'B_Save': 'pt:Save',
+            'A_Export': 'pt:Export Data',
+            'C_Save': 'pt:Save',
+        }
+        stats = translator.last_run_stats
+        assert stats["total_keys"] == 4
+        assert stats["unique_texts"] == 2
+        assert stats["sources"]["engine"] == {"keys": 4, "unique": 2}
+    
+    def test_streaming_matches_tree_output(self, tmp_path):
+        """Testa que o modo streaming gera saída idêntica ao modo em árvore"""
+        source = tmp_path / "catalog.xml"
+        source.write_text(
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<localization xmlns="urn:a" xmlns:x="urn:b" culture="en" x:flag="1">\n'
+            '  <group name="A">\n'
+            '    <string key="k1">Save &amp; close</string>\n'
+            '    <string key="k2"/>\n'
+            '    <group name="B"><string key="k3">Multi\nline</string>tail</group>\n'
+            '    <other><string key="k4">Not extracted</string></other>\n'
+            '    <string key="k6">Hello <b>World</b> again</string>\n'
+            '    <string key="k7"> <br/>Only <i>inline</i></string>\n'
+            '  </group>\n'
+            '  <x:string key="k5">Top level</x:string>\n'
+            '</localization>',
+            encoding="utf-8"
+        )
+        translator = XMLTranslator(str(tmp_path), use_cache=False, engine=FakeEngine(),
+                                   xml_backend="etree")
+        
+        translator.translate_file(str(source), str(tmp_path / "tree.xml"))
+        for chunk_size in (1, 1000):
+            result = translator.translate_file_streaming(
+                str(source), str(tmp_path / "stream.xml"), chunk_size=chunk_size
+            )
+            assert result["strings_processed"] == 4
+            assert ((tmp_path / "stream.xml").read_bytes()
+                    == (tmp_path / "tree.xml").read_bytes())
+        # Texto antes da marcação inline traduzido, filhos e tail preservados
+        assert '<ns0:string key="k6">pt:Hello<ns0:b>World</ns0:b> again</ns0:string>' in \
+            (tmp_path / "stream.xml").read_text(encoding="utf-8")
+    
+    def test_incremental_translates_only_changes(self, tmp_path):
+        """Testa re-tradução incremental a partir da saída anterior"""
+        def write_source(entries):
+            body = "".join(f'<string key="{key}">{text}</string>' for key, text in entries)
+            source.write_text(f'<localization culture="en"><group name="G">{body}</group>'
+                              '</localization>', encoding="utf-8")
+        
+        source = tmp_path / "catalog.xml"
+        output = tmp_path / "catalog_pt-BR.xml"
+        write_source([("k1", "Save"), ("k2", "Export Data"), ("k3", "Reports")])
+        
+        engine = FakeEngine()
+        translator = XMLTranslator(str(tmp_path), use_cache=False, engine=engine)
+        translator.translate_file(str(source), str(output), incremental=True)
+        assert len(engine.texts) == 3
+        
+        # Catálogo inalterado: nenhuma chamada ao motor
+        engine.texts.clear()
+        result = translator.translate_file(str(source), str(output), incremental=True)
+        assert engine.texts == []
+        assert result["incremental"] == {"added": 0, "changed": 0, "reused": 3, "removed": 0}
+        
+        write_source([("k1", "Save"), ("k2", "Export All"), ("k4", "Analytics")])
+        result = translator.translate_file(str(source), str(output), incremental=True)
+        assert sorted(engine.texts) == ["Analytics", "Export All"]
+        assert result["incremental"] == {"added": 1, "changed": 1, "reused": 1, "removed": 1}
+        content = output.read_text(encoding="utf-8")
+        assert "pt:Save" in content and "pt:Export All" in content
+        assert "Reports" not in content
+    
+    def test_incremental_retries_originals(self, tmp_path):
+        """Testa que chaves mantidas como original são refeitas na próxima execução"""
+        source = tmp_path / "catalog.xml"
+        output = tmp_path / "catalog_pt-BR.xml"
+        source.write_text('<localization culture="en"><group name="G">'
+                          '<string key="k1">Save</string><string key="k2">Export Data</string>'
+                          '</group></localization>', encoding="utf-8")
+        
+        engine = FakeEngine(fail_on="Export Data")
+        translator = XMLTranslator(str(tmp_path), use_cache=False, engine=engine)
+        translator.translate_file(str(source), str(output), incremental=True)
+        assert "<string key=\"k2\">Export Data</string>" in output.read_text(encoding="utf-8")
+        
+        # O motor voltou: só a chave que falhou é traduzida
+        engine.fail_on = None
+        engine.texts.clear()
+        result = translator.translate_file(str(source), str(output), incremental=True)
+        assert engine.texts == ["Export Data"]
+        assert result["incremental"] == {"added": 1, "changed": 0, "reused": 1, "removed": 0}
+        assert "pt:Export Data" in output.read_text(encoding="utf-8")
+        
+        # Tudo traduzido: nada a refazer
+        engine.texts.clear()
+        result = translator.translate_file(str(source), str(output), incremental=True)
+        assert engine.texts == []
+        assert result["incremental"]["reused"] == 2
+    
+    def test_translate_file_multiple_cultures(self, tmp_path):
+        """Testa tradução para várias culturas com uma única leitura do XML"""
+        (tmp_path / "overrides.es-ES.json").write_text('{"Save": "Guardar"}', encoding="utf-8")
+        source = tmp_path / "catalog.xml"
+        source.write_text('<localization culture="en"><group name="G">'
+                          '<string key="k1">Save</string><string key="k2">Reports</string>'
+                          '</group></localization>', encoding="utf-8")
+        translator = XMLTranslator(str(tmp_path), use_cache=False, engine=FakeEngine())
+        loads = []
+        original_load = translator.load_xml
+        translator.load_xml = lambda path: loads.append(path) or original_load(path)
+        
+        result = translator.translate_file(str(source), target_cultures=["pt-BR", "es-ES"])
+        
+        assert result["status"] == "success"
+        assert loads == [str(source)]
+        assert sorted(result["outputs"]) == ["es-ES", "pt-BR"]
+        spanish = (tmp_path / "catalog_es-ES.xml").read_text(encoding="utf-8")
+        portuguese = (tmp_path / "catalog_pt-BR.xml").read_text(encoding="utf-8")
+        assert 'culture="es-ES"' in spanish and ">Guardar<" in spanish
+        assert 'culture="pt-BR"' in portuguese and ">pt:Save<" in portuguese
+        assert result["outputs"]["es-ES"]["overrides_count"] == 1
+    
+    def test_call_budget_shared_by_cultures(self, tmp_path):
+        """Testa que o orçamento do motor vale para culturas criadas antes e depois"""
+        translator = XMLTranslator(str(tmp_path), use_cache=False, engine=FakeEngine())
+        spanish = translator.for_culture("es-ES")
+        budget = EngineCallBudget(limit=3)
+        translator.set_call_budget(budget)
+        
+        french = translator.for_culture("fr-FR")
+        for culture in (translator, spanish, french):
+            assert culture.translator.call_budget is budget
+        translator.set_call_budget(None)
+        assert spanish.translator.call_budget is None
+        assert french.translator.call_budget is None
+    
+    def test_checkpoint_resumes_interrupted_run(self, tmp_path):
+        """Testa retomada de uma execução interrompida no meio da tradução"""
+        class InterruptingEngine(FakeEngine):
+            max_batch_size = 3
+            
+            def translate_batch(self, texts, src, dest):
+                if self.requests >= 2:
+                    raise KeyboardInterrupt()
+                return super().translate_batch(texts, src, dest)
+        
+        source = tmp_path / "catalog.xml"
+        body = "".join(f'<string key="k{i}">Text number {i}</string>' for i in range(10))
+        source.write_text(f'<localization culture="en"><group name="G">{body}</group>'
+                          '</localization>', encoding="utf-8")
+        journal = tmp_path / "catalog_pt-BR.xml.checkpoint.jsonl"
+        
+        # Uma única chamada a get_translations: cada lote concluído já vai para o diário
+        translator = XMLTranslator(str(tmp_path), use_cache=False, workers=1,
+                                   engine=InterruptingEngine())
+        with pytest.raises(KeyboardInterrupt):
+            translator.translate_file(str(source), checkpoint=True)
+        assert journal.exists()
+        # Gravação interrompida no meio de uma linha
+        with open(journal, "a", encoding="utf-8") as f:
+            f.write('{"t": "Text num')
+        
+        engine = FakeEngine()
+        translator = XMLTranslator(str(tmp_path), use_cache=False, engine=engine)
+        result = translator.translate_file(str(source), checkpoint=True)
+        
+        assert result["checkpoint"] == {"resumed": 6, "recorded": 4}
+        assert engine.texts == [f"Text number {i}" for i in range(6, 10)]
+        assert translator.last_run_stats["sources"]["checkpoint"]["keys"] == 6
+        assert "pt:Text number 0" in (tmp_path / "catalog_pt-BR.xml").read_text(encoding="utf-8")
+        assert not journal.exists()
+    
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_translate_tree(self, tmp_path, workers):
+        """Testa tradução de diretório com catálogos aninhados"""
+        config_dir = tmp_path / "config"
+        config_dir.mkdir()
+        (config_dir / "settings.json").write_text(
+            '{"engine": "local", "engine_options": {"local": {"prefix": "pt:"}}}',
+            encoding="utf-8"
+        )
+        catalogs = tmp_path / "catalogs"
+        (catalogs / "module").mkdir(parents=True)
+        sample = Path(__file__).parent.parent / "examples" / "sample_en.xml"
+        for target in (catalogs / "a.xml", catalogs / "module" / "b.xml"):
+            target.write_bytes(sample.read_bytes())
+        
+        translator = XMLTranslator(str(config_dir))
+        report = translator.translate_tree(str(catalogs), workers=workers, max_engine_calls=10)
+        
+        assert report["status"] == "success"
+        assert report["totals"]["files"] == 2
+        assert report["totals"]["strings_processed"] == 46
+        assert (catalogs / "module" / "b_pt-BR.xml").exists()
+        
+        # Segunda execução: tudo vem da memória de tradução compartilhada
+        report = translator.translate_tree(str(catalogs), workers=workers)
+        assert report["totals"]["files"] == 2
+        assert report["totals"]["engine_requests"] == 0
+        assert report["totals"]["sources"]["cache"] == 46
+    
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_translate_tree_budget_all_cultures(self, tmp_path, workers):
+        """Testa orçamento de chamadas e de tempo no modo diretório com várias culturas"""
+        config_dir = tmp_path / "config"
+        config_dir.mkdir()
+        (config_dir / "settings.json").write_text(
+            '{"engine": "local", "engine_options": {"local": {"prefix": "pt:"}}, "rate_limit": 0}',
+            encoding="utf-8"
+        )
+        catalogs = tmp_path / "catalogs"
+        catalogs.mkdir()
+        for name in ("a", "b"):
+            strings = "".join(f'<string key="k{i}">Text {name} number {i}</string>'
+                              for i in range(120))
+            (catalogs / f"{name}.xml").write_text(f"<localization>{strings}</localization>",
+                                                  encoding="utf-8")
+        cultures = ["pt-BR", "es-ES"]
+        
+        def translated() -> dict:
+            return {(name, culture): (catalogs / f"{name}_{culture}.xml").read_text(
+                        encoding="utf-8").count("pt:Text")
+                    for name in ("a", "b") for culture in cultures}
+        
+        translator = XMLTranslator(str(config_dir), use_cache=False)
+        report = translator.translate_tree(str(catalogs), workers=workers, time_budget=0,
+                                           target_cultures=cultures)
+        assert report["totals"]["files"] == 2
+        assert sum(translated().values()) == 0
+        
+        translator.translate_tree(str(catalogs), workers=workers, max_engine_calls=2,
+                                  target_cultures=cultures)
+        # Lotes de até 50 textos: 2 requisições somando arquivos, processos e culturas
+        assert sum(translated().values()) == 100
+        assert translator.call_budget is None
 
 
 if __name__ == "__main__":
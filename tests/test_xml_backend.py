@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes para os backends de XML e a gravação com formato preservado
+"""
+
+import pytest
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from xml_translator.core.inplace_writer import find_string_spans, write_in_place
+from xml_translator.core.translator import XMLTranslator
+from xml_translator.core.xml_backend import EtreeBackend, create_backend
+from xml_translator.engines.local import LocalEngine
+
+
+SOURCE = (
+    '<?xml version="1.0" encoding="utf-8"?>\n'
+    '<!-- Catálogo de exemplo -->\n'
+    '<loc:localization xmlns:loc="urn:loc" version=\'2\' culture="en" note="a > b">\n'
+    '    <group name="A">\n'
+    '        <!-- comentário mantido -->\n'
+    '        <string key="k1">Save &amp; close</string>\n'
+    '        <string   key="k2"   >Keep</string>\n'
+    '        <string key="k3"/>\n'
+    '        <string key="k4">Text<b>bold</b>tail</string>\n'
+    '    </group>\n'
+    '</loc:localization>\n'
+)
+
+
+class TestInPlaceWriter:
+    """Testes para write_in_place"""
+
+    def test_find_string_spans(self):
+        """Testa a localização dos textos por posição em bytes"""
+        data = SOURCE.encode("utf-8")
+        spans, root, encoding = find_string_spans(data)
+        assert [span.key for span in spans] == ["k1", "k2", "k4"]
+        assert data[spans[0].start:spans[0].end] == b"Save &amp; close"
+        assert "".join(spans[0].text) == "Save & close"
+        assert data[spans[2].start:spans[2].end] == b"Text"
+        assert data[root[0]:root[1] + 1].endswith(b'note="a > b">')
+        assert encoding == "utf-8"
+
+    def test_only_changed_texts_are_replaced(self, tmp_path):
+        """Testa que comentários, prefixos, aspas e espaços ficam intactos"""
+        source = tmp_path / "catalog.xml"
+        source.write_text(SOURCE, encoding="utf-8")
+        output = tmp_path / "out" / "catalog_pt-BR.xml"
+
+        replaced = write_in_place(str(source), str(output),
+                                  {"k1": "Salvar & fechar", "k2": "Keep", "k4": "Texto <x>"},
+                                  culture="pt-BR")
+
+        assert replaced == 2
+        expected = (SOURCE.replace("Save &amp; close", "Salvar &amp; fechar")
+                    .replace(">Text<b>", ">Texto &lt;x&gt;<b>")
+                    .replace('culture="en"', 'culture="pt-BR"'))
+        assert output.read_text(encoding="utf-8") == expected
+
+    def test_unchanged_file_is_byte_identical(self, tmp_path):
+        """Testa que sem traduções a saída é cópia exata"""
+        source = tmp_path / "catalog.xml"
+        source.write_text(SOURCE, encoding="utf-8")
+        output = tmp_path / "copy.xml"
+        assert write_in_place(str(source), str(output), {}) == 0
+        assert output.read_bytes() == source.read_bytes()
+
+    def test_invalid_xml_raises_parse_error(self, tmp_path):
+        """Testa o mesmo tipo de erro dos backends"""
+        source = tmp_path / "broken.xml"
+        source.write_text("<localization><string key='a'>x</localization>", encoding="utf-8")
+        with pytest.raises(ET.ParseError):
+            write_in_place(str(source), str(tmp_path / "out.xml"), {"a": "y"})
+
+    def test_translate_file_preserve_format(self, tmp_path):
+        """Testa translate_file com preserve_format"""
+        source = tmp_path / "catalog.xml"
+        source.write_text(SOURCE, encoding="utf-8")
+        translator = XMLTranslator(str(tmp_path), use_cache=False,
+                                   engine=LocalEngine(prefix="pt:"))
+
+        result = translator.translate_file(str(source), preserve_format=True)
+
+        assert result["status"] == "success"
+        content = Path(result["output_file"]).read_text(encoding="utf-8")
+        assert "<!-- comentário mantido -->" in content
+        assert "<loc:localization xmlns:loc" in content
+        assert 'culture="pt-BR"' in content
+        assert "pt:" in content
+        with pytest.raises(ValueError):
+            translator.translate_file(str(source), streaming=True, preserve_format=True)
+
+
+class TestBackends:
+    """Testes para create_backend"""
+
+    def test_etree_backend_round_trip(self, tmp_path):
+        """Testa leitura e gravação com o backend padrão"""
+        source = tmp_path / "catalog.xml"
+        source.write_text(SOURCE, encoding="utf-8")
+        backend = create_backend("etree")
+        assert isinstance(backend, EtreeBackend)
+        tree = backend.parse(str(source))
+        backend.write(tree, str(tmp_path / "out.xml"))
+        assert ET.parse(str(tmp_path / "out.xml")).getroot().get("culture") == "en"
+
+    def test_auto_and_unknown(self):
+        """Testa a escolha automática e nomes inválidos"""
+        backend = create_backend("auto")
+        assert backend.name in ("lxml", "etree")
+        with pytest.raises(ValueError):
+            create_backend("sax")
+
+    def test_lxml_falls_back_when_missing(self):
+        """Testa o recuo para etree sem lxml instalado"""
+        backend = create_backend("lxml")
+        try:
+            import lxml  # noqa: F401
+            assert backend.name == "lxml"
+        except ImportError:
+            assert backend.name == "etree"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])